@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Parallel, transactional batch rewriter for page sources.
+
+A per-file transform (see page_transforms) is fanned out over a process pool.
+Workers only read and compute; every result is staged in memory and nothing
+touches the tree until all transforms have succeeded. The commit then writes
+each new file to a temporary sibling, checks that no target changed since it
+was read, and swaps them in with os.replace while keeping hard-link backups.
+If anything fails, already-replaced files are restored from the backups, so
+the tree is either fully rewritten or left exactly as it was.
+
+With dry_run the changes are returned as unified diffs instead of written.
+
+Usage:
+    import batch_rewriter, page_transforms
+    result = batch_rewriter.run_batch(locations_dir, filenames,
+                                      page_transforms.inject_location_canonical)
+"""
+
+import difflib
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import instrumentation
+
+TMP_SUFFIX = '.batch-tmp'
+BACKUP_SUFFIX = '.batch-bak'
+
+
+class BatchError(Exception):
+    """Raised when a batch cannot be applied; the tree is left unchanged"""
+
+
+def _transform_file(job):
+    """Worker: read one file and run the transform on it"""
+    pages_dir, filename, transform, options = job
+    path = os.path.join(pages_dir, filename)
+    started = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            content = f.read()
+        new_content, messages = transform(filename, content, **options)
+    except Exception as error:
+        return {'filename': filename, 'error': f"{type(error).__name__}: {error}"}
+
+    result = {
+        'filename': filename,
+        'messages': messages,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'content': None,
+        'seconds': time.perf_counter() - started,
+    }
+    if new_content is not None and new_content != content:
+        result['content'] = new_content
+        result['original'] = content
+    return result
+
+
+def transform_all(pages_dir, filenames, transform, options=None, workers=None):
+    """Run transform over filenames and return the results in input order"""
+    options = options or {}
+    jobs = [(pages_dir, filename, transform, options) for filename in filenames]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) <= 1:
+        return [_transform_file(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_transform_file, jobs, chunksize=chunksize))
+
+
+def unified_diff(filename, original, content):
+    """Return a unified diff between two versions of a file"""
+    return ''.join(difflib.unified_diff(
+        original.decode('utf-8').splitlines(keepends=True),
+        content.decode('utf-8').splitlines(keepends=True),
+        fromfile=f"a/{filename}",
+        tofile=f"b/{filename}",
+    ))
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def commit(pages_dir, changes):
+    """Atomically apply staged changes, rolling back every file on any failure.
+
+    A change whose mtime_ns is None creates a new file, and fails if the
+    target appeared in the meantime; rollback removes it again.
+    """
+    staged = []
+    replaced = []
+    try:
+        for change in changes:
+            target = os.path.join(pages_dir, change['filename'])
+            tmp = target + TMP_SUFFIX
+            backup = target + BACKUP_SUFFIX
+            staged.append((change, target, tmp, backup))
+            with open(tmp, 'wb') as f:
+                f.write(change['content'])
+                f.flush()
+                os.fsync(f.fileno())
+            if change['mtime_ns'] is not None:
+                shutil.copymode(target, tmp)
+
+        # Refuse to clobber edits made while the workers were running
+        for change, target, _, _ in staged:
+            if change['mtime_ns'] is None:
+                if os.path.exists(target):
+                    raise BatchError(f"{change['filename']} was created on disk during the batch")
+                continue
+            stat = os.stat(target)
+            if (stat.st_mtime_ns, stat.st_size) != (change['mtime_ns'], change['size']):
+                raise BatchError(f"{change['filename']} changed on disk during the batch")
+
+        for change, target, _, backup in staged:
+            if change['mtime_ns'] is None:
+                continue
+            _remove_quietly(backup)
+            try:
+                os.link(target, backup)
+            except OSError:
+                shutil.copy2(target, backup)
+
+        for change, target, tmp, backup in staged:
+            os.replace(tmp, target)
+            replaced.append((target, backup if change['mtime_ns'] is not None else None))
+    except BaseException:
+        for target, backup in reversed(replaced):
+            if backup is None:
+                _remove_quietly(target)
+            else:
+                os.replace(backup, target)
+        for _, _, tmp, backup in staged:
+            _remove_quietly(tmp)
+            _remove_quietly(backup)
+        raise
+
+    for _, _, _, backup in staged:
+        _remove_quietly(backup)
+
+
+def run_batch(pages_dir, filenames, transform, options=None, workers=None, dry_run=False):
+    """Transform filenames in parallel and commit all changes together.
+
+    Returns {'results': [...], 'changed': [...], 'diffs': {filename: diff}}.
+    Raises BatchError, without touching any file, if a transform failed.
+    """
+    metrics = instrumentation.current()
+    with metrics.stage('transform'):
+        results = transform_all(pages_dir, filenames, transform, options, workers)
+    for result in results:
+        if 'error' not in result:
+            metrics.file_time(result['filename'], result['seconds'], read=result['size'])
+
+    failed = [r for r in results if 'error' in r]
+    if failed:
+        details = '; '.join(f"{r['filename']}: {r['error']}" for r in failed)
+        raise BatchError(f"{len(failed)} file(s) failed, nothing was written: {details}")
+
+    changes = [r for r in results if r['content'] is not None]
+    diffs = {}
+    if dry_run:
+        for change in changes:
+            diffs[change['filename']] = unified_diff(change['filename'], change['original'], change['content'])
+    elif changes:
+        with metrics.stage('commit'):
+            commit(pages_dir, changes)
+        for change in changes:
+            metrics.wrote(len(change['content']), change['filename'])
+
+    return {
+        'results': results,
+        'changed': [change['filename'] for change in changes],
+        'diffs': diffs,
+    }
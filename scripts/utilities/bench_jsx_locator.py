@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: jsx_locator.locate() against the old DOTALL insertion regex.
+
+Runs both on pathological inputs built from a real location page and prints
+time per input size. The locator's time should grow linearly with the input
+(roughly constant ns/byte); the regex degrades when the 'Professional Service
+Bar' marker is missing, and goes quadratic when the file has many 'return ('
+candidates or long whitespace runs.
+
+Usage:
+    python3 bench_jsx_locator.py [path/to/Page.tsx]
+"""
+
+import os
+import re
+import sys
+import time
+
+import jsx_locator
+
+OLD_PATTERN = re.compile(r'(\s+return \(\s+<div[^>]*>\s*)(.*?Professional Service Bar)', re.DOTALL)
+
+# Skip the regex once a single run takes longer than this; the trend is clear by then
+REGEX_BUDGET_SECONDS = 5.0
+
+DEFAULT_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            '..', '..', 'src', 'pages', 'locations', 'Kew.tsx')
+
+
+def timed(func, data, repeat=3):
+    """Best-of-n wall time in seconds"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def old_regex(data):
+    return OLD_PATTERN.search(data)
+
+
+def new_locator(data):
+    return jsx_locator.locate(data.encode('utf-8'))
+
+
+def cases(page):
+    """Yield (name, size_label, text) pathological inputs at growing sizes"""
+    without_marker = page.replace('Professional Service Bar', 'Service Bar')
+
+    for copies in (1, 8, 32, 128):
+        yield 'missing marker, repeated page', copies, without_marker * copies
+
+    component = "const Part{n} = () => {{\n  return (\n    <div className=\"part\">\n      <span>{n}</span>\n    </div>\n  );\n}};\n"
+    for count in (250, 500, 1000, 2000):
+        text = ''.join(component.format(n=n) for n in range(count))
+        yield "many 'return (' candidates", count, text
+
+    for width in (10000, 20000, 40000, 80000):
+        yield 'long whitespace run', width, ' ' * width + 'return (x'
+
+
+def main():
+    page_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PAGE
+    with open(page_path, 'r') as f:
+        page = f.read()
+
+    print(f"{'case':32} {'size':>7} {'bytes':>10} {'regex ms':>10} {'locator ms':>11} {'locator ns/B':>13}")
+    skipped = set()
+    for name, size, text in cases(page):
+        data_len = len(text.encode('utf-8'))
+        locator_time = timed(new_locator, text)
+        if name in skipped:
+            regex_ms = 'skipped'
+        else:
+            regex_time = timed(old_regex, text, repeat=1)
+            regex_ms = f"{regex_time * 1000:.1f}"
+            if regex_time > REGEX_BUDGET_SECONDS:
+                skipped.add(name)
+        print(f"{name:32} {size:>7} {data_len:>10} {regex_ms:>10} "
+              f"{locator_time * 1000:>11.2f} {locator_time * 1e9 / data_len:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the SEO utilities on synthetic large-site corpora.
+
+Builds src/pages/locations-style trees of suburb x service pages from a real
+location page (Kew.tsx by default) and times each stage the scripts run:
+
+  scan-cold        page_index.scan_pages with no cache
+  scan-warm        page_index.scan_pages with the cache from scan-cold
+  slugs            SlugRegistry build plus bulk kebab/display/camel conversion
+  sitemap          warm scan + streaming location sitemap shards and index
+  inject           canonical injection over every page without one
+                   (batch_rewriter + page_transforms.inject_location_canonical)
+  inject-noop      the same batch again, which should touch nothing
+
+Every stage runs in a fresh interpreter so its peak RSS is its own. For each
+stage and size the suite records wall time, peak RSS (including worker
+processes) and the number of files created or modified. Results are appended
+to a JSON history, compared with the previous run on the same machine, and a
+scaling exponent (slope of log time against log pages) is printed per stage:
+about 1.0 means linear, clearly above it means the stage will not survive
+growth.
+
+Usage:
+    python3 bench_seo_utilities.py [--sizes 150,1000,10000,50000] [--history PATH]
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import page_index
+
+DEFAULT_SIZES = (150, 1000, 10000, 50000)
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'src', 'pages', 'locations', 'Kew.tsx')
+HISTORY_PATH = os.path.join(page_index.CACHE_DIR, 'bench-history.json')
+
+STAGES = ('scan-cold', 'scan-warm', 'slugs', 'sitemap', 'inject', 'inject-noop')
+
+# Services crossed with suburbs to reach thousands of pages
+SERVICES = ('', 'MouldInspection', 'MouldRemoval', 'Fogging', 'SubfloorRemediation',
+            'MaterialRemoval', 'BlackMould', 'CeilingMould', 'BathroomMould', 'AirQuality')
+
+SUBURBS = (
+    'Abbotsford', 'AlbertPark', 'Altona', 'Armadale', 'AscotVale', 'Balwyn', 'Bentleigh',
+    'BoxHill', 'Brighton', 'Brunswick', 'Bundoora', 'Burwood', 'Camberwell', 'Carlton',
+    'Caulfield', 'Clayton', 'Coburg', 'Collingwood', 'Dandenong', 'Docklands', 'Doncaster',
+    'Elwood', 'Essendon', 'Fitzroy', 'Footscray', 'GlenIris', 'GlenWaverley', 'Hawthorn',
+    'Heidelberg', 'Ivanhoe', 'Kensington', 'Kew', 'MalvernEast', 'McKinnon', 'MelbourneCBD',
+    'MooneePonds', 'Northcote', 'PointCook', 'Prahran', 'Preston', 'Richmond', 'Ringwood',
+    'SouthYarra', 'StKilda', 'StKildaEast', 'Toorak', 'Werribee', 'WheelersHillSE',
+    'Williamstown', 'Yarraville',
+)
+
+_CANONICAL_PROP = re.compile(rb'\n[ \t]*canonical="[^"]*"')
+
+
+def page_names(count):
+    """Return count distinct CamelCase page stems: suburb x service, then numbered areas"""
+    combos = [suburb + service for service in SERVICES for suburb in SUBURBS]
+    names = []
+    for n in range(count):
+        area, index = divmod(n, len(combos))
+        names.append(combos[index] + (f"Area{area}" if area else ''))
+    return names
+
+
+def build_corpus(directory, count, template_path):
+    """Write count pages modelled on the template; every other page has no canonical"""
+    with open(template_path, 'rb') as f:
+        template = f.read()
+    stem = os.path.basename(template_path)[:-4].encode('utf-8')
+    kebab = stem.lower()
+    without_canonical = _CANONICAL_PROP.sub(b'', template, count=1)
+
+    os.makedirs(directory, exist_ok=True)
+    for n, name in enumerate(page_names(count)):
+        source = template if n % 2 else without_canonical
+        data = source.replace(stem, name.encode('utf-8')).replace(b'-' + kebab, b'-' + name.lower().encode('utf-8'))
+        with open(os.path.join(directory, name + '.tsx'), 'wb') as f:
+            f.write(data)
+
+
+def snapshot(*directories):
+    """Return {path: (mtime_ns, size)} for every file under the directories"""
+    state = {}
+    for directory in directories:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def files_touched(before, after):
+    """Count files created, modified or removed between two snapshots"""
+    changed = sum(1 for path, state in after.items() if before.get(path) != state)
+    return changed + sum(1 for path in before if path not in after)
+
+
+def peak_rss_bytes():
+    """Peak RSS of this process and its finished children, in bytes"""
+    scale = 1 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale
+
+
+# Stages: each takes (pages_dir, work_dir) and runs in its own interpreter
+
+def stage_scan(pages_dir, work_dir):
+    page_index.scan_pages(pages_dir, index_path=os.path.join(work_dir, 'index.json'))
+
+
+def stage_inject(pages_dir, work_dir):
+    import batch_rewriter
+    import page_transforms
+
+    index = page_index.scan_pages(pages_dir, index_path=os.path.join(work_dir, 'index.json'))
+    filenames = sorted(name for name, entry in index.items() if not entry['has_canonical'])
+    batch_rewriter.run_batch(pages_dir, filenames, page_transforms.inject_location_canonical)
+
+
+def stage_slugs(pages_dir, work_dir):
+    from slug_registry import SlugRegistry
+
+    stems = sorted(name[:-4] for name in os.listdir(pages_dir) if name.endswith('.tsx'))
+    registry = SlugRegistry(stems)
+    kebabs = registry.bulk_to_kebab(stems)
+    registry.bulk_to_display(stems)
+    registry.bulk_to_camel(kebabs)
+
+
+def stage_sitemap(pages_dir, work_dir):
+    from sitemap_writer import SitemapWriter, write_sitemap_index
+    from slug_registry import SlugRegistry
+
+    index = page_index.scan_pages(pages_dir, index_path=os.path.join(work_dir, 'index.json'), save=False)
+    stems = sorted(entry['stem'] for entry in index.values())
+    suburbs = SlugRegistry(stems)
+    output_dir = os.path.join(work_dir, 'public')
+    os.makedirs(output_dir, exist_ok=True)
+    with SitemapWriter(output_dir, 'sitemap-locations', max_urls=50000, max_bytes=50 * 1024 * 1024,
+                       atomic=True) as writer:
+        for kebab in sorted(suburbs.bulk_to_kebab(stems)):
+            writer.add(f"https://mouldrestoration.com.au/locations/{kebab}", lastmod='2025-01-01',
+                       changefreq='weekly', priority=0.75)
+    write_sitemap_index(os.path.join(output_dir, 'sitemap.xml'),
+                        (f"https://mouldrestoration.com.au/{name}" for name in writer.shards))
+
+
+STAGE_FUNCTIONS = {
+    'scan-cold': stage_scan,
+    'scan-warm': stage_scan,
+    'inject': stage_inject,
+    'inject-noop': stage_inject,
+    'slugs': stage_slugs,
+    'sitemap': stage_sitemap,
+}
+
+
+def run_stage_here(stage, pages_dir, work_dir):
+    """Child side: run one stage and print its timing as JSON"""
+    started = time.perf_counter()
+    STAGE_FUNCTIONS[stage](pages_dir, work_dir)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({'seconds': elapsed, 'peak_rss': peak_rss_bytes()}))
+
+
+def run_stage(stage, pages_dir, work_dir):
+    """Parent side: run a stage in a fresh interpreter and count the files it touched"""
+    before = snapshot(pages_dir, work_dir)
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--run-stage', stage, pages_dir, work_dir],
+        check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['files_touched'] = files_touched(before, snapshot(pages_dir, work_dir))
+    return result
+
+
+def scaling_exponent(points):
+    """Least-squares slope of log(seconds) against log(pages)"""
+    points = [(math.log(n), math.log(seconds)) for n, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def git_revision():
+    """Short commit hash of the checkout, with a + suffix when it has local changes"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=here,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=here,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ('+' if dirty else '')
+
+
+def load_history(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'runs': []}
+
+
+def save_history(path, history):
+    """Write the history via a temporary file and atomic rename"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(history, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+# Slowdowns smaller than this are timer noise, whatever the ratio
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def regressions(previous, current, threshold):
+    """Yield (stage, size, old, new) where a stage got slower than threshold"""
+    for stage, sizes in current['results'].items():
+        for size, result in sizes.items():
+            old = previous['results'].get(stage, {}).get(size)
+            if (old and result['seconds'] > old['seconds'] * (1 + threshold)
+                    and result['seconds'] - old['seconds'] > MIN_REGRESSION_SECONDS):
+                yield stage, size, old['seconds'], result['seconds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SEO utilities on synthetic page trees")
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated page counts (default: %(default)s)")
+    parser.add_argument('--stages', default=','.join(STAGES), help="comma-separated stages to run")
+    parser.add_argument('--template', default=DEFAULT_TEMPLATE, help="location page the corpus is modelled on")
+    parser.add_argument('--history', default=HISTORY_PATH, help="JSON history file (default: %(default)s)")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="slowdown against the previous run reported as a regression (default: 0.2)")
+    parser.add_argument('--keep', metavar='DIR', help="build the corpora under DIR and keep them")
+    parser.add_argument('--run-stage', nargs=3, metavar=('STAGE', 'PAGES_DIR', 'WORK_DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_stage:
+        run_stage_here(*args.run_stage)
+        return 0
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+
+    base_dir = args.keep or tempfile.mkdtemp(prefix='seo-bench-')
+    results = {stage: {} for stage in stages}
+    print(f"{'stage':12} {'pages':>7} {'seconds':>9} {'us/page':>9} {'peak RSS MB':>12} {'touched':>8}")
+    try:
+        for size in sizes:
+            pages_dir = os.path.join(base_dir, str(size), 'locations')
+            work_dir = os.path.join(base_dir, str(size), 'work')
+            shutil.rmtree(os.path.join(base_dir, str(size)), ignore_errors=True)
+            os.makedirs(work_dir)
+            build_corpus(pages_dir, size, args.template)
+            for stage in stages:
+                result = run_stage(stage, pages_dir, work_dir)
+                results[stage][str(size)] = result
+                print(f"{stage:12} {size:>7} {result['seconds']:>9.3f} {result['seconds'] * 1e6 / size:>9.1f} "
+                      f"{result['peak_rss'] / 2 ** 20:>12.1f} {result['files_touched']:>8}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    print(f"\n{'stage':12} {'exponent':>9}  (1.0 = linear)")
+    for stage in stages:
+        exponent = scaling_exponent((int(size), result['seconds']) for size, result in results[stage].items())
+        label = 'n/a' if exponent is None else f"{exponent:.2f}"
+        warning = '  superlinear' if exponent is not None and exponent > 1.2 else ''
+        print(f"{stage:12} {label:>9}{warning}")
+
+    run = {
+        'revision': git_revision(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+    history = load_history(args.history)
+    previous = next((old for old in reversed(history['runs']) if old.get('machine') == run['machine']), None)
+    history['runs'].append(run)
+    save_history(args.history, history)
+    print(f"\nRecorded run {run['revision'] or '(no revision)'} in {args.history}")
+
+    if previous:
+        slower = list(regressions(previous, run, args.threshold))
+        print(f"Compared with {previous.get('revision') or 'previous run'}: {len(slower)} regression(s)")
+        for stage, size, old, new in slower:
+            print(f"  {stage} at {size} pages: {old:.3f}s -> {new:.3f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
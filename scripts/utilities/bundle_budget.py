@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Per-route bundle budgets from the Vite build manifest.
+
+The <Route> table in src/App.tsx maps each path to a component, and each
+component to the module it is imported or lazy-loaded from. The build
+manifest (build.manifest in vite.config.ts, written to dist/.vite/) maps
+every module to its output chunk, the chunks it imports statically and its
+CSS. A route costs the entry chunk's static import closure, which every
+page loads, plus the closure of its own module; /locations/:suburb is
+expanded to one route per suburb in suburbData.ts, since
+DynamicLocationPage imports the page module named after the slug.
+
+For every route the analyzer reports JS and CSS bytes raw, gzipped and
+brotli-compressed, and how much of it is entry code, chunks only this
+route loads, and chunks shared with other routes. Compressed sizes come
+from the .gz/.br files vite-plugin-compression writes next to each asset,
+or are computed (brotli only if the brotli package is installed) in a
+process pool and cached by file name, mtime and size; chunk names carry a
+content hash, so a rebuild only compresses the chunks that changed.
+
+Routes are checked against bundle_budgets.json, where the first entry
+whose pattern matches the route path sets its limits in bytes:
+
+    {"version": 1, "budgets": [{"routes": "/admin/*", "js_gzip": 600000},
+                               {"routes": "*", "js_gzip": 300000, "css_gzip": 40000}]}
+
+Each build's chunk sizes are kept, keyed by chunk name without the hash,
+so the report also shows what changed since the previous build. Rollup
+gives many chunks the same name (index-<hash>.js), so every file under a
+name is kept and their sizes compared together.
+
+Like the other checkers, an exceeded budget is reported but the exit status
+stays 0 unless --strict is given; CI should run it with --strict.
+
+Usage:
+    python3 bundle_budget.py [--root PROJECT] [--dist dist] [--route '/locations/*'] [--json] [--strict]
+"""
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:  # optional; brotli sizes are then only read from .br files
+    brotli = None
+
+import page_index
+from consistency_checker import (DYNAMIC_LOCATION_COMPONENT, dynamic_component_name, load_routes,
+                                 load_suburb_slugs)
+
+HISTORY_VERSION = 2
+SIZES_VERSION = 1
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bundle_budgets.json')
+MANIFEST_PATHS = (os.path.join('.vite', 'manifest.json'), 'manifest.json')
+
+METRICS = ('js', 'js_gzip', 'js_brotli', 'css', 'css_gzip', 'css_brotli')
+MODULE_EXTENSIONS = ('.tsx', '.ts', '.jsx', '.js')
+LOCATION_MODULE = 'src/pages/locations/{component}.tsx'
+
+# The hash Rollup appends to chunk and asset names
+_HASH = re.compile(r'-[A-Za-z0-9_-]{8}(?=\.[^./]+$)')
+
+
+def find_manifest(dist_dir):
+    for relative in MANIFEST_PATHS:
+        path = os.path.join(dist_dir, relative)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def load_manifest(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return json.loads(data), hashlib.sha1(data).hexdigest()
+
+
+def chunk_name(file):
+    """A chunk's file name without its content hash, stable across builds"""
+    return _HASH.sub('', file)
+
+
+def module_key(manifest, import_path):
+    """Manifest key of a module App.tsx imports as './pages/About'"""
+    base = os.path.normpath(os.path.join('src', import_path)).replace(os.sep, '/')
+    for candidate in (base, *(base + ext for ext in MODULE_EXTENSIONS),
+                      *(f"{base}/index{ext}" for ext in MODULE_EXTENSIONS)):
+        if candidate in manifest:
+            return candidate
+    return None
+
+
+def route_table(root, manifest):
+    """Return [(route, [manifest keys])] for every route in App.tsx.
+
+    A module missing from the manifest was bundled into the chunk that
+    imports it (Index is imported statically into the entry), so the route
+    only costs the entry.
+    """
+    routes = load_routes(os.path.join(root, 'src', 'App.tsx'))
+    modules = routes['modules']
+
+    def keys(component):
+        key = module_key(manifest, modules[component]) if component in modules else None
+        return [key] if key else []
+
+    table = []
+    for path, component in routes['paths'].items():
+        if component != DYNAMIC_LOCATION_COMPONENT:
+            table.append((path, keys(component)))
+            continue
+        prefix = path.rpartition('/')[0] + '/'
+        for slug in sorted(load_suburb_slugs(os.path.join(root, 'src', 'data', 'suburbData.ts'))):
+            page = LOCATION_MODULE.format(component=dynamic_component_name(slug))
+            table.append((prefix + slug, keys(component) + ([page] if page in manifest else [])))
+    return sorted(table)
+
+
+class Closures:
+    """Static-import closures over the manifest, memoised per chunk"""
+
+    def __init__(self, manifest):
+        self.manifest = manifest
+        self.memo = {}
+
+    def __call__(self, key):
+        found = self.memo.get(key)
+        if found is None:
+            # Mark first so an import cycle terminates
+            self.memo[key] = found = {key}
+            for imported in self.manifest[key].get('imports', ()):
+                if imported in self.manifest:
+                    found |= self(imported)
+            self.memo[key] = frozenset(found)
+        return found
+
+    def files(self, keys):
+        """Output files (JS chunks and CSS) loaded for a set of manifest keys"""
+        files = set()
+        for key in keys:
+            entry = self.manifest[key]
+            files.add(entry['file'])
+            files.update(entry.get('css', ()))
+        return files
+
+
+def _compress_job(path):
+    """Worker: gzip and brotli sizes of one file, preferring the precompressed copies"""
+    sizes = []
+    with open(path, 'rb') as f:
+        data = f.read()
+    for suffix, compress in (('.gz', lambda raw: gzip.compress(raw, compresslevel=9, mtime=0)),
+                             ('.br', brotli.compress if brotli is not None else None)):
+        try:
+            sizes.append(os.path.getsize(path + suffix))
+        except OSError:
+            sizes.append(len(compress(data)) if compress is not None else None)
+    return sizes
+
+
+def sizes_path(dist_dir):
+    digest = hashlib.sha1(os.path.abspath(dist_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(page_index.CACHE_DIR, f"bundle-sizes-{digest}.json")
+
+
+def file_sizes(dist_dir, files, workers=None):
+    """Return {file: {'raw', 'gzip', 'brotli'}}, compressing only files not seen before"""
+    path = sizes_path(dist_dir)
+    try:
+        with open(path, 'r') as f:
+            cached = json.load(f)
+        if cached.get('version') != SIZES_VERSION:
+            cached = {}
+    except (OSError, ValueError):
+        cached = {}
+    previous = cached.get('files', {})
+
+    sizes = {}
+    stale = []
+    for file in sorted(files):
+        try:
+            stat = os.stat(os.path.join(dist_dir, file))
+        except FileNotFoundError:
+            sizes[file] = {'raw': 0, 'gzip': 0, 'brotli': 0, 'missing': True}
+            continue
+        prior = previous.get(file)
+        if prior and (prior['mtime_ns'], prior['raw']) == (stat.st_mtime_ns, stat.st_size):
+            sizes[file] = prior
+        else:
+            sizes[file] = {'raw': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+            stale.append(file)
+
+    jobs = [os.path.join(dist_dir, file) for file in stale]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2 * workers:
+        computed = [_compress_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_compress_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    for file, (gzip_size, brotli_size) in zip(stale, computed):
+        sizes[file].update(gzip=gzip_size, brotli=brotli_size)
+
+    if stale:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        keep = {file: size for file, size in sizes.items() if not size.get('missing')}
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w') as f:
+            f.write(json.dumps({'version': SIZES_VERSION, 'files': keep}, separators=(',', ':')))
+        os.replace(tmp, path)
+    return sizes
+
+
+def totals(files, sizes):
+    """Sum raw and compressed sizes per asset type; a missing brotli size makes the total None"""
+    result = dict.fromkeys(METRICS, 0)
+    for file in files:
+        kind = 'css' if file.endswith('.css') else 'js'
+        size = sizes[file]
+        result[kind] += size['raw']
+        for metric, field in (('_gzip', 'gzip'), ('_brotli', 'brotli')):
+            if result[kind + metric] is not None:
+                result[kind + metric] = None if size[field] is None else result[kind + metric] + size[field]
+    return result
+
+
+def analyse(root, dist_dir, workers=None):
+    """Compute every route's bundle cost. Returns a report dict"""
+    path = find_manifest(dist_dir)
+    if path is None:
+        raise FileNotFoundError(f"no Vite manifest in {dist_dir}; build with build.manifest enabled")
+    manifest, build = load_manifest(path)
+    closures = Closures(manifest)
+
+    entries = [key for key, entry in manifest.items() if entry.get('isEntry')]
+    entry_keys = set()
+    for key in entries:
+        entry_keys |= closures(key)
+    entry_files = closures.files(entry_keys)
+
+    routes = []
+    for route, keys in route_table(root, manifest):
+        route_keys = set()
+        for key in keys:
+            route_keys |= closures(key)
+        routes.append({'route': route, 'modules': keys, 'files': closures.files(route_keys) - entry_files})
+
+    # A chunk loaded by a single route is that route's own; the rest is shared
+    loaded_by = {}
+    for route in routes:
+        for file in route['files']:
+            loaded_by[file] = loaded_by.get(file, 0) + 1
+    sizes = file_sizes(dist_dir, entry_files | set(loaded_by), workers)
+
+    entry_total = totals(entry_files, sizes)
+    for route in routes:
+        own = {file for file in route['files'] if loaded_by[file] == 1}
+        route['total'] = totals(entry_files | route['files'], sizes)
+        route['own'] = totals(own, sizes)
+        route['shared'] = totals(route['files'] - own, sizes)
+        route['files'] = sorted(route['files'])
+
+    chunks = {}
+    for file, size in sorted(sizes.items()):
+        if size.get('missing'):
+            continue
+        chunk = chunks.setdefault(chunk_name(file), {'files': [], 'raw': 0, 'gzip': 0})
+        chunk['files'].append(file)
+        chunk['raw'] += size['raw']
+        chunk['gzip'] = None if chunk['gzip'] is None or size['gzip'] is None else chunk['gzip'] + size['gzip']
+    return {
+        'manifest': path,
+        'build': build,
+        'entry': entry_total,
+        'entry_files': sorted(entry_files),
+        'routes': routes,
+        'chunks': chunks,
+        'missing': sorted(file for file, size in sizes.items() if size.get('missing')),
+    }
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != 1:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}")
+    for budget in data['budgets']:
+        unknown = set(budget) - {'routes', *METRICS}
+        if unknown:
+            raise ValueError(f"{path}: unknown budget metric(s) {', '.join(sorted(unknown))}")
+    return data['budgets']
+
+
+def check_budgets(routes, budgets):
+    """Return [(route, metric, value, limit)] for every limit a route exceeds"""
+    over = []
+    for route in routes:
+        budget = next((budget for budget in budgets if fnmatch.fnmatchcase(route['route'], budget['routes'])), None)
+        if budget is None:
+            continue
+        for metric in METRICS:
+            limit = budget.get(metric)
+            value = route['total'][metric]
+            if limit is not None and value is not None and value > limit:
+                over.append((route['route'], metric, value, limit))
+    return over
+
+
+def history_path(dist_dir):
+    digest = hashlib.sha1(os.path.abspath(dist_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(page_index.CACHE_DIR, f"bundle-history-{digest}.json")
+
+
+def previous_build(report, dist_dir):
+    """Return the previous build's chunks and record this build's.
+
+    Re-analysing the same build keeps comparing against the build before it.
+    """
+    path = history_path(dist_dir)
+    try:
+        with open(path, 'r') as f:
+            history = json.load(f)
+        if history.get('version') != HISTORY_VERSION:
+            history = {}
+    except (OSError, ValueError):
+        history = {}
+
+    if history.get('build') == report['build']:
+        return history.get('previous')
+    previous = history.get('chunks')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'version': HISTORY_VERSION, 'build': report['build'], 'chunks': report['chunks'],
+                   'previous': previous}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+    return previous
+
+
+def chunk_deltas(chunks, previous):
+    """Return [(name, raw delta, gzip delta, status)] for chunk names whose files changed size, appeared or went away"""
+    deltas = []
+    for name in sorted(set(chunks) | set(previous)):
+        now, before = chunks.get(name), previous.get(name)
+        if before is None:
+            deltas.append((name, now['raw'], now['gzip'], 'added'))
+        elif now is None:
+            deltas.append((name, -before['raw'], -(before['gzip'] or 0), 'removed'))
+        elif now['raw'] != before['raw']:
+            deltas.append((name, now['raw'] - before['raw'], (now['gzip'] or 0) - (before['gzip'] or 0), 'changed'))
+    return sorted(deltas, key=lambda delta: -abs(delta[2]))
+
+
+def kb(value):
+    return '-' if value is None else f"{value / 1024:.1f}"
+
+
+def print_report(report, over, deltas, limit, seconds, strict=False):
+    routes = sorted(report['routes'], key=lambda route: -(route['total']['js_gzip'] or 0))
+    entry = report['entry']
+    print(f"📦 {len(report['routes'])} routes from {report['manifest']} in {seconds:.3f}s; "
+          f"entry {kb(entry['js'])} kB JS ({kb(entry['js_gzip'])} kB gzip), "
+          f"{kb(entry['css'])} kB CSS ({kb(entry['css_gzip'])} kB gzip)")
+    if report['missing']:
+        print(f"⚠️  {len(report['missing'])} file(s) in the manifest are missing from the build: "
+              f"{', '.join(report['missing'][:5])}")
+
+    print(f"\n{'route':<44} {'JS kB':>8} {'gzip':>7} {'br':>7} {'CSS kB':>7} {'gzip':>6} {'own gz':>7} {'shared gz':>9}")
+    shown = routes if limit == 0 else routes[:limit]
+    for route in shown:
+        total = route['total']
+        print(f"{route['route'][:44]:<44} {kb(total['js']):>8} {kb(total['js_gzip']):>7} {kb(total['js_brotli']):>7} "
+              f"{kb(total['css']):>7} {kb(total['css_gzip']):>6} {kb(route['own']['js_gzip']):>7} "
+              f"{kb(route['shared']['js_gzip']):>9}")
+    if len(routes) > len(shown):
+        print(f"... {len(routes) - len(shown)} more (--limit 0 for all)")
+
+    if deltas is None:
+        print("\nNo previous build to compare with")
+    elif not deltas:
+        print("\nNo chunk changed size since the previous build")
+    else:
+        print(f"\nChunks changed since the previous build ({len(deltas)}):")
+        for name, raw, gzipped, status in (deltas if limit == 0 else deltas[:limit]):
+            print(f"  {raw / 1024:+9.1f} kB ({gzipped / 1024:+.1f} kB gzip)  {name}  [{status}]")
+
+    if over:
+        print(f"\n❌ {len(over)} budget(s) exceeded{'' if strict else ' (exit status 0 without --strict)'}:")
+        for route, metric, value, budget in (over if limit == 0 else over[:limit]):
+            print(f"  {route}  {metric} {kb(value)} kB > {kb(budget)} kB")
+    else:
+        print("\n✅ Every route is within its budget")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-route JS/CSS bundle sizes and budgets from the Vite manifest")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--dist', help="build output directory (default: ROOT/dist)")
+    parser.add_argument('--budgets', default=BUDGETS_PATH, help="per-route budgets (default: %(default)s)")
+    parser.add_argument('--route', action='append', metavar='PATTERN',
+                        help="only report routes matching this glob; repeatable")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--limit', type=int, default=20, help="routes and changes listed, 0 for all (default: 20)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    parser.add_argument('--strict', action='store_true',
+                        help="exit with status 1 when a budget is exceeded (without it the run only reports)")
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+    dist_dir = os.path.abspath(args.dist or os.path.join(root, 'dist'))
+
+    started = time.perf_counter()
+    try:
+        report = analyse(root, dist_dir, args.workers)
+    except FileNotFoundError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    if args.route:
+        report['routes'] = [route for route in report['routes']
+                            if any(fnmatch.fnmatchcase(route['route'], pattern) for pattern in args.route)]
+    over = check_budgets(report['routes'], load_budgets(args.budgets))
+    previous = previous_build(report, dist_dir)
+    deltas = chunk_deltas(report['chunks'], previous) if previous is not None else None
+    seconds = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({
+            'seconds': round(seconds, 3),
+            'entry': report['entry'],
+            'routes': report['routes'],
+            'over_budget': [{'route': route, 'metric': metric, 'value': value, 'budget': budget}
+                            for route, metric, value, budget in over],
+            'chunk_deltas': None if deltas is None else [
+                {'chunk': name, 'raw': raw, 'gzip': gzipped, 'status': status}
+                for name, raw, gzipped, status in deltas],
+        }, indent=2))
+    else:
+        print_report(report, over, deltas, args.limit, seconds, args.strict)
+    return 1 if args.strict and over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Cross-artifact consistency checker for location pages, routes and sitemaps.
+
+The same page URL lives in several places that drift apart: the canonical
+and schema props in each location page, the routes in src/App.tsx (plus the
+suburb table DynamicLocationPage resolves /locations/:suburb against) and
+every public/sitemap*.xml. The checker loads each artifact once into hashed
+indexes and then walks every URL occurrence a single time, reporting URLs
+that are:
+
+  unrouted              - no route in App.tsx serves the path
+  missing-from-sitemap  - no sitemap lists any URL that serves the page
+  non-canonical         - canonical and schema URLs disagree, the canonical
+                          is relative or missing, or a sitemap lists a URL
+                          that is not the page's canonical
+  cross-domain          - the host is not the site's host
+  duplicated            - listed twice across sitemaps, or claimed as
+                          canonical by two pages
+
+Known issues are listed in consistency_allowlist.json, each rule with the
+reason it is accepted. A rule names a category and globs for the issue's
+url, source and detail, any of them a list; an issue a rule matches is
+counted as allowed instead of found, and --strict only fails on the rest.
+Rules that no longer match anything are reported so the list shrinks as
+the issues are fixed.
+
+Usage:
+    python3 consistency_checker.py [--root PROJECT] [--host HOST] [--allowlist FILE] [--json] [--strict]
+"""
+
+import argparse
+import fnmatch
+import functools
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from xml.sax.saxutils import unescape
+
+import page_index
+from page_transforms import LOCATION_PATH, slug_path
+from slug_registry import SlugRegistry
+
+SITE_HOST = 'mouldrestoration.com.au'
+ALLOWLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'consistency_allowlist.json')
+ALLOWLIST_FIELDS = ('category', 'url', 'source', 'detail')
+
+CATEGORIES = ('unrouted', 'missing-from-sitemap', 'non-canonical', 'cross-domain', 'duplicated')
+
+# Route component that serves /locations/:suburb from the suburb table
+DYNAMIC_LOCATION_COMPONENT = 'DynamicLocationPage'
+LOCATION_MODULE_PREFIX = './pages/locations/'
+
+_LAZY_IMPORT = re.compile(rb'const\s+(\w+)\s*=\s*lazy\(\s*\(\)\s*=>\s*import\(\s*["\']([^"\']+)["\']')
+_STATIC_IMPORT = re.compile(rb'^import\s+(\w+)\s+from\s+["\'](\.[^"\']+)["\']', re.MULTILINE)
+_ROUTE = re.compile(rb'<Route\s+path=["\']([^"\']+)["\']\s+element=\{\s*<(\w+)')
+_SUBURB_SLUG = re.compile(rb'\bslug:\s*["\']([^"\']+)["\']')
+_LOC = re.compile(rb'<loc>\s*([^<]*?)\s*</loc>')
+_PRIORITY = re.compile(rb'<loc>\s*([^<]*?)\s*</loc>(?:(?!</url>).)*?<priority>\s*([0-9.]+)\s*</priority>', re.DOTALL)
+# scheme://host/path, without the query or fragment; cheaper than urlsplit per URL
+_URL = re.compile(r'(?:[A-Za-z][A-Za-z0-9+.-]*:)?(?://([^/?#]*))?([^?#]*)')
+
+
+@functools.lru_cache(maxsize=None)
+def normalise_url(url):
+    """Split a URL into (host or None, path) with www. and trailing slashes dropped"""
+    host, path = _URL.match(url.strip()).groups()
+    host = host.lower() if host else None
+    if host and host.startswith('www.'):
+        host = host[4:]
+    return host, path.rstrip('/') or '/'
+
+
+def load_routes(app_path):
+    """Index the <Route> table in App.tsx.
+
+    Returns {'static': {path: component}, 'dynamic': [(prefix, component)],
+    'paths': {path: component}, 'modules': {component: import path}}.
+    Dynamic routes are the ones whose last segment is a :param; 'paths'
+    holds every route as written. The catch-all '*' route is ignored.
+    """
+    with open(app_path, 'rb') as f:
+        data = f.read()
+
+    modules = {}
+    for pattern in (_STATIC_IMPORT, _LAZY_IMPORT):
+        for match in pattern.finditer(data):
+            modules[match.group(1).decode('utf-8')] = match.group(2).decode('utf-8')
+
+    static = {}
+    dynamic = []
+    paths = {}
+    for match in _ROUTE.finditer(data):
+        path = match.group(1).decode('utf-8')
+        component = match.group(2).decode('utf-8')
+        if path == '*':
+            continue
+        paths[path] = component
+        prefix, _, last = path.rpartition('/')
+        if last.startswith(':'):
+            dynamic.append((prefix + '/', component))
+        else:
+            static[normalise_url(path)[1]] = component
+    return {'static': static, 'dynamic': dynamic, 'paths': paths, 'modules': modules}
+
+
+def load_suburb_slugs(suburb_data_path):
+    """Return the slugs DynamicLocationPage accepts"""
+    if not os.path.exists(suburb_data_path):
+        return set()
+    with open(suburb_data_path, 'rb') as f:
+        return {slug.decode('utf-8') for slug in _SUBURB_SLUG.findall(f.read())}
+
+
+def dynamic_component_name(slug):
+    """The component name DynamicLocationPage imports for a slug"""
+    return ''.join(word[:1].upper() + word[1:] for word in slug.split('-'))
+
+
+def load_sitemaps(public_dir):
+    """Read every sitemap*.xml(.gz) in public_dir.
+
+    Returns a list of {'file', 'index', 'images', 'locs', 'priorities'}
+    dicts, where index marks a <sitemapindex>, images marks an image sitemap
+    (whose entries repeat pages listed elsewhere by design) and priorities
+    maps each loc that declares a <priority> to it.
+    """
+    sitemaps = []
+    for name in sorted(os.listdir(public_dir)):
+        if not name.startswith('sitemap') or not name.endswith(('.xml', '.xml.gz')):
+            continue
+        path = os.path.join(public_dir, name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'rb') as f:
+            data = f.read()
+        sitemaps.append({
+            'file': name,
+            'index': b'<sitemapindex' in data,
+            'images': b'xmlns:image=' in data,
+            'locs': [unescape(loc.decode('utf-8')) for loc in _LOC.findall(data)],
+            'priorities': {unescape(loc.decode('utf-8')): float(priority)
+                           for loc, priority in _PRIORITY.findall(data)},
+        })
+    return sitemaps
+
+
+class Checker:
+    """Hashed indexes over one project's pages, routes and sitemaps"""
+
+    def __init__(self, pages, routes, suburb_slugs, sitemaps, host=SITE_HOST, path=LOCATION_PATH):
+        self.pages = pages
+        self.routes = routes
+        self.suburb_slugs = suburb_slugs
+        self.sitemaps = sitemaps
+        self.host = host
+        # Path scheme of the location pages, for naming pages that declare no canonical
+        self.path = path
+        self.stems = {entry['stem'] for entry in pages.values()}
+        # Only pages without a canonical need their slug, so names are converted on demand
+        self.registry = SlugRegistry()
+        self.issues = {category: [] for category in CATEGORIES}
+
+    def report(self, category, url, source, detail):
+        self.issues[category].append({'url': url, 'source': source, 'detail': detail})
+
+    def resolve(self, path):
+        """Return what serves path: a location page stem, another component, or None"""
+        component = self.routes['static'].get(path)
+        if component is None:
+            for prefix, candidate in self.routes['dynamic']:
+                param = path[len(prefix):]
+                if path.startswith(prefix) and param and '/' not in param:
+                    if candidate != DYNAMIC_LOCATION_COMPONENT:
+                        return candidate
+                    # DynamicLocationPage redirects unknown slugs and imports the capitalised name
+                    if param not in self.suburb_slugs:
+                        return None
+                    stem = dynamic_component_name(param)
+                    return stem if stem in self.stems else None
+            return None
+        module = self.routes['modules'].get(component, '')
+        if module.startswith(LOCATION_MODULE_PREFIX):
+            return module[len(LOCATION_MODULE_PREFIX):]
+        return component
+
+    def unrouted_detail(self, path):
+        """Explain why resolve() found nothing for a /locations/ path"""
+        prefix = next((p for p, c in self.routes['dynamic'] if c == DYNAMIC_LOCATION_COMPONENT), None)
+        if prefix and path.startswith(prefix):
+            slug = path[len(prefix):]
+            if slug not in self.suburb_slugs:
+                return f"'{slug}' is not in suburbData, so {DYNAMIC_LOCATION_COMPONENT} redirects to /areas"
+            return f"{DYNAMIC_LOCATION_COMPONENT} imports {dynamic_component_name(slug)}.tsx, which does not exist"
+        return "no route serves this path"
+
+    def check_host(self, url, host, source):
+        if host is not None and host != self.host:
+            self.report('cross-domain', url, source, f"host {host}, expected {self.host}")
+
+    def run(self):
+        """Walk every URL occurrence once and collect the issues"""
+        # Sitemap URLs keyed by path, and which pages they serve
+        listed = {}
+        served_by_sitemap = set()
+        sitemap_files = {sitemap['file'] for sitemap in self.sitemaps}
+
+        for sitemap in self.sitemaps:
+            source = f"public/{sitemap['file']}"
+            for loc in sitemap['locs']:
+                host, path = normalise_url(loc)
+                self.check_host(loc, host, source)
+                if sitemap['index']:
+                    if path.rsplit('/', 1)[-1] not in sitemap_files:
+                        self.report('unrouted', loc, source, "sitemap index points at a missing file")
+                    continue
+
+                target = self.resolve(path)
+                if target is None:
+                    self.report('unrouted', loc, source, self.unrouted_detail(path))
+                elif target in self.stems:
+                    served_by_sitemap.add(target)
+                    canonical = self.canonical_path(target)
+                    if canonical is not None and canonical != path:
+                        self.report('non-canonical', loc, source,
+                                    f"{target}.tsx declares canonical {canonical}")
+
+                if sitemap['images']:
+                    continue
+                first = listed.get(path)
+                if first is None:
+                    listed[path] = source
+                else:
+                    self.report('duplicated', loc, source, f"also listed in {first}")
+
+        canonical_owner = {}
+        for filename in sorted(self.pages):
+            entry = self.pages[filename]
+            stem = entry['stem']
+            source = f"src/pages/locations/{filename}"
+            urls = entry['urls']
+            canonical = urls.get('canonical') or urls.get('canonicalUrl')
+
+            if canonical is None:
+                self.report('non-canonical', slug_path(self.registry.to_kebab(stem), self.path), source,
+                            "page declares no canonical URL")
+                canonical_path = None
+            else:
+                canonical_host, canonical_path = normalise_url(canonical)
+                if canonical_host is None:
+                    self.report('non-canonical', canonical, source, "canonical URL is relative")
+                owner = canonical_owner.setdefault(canonical_path, filename)
+                if owner != filename:
+                    self.report('duplicated', canonical, source, f"also the canonical of {owner}")
+
+            for prop, url in urls.items():
+                host, path = normalise_url(url)
+                self.check_host(url, host, f"{source} ({prop})")
+                target = self.resolve(path)
+                if target is None:
+                    self.report('unrouted', url, f"{source} ({prop})", self.unrouted_detail(path))
+                elif target != stem:
+                    self.report('unrouted', url, f"{source} ({prop})", f"path is served by {target}")
+                if canonical_path is not None and path != canonical_path and prop in ('pageUrl', 'serviceUrl'):
+                    self.report('non-canonical', url, f"{source} ({prop})",
+                                f"differs from canonical {canonical_path}")
+
+            if stem not in served_by_sitemap:
+                self.report('missing-from-sitemap', canonical or slug_path(self.registry.to_kebab(stem), self.path),
+                            source, "no sitemap URL serves this page")
+
+        return self.issues
+
+    def canonical_path(self, stem):
+        entry = self.pages.get(stem + '.tsx')
+        if entry is None:
+            return None
+        canonical = entry['urls'].get('canonical') or entry['urls'].get('canonicalUrl')
+        return normalise_url(canonical)[1] if canonical else None
+
+
+def served_location_pages(root, pages, path=LOCATION_PATH):
+    """The location page files a route serves at their own URL under the path scheme.
+
+    Canonicals are only written for these, so none points at a URL that
+    DynamicLocationPage redirects to /areas or no route serves at all.
+    """
+    routes = load_routes(os.path.join(root, 'src', 'App.tsx'))
+    suburb_slugs = load_suburb_slugs(os.path.join(root, 'src', 'data', 'suburbData.ts'))
+    checker = Checker(pages, routes, suburb_slugs, [], path=path)
+    return {filename for filename, entry in pages.items()
+            if checker.resolve(slug_path(checker.registry.to_kebab(entry['stem']), path)) == entry['stem']}
+
+
+def check_project(root, host=SITE_HOST, path=LOCATION_PATH):
+    """Load every artifact under a project root and return (issues, counts)"""
+    pages = page_index.scan_pages(os.path.join(root, 'src', 'pages', 'locations'))
+    routes = load_routes(os.path.join(root, 'src', 'App.tsx'))
+    suburb_slugs = load_suburb_slugs(os.path.join(root, 'src', 'data', 'suburbData.ts'))
+    sitemaps = load_sitemaps(os.path.join(root, 'public'))
+    issues = Checker(pages, routes, suburb_slugs, sitemaps, host, path).run()
+    counts = {
+        'pages': len(pages),
+        'routes': len(routes['static']) + len(routes['dynamic']),
+        'sitemaps': len(sitemaps),
+        'sitemap_urls': sum(len(sitemap['locs']) for sitemap in sitemaps),
+    }
+    return issues, counts
+
+
+def load_allowlist(path=ALLOWLIST_PATH):
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != 1:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}")
+    for number, rule in enumerate(data['allowed']):
+        unknown = set(rule) - {'reason', *ALLOWLIST_FIELDS}
+        if unknown:
+            raise ValueError(f"{path}: rule {number} has unknown field(s) {', '.join(sorted(unknown))}")
+        if not rule.get('reason'):
+            raise ValueError(f"{path}: rule {number} gives no reason")
+    return data['allowed']
+
+
+def _rule_matches(rule, category, issue):
+    """True if every field the rule names matches one of its globs"""
+    values = dict(issue, category=category)
+    for field in ALLOWLIST_FIELDS:
+        if field in rule:
+            patterns = rule[field] if isinstance(rule[field], list) else [rule[field]]
+            if not any(fnmatch.fnmatchcase(values[field], pattern) for pattern in patterns):
+                return False
+    return True
+
+
+def apply_allowlist(issues, rules):
+    """Split issues into (found, allowed) by the allowlist rules.
+
+    Returns the issues no rule matches, the allowed ones per category, and
+    the indexes of rules that matched nothing.
+    """
+    found = {category: [] for category in CATEGORIES}
+    allowed = {category: [] for category in CATEGORIES}
+    used = set()
+    for category in CATEGORIES:
+        for issue in issues[category]:
+            number = next((number for number, rule in enumerate(rules) if _rule_matches(rule, category, issue)), None)
+            if number is None:
+                found[category].append(issue)
+            else:
+                used.add(number)
+                allowed[category].append(dict(issue, reason=rules[number]['reason']))
+    return found, allowed, [number for number in range(len(rules)) if number not in used]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check pages, routes, sitemaps and canonicals agree")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--host', default=SITE_HOST, help=f"expected site host (default: {SITE_HOST})")
+    parser.add_argument('--path', default=LOCATION_PATH,
+                        help="path of a location page, with {slug} for its suburb (default: %(default)s)")
+    parser.add_argument('--limit', type=int, default=10,
+                        help="issues listed per category, 0 for all (default: 10)")
+    parser.add_argument('--allowlist', default=ALLOWLIST_PATH,
+                        help="known issues not counted as found (default: %(default)s)")
+    parser.add_argument('--no-allowlist', action='store_true', help="report every issue")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 when any issue is found")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    issues, counts = check_project(os.path.abspath(args.root), args.host, args.path)
+    rules = [] if args.no_allowlist else load_allowlist(args.allowlist)
+    issues, allowed, unused = apply_allowlist(issues, rules)
+    elapsed = time.perf_counter() - started
+    total = sum(len(found) for found in issues.values())
+    total_allowed = sum(len(found) for found in allowed.values())
+
+    if args.json:
+        print(json.dumps({'counts': counts, 'issues': issues, 'allowed': allowed,
+                          'unused_rules': [rules[number] for number in unused],
+                          'seconds': round(elapsed, 3)}, indent=2))
+    else:
+        print(f"Checked {counts['pages']} pages, {counts['routes']} routes and "
+              f"{counts['sitemap_urls']} URLs in {counts['sitemaps']} sitemaps in {elapsed:.3f}s")
+        for category in CATEGORIES:
+            found = issues[category]
+            print(f"\n{category}: {len(found)}" + (f" ({len(allowed[category])} allowed)" if allowed[category] else ''))
+            shown = found if args.limit == 0 else found[:args.limit]
+            for issue in shown:
+                print(f"  {issue['url']}  [{issue['source']}] {issue['detail']}")
+            if len(found) > len(shown):
+                print(f"  ... {len(found) - len(shown)} more")
+        for number in unused:
+            print(f"\n⚠️  Allowlist rule {number} matches no issue any more: {rules[number]['reason']}")
+        print(f"\n{total} issue(s) found" + (f", {total_allowed} allowed by {args.allowlist}" if total_allowed else ''))
+
+    return 1 if args.strict and total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
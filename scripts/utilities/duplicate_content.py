@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate content detector for location pages (MinHash + LSH).
+
+Each page's visible JSX text (text nodes between tags, not props, code or
+comments) has the page's own suburb name masked, so two pages generated from
+one template with different suburbs compare as copies, and is then split
+into words and shingled into overlapping word n-grams.
+A MinHash signature of NUM_PERM values estimates the Jaccard similarity of
+two pages' shingle sets by the fraction of matching values. LSH banding then
+splits each signature into bands and buckets pages by band; only pages that
+share a bucket are compared, so the run is roughly linear in the number of
+pages instead of comparing every pair.
+
+Reported per page: word count, a thin-content flag, and a uniqueness score,
+1 minus the highest estimated similarity to any of up to MAX_CANDIDATES pages
+found through a second, finer banding (SCORE_ROWS rows per band) that also
+catches loosely similar pages. Near-duplicate clusters are the connected
+groups of pages whose estimated similarity reaches the threshold.
+
+Signatures are cached by content hash (taken from the shared page index) and
+page name, so only edited pages are re-shingled.
+
+Usage:
+    python3 duplicate_content.py [pages_dir | --root PROJECT] [--threshold 0.8] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import jsx_locator
+import page_index
+from slug_registry import SlugRegistry
+
+NUM_PERM = 256
+SHINGLE_WORDS = 5
+DEFAULT_THRESHOLD = 0.8
+THIN_WORDS = 300
+SEED = 20250917
+
+# Pages compared per page when scoring uniqueness; buckets of templated pages can be huge
+MAX_CANDIDATES = 64
+# Rows per band for uniqueness candidates; two rows pair up pages from about 0.1 similarity
+SCORE_ROWS = 2
+
+CACHE_VERSION = 2
+
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# Text between a closing '>' and the next tag or expression
+_TEXT_NODE = re.compile(rb'>([^<>{}]+)(?=[<{])')
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_ENTITIES = {'&amp;': '&', '&apos;': "'", '&quot;': '"', '&nbsp;': ' ', '&lt;': '<', '&gt;': '>'}
+
+DEFAULT_PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 '..', '..', 'src', 'pages', 'locations')
+
+
+def visible_text(data):
+    """Return the text nodes of a page's JSX as one string"""
+    root = jsx_locator.locate(data, components=())['root']
+    start = root['start'] if root else 0
+    parts = []
+    for match in _TEXT_NODE.finditer(data, start):
+        text = match.group(1).decode('utf-8', 'replace').strip()
+        if text and any(char.isalpha() for char in text):
+            parts.append(text)
+    text = ' '.join(parts)
+    for entity, char in _ENTITIES.items():
+        text = text.replace(entity, char)
+    return text
+
+
+def mask_suburb(text, suburb):
+    """Replace a suburb's display name in text with a placeholder word"""
+    return re.sub(re.escape(suburb), 'suburbname', text, flags=re.IGNORECASE)
+
+
+def _permutations(num_perm, seed):
+    """Random odd multipliers and offsets for multiply-shift hashing"""
+    generator = np.random.RandomState(seed)
+    a = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = generator.randint(0, 1 << 63, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+class MinHasher:
+    """Shingle page text and compute MinHash signatures"""
+
+    def __init__(self, num_perm=NUM_PERM, shingle_words=SHINGLE_WORDS, seed=SEED):
+        self.num_perm = num_perm
+        self.shingle_words = shingle_words
+        self.seed = seed
+        self.a, self.b = _permutations(num_perm, seed)
+        self._word_hashes = {}
+
+    def word_hashes(self, text):
+        """Stable 32-bit hash of each word, memoised across pages"""
+        cache = self._word_hashes
+        hashes = []
+        for word in _WORD.findall(text.lower()):
+            value = cache.get(word)
+            if value is None:
+                value = cache[word] = zlib.crc32(word.encode('utf-8'))
+            hashes.append(value)
+        return np.array(hashes, dtype=np.uint64)
+
+    def shingles(self, words):
+        """Combine each run of shingle_words word hashes into one 32-bit shingle hash"""
+        count = len(words) - self.shingle_words + 1
+        if count <= 0:
+            return words & _MAX_HASH
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(self.shingle_words):
+            # Wrapping uint64 arithmetic is the point here
+            shingles = shingles * np.uint64(1000003) + words[offset:offset + count]
+        return np.unique((shingles ^ (shingles >> np.uint64(32))) & _MAX_HASH)
+
+    def signature(self, text):
+        """Return (signature, word count) for one page's text"""
+        words = self.word_hashes(text)
+        shingles = self.shingles(words)
+        if len(shingles) == 0:
+            return np.full(self.num_perm, 0xFFFFFFFF, dtype=np.uint32), 0
+        # Multiply-shift: the high 32 bits of a * x + b (mod 2**64) are a universal hash of x
+        hashed = (self.a * shingles[None, :] + self.b) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32), len(words)
+
+
+def default_cache_path(pages_dir):
+    return page_index.default_index_path(pages_dir).replace('page-index-', 'minhash-').replace('.json', '.npz')
+
+
+def _load_cache(path, hasher):
+    try:
+        cached = np.load(path, allow_pickle=False)
+        params = cached['params'].tolist()
+    except (OSError, ValueError, KeyError):
+        return {}
+    if params != [CACHE_VERSION, hasher.num_perm, hasher.shingle_words, hasher.seed]:
+        return {}
+    return {key: (signature, int(words))
+            for key, signature, words in zip(cached['keys'].tolist(), cached['signatures'], cached['words'])}
+
+
+def _save_cache(path, hasher, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    keys = sorted(entries)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path,
+             params=np.array([CACHE_VERSION, hasher.num_perm, hasher.shingle_words, hasher.seed]),
+             keys=np.array(keys, dtype=str),
+             signatures=np.array([entries[key][0] for key in keys], dtype=np.uint32).reshape(-1, hasher.num_perm),
+             words=np.array([entries[key][1] for key in keys], dtype=np.int64))
+    os.replace(tmp_path, path)
+
+
+_hashers = {}
+
+
+def _signature_job(job):
+    """Worker: read, mask and hash one page"""
+    pages_dir, filename, suburb, params = job
+    hasher = _hashers.get(params)
+    if hasher is None:
+        hasher = _hashers[params] = MinHasher(*params)
+    text = visible_text(page_index.read_page(pages_dir, filename))
+    return hasher.signature(mask_suburb(text, suburb))
+
+
+def page_signatures(pages_dir, hasher=None, cache_path=None, workers=None):
+    """Return (filenames, signature matrix, word counts, pages re-hashed)"""
+    hasher = hasher or MinHasher()
+    cache_path = cache_path or default_cache_path(pages_dir)
+    index = page_index.scan_pages(pages_dir)
+    cached = _load_cache(cache_path, hasher)
+    suburbs = SlugRegistry()
+
+    filenames = sorted(index)
+    keys = [f"{index[filename]['sha1']}:{index[filename]['stem']}" for filename in filenames]
+    entries = {key: cached[key] for key in keys if key in cached}
+
+    # Hash the pages the cache does not cover, fanned out like the batch rewriter
+    params = (hasher.num_perm, hasher.shingle_words, hasher.seed)
+    jobs = [(pages_dir, filename, suburbs.to_display(filename), params)
+            for filename, key in zip(filenames, keys) if key not in entries]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2 * workers:
+        _hashers[params] = hasher
+        computed = [_signature_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            computed = list(pool.map(_signature_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    missing = [key for key in keys if key not in entries]
+    entries.update(zip(missing, computed))
+
+    if computed or set(entries) != set(cached):
+        _save_cache(cache_path, hasher, entries)
+
+    signatures = np.array([entries[key][0] for key in keys], dtype=np.uint32)
+    words = [entries[key][1] for key in keys]
+    return filenames, signatures.reshape(len(filenames), hasher.num_perm), words, len(computed)
+
+
+def choose_bands(num_perm, threshold):
+    """Pick (bands, rows) with bands * rows == num_perm whose LSH threshold sits just below threshold"""
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    below = [(b, r) for b, r in options if (1 / b) ** (1 / r) <= threshold]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1])) if below else options[0]
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _buckets(signatures, rows):
+    """Yield the row indices sharing each LSH bucket (with more than one member)"""
+    count, num_perm = signatures.shape
+    for band in range(num_perm // rows):
+        buckets = {}
+        keys = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i in range(count):
+            buckets.setdefault(keys[i].tobytes(), []).append(i)
+        for members in buckets.values():
+            if len(members) > 1:
+                yield members
+
+
+def analyse(signatures, threshold=DEFAULT_THRESHOLD, max_candidates=MAX_CANDIDATES):
+    """Return (clusters, uniqueness) for a signature matrix.
+
+    clusters is a list of lists of row indices; uniqueness[i] is 1 minus the
+    highest estimated similarity between row i and its LSH candidates.
+    """
+    count, num_perm = signatures.shape
+    _, rows = choose_bands(num_perm, threshold)
+    parent = list(range(count))
+
+    for members in _buckets(signatures, rows):
+        # Link every member to the bucket's first page instead of comparing all pairs
+        first = members[0]
+        similar = np.mean(signatures[members[1:]] == signatures[first], axis=1) >= threshold
+        for i, is_similar in zip(members[1:], similar):
+            if is_similar:
+                parent[_find(parent, i)] = _find(parent, first)
+
+    candidates = [set() for _ in range(count)]
+    for members in _buckets(signatures, min(SCORE_ROWS, rows)):
+        for i in members:
+            if len(candidates[i]) < max_candidates:
+                candidates[i].update(members[:max_candidates])
+
+    uniqueness = np.ones(count)
+    for i, found in enumerate(candidates):
+        found.discard(i)
+        if found:
+            others = np.fromiter(found, dtype=np.int64)
+            uniqueness[i] = 1 - np.mean(signatures[others] == signatures[i], axis=1).max()
+
+    groups = {}
+    for i in range(count):
+        groups.setdefault(_find(parent, i), []).append(i)
+    clusters = sorted((members for members in groups.values() if len(members) > 1), key=len, reverse=True)
+    return clusters, uniqueness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report near-duplicate location pages")
+    parser.add_argument('pages_dir', nargs='?', help="directory of page sources (default: the root's location pages)")
+    parser.add_argument('--root', help="project root whose location pages are analysed (default: this repository)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="estimated Jaccard similarity that counts as a near duplicate (default: %(default)s)")
+    parser.add_argument('--thin-words', type=int, default=THIN_WORDS,
+                        help="pages with fewer visible words are flagged as thin (default: %(default)s)")
+    parser.add_argument('--limit', type=int, default=20, help="least unique pages listed (default: 20)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for re-hashing (default: all cores)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args(argv)
+    pages_dir = args.pages_dir or (os.path.join(os.path.abspath(args.root), 'src', 'pages', 'locations')
+                                   if args.root else DEFAULT_PAGES_DIR)
+
+    started = time.perf_counter()
+    filenames, signatures, words, computed = page_signatures(pages_dir, workers=args.workers)
+    clusters, uniqueness = analyse(signatures, args.threshold)
+    elapsed = time.perf_counter() - started
+
+    pages = [{'file': filename, 'words': words[i], 'thin': words[i] < args.thin_words,
+              'uniqueness': round(float(uniqueness[i]), 3)}
+             for i, filename in enumerate(filenames)]
+    named_clusters = [[filenames[i] for i in members] for members in clusters]
+
+    if args.json:
+        print(json.dumps({'clusters': named_clusters, 'pages': pages, 'seconds': round(elapsed, 3)}, indent=2))
+        return 0
+
+    print(f"Analysed {len(filenames)} pages ({computed} re-hashed) in {elapsed:.2f}s")
+    print(f"\n{len(named_clusters)} near-duplicate cluster(s) at similarity >= {args.threshold}:")
+    for members in named_clusters:
+        print(f"  {len(members)} pages: {', '.join(members)}")
+
+    print(f"\nLeast unique pages:")
+    for page in sorted(pages, key=lambda page: page['uniqueness'])[:args.limit]:
+        print(f"  {page['uniqueness']:.3f}  {page['file']} ({page['words']} words)")
+
+    thin = [page for page in pages if page['thin']]
+    print(f"\n{len(thin)} thin page(s) under {args.thin_words} visible words")
+    for page in thin:
+        print(f"  {page['file']} ({page['words']} words)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
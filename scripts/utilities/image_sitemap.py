@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Image sitemap generator: which images each indexable page shows.
+
+Every page under src/pages that a route serves is scanned for images, along
+with the components it imports (followed transitively through
+src/components, as the link graph does):
+
+  - image imports such as `import hero from '@/assets/hero.jpg'`
+  - quoted root paths ending in an image extension, such as src="/images/x.jpg"
+    (public/) or '/src/assets/x.jpg' (the dev-server path of src/assets)
+
+Each image file is probed for its format, width and height by reading only
+its PNG, JPEG or WebP header through mmap; nothing is decoded. Probes are
+cached by content hash and files are matched to hashes by mtime and size, so
+an unchanged tree costs one stat() per file. Files that are not a PNG, JPEG
+or WebP, or whose header cannot be read, are left out and reported.
+
+Images Vite inlines as data URIs (below build.assetsInlineLimit) have no URL
+and are skipped. Imported images are published by the build under a hashed
+name, which is only known from the Vite manifest of a build (dist/.vite/);
+without one they are left out and reported rather than guessed, so the full
+sitemap is written after the build (npm run build writes it into dist/).
+Captions and titles come from image_captions.json, keyed by image file.
+
+Output goes through SitemapWriter with the image: namespace, and is only
+rewritten when its content differs from the file on disk. The sitemap lives
+only in the build, so it is added to the build's copy of sitemap.xml (which
+Vite copies from public/) rather than to the committed index.
+
+Usage:
+    python3 image_sitemap.py [--root PROJECT] [--dist DIR] [--output DIR] [--site-url URL] [--path SCHEME] [--dry-run] [--json] [--strict]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from xml.sax.saxutils import escape
+
+import consistency_checker
+import page_index
+from bundle_budget import find_manifest, load_manifest
+from page_transforms import LOCATION_PATH, SITE_URL, slug_path
+from sitemap_writer import SitemapWriter, add_to_sitemap_index, file_digest
+from source_cache import PAGES_MODULE_PREFIX, SourceCache, import_specifiers, page_files, resolve_import
+from slug_registry import SlugRegistry
+
+CACHE_VERSION = 1
+SITEMAP_BASENAME = 'sitemap-images'
+CAPTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'image_captions.json')
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.svg', '.avif')
+# vite.config.ts build.assetsInlineLimit: smaller imports become data URIs
+ASSETS_INLINE_LIMIT = 4096
+# Routes kept out of every sitemap
+NOINDEX_PREFIXES = ('/admin', '/mobile')
+
+_IMAGE_PATH = re.compile(rb'''["'](/[^"'\s]+\.(?:png|jpe?g|webp|gif|svg|avif))["']''', re.IGNORECASE)
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def default_cache_paths(root):
+    """Return the (image probe, page source) cache files used for a project"""
+    digest = hashlib.sha1(os.path.abspath(root).encode('utf-8')).hexdigest()[:12]
+    return (os.path.join(page_index.CACHE_DIR, f"image-sitemap-{digest}.json"),
+            os.path.join(page_index.CACHE_DIR, f"image-sources-{digest}.json"))
+
+
+def extract_images(data):
+    """Return the import specifiers and quoted image paths in a source file"""
+    imports = import_specifiers(data)
+    paths = sorted({path.decode('utf-8') for path in _IMAGE_PATH.findall(data)})
+    return {'imports': imports, 'paths': paths}
+
+
+def _png_size(header):
+    if header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def _jpeg_size(data):
+    pos = 2
+    end = len(data)
+    while pos + 4 <= end:
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before a marker
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            pos += 2
+            continue
+        if marker in (0xD9, 0xDA):
+            # End of image or start of scan before any frame header
+            return None
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        if marker in _SOF_MARKERS:
+            if pos + 9 > end:
+                return None
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
+
+
+def _webp_size(header):
+    chunk = header[12:16]
+    if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and header[20:21] == b'\x2f':
+        bits = struct.unpack('<I', header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    return None
+
+
+def probe_image(data):
+    """Return (format, width, height) from an image's header bytes, or None.
+
+    data can be an mmap; only the bytes up to the frame header are touched.
+    """
+    header = data[:32]
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        size = _png_size(header)
+        image_format = 'png'
+    elif header.startswith(b'\xff\xd8'):
+        size = _jpeg_size(data)
+        image_format = 'jpeg'
+    elif header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        size = _webp_size(header)
+        image_format = 'webp'
+    else:
+        return None
+    if size is None:
+        return None
+    return image_format, size[0], size[1]
+
+
+class ImageCache:
+    """Header probes keyed by content hash, and the hash of each file by mtime and size"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.files = {}
+        self.probes = {}
+        self.hashed = 0
+        self.dirty = False
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cached.get('version') == CACHE_VERSION:
+            self.files = cached['files']
+            self.probes = cached['probes']
+
+    def probe(self, path):
+        """Return {'sha1', 'size', 'format', 'width', 'height'} for an image file; format is None if unreadable"""
+        stat = os.stat(path)
+        known = self.files.get(path)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            digest = known[2]
+        else:
+            with open(path, 'rb') as f:
+                if stat.st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        digest = hashlib.sha1(data).hexdigest()
+                        if digest not in self.probes:
+                            self.probes[digest] = probe_image(data)
+                else:
+                    digest = hashlib.sha1(b'').hexdigest()
+                    self.probes.setdefault(digest, None)
+            self.files[path] = [stat.st_mtime_ns, stat.st_size, digest]
+            self.hashed += 1
+            self.dirty = True
+        probe = self.probes[digest]
+        image_format, width, height = probe if probe else (None, None, None)
+        return {'sha1': digest, 'size': stat.st_size, 'format': image_format, 'width': width, 'height': height}
+
+    def save(self, seen):
+        """Write the cache back atomically, dropping files and probes no longer referenced"""
+        stale = set(self.files) - set(seen)
+        if not self.dirty and not stale:
+            return
+        for path in stale:
+            del self.files[path]
+        live = {entry[2] for entry in self.files.values()}
+        self.probes = {digest: probe for digest, probe in self.probes.items() if digest in live}
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps({'version': CACHE_VERSION, 'files': self.files, 'probes': self.probes},
+                               separators=(',', ':')))
+        os.replace(tmp_path, self.cache_path)
+
+
+def page_urls(src_dir, path=LOCATION_PATH):
+    """Return {src/pages-relative path: [url path, ...]} for every indexable page"""
+    routes = consistency_checker.load_routes(os.path.join(src_dir, 'App.tsx'))
+    urls = {}
+    for route, component in routes['static'].items():
+        module = routes['modules'].get(component, '')
+        if route.startswith(NOINDEX_PREFIXES) or not module.startswith(PAGES_MODULE_PREFIX):
+            continue
+        relpath = module[len(PAGES_MODULE_PREFIX):] + '.tsx'
+        urls.setdefault(os.path.normpath(relpath), []).append(route)
+
+    # Location pages are listed under the site's path scheme, as in sitemap-locations.xml
+    locations_dir = os.path.join(src_dir, 'pages', 'locations')
+    suburbs = SlugRegistry()
+    for node in page_files(locations_dir):
+        relpath = os.path.join('locations', node)
+        urls.setdefault(relpath, []).append(slug_path(suburbs.to_kebab(node), path))
+    return {relpath: sorted(set(paths)) for relpath, paths in sorted(urls.items())
+            if os.path.isfile(os.path.join(src_dir, 'pages', relpath))}
+
+
+def built_assets(dist_dir):
+    """Return {project-relative source file: published path} from the Vite manifest in dist_dir, or None without a build"""
+    path = find_manifest(dist_dir)
+    if path is None:
+        return None
+    manifest, _ = load_manifest(path)
+    return {os.path.normpath(key): '/' + entry['file'] for key, entry in manifest.items()
+            if key.lower().endswith(IMAGE_EXTENSIONS) and 'file' in entry}
+
+
+def load_captions(path=CAPTIONS_PATH):
+    """Return {project-relative image file: {'caption', 'title'}}"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if data.get('version') != 1:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}")
+    return {os.path.normpath(image): meta for image, meta in data['images'].items()}
+
+
+def collect(root, cache, path=LOCATION_PATH):
+    """Map every indexable page URL to the images it shows.
+
+    Location pages are listed under the path scheme path. Returns (pages, images, stats): pages is {url path: [image file, ...]},
+    images is {image file: probe} with project-relative image paths.
+    """
+    src_dir = os.path.join(root, 'src')
+    public_dir = os.path.join(root, 'public')
+    sources = SourceCache(src_dir, default_cache_paths(root)[1], extract=extract_images)
+    closures = {}
+    missing = {}
+    dev_paths = set()
+
+    def image_file(relpath, spec):
+        """Project-relative image file an import or quoted path refers to, or None"""
+        if spec.startswith(('@/', '.')):
+            target = resolve_import(src_dir, os.path.dirname(relpath), spec)
+            return os.path.join('src', target) if target else None
+        if spec.startswith('/src/'):
+            dev_paths.add(relpath)
+            return spec[1:] if os.path.isfile(os.path.join(root, spec[1:])) else None
+        return os.path.join('public', spec[1:]) if os.path.isfile(os.path.join(public_dir, spec[1:])) else None
+
+    def images_of(relpath, stack):
+        """Images referenced by a source file and the components it imports"""
+        if relpath in closures:
+            return closures[relpath]
+        if relpath in stack:
+            return ()
+        stack.add(relpath)
+        entry = sources.get(relpath)
+        found = set()
+        for spec in entry['imports']:
+            if spec.lower().endswith(IMAGE_EXTENSIONS):
+                image = image_file(relpath, spec)
+                if image:
+                    found.add(image)
+                else:
+                    missing.setdefault(spec, set()).add(relpath)
+                continue
+            target = resolve_import(src_dir, os.path.dirname(relpath), spec)
+            if target and target.startswith('components' + os.sep):
+                found.update(images_of(target, stack))
+        for spec in entry['paths']:
+            image = image_file(relpath, spec)
+            if image:
+                found.add(image)
+            else:
+                missing.setdefault(spec, set()).add(relpath)
+        stack.discard(relpath)
+        closures[relpath] = frozenset(found)
+        return closures[relpath]
+
+    pages = {}
+    for relpath, paths in page_urls(src_dir, path).items():
+        found = images_of(os.path.join('pages', relpath), set())
+        for path in paths:
+            pages[path] = sorted(found)
+    sources.save()
+
+    images = {}
+    for image in sorted({image for found in pages.values() for image in found}):
+        images[image] = cache.probe(os.path.join(root, image))
+
+    stats = {'sources': len(sources.seen), 'sources_parsed': sources.parsed, 'images_hashed': cache.hashed,
+             'missing': {spec: sorted(files) for spec, files in sorted(missing.items())},
+             'dev_paths': sorted(dev_paths)}
+    return pages, images, stats
+
+
+def is_inlined(image, probe):
+    """True for an imported image Vite turns into a data URI"""
+    return not image.startswith('public' + os.sep) and probe['size'] < ASSETS_INLINE_LIMIT
+
+
+def image_url(image, probe, built, site_url=SITE_URL):
+    """Public URL of an image file, or None if Vite inlines it or the build does not say where it went"""
+    if image.startswith('public' + os.sep):
+        return site_url + '/' + image[len('public' + os.sep):].replace(os.sep, '/')
+    if is_inlined(image, probe) or built is None or image not in built:
+        return None
+    return site_url + built[image]
+
+
+def image_entries(pages, images, built, captions, site_url=SITE_URL):
+    """Yield (page url, image extra XML) for every page with at least one indexable image"""
+    for path, found in sorted(pages.items()):
+        parts = []
+        for image in found:
+            probe = images[image]
+            if probe['format'] is None:
+                continue
+            url = image_url(image, probe, built, site_url)
+            if not url:
+                continue
+            parts.append(f"    <image:image>\n      <image:loc>{escape(url)}</image:loc>\n")
+            meta = captions.get(image, {})
+            for field in ('caption', 'title'):
+                if meta.get(field):
+                    parts.append(f"      <image:{field}>{escape(meta[field])}</image:{field}>\n")
+            parts.append("    </image:image>\n")
+        if parts:
+            yield site_url + path, ''.join(parts)
+
+
+def generate(root, dry_run=False, dist_dir=None, output_dir=None, captions_path=CAPTIONS_PATH,
+             site_url=SITE_URL, path=LOCATION_PATH):
+    """Collect the page images and rewrite sitemap-images.xml if its content changed.
+
+    dist_dir is the build whose manifest names the imported images (default
+    <root>/dist) and output_dir where the sitemap goes (default dist_dir, so
+    the sitemap always ships with the build it was made from). Page and image
+    URLs are built from site_url and the location path scheme.
+    """
+    dist_dir = dist_dir or os.path.join(root, 'dist')
+    output_dir = output_dir or dist_dir
+    if not dry_run and not os.path.isdir(output_dir):
+        raise ValueError(f"{output_dir} does not exist; run after `npm run build` or pass --output")
+    cache = ImageCache(default_cache_paths(root)[0])
+    pages, images, stats = collect(root, cache, path)
+    built = built_assets(dist_dir)
+    entries = list(image_entries(pages, images, built, load_captions(captions_path), site_url))
+
+    def write(hash_only):
+        writer = SitemapWriter(output_dir, SITEMAP_BASENAME, image_namespace=True, atomic=True,
+                               hash_only=hash_only, header_comments=(
+                                   f"Images on {len(entries)} pages, generated by scripts/utilities/image_sitemap.py",))
+        with writer:
+            for loc, extra in entries:
+                writer.add(loc, extra=extra)
+        return writer
+
+    writer = write(hash_only=True)
+    unchanged = all(file_digest(os.path.join(output_dir, name)) == digest
+                    for name, digest in zip(writer.shards, writer.digests))
+    if not dry_run and not unchanged:
+        writer = write(hash_only=False)
+    # The build's copy of public/sitemap.xml lists the sitemaps kept in public/; this one only exists in the build
+    index_path = os.path.join(output_dir, 'sitemap.xml')
+    indexed = []
+    if not dry_run and os.path.isfile(index_path):
+        indexed = add_to_sitemap_index(index_path, [f"{site_url}/{name}" for name in writer.shards])
+    cache.save({os.path.join(root, image) for image in images})
+
+    stats.update({
+        'pages': len(pages), 'pages_with_images': len(entries), 'images': len(images),
+        'image_urls': sum(extra.count('<image:loc>') for _, extra in entries),
+        'unreadable': sorted(image for image, probe in images.items() if probe['format'] is None),
+        'inlined': sorted(image for image, probe in images.items() if probe['format'] and is_inlined(image, probe)),
+        'unbuilt': sorted(image for image, probe in images.items() if probe['format'] and not is_inlined(image, probe)
+                          and image_url(image, probe, built) is None),
+        'built': built is not None, 'written': writer.written, 'shards': writer.shards, 'indexed': indexed,
+    })
+    return pages, images, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate sitemap-images.xml from the images each page shows")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--dist', help="Vite build whose manifest names the imported images (default: <root>/dist)")
+    parser.add_argument('--output', help="directory the sitemap is written to (default: the --dist build)")
+    parser.add_argument('--site-url', default=SITE_URL, help="scheme and host of the page and image URLs (default: %(default)s)")
+    parser.add_argument('--path', default=LOCATION_PATH,
+                        help="path scheme of the location pages, with {slug} for the suburb (default: %(default)s)")
+    parser.add_argument('--dry-run', action='store_true', help="scan and report without writing the sitemap")
+    parser.add_argument('--limit', type=int, default=10, help="problems listed per section, 0 for all (default: 10)")
+    parser.add_argument('--json', action='store_true', help="print pages, image probes and stats as JSON")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 if imported images had to be left out")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    root = os.path.abspath(args.root)
+    try:
+        pages, images, stats = generate(root, dry_run=args.dry_run, dist_dir=args.dist and os.path.abspath(args.dist),
+                                        output_dir=args.output and os.path.abspath(args.output),
+                                        site_url=args.site_url.rstrip('/'), path=args.path)
+    except ValueError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    stats['seconds'] = round(time.perf_counter() - started, 3)
+
+    if args.json:
+        print(json.dumps({'pages': pages, 'images': images, 'stats': stats}, indent=2))
+        return 1 if args.strict and stats['unbuilt'] else 0
+
+    print(f"🖼️  {stats['images']} images on {stats['pages_with_images']} of {stats['pages']} pages "
+          f"({stats['image_urls']} <image:image> entries) in {stats['seconds']:.3f}s")
+    print(f"   {stats['sources_parsed']} of {stats['sources']} sources parsed, "
+          f"{stats['images_hashed']} images hashed")
+    formats = {}
+    for probe in images.values():
+        formats[probe['format'] or 'unreadable'] = formats.get(probe['format'] or 'unreadable', 0) + 1
+    print(f"   formats: {', '.join(f'{count} {name}' for name, count in sorted(formats.items()))}")
+    if stats['unbuilt']:
+        reason = "the build manifest does not list them" if stats['built'] else "there is no Vite manifest in the build"
+        print(f"⚠️  {len(stats['unbuilt'])} imported image(s) left out, {reason}; "
+              f"run after `npm run build` or pass --dist")
+    if stats['inlined']:
+        print(f"   {len(stats['inlined'])} image(s) below {ASSETS_INLINE_LIMIT} bytes are inlined by Vite and not listed")
+    def shown(items):
+        return items if args.limit == 0 else items[:args.limit]
+
+    if stats['unreadable']:
+        print(f"\n⚠️  {len(stats['unreadable'])} image(s) are not a readable PNG, JPEG or WebP and are left out:")
+        for image in shown(stats['unreadable']):
+            print(f"  {image}")
+    if stats['missing']:
+        print(f"\n⚠️  {len(stats['missing'])} referenced image(s) do not exist:")
+        for spec, files in shown(list(stats['missing'].items())):
+            print(f"  {spec}  from {', '.join(files)}")
+    if stats['dev_paths']:
+        print(f"⚠️  {len(stats['dev_paths'])} file(s) use /src/assets/ paths, which only the dev server serves")
+
+    if args.dry_run:
+        print("🔍 Dry run, sitemap not written")
+    elif stats['written']:
+        print(f"✅ Wrote {', '.join(stats['written'])}")
+    else:
+        print(f"✅ {', '.join(stats['shards'])} already up to date")
+    if stats['indexed']:
+        print(f"✅ Listed {', '.join(stats['indexed'])} in the build's sitemap.xml")
+    return 1 if args.strict and stats['unbuilt'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
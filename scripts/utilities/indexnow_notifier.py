@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Tell search engines which page URLs changed, through IndexNow.
+
+The notifier keeps one state file next to the other caches with two maps:
+
+  - submitted: {url: content hash} as last accepted by the endpoint
+  - pending: {url: content hash, or null for a removed page} still to send
+
+`enqueue` hashes the page sources (through the shared page index, so only
+changed files are read) and queues every URL whose hash differs from the
+submitted one; a URL edited again before it was sent is queued once, with
+its latest hash, and a page reverted to what was last sent drops out of the
+queue. updated_sitemap_generator.py --notify queues its location URLs the
+same way, so one build produces both the sitemap and the batch to send.
+
+`submit` posts the queue in batches of up to 10,000 URLs (the IndexNow
+limit) over a small pool of keep-alive connections. Requests are spaced by a
+shared rate limit, 429 and 5xx responses and connection errors are retried
+with exponential backoff (a 429's Retry-After pauses the whole pool), and
+each accepted batch is removed from the queue on its own. The state file is
+rewritten atomically and fsynced under a lock after every change, so a crash
+or Ctrl-C loses nothing: at worst the batch that was in flight is sent again.
+
+Usage:
+    python3 indexnow_notifier.py [--site-url URL] [--path SCHEME] enqueue [--baseline]
+    python3 indexnow_notifier.py [--site-url URL] submit --key KEY [--endpoint URL] [--dry-run]
+    python3 indexnow_notifier.py status [--json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from urllib.parse import urlsplit
+
+import page_index
+from link_verifier import Connection
+from page_transforms import LOCATION_PATH, SITE_URL, slug_path
+from slug_registry import SlugRegistry
+
+DEFAULT_ENDPOINT = "https://api.indexnow.org/indexnow"
+STATE_PATH = os.path.join(page_index.CACHE_DIR, 'indexnow-state.json')
+STATE_VERSION = 1
+
+# URLs per POST accepted by IndexNow
+MAX_BATCH = 10000
+DEFAULT_CONCURRENCY = 2
+# Requests per second across the whole pool
+DEFAULT_RATE = 1.0
+DEFAULT_TIMEOUT = 30.0
+MAX_ATTEMPTS = 5
+# First retry delay in seconds, doubled per attempt up to MAX_BACKOFF
+BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+ACCEPTED = {200, 202}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_MISSING = object()
+
+
+def location_url(kebab_name, site_url=SITE_URL, path=LOCATION_PATH):
+    return f"{site_url}{slug_path(kebab_name, path)}"
+
+
+def location_hashes(index, suburbs, site_url=SITE_URL, path=LOCATION_PATH):
+    """Return {sitemap URL: content hash} for the location pages of a page index"""
+    return {location_url(suburbs.to_kebab(entry['stem']), site_url, path): entry['sha1']
+            for entry in index.values()}
+
+
+def page_hashes(root, site_url=SITE_URL, path=LOCATION_PATH):
+    """Return {url: content hash} for the location pages and every top-level page with a canonical on site_url"""
+    pages_dir = os.path.join(root, 'src', 'pages')
+    locations = page_index.scan_pages(os.path.join(pages_dir, 'locations'))
+    hashes = location_hashes(locations, SlugRegistry(sorted(entry['stem'] for entry in locations.values())),
+                             site_url, path)
+
+    declared = {}
+    for filename, entry in sorted(page_index.scan_pages(pages_dir).items()):
+        url = entry['urls'].get('canonical') or entry['urls'].get('canonicalUrl')
+        if url and url.startswith(site_url + '/') and url not in hashes:
+            declared.setdefault(url, []).append(entry['sha1'])
+    # A URL declared by several sources (e.g. a backup copy) changes when any of them does
+    for url, digests in declared.items():
+        hashes[url] = digests[0] if len(digests) == 1 else hashlib.sha1(''.join(digests).encode()).hexdigest()
+    return hashes
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path, 'r') as f:
+            state = json.load(f)
+        if state.get('version') == STATE_VERSION:
+            return state
+    except (OSError, ValueError):
+        pass
+    return {'version': STATE_VERSION, 'submitted': {}, 'pending': {}}
+
+
+def save_state(state, path=STATE_PATH):
+    """Write the state atomically and make sure it reached the disk"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(state, indent=1))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def locked_state(path=STATE_PATH):
+    """Load the state under an exclusive lock and save it on exit if it changed"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        state = load_state(path)
+        before = json.dumps(state)
+        yield state
+        if json.dumps(state) != before:
+            save_state(state, path)
+
+
+def enqueue(hashes, prefix=SITE_URL + '/', path=STATE_PATH):
+    """Queue the URLs whose hash differs from the last submitted one; returns the URLs newly queued.
+
+    Submitted URLs under prefix that are missing from hashes are queued as
+    removed, so callers that only know part of the site pass a narrower prefix.
+    """
+    queued = []
+    with locked_state(path) as state:
+        submitted, pending = state['submitted'], state['pending']
+        for url, digest in hashes.items():
+            if submitted.get(url) == digest:
+                pending.pop(url, None)
+            elif pending.get(url, _MISSING) != digest:
+                pending[url] = digest
+                queued.append(url)
+        for url in list(pending.keys() | submitted.keys()):
+            if url.startswith(prefix) and url not in hashes:
+                if url in submitted:
+                    if pending.get(url, _MISSING) is not None:
+                        pending[url] = None
+                        queued.append(url)
+                else:
+                    # Added and removed again before it was ever sent
+                    del pending[url]
+    return queued
+
+
+def baseline(hashes, prefix=SITE_URL + '/', path=STATE_PATH):
+    """Record hashes as already submitted without queuing anything, e.g. on first setup"""
+    with locked_state(path) as state:
+        for url in [url for url in state['submitted'] if url.startswith(prefix)]:
+            del state['submitted'][url]
+        for url in [url for url in state['pending'] if url.startswith(prefix)]:
+            del state['pending'][url]
+        state['submitted'].update(hashes)
+
+
+def mark_submitted(batch, path=STATE_PATH):
+    """Move an accepted batch of (url, hash) from pending to submitted, unless re-queued with a newer hash meanwhile"""
+    with locked_state(path) as state:
+        submitted, pending = state['submitted'], state['pending']
+        for url, digest in batch:
+            if pending.get(url, _MISSING) != digest:
+                continue
+            del pending[url]
+            if digest is None:
+                submitted.pop(url, None)
+            else:
+                submitted[url] = digest
+
+
+class RateLimiter:
+    """Space requests at least 1/rate seconds apart across every worker"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.next = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            if self.next > now:
+                await asyncio.sleep(self.next - now)
+                now = self.next
+            self.next = now + self.interval
+
+    def defer(self, seconds):
+        """Hold every worker back for seconds, e.g. after a 429"""
+        self.next = max(self.next, asyncio.get_running_loop().time() + seconds)
+
+
+def retry_delay(attempt, headers=None, backoff=BACKOFF):
+    """Seconds to wait before the next attempt: Retry-After if given, else jittered exponential backoff"""
+    retry_after = (headers or {}).get('retry-after', '')
+    if retry_after.isdigit():
+        return min(float(retry_after), MAX_BACKOFF)
+    return min(MAX_BACKOFF, backoff * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+
+async def post_batch(connection, target, payload, limiter, max_attempts=MAX_ATTEMPTS, backoff=BACKOFF):
+    """POST one batch, retrying transient failures; returns {'status', 'attempts', 'error'}"""
+    body = json.dumps(payload).encode('utf-8')
+    headers = {'Content-Type': 'application/json; charset=utf-8'}
+    result = {'status': None, 'attempts': 0, 'error': None}
+    for attempt in range(1, max_attempts + 1):
+        await limiter.wait()
+        result['attempts'] = attempt
+        response = None
+        try:
+            status, response, content = await connection.request('POST', target, body, headers)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+            result['status'], result['error'] = None, f"{type(error).__name__}: {error}".rstrip(': ')
+        else:
+            result['status'] = status
+            result['error'] = None if status in ACCEPTED else content.decode('utf-8', 'replace')[:200] or None
+            if status not in RETRY_STATUSES:
+                return result
+        if attempt == max_attempts:
+            break
+        delay = retry_delay(attempt, response, backoff)
+        if result['status'] == 429:
+            limiter.defer(delay)
+        else:
+            await asyncio.sleep(delay)
+    return result
+
+
+def make_batches(pending, batch_size=MAX_BATCH):
+    """Split the pending (url, hash) pairs into batches of at most batch_size"""
+    items = list(pending.items())
+    return [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+
+
+async def submit(batches, endpoint, key, key_location=None, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                 timeout=DEFAULT_TIMEOUT, max_attempts=MAX_ATTEMPTS, backoff=BACKOFF, path=STATE_PATH,
+                 site_url=SITE_URL):
+    """Send the batches of site_url's URLs through a pool of connections; each accepted batch is marked submitted as it completes"""
+    split = urlsplit(endpoint)
+    target = (split.path or '/') + (f"?{split.query}" if split.query else '')
+    limiter = RateLimiter(rate)
+    queue = asyncio.Queue()
+    for number, batch in enumerate(batches):
+        queue.put_nowait((number, batch))
+    results = [None] * len(batches)
+
+    async def worker():
+        connection = Connection.for_url(endpoint, timeout)
+        try:
+            while not queue.empty():
+                number, batch = queue.get_nowait()
+                payload = {'host': urlsplit(site_url).hostname, 'key': key, 'urlList': [url for url, _ in batch]}
+                if key_location:
+                    payload['keyLocation'] = key_location
+                started = time.perf_counter()
+                result = await post_batch(connection, target, payload, limiter, max_attempts, backoff)
+                result.update(urls=len(batch), seconds=round(time.perf_counter() - started, 3))
+                if result['status'] in ACCEPTED:
+                    mark_submitted(batch, path)
+                results[number] = result
+        finally:
+            connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(batches))))))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Queue changed page URLs and submit them to IndexNow")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--state', default=STATE_PATH, help="queue and submission state file (default: %(default)s)")
+    parser.add_argument('--site-url', default=SITE_URL,
+                        help="scheme and host of the site whose URLs are queued and sent (default: %(default)s)")
+    parser.add_argument('--path', default=LOCATION_PATH,
+                        help="path of a location page, with {slug} for its suburb (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = commands.add_parser('enqueue', help="queue the URLs whose page content changed")
+    enqueue_parser.add_argument('--baseline', action='store_true',
+                                help="record the current pages as submitted without queuing them")
+
+    submit_parser = commands.add_parser('submit', help="send the queued URLs")
+    submit_parser.add_argument('--endpoint', default=DEFAULT_ENDPOINT, help="IndexNow endpoint (default: %(default)s)")
+    submit_parser.add_argument('--key', default=os.environ.get('INDEXNOW_KEY'),
+                               help="IndexNow key, hosted at <site>/<key>.txt (default: $INDEXNOW_KEY)")
+    submit_parser.add_argument('--batch-size', type=int, default=MAX_BATCH, help="URLs per request (default: %(default)s)")
+    submit_parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                               help="connections kept open at once (default: %(default)s)")
+    submit_parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                               help="requests per second across all connections (default: %(default)s)")
+    submit_parser.add_argument('--attempts', type=int, default=MAX_ATTEMPTS,
+                               help="tries per batch before giving up (default: %(default)s)")
+    submit_parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                               help="seconds per request (default: %(default)s)")
+    submit_parser.add_argument('--dry-run', action='store_true', help="show the batches without sending them")
+
+    status_parser = commands.add_parser('status', help="show the queue")
+    status_parser.add_argument('--limit', type=int, default=20, help="queued URLs to list, 0 for all (default: 20)")
+    status_parser.add_argument('--json', action='store_true', help="print the queue as JSON")
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+    site_url = args.site_url.rstrip('/')
+    # Sites may share a state file; each run only touches its own host's URLs
+    prefix = site_url + '/'
+
+    if args.command == 'enqueue':
+        hashes = page_hashes(root, site_url, args.path)
+        if args.baseline:
+            baseline(hashes, prefix, path=args.state)
+            print(f"✅ Recorded {len(hashes)} page URLs as submitted")
+            return 0
+        queued = enqueue(hashes, prefix, path=args.state)
+        pending = load_state(args.state)['pending']
+        print(f"📮 Queued {len(queued)} changed URL(s) of {len(hashes)} pages, {len(pending)} pending in total")
+        for url in queued[:20]:
+            print(f"   • {url}{'  (removed)' if pending.get(url, '') is None else ''}")
+        return 0
+
+    state = load_state(args.state)
+    if args.command == 'status':
+        pending = list(state['pending'].items())
+        if args.json:
+            print(json.dumps({'submitted': len(state['submitted']), 'pending': state['pending']}, indent=2))
+            return 0
+        print(f"📮 {len(pending)} URL(s) pending, {len(state['submitted'])} submitted")
+        for url, digest in (pending if args.limit == 0 else pending[:args.limit]):
+            print(f"   • {url}{'  (removed)' if digest is None else ''}")
+        return 0
+
+    # One IndexNow request names one host, so other sites' URLs wait for their own run
+    pending = {url: digest for url, digest in state['pending'].items() if url.startswith(prefix)}
+    batches = make_batches(pending, args.batch_size)
+    if not batches:
+        print("✅ Nothing to submit")
+        return 0
+    if args.dry_run:
+        print(f"📦 {len(pending)} URL(s) in {len(batches)} batch(es) for {args.endpoint}")
+        for number, batch in enumerate(batches, 1):
+            print(f"   batch {number}: {len(batch)} URLs, first {batch[0][0]}")
+        return 0
+    if not args.key:
+        print("❌ No IndexNow key, pass --key or set INDEXNOW_KEY")
+        return 1
+    key_file = os.path.join(root, 'public', f"{args.key}.txt")
+    if not os.path.isfile(key_file):
+        print(f"⚠️  {os.path.relpath(key_file, root)} does not exist, endpoints will reject the key until it is deployed")
+
+    started = time.perf_counter()
+    results = asyncio.run(submit(batches, args.endpoint, args.key, f"{site_url}/{args.key}.txt", args.concurrency,
+                                 args.rate, args.timeout, args.attempts, path=args.state, site_url=site_url))
+    sent = sum(result['urls'] for result in results if result['status'] in ACCEPTED)
+    print(f"🚀 Submitted {sent} of {sum(len(batch) for batch in batches)} URL(s) in {len(batches)} batch(es) "
+          f"in {time.perf_counter() - started:.2f}s")
+    failed = [result for result in results if result['status'] not in ACCEPTED]
+    for result in failed:
+        print(f"   ❌ {result['urls']} URLs: {result['status'] or result['error']} after {result['attempts']} attempt(s)"
+              f"{': ' + result['error'] if result['status'] and result['error'] else ''}")
+    if failed:
+        print(f"   {sum(url.startswith(prefix) for url in load_state(args.state)['pending'])} URL(s) stay queued for the next run")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Run instrumentation shared by the SEO utility scripts.
+
+A script adds the --profile / --metrics-json flags with add_arguments() and
+wraps its work in run(). Inside the run, code records what it does on the
+collector returned by current(), so shared modules (page_index, the batch
+rewriter) report without having every caller pass a collector through:
+
+  - stages: wall and CPU time per named stage, e.g. scan, transform, write
+  - files: time, bytes read and bytes written per file
+  - I/O: total bytes read and written
+  - regexes: call, match and time totals for the compiled patterns of the
+    shared modules, which are wrapped in timing proxies for the duration of
+    the run
+  - peak RSS of the process and its finished worker processes
+
+--metrics-json PATH writes everything as one JSON artifact. --profile also
+runs the script under cProfile, prints the stage table and the top functions
+by own time to stderr, and adds those hotspots to the artifact.
+
+Without either flag current() is a no-op collector and patterns are left
+alone, so the scripts run exactly as before.
+
+Usage:
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    with instrumentation.run('update_canonicals', args) as metrics:
+        with metrics.stage('scan'):
+            index = page_index.scan_pages(pages_dir)
+"""
+
+import contextlib
+import json
+import os
+import re
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+
+METRICS_VERSION = 1
+PROFILE_TOP = 25
+SLOWEST_FILES = 10
+
+# Modules whose module-level compiled patterns are timed during an instrumented run
+PATTERN_MODULES = ('jsx_locator', 'page_index', 'slug_registry', 'consistency_checker',
+                   'page_transforms', 'link_graph', 'image_sitemap')
+
+
+class TimedPattern:
+    """Stand-in for a compiled pattern that counts calls, matches and time"""
+
+    def __init__(self, pattern, stats):
+        self._pattern = pattern
+        self._stats = stats
+
+    def __getattr__(self, name):
+        return getattr(self._pattern, name)
+
+    def _record(self, started, matches):
+        self._stats['calls'] += 1
+        self._stats['matches'] += matches
+        self._stats['seconds'] += time.perf_counter() - started
+
+    def match(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._pattern.match(*args, **kwargs)
+        self._record(started, result is not None)
+        return result
+
+    def fullmatch(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._pattern.fullmatch(*args, **kwargs)
+        self._record(started, result is not None)
+        return result
+
+    def search(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._pattern.search(*args, **kwargs)
+        self._record(started, result is not None)
+        return result
+
+    def findall(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._pattern.findall(*args, **kwargs)
+        self._record(started, len(result))
+        return result
+
+    def split(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._pattern.split(*args, **kwargs)
+        self._record(started, len(result) - 1)
+        return result
+
+    def subn(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = self._pattern.subn(*args, **kwargs)
+        self._record(started, result[1])
+        return result
+
+    def sub(self, *args, **kwargs):
+        return self.subn(*args, **kwargs)[0]
+
+    def finditer(self, *args, **kwargs):
+        # Time is spent while the caller iterates, so it is taken per step
+        started = time.perf_counter()
+        iterator = self._pattern.finditer(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        matches = 0
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    match = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - started
+                matches += 1
+                yield match
+        finally:
+            self._stats['calls'] += 1
+            self._stats['matches'] += matches
+            self._stats['seconds'] += elapsed
+
+
+class Metrics:
+    """Collector for one script run; a disabled collector ignores everything"""
+
+    def __init__(self, script, enabled=True):
+        self.script = script
+        self.enabled = enabled
+        self.stages = {}
+        self.files = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.counters = {}
+        self.patterns = {}
+        self.hotspots = None
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+        self._patched = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block under a stage name; repeated stages accumulate"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            stage = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0, 'cpu_seconds': 0.0})
+            stage['calls'] += 1
+            stage['seconds'] += time.perf_counter() - started
+            stage['cpu_seconds'] += time.process_time() - cpu_started
+
+    @contextlib.contextmanager
+    def file(self, name):
+        """Time the processing of one file"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.file_time(name, time.perf_counter() - started)
+
+    def file_time(self, name, seconds, read=0, written=0):
+        """Record time and bytes for a file processed elsewhere, e.g. in a worker process"""
+        if not self.enabled:
+            return
+        entry = self.files.setdefault(name, {'seconds': 0.0, 'read': 0, 'written': 0})
+        entry['seconds'] += seconds
+        entry['read'] += read
+        entry['written'] += written
+        self.bytes_read += read
+        self.bytes_written += written
+
+    def read(self, nbytes, name=None):
+        if not self.enabled:
+            return
+        self.bytes_read += nbytes
+        if name is not None:
+            self.files.setdefault(name, {'seconds': 0.0, 'read': 0, 'written': 0})['read'] += nbytes
+
+    def wrote(self, nbytes, name=None):
+        if not self.enabled:
+            return
+        self.bytes_written += nbytes
+        if name is not None:
+            self.files.setdefault(name, {'seconds': 0.0, 'read': 0, 'written': 0})['written'] += nbytes
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def patch_patterns(self):
+        """Swap the compiled patterns of the loaded shared modules for timing proxies"""
+        for module_name in PATTERN_MODULES:
+            module = sys.modules.get(module_name)
+            if module is None:
+                continue
+            for attr, value in list(vars(module).items()):
+                if isinstance(value, re.Pattern):
+                    stats = self.patterns.setdefault(f"{module_name}.{attr}", {
+                        'pattern': value.pattern if isinstance(value.pattern, str) else value.pattern.decode('latin-1'),
+                        'calls': 0, 'matches': 0, 'seconds': 0.0})
+                    setattr(module, attr, TimedPattern(value, stats))
+                    self._patched.append((module, attr, value))
+
+    def restore_patterns(self):
+        for module, attr, value in reversed(self._patched):
+            setattr(module, attr, value)
+        self._patched = []
+
+    def summary(self):
+        """Everything recorded, as a JSON-serialisable dict"""
+        scale = 1 if sys.platform == 'darwin' else 1024
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+        files = sorted(self.files.items(), key=lambda item: -item[1]['seconds'])
+        return {
+            'version': METRICS_VERSION,
+            'script': self.script,
+            'finished': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'seconds': round(time.perf_counter() - self.started, 6),
+            'cpu_seconds': round(time.process_time() - self.cpu_started, 6),
+            'peak_rss_bytes': own,
+            'peak_rss_children_bytes': children,
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'stages': {name: {key: round(value, 6) if isinstance(value, float) else value
+                              for key, value in stage.items()} for name, stage in self.stages.items()},
+            'counters': self.counters,
+            'files': {name: dict(entry, seconds=round(entry['seconds'], 6)) for name, entry in files},
+            'patterns': dict(sorted(
+                ((name, dict(stats, seconds=round(stats['seconds'], 6)))
+                 for name, stats in self.patterns.items() if stats['calls']),
+                key=lambda item: -item[1]['seconds'])),
+            'hotspots': self.hotspots,
+        }
+
+
+_DISABLED = Metrics(None, enabled=False)
+_current = _DISABLED
+
+
+def current():
+    """The collector of the run in progress, or a disabled one"""
+    return _current
+
+
+def add_arguments(parser):
+    """Add --profile and --metrics-json to a script's argument parser"""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--profile', action='store_true',
+                       help="run under cProfile and print stage timings and hotspots to stderr")
+    group.add_argument('--metrics-json', metavar='PATH',
+                       help="write stage, file, I/O, regex and memory metrics to a JSON file")
+
+
+def _hotspots(profiler, limit=PROFILE_TOP):
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (calls, primitive, own, cumulative, _) in stats.stats.items():
+        rows.append({'function': f"{os.path.basename(filename)}:{line}({function})", 'calls': calls,
+                     'primitive_calls': primitive, 'seconds': round(own, 6), 'cumulative_seconds': round(cumulative, 6)})
+    rows.sort(key=lambda row: -row['seconds'])
+    return rows[:limit]
+
+
+def print_report(summary, stream=sys.stderr):
+    """Human-readable stage, pattern and hotspot tables"""
+    print(f"\n⏱️  {summary['script']}: {summary['seconds']:.3f}s wall, {summary['cpu_seconds']:.3f}s CPU, "
+          f"peak RSS {summary['peak_rss_bytes'] / 2**20:.1f} MiB, "
+          f"{summary['bytes_read']:,} bytes read, {summary['bytes_written']:,} written", file=stream)
+    for name, stage in summary['stages'].items():
+        print(f"  {name:<24} {stage['seconds']:9.4f}s  cpu {stage['cpu_seconds']:8.4f}s  x{stage['calls']}", file=stream)
+    if summary['counters']:
+        print("  " + ', '.join(f"{name} {value}" for name, value in summary['counters'].items()), file=stream)
+    if summary['files']:
+        print(f"  slowest of {len(summary['files'])} files:", file=stream)
+        for name, entry in list(summary['files'].items())[:SLOWEST_FILES]:
+            print(f"    {entry['seconds'] * 1000:8.2f}ms  {entry['read']:>8} B in  {entry['written']:>8} B out  {name}",
+                  file=stream)
+    if summary['patterns']:
+        print("  regexes:", file=stream)
+        for name, stats in summary['patterns'].items():
+            print(f"    {stats['seconds'] * 1000:8.2f}ms  {stats['calls']:>7} calls  {stats['matches']:>7} matches  {name}",
+                  file=stream)
+    if summary['hotspots']:
+        print("  hotspots by own time:", file=stream)
+        for row in summary['hotspots']:
+            print(f"    {row['seconds']:8.4f}s  cum {row['cumulative_seconds']:8.4f}s  {row['calls']:>8}  {row['function']}",
+                  file=stream)
+
+
+def write_json(summary, path):
+    """Write the metrics artifact atomically"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(summary, indent=2))
+    os.replace(tmp_path, path)
+
+
+@contextlib.contextmanager
+def run(script, args):
+    """Collect metrics for the enclosed block if args asked for them, and report at the end"""
+    global _current
+    profile = getattr(args, 'profile', False)
+    metrics_path = getattr(args, 'metrics_json', None)
+    if not profile and not metrics_path:
+        yield _DISABLED
+        return
+
+    metrics = Metrics(script)
+    metrics.patch_patterns()
+    profiler = None
+    if profile:
+        # Imported here so uninstrumented runs do not pay for cProfile and pstats
+        import cProfile
+        profiler = cProfile.Profile()
+    _current = metrics
+    if profiler:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler:
+            profiler.disable()
+            metrics.hotspots = _hotspots(profiler)
+        _current = _DISABLED
+        metrics.restore_patterns()
+        summary = metrics.summary()
+        if profile:
+            print_report(summary)
+        if metrics_path:
+            write_json(summary, metrics_path)
+            print(f"📊 Metrics written to {metrics_path}", file=sys.stderr)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Linear-time locator for the JSX insertion points the SEO scripts rewrite.
+
+The scripts used to find where to inject SEO components with
+r'(\\s+return \\(\\s+<div[^>]*>\\s*)(.*?Professional Service Bar)' under
+re.DOTALL, which rescans the rest of the file for every candidate 'return ('
+and backtracks over whitespace runs. The locator makes one forward pass over
+the raw bytes instead: a token regex without nested quantifiers jumps to the
+next interesting token (a comment, a string literal, 'return (', or a
+tracked component tag), and tags are parsed with a small attribute scanner that understands
+quoted strings and {...} expressions. Every offset is an exact byte offset
+into the file.
+
+Usage:
+    import jsx_locator
+    found = jsx_locator.locate(data)
+    insert_at = found['root']['insert']
+    data = jsx_locator.insert(data, insert_at, snippet)
+"""
+
+import json
+import re
+
+# Components whose props the scripts read or rewrite
+SEO_COMPONENTS = ('LocationPageSEO', 'ServicePageSEO', 'LocalBusinessSchema', 'ServiceSchema')
+
+_WHITESPACE = b' \t\r\n'
+_NAME_END = b' \t\r\n/>={'
+
+
+def _token_pattern(components):
+    # A '//' after ':' or a word character is part of a URL in JSX text, and a
+    # quote only opens a string where an expression can start, not in "we're"
+    pattern = (rb'(?P<comment>/\*)|(?P<line>(?<![:\w])//)|(?P<string>(?<=[\s=(,:\[!&|?{};+])["\'`])'
+               rb'|(?P<root>\breturn[ \t\r\n]*\([ \t\r\n]*<)')
+    if components:
+        names = b'|'.join(re.escape(name.encode('utf-8')) for name in components)
+        pattern += rb'|<(?P<component>' + names + rb')(?=[ \t\r\n/>])'
+    return re.compile(pattern)
+
+
+_TOKENS = _token_pattern(SEO_COMPONENTS)
+
+
+def _skip_string(data, pos):
+    """Return the position just after the quoted string starting at pos"""
+    quote = data[pos]
+    pos += 1
+    length = len(data)
+    while pos < length:
+        char = data[pos]
+        if char == 0x5c:  # backslash
+            pos += 2
+            continue
+        if char == quote:
+            return pos + 1
+        pos += 1
+    return pos
+
+
+def _literal_end(data, pos):
+    """Return the position just after the string literal starting at pos, or None if it is not one.
+
+    Quoted strings end on their line, so a lone quote in JSX text does not
+    swallow the rest of the file; template literals may span lines.
+    """
+    if data[pos:pos + 1] == b'`':
+        return _skip_string(data, pos)
+    quote = data[pos]
+    pos += 1
+    length = len(data)
+    while pos < length:
+        char = data[pos]
+        if char == 0x5c:  # backslash
+            pos += 2
+            continue
+        if char == quote:
+            return pos + 1
+        if char == 0x0a:  # newline
+            return None
+        pos += 1
+    return None
+
+
+def _skip_expression(data, pos):
+    """Return the position just after the {...} expression starting at pos"""
+    depth = 0
+    length = len(data)
+    while pos < length:
+        char = data[pos:pos + 1]
+        if char in (b'"', b"'", b'`'):
+            pos = _skip_string(data, pos)
+            continue
+        if char == b'{':
+            depth += 1
+        elif char == b'}':
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return pos
+
+
+def _expression_value(raw):
+    """Decode a JSX expression prop, keeping the raw source if it is not a plain literal"""
+    inner = raw[1:-1].strip()
+    try:
+        return json.loads(inner)
+    except ValueError:
+        return raw
+
+
+def parse_element(data, start, spans=None):
+    """Parse the props of the JSX element whose '<' is at start.
+
+    Returns (props, end) where end is the offset just past the closing '>' of
+    the opening tag. Quoted props are returned as strings, literal expressions
+    (booleans, numbers, arrays of strings) as JSON values and anything else as
+    the raw '{...}' source. If spans is a dict it receives
+    {name: (value_start, value_end)} covering each value including its quotes
+    or braces.
+    """
+    pos = start + 1
+    length = len(data)
+    while pos < length and data[pos:pos + 1] not in _NAME_END:
+        pos += 1
+
+    props = {}
+    while pos < length:
+        if data[pos] in _WHITESPACE:
+            pos += 1
+            continue
+        char = data[pos:pos + 1]
+        if char == b'/' and data[pos + 1:pos + 2] == b'>':
+            return props, pos + 2
+        if char == b'>':
+            return props, pos + 1
+        if char == b'{':
+            # Spread props ({...rest}) and comments carry no named values
+            pos = _skip_expression(data, pos)
+            continue
+
+        name_start = pos
+        while pos < length and data[pos:pos + 1] not in _NAME_END:
+            pos += 1
+        if pos == name_start:
+            pos += 1
+            continue
+        name = data[name_start:pos].decode('utf-8')
+
+        while pos < length and data[pos] in _WHITESPACE:
+            pos += 1
+        if data[pos:pos + 1] != b'=':
+            props[name] = True
+            continue
+        pos += 1
+        while pos < length and data[pos] in _WHITESPACE:
+            pos += 1
+
+        if data[pos:pos + 1] in (b'"', b"'"):
+            end = _skip_string(data, pos)
+            props[name] = data[pos + 1:end - 1].decode('utf-8')
+        elif data[pos:pos + 1] == b'{':
+            end = _skip_expression(data, pos)
+            props[name] = _expression_value(data[pos:end].decode('utf-8'))
+        else:
+            end = pos
+        if spans is not None:
+            spans[name] = (pos, end)
+        pos = end
+
+    return props, length
+
+
+def find_imports(data):
+    """Return the leading import statements as dicts with byte offsets.
+
+    Each statement has 'start', 'end' (past the optional ';'), 'module' (the
+    specifier) and 'names' ([open, close] offsets of the {...} clause, or None).
+    """
+    statements = []
+    pos = 0
+    length = len(data)
+    while pos < length:
+        while pos < length and data[pos] in _WHITESPACE:
+            pos += 1
+        if data.startswith(b'//', pos):
+            newline = data.find(b'\n', pos)
+            pos = length if newline == -1 else newline + 1
+            continue
+        if not data.startswith(b'import', pos):
+            break
+        # The module specifier is the first quoted string of the statement
+        quotes = [i for i in (data.find(b'"', pos), data.find(b"'", pos)) if i != -1]
+        if not quotes:
+            break
+        quote = min(quotes)
+        spec_end = _skip_string(data, quote)
+        open_brace = data.find(b'{', pos, quote)
+        names = [open_brace, data.find(b'}', open_brace, quote)] if open_brace != -1 else None
+        end = spec_end + 1 if data[spec_end:spec_end + 1] == b';' else spec_end
+        statements.append({
+            'start': pos,
+            'end': end,
+            'module': data[quote + 1:spec_end - 1].decode('utf-8'),
+            'names': names,
+        })
+        pos = end
+    return statements
+
+
+def import_block(statements):
+    """Return [start, end] of the leading import statements, or None"""
+    if not statements:
+        return None
+    return [statements[0]['start'], statements[-1]['end']]
+
+
+def imported_names(data, statement):
+    """Return the names in an import statement's {...} clause"""
+    if not statement['names']:
+        return []
+    open_brace, close_brace = statement['names']
+    clause = data[open_brace + 1:close_brace].decode('utf-8')
+    return [name.strip() for name in clause.split(',') if name.strip()]
+
+
+def import_insertion(data, imports, name, module, after=None):
+    """Return the (offset, text) insertion that imports name from module.
+
+    Extends an existing {...} import from module when there is one, keeping
+    a trailing comma last, otherwise adds a new statement after the import
+    from `after` (or the last import). Returns None when name is already
+    imported from module.
+    """
+    for statement in imports:
+        if statement['module'] != module or not statement['names']:
+            continue
+        if name in imported_names(data, statement):
+            return None
+        close = statement['names'][1]
+        while data[close - 1] in _WHITESPACE:
+            close -= 1
+        if data[close - 1:close] == b',':
+            return close, f" {name},"
+        if data[close - 1:close] == b'{':
+            return close, f" {name}"
+        return close, f", {name}"
+
+    anchor = next((s for s in imports if s['module'] == after), None)
+    if anchor is None and imports:
+        anchor = imports[-1]
+    line = f"import {{ {name} }} from '{module}';"
+    if anchor is None:
+        return 0, line + "\n"
+    return anchor['end'], "\n" + line
+
+
+def _root_element(data, match):
+    """Describe the first element after 'return (' matched by the token regex"""
+    start = match.end() - 1
+    _, end = parse_element(data, start)
+    # Insert at the start of the line after the opening tag when it ends the line
+    insert = end
+    while insert < len(data) and data[insert] in b' \t\r':
+        insert += 1
+    if data[insert:insert + 1] == b'\n':
+        insert += 1
+    else:
+        insert = end
+    return {'start': start, 'end': end, 'insert': insert}
+
+
+def locate(data, components=SEO_COMPONENTS):
+    """Find the import block, the root JSX element and the tracked components.
+
+    Returns a dict with:
+      'imports'  - list of import statements (see find_imports)
+      'root'     - {'start', 'end', 'insert'} for the first element after
+                   'return (', where 'insert' is the start of the line after
+                   its opening tag, or None
+      'elements' - {component: [(start, end, props)]} for each opening tag
+    Comments and string literals are skipped in the same pass, so markup that
+    is commented out or quoted is never matched.
+    """
+    pattern = _TOKENS if components == SEO_COMPONENTS else _token_pattern(components)
+    imports = find_imports(data)
+    root = None
+    elements = {}
+    pos = imports[-1]['end'] if imports else 0
+
+    while True:
+        match = pattern.search(data, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        if kind == 'comment':
+            close = data.find(b'*/', match.end())
+            pos = len(data) if close == -1 else close + 2
+        elif kind == 'line':
+            newline = data.find(b'\n', match.end())
+            pos = len(data) if newline == -1 else newline + 1
+        elif kind == 'string':
+            end = _literal_end(data, match.start())
+            pos = match.end() if end is None else end
+        elif kind == 'root':
+            if root is None:
+                root = _root_element(data, match)
+                pos = root['end']
+            else:
+                pos = match.end()
+        else:
+            props, end = parse_element(data, match.start())
+            elements.setdefault(match.group('component').decode('utf-8'), []).append(
+                (match.start(), end, props))
+            pos = end
+
+    return {'imports': imports, 'root': root, 'elements': elements}
+
+
+def closing_offset(data, start, end):
+    """Return where new props go in the opening tag spanning start:end.
+
+    That is just before the whitespace preceding '/>' or '>', so a prop
+    inserted as '\\n        name="value"' lands on its own line.
+    """
+    close = end - 2 if data[end - 2:end] == b'/>' else end - 1
+    while close > start and data[close - 1] in _WHITESPACE:
+        close -= 1
+    return close
+
+
+def insert(data, offset, text):
+    """Insert text (str or bytes) at a byte offset"""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return data[:offset] + text + data[offset:]
+
+
+def apply_insertions(data, insertions):
+    """Apply several (offset, text) insertions computed against the same data"""
+    # Apply from the end so earlier offsets stay valid; ties keep their given order
+    ordered = sorted(enumerate(insertions), key=lambda item: (item[1][0], item[0]), reverse=True)
+    for _, (offset, text) in ordered:
+        data = insert(data, offset, text)
+    return data
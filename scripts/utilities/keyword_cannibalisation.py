@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Keyword-cannibalisation report: pages of this site competing for one query.
+
+Location and service pages are written from a handful of templates ("Mould
+Removal X Melbourne - Professional Same-Day Service"), so pages whose
+suburbs or services overlap end up targeting the same search query. Each
+indexed URL's primary query is taken from what search engines weigh most:
+
+  title        - the LocationPageSEO/ServicePageSEO title as snippet_auditor
+                 resolves it, the SEOHead title prop (or that of a preset such
+                 as HomePageSEO), or the generator text
+  h1           - the page's <h1> markup, or the text LocationPageH1 and the
+                 other components in src/components/seo/H1Optimization.tsx
+                 render for their props
+  description  - resolved the same way as the title, falling back to
+                 SUBURB_META_DESCRIPTIONS
+
+The fields are split into words and word pairs, weighted by field, and
+turned into a sparse TF-IDF matrix (sublinear term frequency, smoothed IDF,
+rows L2-normalised, so a row product is the cosine similarity). Terms on
+more than --common-df of the pages ("mould", "melbourne") are common; the
+others form an inverted index. A pair of pages can only reach the threshold
+without sharing an uncommon term if both vectors are mostly common terms
+(their common parts' norms bound the common share of the product), so the
+candidate pairs are the pages found through each row's uncommon postings
+plus all pairs among those few common-heavy pages. The product is computed
+exactly for the candidates, in row blocks with vectorised sparse
+operations, and only the top --top-k matches per page are kept, so the run
+grows with the pages that share terms rather than with every pair.
+
+Pages are taken from the sitemaps and listed by sitemap priority, the more
+important page of a pair first, since that is the page the other one takes
+clicks from.
+
+Usage:
+    python3 keyword_cannibalisation.py [--root PROJECT] [--threshold 0.6] [--top-k 5] [--json] [--strict]
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+import jsx_locator
+import page_index
+import snippet_auditor
+from consistency_checker import load_routes, load_sitemaps, normalise_url
+from page_transforms import SUBURBS
+
+FIELDS = ('title', 'h1', 'description')
+FIELD_WEIGHTS = {'title': 3.0, 'h1': 2.0, 'description': 1.0}
+# Which snippet_auditor source wins when a field has several
+SOURCE_ORDER = {'title': ('page', 'generator'), 'description': ('page', 'table', 'generator')}
+
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_TOP_K = 5
+DEFAULT_COMMON_DF = 0.05
+# Row products expanded per block, which bounds the memory a block needs
+BLOCK_PRODUCTS = 1 << 21
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or',
+    'our', 'the', 'to', 'we', 'with', 'you', 'your',
+))
+
+H1_COMPONENTS = ('OptimizedH1', 'HomePageH1', 'ServicePageH1', 'LocationPageH1', 'AboutPageH1', 'ContactPageH1')
+PAGE_COMPONENTS = ('SEOHead', 'h1') + H1_COMPONENTS
+
+_PRESET = re.compile(rb'^export\s+const\s+(\w+)\s*:\s*React\.FC\b', re.MULTILINE)
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_CONST_STRING = re.compile(rb"""\bconst\s+(\w+)\s*=\s*(["'])((?:(?!\2).)*)\2\s*;""")
+_JSX_EXPRESSION = re.compile(r'\{([^{}]*)\}')
+_TAG = re.compile(r'<[^<>]*>')
+_SPACE = re.compile(r'\s+')
+_H1_BLOCK = re.compile(rb'const\s+(H1_PATTERNS|LOCATION_H1_VARIANTS)\s*=\s*\{(.*?)\n\};', re.DOTALL)
+_H1_SECTION = re.compile(r"""^\s*['"]?([\w-]+)['"]?\s*:\s*\{\s*$""")
+_H1_ENTRY = re.compile(r"""^\s*['"]?([\w-]+)['"]?\s*:\s*(["'])((?:(?!\2).)*)\2""")
+
+
+def terms(text):
+    """Words and adjacent word pairs of a text, stopwords left out"""
+    words = [word for word in _WORD.findall(text.lower().replace('’', "'")) if word not in STOPWORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def load_h1_patterns(path):
+    """Return the H1_PATTERNS and LOCATION_H1_VARIANTS tables of H1Optimization.tsx as dicts"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        data = f.read()
+    tables = {}
+    for match in _H1_BLOCK.finditer(data.encode('utf-8')):
+        table = tables[match.group(1).decode('utf-8')] = {}
+        stack = [table]
+        for line in match.group(2).decode('utf-8').splitlines():
+            section = _H1_SECTION.match(line)
+            entry = _H1_ENTRY.match(line)
+            if section:
+                stack.append(stack[-1].setdefault(section.group(1), {}))
+            elif entry:
+                stack[-1][entry.group(1)] = entry.group(3)
+            elif line.strip().startswith('}') and len(stack) > 1:
+                stack.pop()
+    return tables
+
+
+def load_head_presets(path):
+    """Return {component: {'title', 'description'}} for the SEOHead.tsx components that pass SEOHead literal text"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        data = f.read()
+    presets = {}
+    starts = list(_PRESET.finditer(data))
+    for match, following in zip(starts, starts[1:] + [None]):
+        body_end = following.start() if following else len(data)
+        tag = data.find(b'<SEOHead', match.end(), body_end)
+        if tag == -1:
+            continue
+        props = jsx_locator.parse_element(data, tag)[0]
+        text = {field: html.unescape(props[field]) for field in ('title', 'description')
+                if isinstance(props.get(field), str) and not props[field].startswith('{')}
+        if text:
+            presets[match.group(1).decode('utf-8')] = text
+    return presets
+
+
+def render_h1_component(name, props, patterns):
+    """The text an H1Optimization component renders for literal props, following OptimizedH1"""
+    page_type = {'HomePageH1': 'homepage', 'ServicePageH1': 'service', 'LocationPageH1': 'location',
+                 'AboutPageH1': 'about', 'ContactPageH1': 'contact'}.get(name) or props.get('pageType', 'location')
+    h1 = patterns.get('H1_PATTERNS', {})
+    homepage = h1.get('homepage', {})
+    emergency = props.get('emergency') is True
+    if page_type == 'homepage':
+        return homepage.get('emergency' if emergency else 'standard')
+    if page_type == 'service':
+        service = props.get('service', 'removal')
+        return h1.get('service', {}).get(service) or f"{service[:1].upper()}{service[1:]} Melbourne - Professional Service"
+    if page_type == 'location':
+        location = props.get('location')
+        if not isinstance(location, str):
+            return homepage.get('standard')
+        variant = patterns.get('LOCATION_H1_VARIANTS', {}).get(_SPACE.sub('-', location.lower()))
+        if variant:
+            return variant
+        location_patterns = h1.get('location', {})
+        pattern = (location_patterns.get('emergency') if emergency else
+                   location_patterns.get(props.get('service', 'removal')) or location_patterns.get('removal'))
+        return pattern.replace('{location}', location) if pattern else None
+    if page_type in ('about', 'contact'):
+        return h1.get(page_type)
+    return homepage.get('standard')
+
+
+def _resolve(value, constants):
+    """A prop or expression's text: string literals as they are, {name} through the page's string constants"""
+    if not isinstance(value, str):
+        return None
+    if value.startswith('{'):
+        return constants.get(value[1:-1].strip())
+    return html.unescape(value)
+
+
+def _jsx_text(raw, constants):
+    """Visible text of a JSX fragment, with {name} expressions filled in from string constants"""
+    def expression(match):
+        inner = match.group(1).strip()
+        if len(inner) > 1 and inner[0] == inner[-1] and inner[0] in '\'"`':
+            return inner[1:-1]
+        return constants.get(inner, ' ')
+
+    text = _TAG.sub(' ', _JSX_EXPRESSION.sub(expression, raw))
+    return _SPACE.sub(' ', html.unescape(text)).strip()
+
+
+def page_markup(data, h1_patterns, presets):
+    """Return ({'title', 'description'} from SEOHead or a preset, first H1 text) for one page source"""
+    constants = {name.decode('utf-8'): value.decode('utf-8') for name, _, value in _CONST_STRING.findall(data)}
+    elements = jsx_locator.locate(data, components=PAGE_COMPONENTS + tuple(presets))['elements']
+
+    head = {}
+    for name, text in presets.items():
+        if elements.get(name):
+            head = dict(text)
+            break
+    if elements.get('SEOHead'):
+        props = elements['SEOHead'][0][2]
+        for field in ('title', 'description'):
+            text = _resolve(props.get(field), constants)
+            if text:
+                head[field] = text
+
+    # The first heading in source order, whether markup or a component
+    headings = sorted((start, name, end, props) for name in ('h1',) + H1_COMPONENTS
+                      for start, end, props in elements.get(name, ()))
+    for start, name, end, props in headings:
+        if name == 'h1':
+            close = data.find(b'</h1>', end)
+            text = _jsx_text(data[end:close].decode('utf-8', 'replace'), constants) if close != -1 else ''
+        else:
+            resolved = {key: (_resolve(value, constants) if isinstance(value, str) else value)
+                        for key, value in props.items()}
+            text = render_h1_component(name, resolved, h1_patterns)
+        if text:
+            return head, text
+    return head, None
+
+
+def module_file(import_path):
+    """Project-relative source file of a module App.tsx imports as './pages/About'"""
+    return os.path.normpath(os.path.join('src', import_path)).replace(os.sep, '/') + '.tsx'
+
+
+def sitemap_priorities(public_dir):
+    """{path: priority} over every page sitemap, the highest where a path is listed twice"""
+    priorities = {}
+    if not os.path.isdir(public_dir):
+        return priorities
+    for sitemap in load_sitemaps(public_dir):
+        for loc, priority in sitemap['priorities'].items():
+            path = normalise_url(loc)[1]
+            priorities[path] = max(priority, priorities.get(path, priority))
+        for loc in sitemap['locs']:
+            if not sitemap['index'] and not sitemap['images']:
+                priorities.setdefault(normalise_url(loc)[1], None)
+    return priorities
+
+
+def collect_pages(root, unlisted=False):
+    """Return [{'url', 'file', 'priority', 'title', 'h1', 'description'}], one per URL.
+
+    A page's URL is the one the sitemaps list among its route paths, its
+    /locations/ path and its canonical; pages no sitemap lists are left out
+    unless unlisted is set. When several files claim a URL the routed one
+    wins (ProfessionalMouldInspections_backup.tsx shares its canonical).
+    """
+    routes = load_routes(os.path.join(root, 'src', 'App.tsx'))
+    route_paths = {}
+    for path, component in routes['paths'].items():
+        if ':' not in path and component in routes['modules']:
+            route_paths.setdefault(module_file(routes['modules'][component]), []).append(path)
+
+    snippets = snippet_auditor.collect(root)
+    columns = snippets.columns
+    texts = {}
+    canonicals = {}
+    for i in range(len(snippets)):
+        texts.setdefault(columns['url'][i], {}).setdefault(columns['field'][i], {}).setdefault(
+            columns['source'][i], columns['text'][i])
+        if columns['source'][i] == 'page':
+            canonicals[columns['origin'][i]] = columns['url'][i]
+    for url, _, origin in snippets.defaulted + snippets.unresolved:
+        canonicals[origin] = url
+
+    locations_dir = os.path.join(root, 'src', 'pages', 'locations')
+    location_files = [f"src/pages/locations/{filename}" for filename in
+                      sorted(page_index.scan_pages(locations_dir)) if os.path.isdir(locations_dir)]
+    files = sorted(set(route_paths) | set(location_files) | set(canonicals))
+    routed = set(route_paths) | set(location_files)
+    priorities = sitemap_priorities(os.path.join(root, 'public'))
+    h1_patterns = load_h1_patterns(os.path.join(root, 'src', 'components', 'seo', 'H1Optimization.tsx'))
+    presets = load_head_presets(os.path.join(root, 'src', 'components', 'seo', 'SEOHead.tsx'))
+
+    pages = {}
+    for file in files:
+        path = os.path.join(root, file)
+        if not os.path.exists(path):
+            continue
+        directory, filename = os.path.split(path)
+        candidates = list(route_paths.get(file, ()))
+        if file.startswith('src/pages/locations/'):
+            candidates.append(f"/locations/{SUBURBS.to_kebab(filename)}")
+        if file in canonicals:
+            candidates.append(canonicals[file])
+        listed = [url for url in candidates if url in priorities]
+        if listed:
+            url = max(listed, key=lambda url: priorities[url] or 0.0)
+        elif unlisted and candidates:
+            url = candidates[-1]
+        else:
+            continue
+        if url in pages and (pages[url]['file'] in routed or file not in routed):
+            continue
+
+        head, h1 = page_markup(page_index.read_page(directory, filename), h1_patterns, presets)
+        page = {'url': url, 'file': file, 'priority': priorities.get(url), 'h1': h1}
+        found = texts.get(canonicals.get(file), {})
+        for field in ('title', 'description'):
+            sources = found.get(field, {})
+            page[field] = next((sources[source] for source in SOURCE_ORDER[field][:1] if source in sources),
+                               head.get(field))
+            if page[field] is None:
+                page[field] = next((sources[source] for source in SOURCE_ORDER[field][1:] if source in sources), None)
+        pages[url] = page
+    return sorted(pages.values(), key=lambda page: page['url'])
+
+
+def tfidf_matrix(pages):
+    """Return (vocabulary, indptr, indices, data): the pages' L2-normalised TF-IDF rows in CSR form"""
+    vocabulary = {}
+    rows = []
+    for page in pages:
+        counts = {}
+        for field in FIELDS:
+            if page[field]:
+                for term in terms(page[field]):
+                    counts[term] = counts.get(term, 0.0) + FIELD_WEIGHTS[field]
+        rows.append({vocabulary.setdefault(term, len(vocabulary)): count for term, count in counts.items()})
+
+    lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    indices = np.empty(indptr[-1], dtype=np.int64)
+    data = np.empty(indptr[-1], dtype=np.float64)
+    for row, start in zip(rows, indptr[:-1]):
+        ordered = sorted(row.items())
+        indices[start:start + len(ordered)] = [term for term, _ in ordered]
+        data[start:start + len(ordered)] = [count for _, count in ordered]
+
+    df = np.bincount(indices, minlength=len(vocabulary))
+    idf = np.log((1 + len(pages)) / (1 + df)) + 1
+    data = (1 + np.log(data)) * idf[indices]
+    norms = np.sqrt(np.add.reduceat(data ** 2, indptr[:-1])) if len(data) else np.zeros(0)
+    norms = np.where(lengths > 0, norms, 1.0)
+    data /= np.repeat(norms, lengths)
+    return sorted(vocabulary, key=vocabulary.get), indptr, indices, data
+
+
+def _blocks(costs, budget):
+    """Split positions into consecutive [start, end) ranges whose costs sum to about budget"""
+    bounds = [0]
+    cumulative = np.cumsum(costs)
+    while bounds[-1] < len(costs):
+        done = cumulative[bounds[-1] - 1] if bounds[-1] else 0
+        # At least one position per block, however costly
+        bounds.append(max(bounds[-1] + 1, int(np.searchsorted(cumulative, done + budget, side='right'))))
+    return zip(bounds[:-1], bounds[1:])
+
+
+def _expand(lengths):
+    """For segments of the given lengths, the segment and the offset within it of each expanded position"""
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    offset = np.arange(owner.size) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return owner, offset
+
+
+class SimilarityIndex:
+    """Exact above-threshold cosine similarities between the rows of a CSR matrix.
+
+    Terms in more than common_df of the rows are common; the rest are kept
+    in an inverted index (the CSC transpose of the uncommon part).
+    """
+
+    def __init__(self, indptr, indices, data, common_df=DEFAULT_COMMON_DF):
+        self.count = len(indptr) - 1
+        self.terms = int(indices.max()) + 1 if len(indices) else 0
+        self.rows = np.repeat(np.arange(self.count), np.diff(indptr))
+        self.indices = indices
+        self.data = data
+
+        df = np.bincount(indices, minlength=self.terms)
+        common = (df > common_df * self.count)[indices]
+        self.common = np.flatnonzero(common)
+        self.uncommon = np.flatnonzero(~common)
+
+        # Inverted index over the uncommon terms
+        order = self.uncommon[np.argsort(indices[self.uncommon], kind='stable')]
+        self.postings_rows = self.rows[order]
+        self.postings_data = data[order]
+        self.postings_ptr = np.concatenate(([0], np.cumsum(np.bincount(indices[self.uncommon], minlength=self.terms))))
+
+        # Common parts, keyed row * terms + term so a (row, term) lookup is one binary search
+        self.common_keys = self.rows[self.common] * self.terms + indices[self.common]
+        self.common_ptr = np.concatenate(([0], np.cumsum(np.bincount(self.rows[self.common], minlength=self.count))))
+        self.common_norms = np.sqrt(np.bincount(self.rows[self.common], data[self.common] ** 2, minlength=self.count))
+
+    def common_dots(self, left, right):
+        """Common-term share of the products of rows left[n] and right[n]"""
+        dots = np.zeros(len(left))
+        lengths = np.diff(self.common_ptr)[left]
+        for start, end in _blocks(lengths, BLOCK_PRODUCTS):
+            pair, offset = _expand(lengths[start:end])
+            entry = self.common[self.common_ptr[left[start:end]][pair] + offset]
+            keys = right[start:end][pair] * self.terms + self.indices[entry]
+            found = np.minimum(np.searchsorted(self.common_keys, keys), max(len(self.common_keys) - 1, 0))
+            match = self.common_keys[found] == keys if len(self.common_keys) else np.zeros(len(keys), dtype=bool)
+            products = self.data[entry[match]] * self.data[self.common[found[match]]]
+            dots[start:end] = np.bincount(pair[match], products, minlength=end - start)
+        return dots
+
+    def _uncommon_pairs(self, start, end):
+        """(row, other, uncommon-term product) for rows start..end and every row sharing an uncommon term"""
+        first, last = np.searchsorted(self.rows[self.uncommon], (start, end))
+        entries = self.uncommon[first:last]
+        term = self.indices[entries]
+        lengths = self.postings_ptr[term + 1] - self.postings_ptr[term]
+        owner, offset = _expand(lengths)
+        position = self.postings_ptr[term][owner] + offset
+        row = self.rows[entries][owner]
+        other = self.postings_rows[position]
+        keep = row != other
+        keys, inverse = np.unique(row[keep] * self.count + other[keep], return_inverse=True)
+        products = np.bincount(inverse, (self.data[entries][owner] * self.postings_data[position])[keep],
+                               minlength=len(keys))
+        return keys // self.count, keys % self.count, products
+
+    def _common_heavy_pairs(self, rows, heavy, threshold):
+        """(row, other, common-term product) for rows against the common-heavy rows, above threshold"""
+        found = ([], [], [])
+        step = max(1, BLOCK_PRODUCTS // len(heavy))
+        for start in range(0, len(rows), step):
+            block = rows[start:start + step]
+            left = np.repeat(block, len(heavy))
+            right = np.tile(heavy, len(block))
+            keep = left != right
+            dots = self.common_dots(left[keep], right[keep])
+            above = dots >= threshold
+            for parts, values in zip(found, (left[keep][above], right[keep][above], dots[above])):
+                parts.append(values)
+        return tuple(np.concatenate(parts) if parts else np.zeros(0) for parts in found)
+
+    def common_heavy(self, threshold):
+        """Rows that can reach threshold with another row through common terms alone"""
+        if not self.count:
+            return np.zeros(0, dtype=np.int64)
+        # The common share of a product is at most the product of the common norms
+        return np.flatnonzero(self.common_norms * self.common_norms.max() >= threshold)
+
+    def top_pairs(self, threshold, top_k=DEFAULT_TOP_K):
+        """Return (rows, others, similarities): each row's top_k matches at or above threshold"""
+        heavy = self.common_heavy(threshold)
+        costs = np.zeros(self.count, dtype=np.int64)
+        if len(self.uncommon):
+            term = self.indices[self.uncommon]
+            np.add.at(costs, self.rows[self.uncommon], self.postings_ptr[term + 1] - self.postings_ptr[term])
+
+        results = ([], [], [])
+        for start, end in _blocks(costs + 1, BLOCK_PRODUCTS):
+            row, other, similarity = self._uncommon_pairs(start, end)
+            similarity = similarity + self.common_dots(row, other)
+            in_block = heavy[(heavy >= start) & (heavy < end)]
+            if len(in_block):
+                heavy_row, heavy_other, heavy_similarity = self._common_heavy_pairs(in_block, heavy, threshold)
+                # A pair found both ways has its uncommon share too, so the larger value is exact
+                row = np.concatenate((row, heavy_row.astype(np.int64)))
+                other = np.concatenate((other, heavy_other.astype(np.int64)))
+                similarity = np.concatenate((similarity, heavy_similarity))
+            keep = similarity >= threshold - 1e-12
+            row, other, similarity = row[keep], other[keep], similarity[keep]
+
+            # Highest similarity first per row; the first occurrence of a pair is its exact value
+            order = np.lexsort((-similarity, other, row))
+            row, other, similarity = row[order], other[order], similarity[order]
+            first = np.ones(len(row), dtype=bool)
+            first[1:] = (row[1:] != row[:-1]) | (other[1:] != other[:-1])
+            row, other, similarity = row[first], other[first], similarity[first]
+            order = np.lexsort((-similarity, row))
+            row, other, similarity = row[order], other[order], similarity[order]
+            starts = np.searchsorted(row, row)
+            keep = np.arange(len(row)) - starts < top_k
+            for parts, values in zip(results, (row[keep], other[keep], similarity[keep])):
+                parts.append(values)
+        return tuple(np.concatenate(parts) if parts else np.zeros(0) for parts in results)
+
+
+def shared_terms(vocabulary, indptr, indices, data, first, second, limit=5):
+    """The terms that contribute most to the similarity of two rows"""
+    left = dict(zip(indices[indptr[first]:indptr[first + 1]], data[indptr[first]:indptr[first + 1]]))
+    right = dict(zip(indices[indptr[second]:indptr[second + 1]], data[indptr[second]:indptr[second + 1]]))
+    products = sorted(((left[term] * right[term], term) for term in left.keys() & right.keys()), reverse=True)
+    return [vocabulary[term] for _, term in products[:limit]]
+
+
+def analyse(pages, threshold=DEFAULT_THRESHOLD, top_k=DEFAULT_TOP_K, common_df=DEFAULT_COMMON_DF):
+    """Return the competing page pairs, the more important page of each first, ranked by sitemap priority"""
+    vocabulary, indptr, indices, data = tfidf_matrix(pages)
+    index = SimilarityIndex(indptr, indices, data, common_df)
+    rows, others, similarities = index.top_pairs(threshold, top_k)
+
+    # A pair kept in either page's top k is reported once
+    best = {}
+    for row, other, similarity in zip(rows.tolist(), others.tolist(), similarities.tolist()):
+        key = (min(row, other), max(row, other))
+        best[key] = max(similarity, best.get(key, 0.0))
+
+    def rank(priority):
+        return -1.0 if priority is None else priority
+
+    pairs = []
+    for (first, second), similarity in best.items():
+        if (rank(pages[second]['priority']), pages[first]['url']) > (rank(pages[first]['priority']), pages[second]['url']):
+            first, second = second, first
+        a, b = pages[first], pages[second]
+        pairs.append({
+            'url': a['url'], 'priority': a['priority'],
+            'competitor': b['url'], 'competitor_priority': b['priority'],
+            'similarity': round(similarity, 3),
+            'shared': shared_terms(vocabulary, indptr, indices, data, first, second),
+            'identical': [field for field in FIELDS if a[field] and a[field] == b[field]],
+        })
+    pairs.sort(key=lambda pair: (-rank(pair['priority']), -rank(pair['competitor_priority']),
+                                 -pair['similarity'], pair['url'], pair['competitor']))
+    stats = {'terms': len(vocabulary), 'nonzeros': int(len(data)),
+             'common_terms': int(len(np.unique(indices[index.common]))),
+             'common_heavy': int(len(index.common_heavy(threshold)))}
+    return pairs, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report pages whose titles, H1s and descriptions target the same query")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="cosine similarity of two pages' query vectors that counts as competing (default: %(default)s)")
+    parser.add_argument('--top-k', type=int, default=DEFAULT_TOP_K,
+                        help="competitors kept per page (default: %(default)s)")
+    parser.add_argument('--common-df', type=float, default=DEFAULT_COMMON_DF,
+                        help="share of pages above which a term is left out of the inverted index; "
+                             "only affects speed (default: %(default)s)")
+    parser.add_argument('--unlisted', action='store_true', help="also analyse pages no sitemap lists")
+    parser.add_argument('--limit', type=int, default=20, help="pairs listed, 0 for all (default: 20)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 when any pages compete")
+    args = parser.parse_args(argv)
+    if not 0 < args.threshold <= 1:
+        parser.error("--threshold must be in (0, 1]")
+
+    started = time.perf_counter()
+    pages = collect_pages(os.path.abspath(args.root), args.unlisted)
+    collected = time.perf_counter() - started
+    pairs, stats = analyse(pages, args.threshold, args.top_k, args.common_df)
+    seconds = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({'seconds': round(seconds, 3), 'pages': len(pages), **stats, 'pairs': pairs}, indent=2))
+        return 1 if args.strict and pairs else 0
+
+    missing = {field: sum(1 for page in pages if not page[field]) for field in FIELDS}
+    print(f"🔑 {len(pages)} pages, {stats['terms']} terms ({stats['common_terms']} common) "
+          f"in {seconds:.3f}s ({collected:.3f}s collecting)")
+    gaps = ', '.join(f"{count} without {'an' if field == 'h1' else 'a'} {field}" for field, count in missing.items() if count)
+    if gaps:
+        print(f"   {gaps}")
+
+    def priority(value):
+        return '-' if value is None else f"{value:g}"
+
+    shown = pairs if args.limit == 0 else pairs[:args.limit]
+    print(f"\n{len(pairs)} competing pair(s) at similarity >= {args.threshold}:")
+    for pair in shown:
+        identical = f"  identical {', '.join(pair['identical'])}" if pair['identical'] else ''
+        print(f"  {pair['similarity']:.3f}  {pair['url']} ({priority(pair['priority'])}) <- "
+              f"{pair['competitor']} ({priority(pair['competitor_priority'])}){identical}")
+        print(f"         shared: {', '.join(pair['shared'])}")
+    if len(shown) < len(pairs):
+        print(f"  ... {len(pairs) - len(shown)} more (--limit 0 for all)")
+    return 1 if args.strict and pairs else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
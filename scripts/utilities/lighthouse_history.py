@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Lighthouse run history: streaming ingest, columnar storage and regression report.
+
+Full Lighthouse reports are 0.3-1.3 MB each, mostly screenshots, i18n strings
+and audit details nobody reads. The ingest step walks each report with a
+forward-only JSON reader that decodes only the members it needs (URLs,
+fetchTime, formFactor, the metric audits, opportunity audits and category
+scores) and skips everything else by scanning for brackets, so a report is
+never held in memory as a whole.
+
+Every run becomes one row of a columnar history file keyed by page, form
+factor and fetchTime: LCP, CLS, TBT and FCP, the four category scores, the
+runtime error code of failed runs and the top opportunities by estimated
+savings. Files already ingested are skipped by mtime and size, and a run
+that is already in the history is never added twice. The history is kept
+next to the reports in lighthouse-results/history.json, which git ignores.
+
+The report groups the history per page and form factor, shows each metric's
+latest value against the median of the previous runs, and lists every run
+where a metric got worse than that baseline by more than --threshold.
+
+Usage:
+    python3 lighthouse_history.py ingest [paths ...]
+    python3 lighthouse_history.py report [--page /services] [--form-factor mobile] [--metric lcp]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+HISTORY_VERSION = 1
+CHUNK_SIZE = 64 * 1024
+TOP_OPPORTUNITIES = 5
+
+# History column -> Lighthouse audit id
+METRIC_AUDITS = {
+    'lcp': 'largest-contentful-paint',
+    'cls': 'cumulative-layout-shift',
+    'tbt': 'total-blocking-time',
+    'fcp': 'first-contentful-paint',
+}
+# History column -> Lighthouse category id
+CATEGORIES = {
+    'performance': 'performance',
+    'accessibility': 'accessibility',
+    'best_practices': 'best-practices',
+    'seo': 'seo',
+}
+METRICS = tuple(METRIC_AUDITS) + tuple(CATEGORIES)
+# Timings and CLS regress upwards, category scores downwards
+HIGHER_IS_WORSE = set(METRIC_AUDITS)
+UNITS = {'lcp': 'ms', 'tbt': 'ms', 'fcp': 'ms'}
+
+# Smallest change reported as a regression, whatever the relative threshold says
+MIN_DELTA = {'lcp': 100.0, 'fcp': 100.0, 'tbt': 50.0, 'cls': 0.01,
+             'performance': 0.02, 'accessibility': 0.02, 'best_practices': 0.02, 'seo': 0.02}
+DEFAULT_THRESHOLD = 0.1
+# Previous runs whose median is the baseline for a regression
+BASELINE_RUNS = 5
+
+# Audits that only carry screenshots
+SKIPPED_AUDITS = {'screenshot-thumbnails', 'final-screenshot', 'full-page-screenshot'}
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+DEFAULT_RESULTS_DIR = os.path.join(ROOT_DIR, 'lighthouse-results')
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_RESULTS_DIR, 'history.json')
+
+_WHITESPACE = re.compile(rb'[ \t\r\n]*')
+_STRING_STOP = re.compile(rb'["\\]')
+# Everything up to the next bracket, passing over whole strings; a lone '"' is a string cut off by the chunk end
+_SKIP_RUN = re.compile(rb'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*([{}\[\]"])?')
+_SCALAR = re.compile(rb'[^,:}\] \t\r\n]*')
+
+
+class JsonStream:
+    """Forward-only reader over a JSON document in a binary file.
+
+    Only the current chunk is buffered. Values are either decoded with
+    read_value() or passed over with skip_value(); objects can be walked
+    member by member with members().
+    """
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = b''
+        self.pos = 0
+        # Start of the value being captured by read_value(), and its completed pieces
+        self.mark = None
+        self.captured = []
+
+    def _more(self):
+        data = self.f.read(self.chunk_size)
+        if not data:
+            raise ValueError("unexpected end of JSON document")
+        if self.mark is not None:
+            self.captured.append(self.buf[self.mark:self.pos])
+            self.mark = 0
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+
+    def peek(self):
+        """Skip whitespace and return the next byte without consuming it"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos:self.pos + 1]
+            self._more()
+
+    def _expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self.pos}, found {self.peek()!r}")
+        self.pos += 1
+
+    def _skip_string(self):
+        self.pos += 1
+        while True:
+            match = _STRING_STOP.search(self.buf, self.pos)
+            if match is None:
+                self.pos = len(self.buf)
+                self._more()
+                continue
+            if match.group() == b'"':
+                self.pos = match.end()
+                return
+            if match.end() >= len(self.buf):
+                # The escaped character is in the next chunk
+                self.pos = match.start()
+                self._more()
+                continue
+            self.pos = match.end() + 1
+
+    def skip_value(self):
+        """Move past the next value without decoding it"""
+        char = self.peek()
+        if char == b'"':
+            self._skip_string()
+            return
+        if char not in (b'{', b'['):
+            while True:
+                end = _SCALAR.match(self.buf, self.pos).end()
+                if end < len(self.buf):
+                    self.pos = end
+                    return
+                self._more()
+        depth = 0
+        while True:
+            match = _SKIP_RUN.match(self.buf, self.pos)
+            char = match.group(1)
+            if char is None:
+                self.pos = match.end()
+                self._more()
+                continue
+            if char == b'"':
+                # Finish the string chunk by chunk rather than rescanning it after every refill
+                self.pos = match.start(1)
+                self._skip_string()
+                continue
+            self.pos = match.end()
+            if char in b'{[':
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    return
+
+    def read_value(self):
+        """Decode the next value"""
+        self.peek()
+        self.mark = self.pos
+        self.captured = []
+        self.skip_value()
+        raw = b''.join(self.captured) + self.buf[self.mark:self.pos]
+        self.mark = None
+        self.captured = []
+        return json.loads(raw)
+
+    def members(self):
+        """Yield the keys of the next object; the caller reads or skips each value"""
+        self._expect(b'{')
+        if self.peek() == b'}':
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            self._expect(b':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == b'}':
+                return
+            if char != b',':
+                raise ValueError(f"expected ',' or '}}' at offset {self.pos - 1}, found {char!r}")
+
+
+def _opportunity(audit_id, audit):
+    details = audit.get('details') or {}
+    if details.get('type') != 'opportunity':
+        return None
+    savings_ms = details.get('overallSavingsMs') or 0
+    savings_bytes = details.get('overallSavingsBytes') or 0
+    if not savings_ms and not savings_bytes:
+        return None
+    return [audit_id, round(savings_ms), round(savings_bytes)]
+
+
+def extract_run(path):
+    """Stream one Lighthouse report and return its history row, or None if it is not a report"""
+    run = {'requested_url': None, 'final_url': None, 'fetch_time': None, 'form_factor': None,
+           'error': None, 'opportunities': []}
+    run.update({metric: None for metric in METRICS})
+    seen_audits = False
+
+    with open(path, 'rb') as f:
+        stream = JsonStream(f)
+        if stream.peek() != b'{':
+            return None
+        for key in stream.members():
+            if key == 'requestedUrl':
+                run['requested_url'] = stream.read_value()
+            elif key in ('finalDisplayedUrl', 'finalUrl'):
+                value = stream.read_value()
+                run['final_url'] = run['final_url'] or value
+            elif key == 'fetchTime':
+                run['fetch_time'] = stream.read_value()
+            elif key == 'runtimeError':
+                error = stream.read_value()
+                run['error'] = error.get('code') if isinstance(error, dict) else str(error)
+            elif key == 'configSettings':
+                for setting in stream.members():
+                    if setting == 'formFactor':
+                        run['form_factor'] = stream.read_value()
+                    else:
+                        stream.skip_value()
+            elif key == 'audits':
+                seen_audits = True
+                for audit_id in stream.members():
+                    if audit_id in SKIPPED_AUDITS:
+                        stream.skip_value()
+                        continue
+                    audit = stream.read_value()
+                    for metric, metric_audit in METRIC_AUDITS.items():
+                        if audit_id == metric_audit:
+                            run[metric] = audit.get('numericValue')
+                    opportunity = _opportunity(audit_id, audit)
+                    if opportunity:
+                        run['opportunities'].append(opportunity)
+            elif key == 'categories':
+                scores = {category_id: column for column, category_id in CATEGORIES.items()}
+                for category_id in stream.members():
+                    category = stream.read_value()
+                    if category_id in scores:
+                        run[scores[category_id]] = category.get('score')
+            else:
+                stream.skip_value()
+
+    if not seen_audits or run['fetch_time'] is None:
+        return None
+    run['opportunities'].sort(key=lambda item: (-item[1], -item[2]))
+    del run['opportunities'][TOP_OPPORTUNITIES:]
+    return run
+
+
+def page_path(run):
+    """Site path a run measured, from the requested URL so redirects do not split a page's history"""
+    url = run['requested_url'] or run['final_url'] or ''
+    return urlsplit(url).path.rstrip('/') or '/'
+
+
+class History:
+    """Columnar store of Lighthouse runs, one list per column.
+
+    Pages are stored once and referenced by index; metric columns hold None
+    for runs that did not produce the value. Runs are unique by page, form
+    factor and fetchTime.
+    """
+
+    COLUMNS = ('page', 'form_factor', 'fetch_time', 'file', 'error') + METRICS + ('opportunities',)
+
+    def __init__(self, path):
+        self.path = path
+        self.pages = []
+        self.columns = {column: [] for column in self.COLUMNS}
+        # Ingested report -> [mtime_ns, size]
+        self.files = {}
+        self._page_index = {}
+        self._keys = set()
+
+    @classmethod
+    def load(cls, path):
+        history = cls(path)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return history
+        if data.get('version') != HISTORY_VERSION:
+            return history
+        history.pages = data['pages']
+        history.columns.update(data['columns'])
+        history.files = data['files']
+        history._page_index = {page: index for index, page in enumerate(history.pages)}
+        history._keys = set(zip(history.columns['page'], history.columns['form_factor'],
+                                history.columns['fetch_time']))
+        return history
+
+    def __len__(self):
+        return len(self.columns['fetch_time'])
+
+    def add(self, run, file):
+        """Append a run; returns False if it is already in the history"""
+        page = page_path(run)
+        index = self._page_index.get(page)
+        if index is None:
+            index = self._page_index[page] = len(self.pages)
+            self.pages.append(page)
+        key = (index, run['form_factor'], run['fetch_time'])
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        row = dict(run, page=index, file=file)
+        for column, values in self.columns.items():
+            values.append(row[column])
+        return True
+
+    def save(self):
+        """Write the history sorted by fetchTime, atomically"""
+        order = sorted(range(len(self)), key=self.columns['fetch_time'].__getitem__)
+        columns = {column: [values[i] for i in order] for column, values in self.columns.items()}
+        data = {'version': HISTORY_VERSION, 'pages': self.pages, 'columns': columns, 'files': self.files}
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(data, separators=(',', ':')))
+        os.replace(tmp_path, self.path)
+
+    def series(self, metric):
+        """Metric column as a float array with NaN for missing values"""
+        return np.array([np.nan if value is None else value for value in self.columns[metric]], dtype=float)
+
+
+def ingest(paths, history_path=DEFAULT_HISTORY_PATH):
+    """Add the runs in the given report files to the history, skipping files already ingested"""
+    history = History.load(history_path)
+    history_file = os.path.abspath(history_path)
+    stats = {'files': 0, 'unchanged': 0, 'not_reports': 0, 'added': 0, 'duplicates': 0, 'failed_runs': 0}
+
+    for path in paths:
+        if os.path.abspath(path) == history_file:
+            continue
+        stats['files'] += 1
+        stat = os.stat(path)
+        signature = [stat.st_mtime_ns, stat.st_size]
+        key = os.path.relpath(os.path.abspath(path), ROOT_DIR)
+        if history.files.get(key) == signature:
+            stats['unchanged'] += 1
+            continue
+        try:
+            run = extract_run(path)
+        except ValueError as e:
+            print(f"⚠️  {key}: {e}")
+            continue
+        history.files[key] = signature
+        if run is None:
+            stats['not_reports'] += 1
+            continue
+        if history.add(run, key):
+            stats['added'] += 1
+            stats['failed_runs'] += run['error'] is not None
+        else:
+            stats['duplicates'] += 1
+
+    history.save()
+    stats['runs'] = len(history)
+    return stats
+
+
+def _format(metric, value):
+    if value is None:
+        return '-'
+    if metric in UNITS:
+        return f"{value:.0f}{UNITS[metric]}"
+    return f"{value:.3f}" if metric == 'cls' else f"{value * 100:.0f}"
+
+
+def rolling_baseline(values, window=BASELINE_RUNS):
+    """Median of up to `window` preceding values for every value after the first"""
+    padded = np.concatenate([np.full(window - 1, np.nan), values[:-1]])
+    # Sorting pushes the NaN padding to the end of each window, so the median sits at the middle of the valid part
+    windows = np.sort(np.lib.stride_tricks.sliding_window_view(padded, window), axis=1)
+    valid = np.minimum(np.arange(1, len(values)), window)
+    rows = np.arange(len(windows))
+    return (windows[rows, (valid - 1) // 2] + windows[rows, valid // 2]) / 2
+
+
+def report(history, page=None, form_factor=None, metrics=METRICS, threshold=DEFAULT_THRESHOLD):
+    """Latest value against baseline and regression events per page, form factor and metric.
+
+    Failed runs are left out. A run regresses a metric when it is worse than the
+    median of the previous BASELINE_RUNS runs by more than threshold (relative)
+    and by more than the metric's MIN_DELTA.
+    """
+    columns = history.columns
+    pages = np.array(columns['page'], dtype=np.int64)
+    factor_names, factors = np.unique([value or 'unknown' for value in columns['form_factor']], return_inverse=True)
+    failed = np.array([error is not None for error in columns['error']], dtype=bool)
+    ok = ~failed
+    if page is not None:
+        wanted = page.rstrip('/') or '/'
+        ok &= pages == (history.pages.index(wanted) if wanted in history.pages else -1)
+    if form_factor is not None:
+        ok &= factor_names[factors] == form_factor
+    series = {metric: history.series(metric) for metric in metrics}
+
+    # One stable sort groups the runs; rows are stored in fetchTime order, so each group stays chronological
+    selected = np.flatnonzero(ok)
+    keys = pages[selected] * len(factor_names) + factors[selected]
+    order = np.argsort(keys, kind='stable')
+    bounds = np.flatnonzero(np.diff(keys[order])) + 1
+    groups = []
+    for rows in np.split(selected[order], bounds) if len(selected) else []:
+        index, factor = int(pages[rows[0]]), str(factor_names[factors[rows[0]]])
+        group = {'page': history.pages[index], 'form_factor': factor, 'runs': len(rows),
+                 'first': columns['fetch_time'][rows[0]], 'last': columns['fetch_time'][rows[-1]],
+                 'metrics': {}}
+        for metric in metrics:
+            present = rows[~np.isnan(series[metric][rows])]
+            values = series[metric][present]
+            result = {'latest': None, 'baseline': None, 'change': None, 'regressions': []}
+            if len(values):
+                result['latest'] = float(values[-1])
+                if len(values) > 1:
+                    result['baseline'] = float(np.median(values[-1 - BASELINE_RUNS:-1]))
+                    result['change'] = result['latest'] - result['baseline']
+            if len(values) > 1:
+                baselines = rolling_baseline(values)
+                deltas = values[1:] - baselines
+                if metric not in HIGHER_IS_WORSE:
+                    deltas = -deltas
+                regressed = (deltas > MIN_DELTA[metric]) & (deltas > threshold * np.abs(baselines))
+                for i in np.flatnonzero(regressed):
+                    row = present[i + 1]
+                    result['regressions'].append({
+                        'fetch_time': columns['fetch_time'][row], 'file': columns['file'][row],
+                        'value': float(values[i + 1]), 'baseline': float(baselines[i]),
+                    })
+            group['metrics'][metric] = result
+        latest = rows[-1]
+        group['opportunities'] = columns['opportunities'][latest]
+        groups.append(group)
+
+    groups.sort(key=lambda group: (group['page'], group['form_factor']))
+    return {'runs': len(history), 'failed_runs': int(np.count_nonzero(failed)), 'threshold': threshold,
+            'groups': groups}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect Lighthouse runs into a history and report regressions")
+    parser.add_argument('--history', default=DEFAULT_HISTORY_PATH, help="history file (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = commands.add_parser('ingest', help="add Lighthouse JSON reports to the history")
+    ingest_parser.add_argument('paths', nargs='*',
+                               help=f"report files or directories (default: {DEFAULT_RESULTS_DIR})")
+
+    report_parser = commands.add_parser('report', help="show latest values, baselines and regressions")
+    report_parser.add_argument('--page', help="site path, e.g. /services")
+    report_parser.add_argument('--form-factor', choices=('mobile', 'desktop'))
+    report_parser.add_argument('--metric', choices=METRICS, action='append',
+                               help="metric to show, repeatable (default: all)")
+    report_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                               help="relative change counted as a regression (default: %(default)s)")
+    report_parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.command == 'ingest':
+        paths = []
+        for path in args.paths or [DEFAULT_RESULTS_DIR]:
+            if os.path.isdir(path):
+                paths.extend(sorted(glob.glob(os.path.join(path, '*.json'))))
+            else:
+                paths.append(path)
+        stats = ingest(paths, args.history)
+        print(f"📥 Read {stats['files'] - stats['unchanged']} of {stats['files']} file(s) "
+              f"in {time.perf_counter() - started:.2f}s ({stats['unchanged']} unchanged, "
+              f"{stats['not_reports']} not Lighthouse reports)")
+        print(f"   {stats['added']} run(s) added ({stats['failed_runs']} failed), "
+              f"{stats['duplicates']} already in history, {stats['runs']} total")
+        return 0
+
+    if not os.path.exists(args.history):
+        print(f"❌ No history at {args.history}, run ingest first")
+        return 1
+    history = History.load(args.history)
+    result = report(history, args.page, args.form_factor, tuple(args.metric or METRICS), args.threshold)
+    result['seconds'] = round(time.perf_counter() - started, 3)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"📈 {result['runs']} run(s) in history, {result['failed_runs']} failed and left out "
+          f"({result['seconds']:.3f}s)")
+    if not result['groups']:
+        print("No successful runs match")
+    for group in result['groups']:
+        print(f"\n=== {group['page']} [{group['form_factor']}] {group['runs']} run(s), "
+              f"{group['first']} to {group['last']} ===")
+        for metric, values in group['metrics'].items():
+            if values['latest'] is None:
+                continue
+            line = f"  {metric:<15} {_format(metric, values['latest']):>8}"
+            if values['baseline'] is not None:
+                line += f"  baseline {_format(metric, values['baseline']):>8}"
+            if values['regressions']:
+                line += f"  ⚠️  {len(values['regressions'])} regression(s)"
+            print(line)
+            for event in values['regressions']:
+                print(f"      {event['fetch_time']}  {_format(metric, event['value'])} "
+                      f"vs {_format(metric, event['baseline'])}  {event['file']}")
+        if group['opportunities']:
+            print("  top opportunities in the latest run:")
+            for audit_id, savings_ms, savings_bytes in group['opportunities']:
+                print(f"      {audit_id}: {savings_ms}ms, {savings_bytes // 1024}KiB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Internal-link graph of the site's pages: orphans, click depth and PageRank.
+
+Every .tsx file under src/pages is a node. A page links to:
+
+  - the literal href/to targets in its own source, including object-literal
+    { href: '/...' } entries such as breadcrumbs
+  - the literal targets of the components it imports, followed transitively
+    through src/components (Navigation, Footer, Breadcrumb, ...)
+  - the literal targets of the data modules (src/data) a page imports
+    directly, which is how Areas lists every suburb; shared components that
+    only render a slice of a data table are not expanded
+  - the links rendered by the internal-linking components in
+    src/components/seo (StrategicLocationLinks, SuburbClusterLinks,
+    StrategicServiceLinks, ...), which build /locations/ URLs from suburb
+    names at runtime. Their clusters and target tables are read from
+    ComprehensiveInternalLinking.tsx and expanded with the props each page
+    passes in
+
+Targets are resolved to pages through the App.tsx route table, the same way
+the consistency checker does (including DynamicLocationPage and the slugs in
+src/data/suburbData.ts). The graph is stored as NumPy CSR arrays (indptr,
+indices) over deduplicated edges, from which the analyzer computes in-degree,
+orphans (no inbound link from another page), the shortest click depth from
+'/', and PageRank by sparse power iteration.
+
+What each file links to is cached by path, mtime, size and content hash, so
+after editing one page only that file is re-read.
+
+Usage:
+    python3 link_graph.py [--root PROJECT] [--limit 20] [--json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+import consistency_checker
+import jsx_locator
+import page_index
+import source_cache
+from consistency_checker import normalise_url
+from source_cache import PAGES_MODULE_PREFIX, import_specifiers, page_files, resolve_import
+
+DAMPING = 0.85
+TOLERANCE = 1e-9
+MAX_ITERATIONS = 200
+
+LINKING_COMPONENTS_FILE = os.path.join('components', 'seo', 'ComprehensiveInternalLinking.tsx')
+# Modules whose links are modelled from their props instead of read literally
+MODELLED_MODULES = (
+    os.path.join('components', 'seo', 'ComprehensiveInternalLinking.tsx'),
+    os.path.join('components', 'seo', 'InternalLinking.tsx'),
+)
+
+# Linking component -> (fixed StrategicInternalLinks props, {own prop: StrategicInternalLinks prop})
+LINK_COMPONENTS = {
+    'StrategicInternalLinks': ({}, {name: name for name in (
+        'variant', 'currentLocation', 'currentService', 'showNearbySuburbs', 'showRelatedServices')}),
+    'StrategicLocationLinks': ({'variant': 'location', 'showNearbySuburbs': True, 'showRelatedServices': True},
+                               {'currentLocation': 'currentLocation'}),
+    'SuburbClusterLinks': ({'variant': 'location', 'showNearbySuburbs': True, 'showRelatedServices': False},
+                           {'currentSuburb': 'currentLocation'}),
+    'RelatedServices': ({'variant': 'location', 'showNearbySuburbs': False, 'showRelatedServices': True},
+                        {'location': 'currentLocation'}),
+    'StrategicServiceLinks': ({'variant': 'service'}, {'currentService': 'currentService'}),
+    'RelatedLocations': ({'variant': 'service'}, {'service': 'currentService'}),
+    'ServiceLocationLinks': ({'variant': 'service'}, {'service': 'currentService'}),
+    'HomePageStrategicLinks': ({'variant': 'homepage'}, {}),
+}
+
+# href="/x", to={'/x'} and { href: '/x' }; one pattern per literal prefix keeps the scan fast
+_LINKS = tuple(re.compile(prefix + rb'''(?:=|\s*:\s*)(?:"([^"]*)"|'([^']*)'|\{\s*["'`]([^"'`$}]*)["'`]\s*\})''')
+               for prefix in (rb'href', rb'to'))
+_LINK_COMPONENT_TAG = re.compile(rb'<(' + b'|'.join(name.encode('utf-8') for name in LINK_COMPONENTS) + rb')(?=[ \t\r\n/>])')
+_STRING = re.compile(rb'''["']([^"']*)["']''')
+
+
+def default_cache_path(src_dir):
+    """Return the link cache file used for a source tree"""
+    digest = hashlib.sha1(os.path.abspath(src_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(page_index.CACHE_DIR, f"link-graph-{digest}.json")
+
+
+def is_internal(url, host=consistency_checker.SITE_HOST):
+    """Return the normalised path of an internal link, or None"""
+    if not url or url.startswith(('#', 'tel:', 'mailto:', '//')):
+        return None
+    link_host, path = normalise_url(url)
+    if link_host is not None and link_host != host:
+        return None
+    if link_host is None and ':' in url.split('/', 1)[0]:
+        return None
+    return path if path.startswith('/') else None
+
+
+def extract_links(data):
+    """Return the link targets, import specifiers and linking-component props in a source file"""
+    links = set()
+    for pattern in _LINKS:
+        for match in pattern.finditer(data):
+            before = data[match.start() - 1:match.start()]
+            if before.isalnum() or before == b'_':
+                continue
+            links.add(next(group for group in match.groups() if group is not None).decode('utf-8'))
+
+    imports = import_specifiers(data)
+
+    components = []
+    for match in _LINK_COMPONENT_TAG.finditer(data):
+        fixed, renamed = LINK_COMPONENTS[match.group(1).decode('utf-8')]
+        props, _ = jsx_locator.parse_element(data, match.start())
+        model = dict(fixed)
+        model.update({target: props[prop] for prop, target in renamed.items() if prop in props})
+        components.append(model)
+
+    return {'links': sorted(links), 'imports': imports, 'components': components}
+
+
+class SourceCache(source_cache.SourceCache):
+    """source_cache.SourceCache with the link extractor and link-graph cache file as defaults"""
+
+    def __init__(self, src_dir, cache_path=None, extract=extract_links):
+        super().__init__(src_dir, cache_path or default_cache_path(src_dir), extract)
+
+
+def _strings(raw):
+    return [value.decode('utf-8') for value in _STRING.findall(raw)]
+
+
+def _block(data, name):
+    start = data.find(b'const ' + name)
+    if start == -1:
+        return b''
+    end = data.find(b'\n};', start)
+    return data[start:end if end != -1 else len(data)]
+
+
+def load_link_tables(path):
+    """Read the suburb clusters and target tables StrategicInternalLinks renders from"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    relevant = data[data.find(b'const getRelevantServices'):data.find(b'const getTargetLocations')]
+    fallback = relevant.rfind(b'return [')
+    location_kinds = re.findall(rb'const (\w+)Suburbs = \[([^\]]*)\]', relevant)
+    location_targets = {kind.decode('utf-8'): _strings(raw) for kind, raw in
+                        re.findall(rb'(\w+):\s*\[([^\]]*)\]', _block(data, b'LOCATION_SERVICE_TARGETS'))}
+    homepage = re.search(rb'\{\[([^\]]*)\]\.map\(\(location\)', data)
+
+    return {
+        'clusters': [_strings(raw) for raw in
+                     re.findall(rb'suburbs:\s*\[([^\]]*)\]', _block(data, b'MELBOURNE_CLUSTERS'))],
+        'service_targets': {
+            key.decode('utf-8'): (_strings(primary), _strings(secondary))
+            for key, primary, secondary in re.findall(
+                rb'''['"]([\w-]+)['"]:\s*\{\s*primary:\s*\[([^\]]*)\],\s*secondary:\s*\[([^\]]*)\]''',
+                _block(data, b'SERVICE_LOCATION_TARGETS'))},
+        'location_kinds': [(_strings(raw), location_targets.get(kind.decode('utf-8'), []))
+                           for kind, raw in location_kinds],
+        'default_services': _strings(relevant[fallback:relevant.find(b']', fallback)]) if fallback != -1 else [],
+        'services': {key.decode('utf-8'): path.decode('utf-8') for key, path in re.findall(
+            rb'''['"]([\w-]+)['"]:\s*\{[^}]*?path:\s*['"]([^'"]*)['"]''', _block(data, b'SERVICES'))},
+        'homepage_locations': _strings(homepage.group(1)) if homepage else [],
+    }
+
+
+def location_href(name):
+    """The URL StrategicInternalLinks builds for a suburb name"""
+    return '/locations/' + '-'.join(name.lower().split())
+
+
+def strategic_links(tables, props):
+    """Mirror StrategicInternalLinks: the internal URLs it renders for the given props"""
+    variant = props.get('variant', 'location')
+    location = props.get('currentLocation')
+    service = props.get('currentService')
+    location = location if isinstance(location, str) else None
+    service = service if isinstance(service, str) else None
+    services = tables['services']
+
+    if variant == 'homepage':
+        return list(services.values())[:5] + [location_href(name) for name in tables['homepage_locations']] + ['/areas']
+
+    if variant == 'service':
+        links = ['/areas']
+        targets = tables['service_targets'].get(service.replace('/services/', '')) if service else None
+        if targets:
+            links.extend(location_href(name) for name in targets[0][:8] + targets[1][:4])
+        return links
+
+    links = []
+    if location and props.get('showRelatedServices', True) is not False:
+        relevant = next((targets for suburbs, targets in tables['location_kinds'] if location in suburbs),
+                        tables['default_services'])
+        links.extend(services[key] for key in relevant[:4] if key in services)
+    if location and props.get('showNearbySuburbs', True) is not False:
+        nearby = next(([name for name in cluster if name != location][:6]
+                       for cluster in tables['clusters'] if location in cluster), [])
+        if nearby:
+            links.extend(location_href(name) for name in nearby)
+            links.append('/areas')
+    return links
+
+
+class LinkGraph:
+    """Directed page graph in CSR form: page i links to indices[indptr[i]:indptr[i + 1]]"""
+
+    def __init__(self, nodes, indptr, indices, root=None, broken=None):
+        self.nodes = nodes
+        self.root = root
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.indptr = indptr
+        self.indices = indices
+        self.broken = broken or {}
+
+    @classmethod
+    def from_edges(cls, nodes, sources, targets, root=None, broken=None):
+        """Build the CSR arrays from parallel edge lists, dropping self-links and repeats"""
+        n = len(nodes)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        keep = sources != targets
+        keys = np.unique(sources[keep] * n + targets[keep])
+        sources, targets = np.divmod(keys, n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+        return cls(nodes, indptr, targets.astype(np.int32), root, broken)
+
+    @property
+    def edge_count(self):
+        return int(self.indptr[-1])
+
+    def out_degree(self):
+        return np.diff(self.indptr)
+
+    def in_degree(self):
+        return np.bincount(self.indices, minlength=len(self.nodes))
+
+    def click_depth(self, root):
+        """Shortest number of clicks from root to every page, -1 when unreachable"""
+        depth = np.full(len(self.nodes), -1, dtype=np.int32)
+        depth[root] = 0
+        frontier = np.array([root], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            level += 1
+            starts = self.indptr[frontier]
+            lengths = self.indptr[frontier + 1] - starts
+            total = int(lengths.sum())
+            if not total:
+                break
+            # Gather every frontier page's adjacency slice in one indexing operation
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+            neighbours = np.unique(self.indices[offsets])
+            frontier = neighbours[depth[neighbours] < 0]
+            depth[frontier] = level
+        return depth
+
+    def pagerank(self, damping=DAMPING, tolerance=TOLERANCE, max_iterations=MAX_ITERATIONS):
+        """Return (ranks, iterations) by power iteration over the CSR edges.
+
+        Pages without outgoing links spread their rank evenly over all pages.
+        """
+        n = len(self.nodes)
+        out_degree = self.out_degree()
+        sources = np.repeat(np.arange(n), out_degree)
+        weights = 1.0 / out_degree[sources]
+        dangling = out_degree == 0
+        ranks = np.full(n, 1.0 / n)
+        for iteration in range(1, max_iterations + 1):
+            spread = np.bincount(self.indices, weights=ranks[sources] * weights, minlength=n)
+            updated = (1.0 - damping) / n + damping * (spread + ranks[dangling].sum() / n)
+            delta = np.abs(updated - ranks).sum()
+            ranks = updated
+            if delta < tolerance:
+                break
+        return ranks, iteration
+
+
+def build_graph(root, host=consistency_checker.SITE_HOST, cache_path=None):
+    """Walk the project's pages and their components into a LinkGraph.
+
+    Returns (graph, stats) where stats counts the files parsed this run.
+    """
+    src_dir = os.path.join(root, 'src')
+    pages_dir = os.path.join(src_dir, 'pages')
+    nodes = page_files(pages_dir)
+    routes = consistency_checker.load_routes(os.path.join(src_dir, 'App.tsx'))
+    suburb_slugs = consistency_checker.load_suburb_slugs(os.path.join(src_dir, 'data', 'suburbData.ts'))
+    locations = {os.path.basename(node): {'stem': os.path.basename(node)[:-4]}
+                 for node in nodes if node.startswith('locations' + os.sep)}
+    resolver = consistency_checker.Checker(locations, routes, suburb_slugs, [], host)
+    tables = load_link_tables(os.path.join(src_dir, LINKING_COMPONENTS_FILE))
+    sources = SourceCache(src_dir, cache_path)
+
+    closures = {}
+
+    def component_links(relpath, stack):
+        """Literal links of a component and everything it imports"""
+        if relpath in closures:
+            return closures[relpath]
+        if relpath in stack or relpath in MODELLED_MODULES:
+            return ()
+        stack.add(relpath)
+        entry = sources.get(relpath)
+        links = set(entry['links'])
+        for spec in entry['imports']:
+            target = resolve_import(src_dir, os.path.dirname(relpath), spec)
+            if target and target.startswith('components' + os.sep):
+                links.update(component_links(target, stack))
+        stack.discard(relpath)
+        closures[relpath] = frozenset(links)
+        return closures[relpath]
+
+    def page_links(relpath):
+        entry = sources.get(relpath)
+        links = set(entry['links'])
+        for spec in entry['imports']:
+            target = resolve_import(src_dir, os.path.dirname(relpath), spec)
+            if target is None:
+                continue
+            if target.startswith('components' + os.sep):
+                links.update(component_links(target, set()))
+            elif target.startswith('data' + os.sep):
+                links.update(sources.get(target)['links'])
+        if tables:
+            for props in entry['components']:
+                links.update(strategic_links(tables, props))
+        return links
+
+    index = {node: i for i, node in enumerate(nodes)}
+    resolved = {}
+
+    def page_for(path):
+        """Index of the page that serves path, or None"""
+        if path not in resolved:
+            target = resolver.resolve(path)
+            if target in resolver.stems:
+                relpath = os.path.join('locations', target + '.tsx')
+            else:
+                module = routes['modules'].get(target, '')
+                relpath = module[len(PAGES_MODULE_PREFIX):] + '.tsx' if module.startswith(PAGES_MODULE_PREFIX) else None
+            resolved[path] = index.get(relpath)
+        return resolved[path]
+
+    # url -> (path, page index) for internal links, None for external ones
+    link_targets = {}
+    edge_sources = []
+    edge_targets = []
+    broken = {}
+    for i, node in enumerate(nodes):
+        for url in page_links(os.path.join('pages', node)):
+            if url not in link_targets:
+                path = is_internal(url, host)
+                link_targets[url] = None if path is None else (path, page_for(path))
+            if link_targets[url] is None:
+                continue
+            path, target = link_targets[url]
+            if target is None:
+                broken.setdefault(path, []).append(node)
+            else:
+                edge_sources.append(i)
+                edge_targets.append(target)
+
+    sources.save()
+    graph = LinkGraph.from_edges(nodes, edge_sources, edge_targets, page_for('/'), broken)
+    return graph, {'parsed': sources.parsed, 'files': len(sources.seen), 'modelled': tables is not None}
+
+
+def analyse(graph, damping=DAMPING):
+    """Compute the per-page metrics and the report summary"""
+    in_degree = graph.in_degree()
+    out_degree = graph.out_degree()
+    depth = graph.click_depth(graph.root) if graph.root is not None else np.full(len(graph.nodes), -1)
+    ranks, iterations = graph.pagerank(damping)
+    pages = [{'page': node, 'in': int(in_degree[i]), 'out': int(out_degree[i]),
+              'depth': int(depth[i]), 'pagerank': float(ranks[i])}
+             for i, node in enumerate(graph.nodes)]
+    return {
+        'pages': pages,
+        'orphans': [page['page'] for page in pages if page['in'] == 0 and page['depth'] != 0],
+        'unreachable': [page['page'] for page in pages if page['depth'] < 0],
+        'depths': {str(level): int(count) for level, count in zip(*np.unique(depth[depth >= 0], return_counts=True))},
+        'iterations': iterations,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse the internal-link graph of the site's pages")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--host', default=consistency_checker.SITE_HOST,
+                        help=f"site host whose absolute URLs count as internal (default: {consistency_checker.SITE_HOST})")
+    parser.add_argument('--damping', type=float, default=DAMPING, help="PageRank damping factor (default: %(default)s)")
+    parser.add_argument('--limit', type=int, default=20, help="pages listed per section, 0 for all (default: 20)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    graph, stats = build_graph(os.path.abspath(args.root), args.host)
+    report = analyse(graph, args.damping)
+    elapsed = time.perf_counter() - started
+    broken = {path: sorted(pages) for path, pages in sorted(graph.broken.items())}
+
+    if args.json:
+        print(json.dumps(dict(report, broken=broken, edges=graph.edge_count, seconds=round(elapsed, 3)), indent=2))
+        return 0
+
+    def shown(items):
+        return items if args.limit == 0 else items[:args.limit]
+
+    print(f"🔗 {len(graph.nodes)} pages, {graph.edge_count} links "
+          f"({stats['parsed']} of {stats['files']} files re-read) in {elapsed:.3f}s")
+    if not stats['modelled']:
+        print(f"⚠️  {LINKING_COMPONENTS_FILE} not found, internal-linking components not expanded")
+
+    location_pages = [page for page in report['pages'] if page['page'].startswith('locations' + os.sep)]
+    print("\nClick depth from /: " + ', '.join(f"{level}: {count}" for level, count in report['depths'].items()))
+    print(f"\n{len(report['orphans'])} orphan page(s) with no inbound links"
+          f" ({sum(1 for page in location_pages if page['in'] == 0)} location pages):")
+    for page in shown(report['orphans']):
+        print(f"  {page}")
+    print(f"\n{len(report['unreachable'])} page(s) unreachable from /")
+
+    # PageRank scaled by the page count, so 1.0 is an average page
+    print(f"\nLowest PageRank location pages, 1.0 = average ({report['iterations']} iterations):")
+    for page in shown(sorted(location_pages, key=lambda page: page['pagerank'])):
+        print(f"  {page['pagerank'] * len(graph.nodes):.3f}  {page['page']} (in {page['in']}, depth {page['depth']})")
+
+    print(f"\n{len(broken)} internal link target(s) that no page serves:")
+    for path, pages in shown(list(broken.items())):
+        print(f"  {path}  linked from {len(pages)} page(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Fetch every sitemap and canonical URL from a running build and check what it serves.
+
+URLs come from public/sitemap*.xml (page entries only; sitemap indexes and
+image sitemaps are skipped) and from the canonical props of the location
+and top-level pages. Each URL's path is requested from --base-url, or from a
+built-in static server over dist/ that falls back to index.html the way the
+vercel.json rewrite does. For every URL the verifier records:
+
+  - the status, following same-origin redirects up to MAX_REDIRECTS hops
+  - the <link rel="canonical"> and <title> in the served HTML
+  - the time to the full response
+
+and reports URLs that do not end in a 200, redirects, served canonicals
+that differ from the URL (or are missing), missing and shared titles, and
+latency percentiles. The SPA sets canonicals and titles at runtime through
+react-helmet-async, so against a plain build every page serves the shell's
+title and no canonical; that shows up as one shared title and missing
+canonicals rather than as per-page mismatches.
+
+Requests go through a fixed pool of --concurrency keep-alive connections,
+each owned by one asyncio worker pulling from a shared queue, using only
+asyncio streams from the standard library.
+
+Usage:
+    python3 link_verifier.py [--base-url http://localhost:4173] [--concurrency 32] [--json]
+"""
+
+import argparse
+import asyncio
+import functools
+import html
+import http.server
+import json
+import os
+import re
+import ssl
+import sys
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+import consistency_checker
+import page_index
+from consistency_checker import SITE_HOST, normalise_url
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_TIMEOUT = 10.0
+MAX_REDIRECTS = 5
+# Larger bodies are read to keep the connection usable but not searched past this point
+MAX_HEAD_BYTES = 256 * 1024
+USER_AGENT = 'mould-restoration-link-verifier/1.0'
+PERCENTILES = (50, 90, 99)
+
+_TITLE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_LINK_TAG = re.compile(rb'<link\s[^>]*>', re.IGNORECASE)
+_REL_CANONICAL = re.compile(rb'''\brel\s*=\s*["']?canonical\b''', re.IGNORECASE)
+_HREF = re.compile(rb'''\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.IGNORECASE)
+
+
+def collect_urls(root):
+    """Return {url: [source, ...]} for every page URL in the sitemaps and the page canonicals"""
+    urls = {}
+    for sitemap in consistency_checker.load_sitemaps(os.path.join(root, 'public')):
+        if sitemap['index'] or sitemap['images']:
+            continue
+        for loc in sitemap['locs']:
+            urls.setdefault(loc, []).append(sitemap['file'])
+
+    pages_dir = os.path.join(root, 'src', 'pages')
+    for directory in (pages_dir, os.path.join(pages_dir, 'locations')):
+        for filename, entry in sorted(page_index.scan_pages(directory).items()):
+            canonical = entry['urls'].get('canonical') or entry['urls'].get('canonicalUrl')
+            if canonical:
+                source = os.path.relpath(os.path.join(directory, filename), pages_dir)
+                urls.setdefault(canonical, []).append(f"canonical in {source}")
+    return urls
+
+
+def parse_head(body):
+    """Return (title, canonical) from an HTML document, either None if absent"""
+    head = body[:MAX_HEAD_BYTES]
+    match = _TITLE.search(head)
+    title = html.unescape(match.group(1).decode('utf-8', 'replace')).strip() if match else None
+    canonical = None
+    for tag in _LINK_TAG.finditer(head):
+        if _REL_CANONICAL.search(tag.group()):
+            href = _HREF.search(tag.group())
+            if href:
+                value = next(group for group in href.groups() if group is not None)
+                canonical = html.unescape(value.decode('utf-8', 'replace'))
+            break
+    return title, canonical
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection to an origin"""
+
+    def __init__(self, scheme, host, port, timeout):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.opened = 0
+
+    async def _open(self):
+        context = ssl.create_default_context() if self.scheme == 'https' else None
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=context)
+        self.opened += 1
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    @classmethod
+    def for_url(cls, url, timeout=DEFAULT_TIMEOUT):
+        """A connection to the origin of url"""
+        split = urlsplit(url)
+        return cls(split.scheme, split.hostname, split.port or (443 if split.scheme == 'https' else 80), timeout)
+
+    async def get(self, target):
+        """GET target and return (status, headers, body)"""
+        return await self.request('GET', target, headers={'Accept': 'text/html'})
+
+    async def request(self, method, target, body=b'', headers=None):
+        """Send one request and return (status, headers, body); reconnects once if a kept-alive socket was dropped"""
+        for attempt in (0, 1):
+            reused = self.writer is not None
+            if not reused:
+                await self._open()
+            try:
+                return await asyncio.wait_for(self._exchange(method, target, body, headers or {}), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                self.close()
+                if not reused or attempt:
+                    raise
+            except BaseException:
+                self.close()
+                raise
+
+    async def _exchange(self, method, target, body, headers):
+        host_header = self.host if self.port in (80, 443) else f"{self.host}:{self.port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", f"User-Agent: {USER_AGENT}",
+                 "Accept-Encoding: identity", "Connection: keep-alive"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        if body or method not in ('GET', 'HEAD'):
+            lines.append(f"Content-Length: {len(body)}")
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        version, status = lines[0].split(' ', 2)[:2]
+        response = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                response[name.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in ('204', '304'):
+            content = b''
+        elif response.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if not size:
+                    # Trailers end with an empty line
+                    while await self.reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readexactly(2)
+            content = b''.join(chunks)
+        elif 'content-length' in response:
+            content = await self.reader.readexactly(int(response['content-length']))
+        else:
+            content = await self.reader.read()
+            self.close()
+
+        if version == 'HTTP/1.0' or response.get('connection', '').lower() == 'close':
+            self.close()
+        return int(status), response, content
+
+
+async def check_url(connection, base, url):
+    """Fetch one URL's path from base, following same-origin redirects"""
+    host, path = normalise_url(url)
+    split = urlsplit(url)
+    target = (split.path or '/') + (f"?{split.query}" if split.query else '')
+    result = {'url': url, 'path': path, 'host': host, 'status': None, 'redirects': [], 'title': None,
+              'canonical': None, 'seconds': None, 'error': None}
+    started = time.perf_counter()
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, headers, body = await connection.get(target)
+            result['status'] = status
+            if status in (301, 302, 303, 307, 308) and 'location' in headers:
+                location = urljoin(base + target, headers['location'])
+                result['redirects'].append([status, location])
+                if not location.startswith(base):
+                    break
+                target = location[len(base):] or '/'
+                continue
+            if 'html' in headers.get('content-type', 'text/html'):
+                result['title'], result['canonical'] = parse_head(body)
+            break
+    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as error:
+        result['error'] = f"{type(error).__name__}: {error}".rstrip(': ')
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+async def verify(urls, base_url, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT):
+    """Check every URL through a pool of concurrency keep-alive connections; returns the results in input order"""
+    split = urlsplit(base_url)
+    base = f"{split.scheme}://{split.netloc}"
+    queue = asyncio.Queue()
+    for index, url in enumerate(urls):
+        queue.put_nowait((index, url))
+    results = [None] * len(urls)
+    connections = []
+
+    async def worker():
+        connection = Connection.for_url(base_url, timeout)
+        connections.append(connection)
+        try:
+            while not queue.empty():
+                index, url = queue.get_nowait()
+                results[index] = await check_url(connection, base, url)
+        finally:
+            connection.close()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(urls))))))
+    return results, sum(connection.opened for connection in connections)
+
+
+class _SpaHandler(http.server.SimpleHTTPRequestHandler):
+    """Static files from dist/, index.html for everything else (the vercel.json rewrite)"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.path = '/index.html'
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs when the whole pool connects at once, costing a 1s retransmit each
+    request_queue_size = 256
+
+
+def serve(directory):
+    """Start a background SPA static server on a free local port; returns (server, base URL)"""
+    handler = functools.partial(_SpaHandler, directory=directory)
+    server = _Server(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def analyse(results, sources, host=SITE_HOST):
+    """Group the fetch results into the report sections"""
+    report = {'failed': [], 'redirected': [], 'canonical_mismatch': [], 'canonical_missing': [],
+              'title_missing': [], 'shared_titles': [], 'latency': {}}
+    titles = {}
+    for result in results:
+        where = sources[result['url']]
+        if result['error'] or result['status'] != 200:
+            report['failed'].append({'url': result['url'], 'status': result['status'], 'error': result['error'],
+                                     'sources': where})
+            continue
+        if result['redirects']:
+            report['redirected'].append({'url': result['url'], 'chain': result['redirects'], 'sources': where})
+        if result['canonical'] is None:
+            report['canonical_missing'].append(result['url'])
+        else:
+            # After a redirect the page served is the final hop's, so that is what its canonical should name
+            expected = normalise_url(result['redirects'][-1][1])[1] if result['redirects'] else result['path']
+            canonical_host, canonical_path = normalise_url(result['canonical'])
+            if canonical_path != expected or (canonical_host or host) != host:
+                report['canonical_mismatch'].append({'url': result['url'], 'canonical': result['canonical'],
+                                                     'sources': where})
+        if not result['title']:
+            report['title_missing'].append(result['url'])
+        else:
+            titles.setdefault(result['title'], []).append(result['url'])
+
+    report['shared_titles'] = sorted(({'title': title, 'urls': urls} for title, urls in titles.items() if len(urls) > 1),
+                                     key=lambda group: -len(group['urls']))
+    seconds = sorted(result['seconds'] for result in results)
+    report['latency'] = {f"p{percent}": round(percentile(seconds, percent) * 1000, 2) for percent in PERCENTILES
+                         if seconds}
+    if seconds:
+        report['latency']['max'] = round(seconds[-1] * 1000, 2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch every sitemap and canonical URL and check status, canonical and title")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--base-url', help="server to check against (default: serve <root>/dist locally)")
+    parser.add_argument('--dist', help="build directory to serve when no --base-url is given (default: <root>/dist)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help="connections kept open at once (default: %(default)s)")
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="seconds per request (default: %(default)s)")
+    parser.add_argument('--limit', type=int, default=10, help="URLs listed per section, 0 for all (default: 10)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 when any URL fails")
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    sources = collect_urls(root)
+    urls = sorted(sources)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        dist = os.path.abspath(args.dist or os.path.join(root, 'dist'))
+        if not os.path.isfile(os.path.join(dist, 'index.html')):
+            print(f"❌ No build at {dist}, run `npm run build` or pass --base-url")
+            return 1
+        server, base_url = serve(dist)
+    base_url = base_url.rstrip('/')
+
+    started = time.perf_counter()
+    results, connections = asyncio.run(verify(urls, base_url, args.concurrency, args.timeout))
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.shutdown()
+    report = analyse(results, sources)
+    report.update({'base_url': base_url, 'urls': len(urls), 'connections': connections, 'seconds': round(elapsed, 3)})
+
+    if args.json:
+        report['results'] = results
+        print(json.dumps(report, indent=2))
+        return 1 if args.strict and report['failed'] else 0
+
+    def shown(items):
+        return items if args.limit == 0 else items[:args.limit]
+
+    latency = ', '.join(f"{name} {value}ms" for name, value in report['latency'].items())
+    print(f"🌐 Checked {len(urls)} URLs against {base_url} in {elapsed:.3f}s "
+          f"({len(urls) / elapsed if elapsed else 0:.0f}/s over {connections} connections)")
+    print(f"   latency {latency}")
+
+    print(f"\n{len(report['failed'])} URL(s) did not return 200:")
+    for item in shown(report['failed']):
+        print(f"  {item['status'] or item['error']}  {item['url']}  [{', '.join(item['sources'])}]")
+    print(f"\n{len(report['redirected'])} URL(s) redirect:")
+    for item in shown(report['redirected']):
+        chain = ' -> '.join(f"{status} {location}" for status, location in item['chain'])
+        print(f"  {item['url']}  {chain}")
+    print(f"\n{len(report['canonical_mismatch'])} URL(s) serve a canonical for a different URL:")
+    for item in shown(report['canonical_mismatch']):
+        print(f"  {item['url']}  -> {item['canonical']}  [{', '.join(item['sources'])}]")
+    print(f"\n{len(report['canonical_missing'])} URL(s) serve no <link rel=\"canonical\"> in their HTML")
+    print(f"{len(report['title_missing'])} URL(s) serve no <title>")
+    for group in shown(report['shared_titles']):
+        print(f"{len(group['urls'])} URL(s) share the title: {group['title'][:90]}")
+    return 1 if args.strict and report['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,784 @@
+#!/usr/bin/env python3
+"""
+Render location pages from one template and a data record per suburb.
+
+location_pages.json holds the services a suburb can have a page for, the
+default copy (format strings over {name}, {postcode}, {region},
+{service_label}, ...) and one record per suburb overriding whatever is
+specific to it: title, description, area_served, local paragraphs, issues.
+Every record is expanded into one page per service and rendered through
+templates/location_page.tsx.tmpl.
+
+Template syntax, chosen so it cannot collide with JSX braces:
+    @@{field}             value escaped for JSX text
+    @@{field|attr}        quoted JSX attribute value
+    @@{field|json}        JSON literal, e.g. inside areaServed={...}
+    @@{field|raw}         value as is
+    @@for item in field   repeat the lines up to @@end, with @@{item.key}
+    @@if field            keep the lines up to @@end when field is truthy
+
+The page URL is computed once per page, through the same page_transforms
+path scheme the canonicals tool and the sitemap use (a service may name its
+own), and fed to the canonical, pageUrl and serviceUrl props alike, so they
+cannot drift apart; records may not override it.
+
+Rendering runs in a process pool. Each rendered page is hashed and compared
+with the sha1 the shared page index holds for the file on disk, so
+unchanged pages are neither read nor written, and the pages that did change
+are committed together through batch_rewriter. Generated files start with a
+marker comment. A hand-written page is only replaced with --adopt. Adopting
+first fills the fields its record lacks from the page (SEO props and, where
+the page is laid out like the template, its heading, intro, highlights,
+local paragraphs, issues, process steps and call to action), then replaces
+the page only if every piece of its copy is in the render, so adopting never
+loses copy the records do not hold; --force replaces it regardless and
+reports how much copy each such page lost. import fills the same fields for
+every page, so the records can be reviewed before anything is adopted.
+
+Usage:
+    python3 location_page_generator.py render [--site-url URL] [--path SCHEME] [--dry-run [--diff]] [--adopt [--force]] [NAME ...]
+    python3 location_page_generator.py import    # add or fill records from the existing pages
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import batch_rewriter
+import instrumentation
+import jsx_locator
+import page_index
+import suburb_catalog
+from consistency_checker import dynamic_component_name, load_suburb_slugs
+from page_transforms import LOCATION_PATH, SITE_URL, slug_path
+from slug_registry import SlugRegistry
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'location_pages.json')
+DATA_VERSION = 1
+
+GENERATED_MARKER = '// @generated by scripts/utilities/location_page_generator.py'
+
+# Derived per page; a record overriding one would reintroduce URL drift
+RESERVED_FIELDS = ('path', 'url', 'component', 'service', 'service_label', 'service_phrase')
+
+# Record fields that are not page copy
+RECORD_FIELDS = ('name', 'slug', 'postcode', 'region', 'area_served', 'services', 'by_service')
+
+# Copy a page laid out like the template holds per suburb, read back from hand-written pages
+CONTENT_FIELDS = ('heading', 'intro', 'highlights', 'local', 'issues', 'process', 'cta')
+
+_PLACEHOLDER = re.compile(r'@@\{([\w.]+)(?:\|(\w+))?\}')
+_DIRECTIVE = re.compile(r'^[ \t]*@@(for|if|end)\b[ \t]*(.*?)\s*$')
+_FOR = re.compile(r'(\w+)\s+in\s+([\w.]+)$')
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*$')
+
+# A JSX tag, {/* comment */} or {expression}; attributes may hold strings and one level of nested braces
+_JSX_TOKEN = re.compile(r'''<(/?)([A-Za-z][\w.]*)((?:[^>"'{]|"[^"]*"|'[^']*'|\{(?:[^{}]|\{[^{}]*\})*\})*?)(/?)>'''
+                        r'''|\{/\*.*?\*/\}|\{((?:[^{}]|\{[^{}]*\})*)\}''', re.DOTALL)
+_STRING_EXPRESSION = re.compile(r'''\s*(["'])(.*)\1\s*$''', re.DOTALL)
+# JSX text, and string literals with the attribute they are the value of
+_COPY = re.compile(rb'''>([^<>{}]+)(?=[<{])|(?:(\w+)=)?(["'])((?:(?!\3)[^\\\n]|\\.)*)\3''')
+
+_JSX_TEXT = str.maketrans({'{': '&#123;', '}': '&#125;', '<': '&lt;', '>': '&gt;'})
+
+SUBURBS = SlugRegistry()
+
+
+class TemplateError(Exception):
+    """Raised for a malformed template or a page it cannot render"""
+
+
+def jsx_text(value):
+    """Escape a value for use as JSX children"""
+    return str(value).translate(_JSX_TEXT)
+
+
+def jsx_attr(value):
+    """A quoted JSX attribute value, or a string expression when quotes would break it"""
+    value = str(value)
+    if '"' in value or '\n' in value:
+        return '{' + json.dumps(value, ensure_ascii=False) + '}'
+    return f'"{value}"'
+
+
+def json_literal(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+FILTERS = {'text': jsx_text, 'attr': jsx_attr, 'json': json_literal, 'raw': str}
+
+
+def compile_template(source):
+    """Compile template source into a node list.
+
+    Nodes are ['text', [(literal, field_path, filter)], tail],
+    ('for', name, field_path, body) and ('if', field_path, body); runs of
+    lines without directives are merged into one text node.
+    """
+    root = []
+    stack = [(root, None, 0)]
+    for number, line in enumerate(source.splitlines(keepends=True), 1):
+        body = stack[-1][0]
+        directive = _DIRECTIVE.match(line)
+        if directive is None:
+            if not body or body[-1][0] != 'text':
+                body.append(['text', [], ''])
+            node = body[-1]
+            pos = 0
+            for match in _PLACEHOLDER.finditer(line):
+                name = match.group(2) or 'text'
+                if name not in FILTERS:
+                    raise TemplateError(f"line {number}: unknown filter {name!r}")
+                node[1].append((node[2] + line[pos:match.start()], match.group(1).split('.'), FILTERS[name]))
+                node[2] = ''
+                pos = match.end()
+            node[2] += line[pos:]
+            continue
+
+        kind, argument = directive.groups()
+        if kind == 'end':
+            if len(stack) == 1:
+                raise TemplateError(f"line {number}: @@end without @@for or @@if")
+            stack.pop()
+            continue
+        if kind == 'for':
+            loop = _FOR.match(argument)
+            if loop is None:
+                raise TemplateError(f"line {number}: expected '@@for NAME in FIELD'")
+            node = ('for', loop.group(1), loop.group(2).split('.'), [])
+        else:
+            if not re.fullmatch(r'[\w.]+', argument):
+                raise TemplateError(f"line {number}: expected '@@if FIELD'")
+            node = ('if', argument.split('.'), [])
+        body.append(node)
+        stack.append((node[-1], kind, number))
+
+    if len(stack) > 1:
+        _, kind, number = stack[-1]
+        raise TemplateError(f"line {number}: @@{kind} is never closed")
+    return root
+
+
+def _lookup(context, path):
+    value = context
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, TypeError):
+            raise TemplateError(f"no value for {'.'.join(path)}") from None
+    return value
+
+
+def _render(nodes, context, out):
+    for node in nodes:
+        kind = node[0]
+        if kind == 'text':
+            for literal, path, apply in node[1]:
+                out.append(literal)
+                out.append(apply(_lookup(context, path)))
+            out.append(node[2])
+        elif kind == 'for':
+            _, name, path, body = node
+            for item in _lookup(context, path):
+                _render(body, {**context, name: item}, out)
+        elif _lookup(context, node[1]):
+            _render(node[2], context, out)
+
+
+def render_page(template, context, header=''):
+    """Render one page's context to bytes"""
+    out = [header]
+    _render(template, context, out)
+    return ''.join(out).encode('utf-8')
+
+
+def load_data(path=DATA_PATH):
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('version') != DATA_VERSION:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}")
+    return data
+
+
+def save_data(data, path=DATA_PATH):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def _fill(value, fields):
+    """Fill {field} references in copy, recursing into lists and objects"""
+    if isinstance(value, str):
+        return value.format_map(fields)
+    if isinstance(value, list):
+        return [_fill(item, fields) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, fields) for key, item in value.items()}
+    return value
+
+
+def suburb_fields(record, catalog, k=suburb_catalog.DEFAULT_NEIGHBOURS):
+    """The per-suburb fields every page of a record shares"""
+    name = record['name']
+    camel = SUBURBS.from_display(name)
+    row = catalog.row(camel) if camel in catalog else {}
+    slug = record.get('slug') or SUBURBS.to_kebab(camel)
+    if 'area_served' in record:
+        area_served = record['area_served']
+    elif camel in catalog:
+        area_served = SUBURBS.bulk_to_display(catalog.area_served(camel, k))
+    else:
+        area_served = [name]
+    fields = {
+        'name': name,
+        'slug': slug,
+        'suburb_component': dynamic_component_name(slug),
+        'area_served': area_served,
+        'area_served_text': ', '.join(area_served),
+    }
+    for column in ('postcode', 'region'):
+        if record.get(column) or row.get(column):
+            fields[column] = record.get(column) or row[column]
+    return fields
+
+
+def build_pages(data, catalog, names=None, k=suburb_catalog.DEFAULT_NEIGHBOURS, site_url=SITE_URL, path=LOCATION_PATH):
+    """Expand the suburb records into page contexts, one per suburb and service.
+
+    A service without a path of its own is published under path, the
+    location scheme of the site.
+
+    Returns (pages, problems) where pages is [(filename, context)] and
+    problems lists the records that could not be expanded.
+    """
+    services = {service['key']: service for service in data['services']}
+    defaults = data['defaults']
+    pages = []
+    problems = []
+    seen = {}
+    for record in data['suburbs']:
+        if names and record['name'] not in names:
+            continue
+        reserved = sorted(set(record) & set(RESERVED_FIELDS))
+        if reserved:
+            problems.append(f"{record['name']}: {', '.join(reserved)} cannot be overridden")
+            continue
+        base = suburb_fields(record, catalog, k)
+        for key in record.get('services') or list(services):
+            if key not in services:
+                problems.append(f"{record['name']}: unknown service {key!r}")
+                continue
+            service = services[key]
+            fields = dict(base, service=key, service_label=service['label'], service_phrase=service['phrase'])
+            try:
+                fields['path'] = slug_path(fields['slug'], service.get('path', path), fields)
+                fields['component'] = service['component'].format_map(fields)
+                copy = {**defaults,
+                        **{field: value for field, value in record.items() if field not in RECORD_FIELDS},
+                        **record.get('by_service', {}).get(key, {})}
+                context = dict(fields, **_fill(copy, fields))
+            except KeyError as error:
+                problems.append(f"{record['name']} ({key}): no value for {{{error.args[0]}}}")
+                continue
+            except (ValueError, IndexError) as error:
+                problems.append(f"{record['name']} ({key}): {error}")
+                continue
+            if not _IDENTIFIER.match(context['component']):
+                problems.append(f"{record['name']} ({key}): {context['component']!r} is not a component name")
+                continue
+            context['url'] = site_url + context['path']
+            for number, step in enumerate(context.get('process', ()), 1):
+                step['number'] = number
+
+            filename = context['component'] + '.tsx'
+            for claimed in (filename, context['url']):
+                if claimed in seen:
+                    problems.append(f"{record['name']} ({key}): {claimed} is also generated for {seen[claimed]}")
+                    break
+                seen[claimed] = f"{record['name']} ({key})"
+            else:
+                pages.append((filename, context))
+    return pages, problems
+
+
+_template = None
+_header = ''
+
+
+def _init_worker(template_source, header):
+    global _template, _header
+    _template = compile_template(template_source)
+    _header = header
+
+
+def _copy(content):
+    """The pieces of copy in page source, whitespace collapsed: JSX text and strings with a space in them"""
+    copy = []
+    for match in _COPY.finditer(content):
+        text = match.group(1)
+        if text is None:
+            text = match.group(4)
+            if match.group(2) == b'className' or not any(char in text for char in b' \t'):
+                continue
+        text = b' '.join(text.split()).decode('utf-8', 'replace')
+        if any(char.isalpha() for char in text):
+            copy.append(text)
+    return copy
+
+
+def lost_copy(original, content):
+    """The copy of original, in order and without repeats, that content does not hold"""
+    kept = '\n'.join(_copy(content))
+    return [text for text in dict.fromkeys(_copy(original)) if text not in kept]
+
+
+def _render_job(job):
+    """Worker: render one page and return it only if it differs from the file on disk"""
+    output_dir, filename, context, indexed_sha1 = job
+    try:
+        content = render_page(_template, context, _header)
+    except TemplateError as error:
+        return {'filename': filename, 'error': str(error)}
+    result = {'filename': filename, 'content': None, 'size': len(content)}
+    digest = hashlib.sha1(content).hexdigest()
+    if digest == indexed_sha1:
+        return result
+
+    try:
+        with open(os.path.join(output_dir, filename), 'rb') as f:
+            stat = os.fstat(f.fileno())
+            original = f.read()
+    except FileNotFoundError:
+        original = None
+    if original is not None and hashlib.sha1(original).hexdigest() == digest:
+        return result
+    generated = original is None or original.startswith(GENERATED_MARKER.encode('utf-8'))
+    result.update({
+        'content': content,
+        'original': original,
+        'mtime_ns': stat.st_mtime_ns if original is not None else None,
+        'size': stat.st_size if original is not None else None,
+        'generated': generated,
+        # Copy of a hand-written page the render would drop
+        'lost': [] if generated else lost_copy(original, content),
+    })
+    return result
+
+
+def render_all(output_dir, template_source, header, pages, indexed, workers=None):
+    """Render pages in a process pool; returns results in page order"""
+    jobs = [(output_dir, filename, context, indexed.get(filename)) for filename, context in pages]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2 * workers:
+        _init_worker(template_source, header)
+        return [_render_job(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(template_source, header)) as pool:
+        return list(pool.map(_render_job, jobs, chunksize=chunksize))
+
+
+def _relative(path, root):
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+
+def render_command(args, root, data, data_path, metrics):
+    output_dir = os.path.abspath(args.output or os.path.join(root, data['output']))
+    template_path = os.path.join(os.path.dirname(data_path), data['template'])
+
+    catalog = suburb_catalog.default_catalog()
+    with metrics.stage('expand'):
+        pages, problems = build_pages(data, catalog, set(args.names), args.k, args.site_url.rstrip('/'), args.path)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        return 1
+    if not pages:
+        print(f"No suburb records to render in {os.path.relpath(data_path)}")
+        return 0
+
+    if args.adopt:
+        # The records take the copy of the pages they are about to replace first
+        with metrics.stage('fill'):
+            filled = fill_records(data, pages, output_dir, metrics)
+        if filled:
+            pages, _ = build_pages(data, catalog, set(args.names), args.k, args.site_url.rstrip('/'), args.path)
+            if not args.dry_run:
+                save_data(data, data_path)
+            print(f"✅ {'Would fill' if args.dry_run else 'Filled'} {sum(map(len, filled.values()))} field(s) "
+                  f"of {len(filled)} record(s) from their hand-written pages")
+
+    routable = load_suburb_slugs(os.path.join(root, 'src', 'data', 'suburbData.ts'))
+    unrouted = sorted({context['slug'] for _, context in pages
+                       if context['path'].startswith('/locations/') and context['slug'] not in routable})
+    if unrouted:
+        print(f"⚠️  {len(unrouted)} suburb(s) missing from suburbData.ts, their /locations/ URLs redirect to /areas: "
+              f"{', '.join(unrouted)}")
+
+    with open(template_path, encoding='utf-8') as f:
+        template_source = f.read()
+    compile_template(template_source)  # fail here rather than once per worker
+    header = (f"{GENERATED_MARKER}; edit {_relative(data_path, root)} "
+              f"or {_relative(template_path, root)}, not this file\n")
+
+    os.makedirs(output_dir, exist_ok=True)
+    with metrics.stage('index'):
+        indexed = {filename: entry['sha1'] for filename, entry in page_index.scan_pages(output_dir).items()}
+    with metrics.stage('render'):
+        results = render_all(output_dir, template_source, header, pages, indexed, args.workers)
+
+    failed = [result for result in results if 'error' in result]
+    for result in failed:
+        print(f"❌ {result['filename']}: {result['error']}")
+    if failed:
+        return 1
+
+    changes = [result for result in results if result['content'] is not None]
+    hand_written = [change for change in changes if not change['generated'] and not args.adopt]
+    # Adopting a page whose copy the render does not hold would throw that copy away
+    refused = [change for change in changes if not change['generated'] and args.adopt
+               and change['lost'] and not args.force]
+    changes = [change for change in changes
+               if change['generated'] or (args.adopt and (not change['lost'] or args.force))]
+    forced = [change for change in changes if change['lost']]
+    created = sum(1 for change in changes if change['original'] is None)
+
+    if args.dry_run:
+        for change in changes:
+            if args.diff and change['original'] is not None:
+                print(batch_rewriter.unified_diff(change['filename'], change['original'], change['content']), end='')
+            else:
+                print(f"  would {'create' if change['original'] is None else 'update'} {change['filename']}")
+    elif changes:
+        with metrics.stage('commit'):
+            try:
+                batch_rewriter.commit(output_dir, changes)
+            except batch_rewriter.BatchError as error:
+                print(f"Render aborted, no files were changed: {error}")
+                return 1
+        for change in changes:
+            metrics.wrote(len(change['content']), change['filename'])
+
+    verb = "Would write" if args.dry_run else "Wrote"
+    print(f"✅ {verb} {len(changes)} of {len(pages)} pages ({created} new), "
+          f"{len(pages) - len(changes) - len(hand_written) - len(refused)} unchanged")
+    if hand_written:
+        print(f"⚠️  Left {len(hand_written)} hand-written page(s) alone, rerun with --adopt to replace them: "
+              f"{', '.join(change['filename'] for change in hand_written)}")
+    if refused:
+        print(f"⚠️  Did not adopt {len(refused)} page(s) with copy the render does not hold; compare with "
+              f"--dry-run --diff and rerun with --force to replace them: "
+              f"{', '.join(change['filename'] for change in refused)}")
+    for change in forced:
+        print(f"⚠️  {change['filename']} {'would lose' if args.dry_run else 'lost'} {len(change['lost'])} "
+              f"piece(s) of copy, starting with {change['lost'][0]!r}")
+    return 0
+
+
+def _jsx_tree(source):
+    """Elements of JSX source as {'tag', 'attrs', 'children'}; an {expression} is an element without a tag"""
+    root = {'tag': None, 'attrs': '', 'children': []}
+    stack = [root]
+    pos = 0
+    for match in _JSX_TOKEN.finditer(source):
+        if source[pos:match.start()].strip():
+            stack[-1]['children'].append(source[pos:match.start()])
+        pos = match.end()
+        closing, tag, attrs, self_closing, expression = match.groups()
+        if expression is not None:
+            stack[-1]['children'].append({'tag': None, 'attrs': expression, 'children': []})
+        elif tag is None:
+            continue
+        elif closing:
+            while len(stack) > 1 and stack.pop()['tag'] != tag:
+                pass
+        else:
+            element = {'tag': tag, 'attrs': attrs, 'children': []}
+            stack[-1]['children'].append(element)
+            if not self_closing:
+                stack.append(element)
+    return root
+
+
+def _elements(element, tag=None):
+    """Descendants of element in document order, with the parent of each"""
+    for child in element['children']:
+        if isinstance(child, dict) and child['tag'] is not None:
+            if tag is None or child['tag'] == tag:
+                yield child, element
+            yield from _elements(child, tag)
+
+
+def _text(element):
+    """The element's copy when it is plain text, else None"""
+    parts = []
+    for child in element['children']:
+        if isinstance(child, str):
+            parts.append(child)
+            continue
+        literal = _STRING_EXPRESSION.match(child['attrs']) if child['tag'] is None else None
+        if literal is None:
+            return None
+        parts.append(literal.group(2))
+    text = ' '.join(''.join(parts).split())
+    return text or None
+
+
+def _after(parent, element, tag):
+    """The first tag element following element among the children of parent"""
+    following = False
+    for child in parent['children']:
+        if following and isinstance(child, dict) and child['tag'] == tag:
+            return child
+        following = following or child is element
+    return None
+
+
+def _issue(item):
+    """{'title', 'text'} of a <li> holding <span><strong>Title:</strong> text</span>, else None"""
+    span = next((child for child in item['children'] if isinstance(child, dict) and child['tag'] == 'span'), None)
+    if span is None or not span['children'] or not isinstance(span['children'][0], dict):
+        return None
+    strong, rest = span['children'][0], span['children'][1:]
+    title = _text(strong) if strong['tag'] == 'strong' else None
+    if not title or not title.endswith(':') or not rest or not all(isinstance(child, str) for child in rest):
+        return None
+    return {'title': title[:-1], 'text': ' '.join(''.join(rest).split())}
+
+
+def _heading(root, tag, predicate):
+    """The first tag element whose text satisfies predicate, and its parent"""
+    return next(((element, parent) for element, parent in _elements(root, tag)
+                 if predicate(_text(element) or '')), (None, None))
+
+
+def page_content(source):
+    """The CONTENT_FIELDS of a page laid out like the template, as far as it holds them as plain text"""
+    root = _jsx_tree(source)
+    content = {}
+    h1, hero = _heading(root, 'h1', bool)
+    if h1 is not None:
+        content['heading'] = _text(h1)
+        intro = _after(hero, h1, 'p')
+        if intro is not None and _text(intro):
+            content['intro'] = _text(intro)
+        # Icon and label rows, as the template renders highlights
+        highlights = [_text(row['children'][1]) for row, _ in _elements(hero, 'div')
+                      if len(row['children']) == 2 and all(isinstance(child, dict) for child in row['children'])
+                      and row['children'][0]['tag'][:1].isupper() and not row['children'][0]['children']
+                      and row['children'][1]['tag'] == 'span']
+        if highlights and all(highlights):
+            content['highlights'] = highlights
+
+    h3, column = _heading(root, 'h3', lambda text: text.endswith('Suburb Expertise'))
+    if h3 is not None:
+        local = [_text(p) for p, parent in _elements(column, 'p') if parent is column]
+        if local and all(local):
+            content['local'] = local
+
+    h3, column = _heading(root, 'h3', lambda text: text.startswith('Common ') and text.endswith('Mould Issues'))
+    listing = _after(column, h3, 'ul') if h3 is not None else None
+    if listing is not None:
+        issues = [_issue(item) for item, parent in _elements(listing, 'li') if parent is listing]
+        if issues and all(issues):
+            content['issues'] = issues
+
+    for section, _ in _elements(root, 'section'):
+        h2, parent = next(_elements(section, 'h2'), (None, None))
+        if h2 is None:
+            continue
+        if 'Process' in (_text(h2) or '') and 'process' not in content:
+            steps = []
+            for h4, row in _elements(section, 'h4'):
+                text = _after(row, h4, 'p')
+                steps.append({'title': _text(h4), 'text': text and _text(text)})
+            if steps and all(step['title'] and step['text'] for step in steps):
+                content['process'] = steps
+        elif any('ABN:' in (_text(p) or '') for p, _ in _elements(section, 'p')):
+            cta = _after(parent, h2, 'p')
+            if cta is not None and _text(cta):
+                content['cta'] = _text(cta)
+    return {field: content[field] for field in CONTENT_FIELDS if field in content}
+
+
+def page_fields(content):
+    """The record fields an existing page holds: its SEO props and the copy page_content finds.
+
+    name is the page's location prop. Expressions ({...} source) cannot be
+    carried into a record and are left out.
+    """
+    found = jsx_locator.locate(content)
+
+    def props(component):
+        elements = found['elements'].get(component)
+        return elements[0][2] if elements else {}
+
+    seo, business, schema = props('LocationPageSEO'), props('LocalBusinessSchema'), props('ServiceSchema')
+    fields = {
+        'name': seo.get('location') or business.get('location'),
+        'title': seo.get('title'),
+        'description': seo.get('description'),
+        'page_name': business.get('pageName'),
+        'service_name': schema.get('serviceName'),
+        'service_description': schema.get('serviceDescription'),
+        'area_served': schema.get('areaServed'),
+    }
+    fields = {field: value for field, value in fields.items()
+              if value is not None and not (isinstance(value, str) and value.startswith('{'))}
+    if not isinstance(fields.get('area_served', []), list):
+        del fields['area_served']
+    if found['root'] is not None:
+        fields.update(page_content(content[found['root']['start']:].decode('utf-8', 'replace')))
+    return fields
+
+
+def _differing(fields, context):
+    """The fields whose value differs from what the page context renders"""
+    differing = {}
+    for field, value in fields.items():
+        rendered = context.get(field)
+        if field == 'process' and isinstance(rendered, list):
+            rendered = [{key: item for key, item in step.items() if key != 'number'} for step in rendered]
+        if value != rendered:
+            differing[field] = value
+    return differing
+
+
+def page_record(filename, content, data, catalog):
+    """A suburb record holding the SEO props and copy of an existing page that differ from the defaults"""
+    stem = filename[:-4]
+    fields = page_fields(content)
+    name = fields.pop('name', None) or SUBURBS.to_display(stem)
+    record = {'name': name}
+    slug = SUBURBS.to_kebab(stem)
+    if SUBURBS.to_kebab(SUBURBS.from_display(name)) != slug:
+        record['slug'] = slug
+    pages, _ = build_pages({**data, 'suburbs': [record]}, catalog)
+    record.update(_differing(fields, pages[0][1] if pages else {}))
+    return record
+
+
+def fill_records(data, pages, output_dir, metrics):
+    """Fill the fields records lack from the hand-written pages they render to.
+
+    pages is build_pages output for data. A record that renders one page
+    takes the copy itself, one with several pages under by_service. Returns
+    {filename: [field, ...]} for the pages that filled anything.
+    """
+    records = {record['name']: record for record in data['suburbs']}
+    page_counts = {}
+    for _, context in pages:
+        page_counts[context['name']] = page_counts.get(context['name'], 0) + 1
+
+    filled = {}
+    for filename, context in pages:
+        try:
+            with open(os.path.join(output_dir, filename), 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            continue
+        if content.startswith(GENERATED_MARKER.encode('utf-8')):
+            continue
+        metrics.read(len(content), filename)
+        record = records[context['name']]
+        target = record
+        if page_counts[context['name']] > 1:
+            target = record.setdefault('by_service', {}).setdefault(context['service'], {})
+        fields = page_fields(content)
+        fields.pop('name', None)
+        added = {field: value for field, value in _differing(fields, context).items()
+                 if field not in record and field not in target}
+        if added:
+            target.update(added)
+            filled[filename] = sorted(added)
+    return filled
+
+
+def import_command(args, root, data, data_path, metrics):
+    output_dir = os.path.abspath(args.output or os.path.join(root, data['output']))
+    catalog = suburb_catalog.default_catalog()
+    with metrics.stage('index'):
+        index = page_index.scan_pages(output_dir)
+    expanded, _ = build_pages(data, catalog)
+    known = {filename for filename, _ in expanded}
+    pages = [(filename, context) for filename, context in expanded if not args.names or filename[:-4] in args.names]
+    with metrics.stage('fill'):
+        filled = fill_records(data, pages, output_dir, metrics)
+
+    added = []
+    skipped = []
+    for filename in sorted(index):
+        if filename in known or (args.names and filename[:-4] not in args.names):
+            continue
+        if filename[:-4] != dynamic_component_name(SUBURBS.to_kebab(filename[:-4])):
+            # DynamicLocationPage could never load it under its own name
+            skipped.append(filename)
+            continue
+        with open(os.path.join(output_dir, filename), 'rb') as f:
+            content = f.read()
+        metrics.read(len(content), filename)
+        added.append(page_record(filename, content, data, catalog))
+
+    data['suburbs'] = sorted(data['suburbs'] + added, key=lambda record: record['name'])
+    if (added or filled) and not args.dry_run:
+        save_data(data, data_path)
+    print(f"✅ {'Would add' if args.dry_run else 'Added'} {len(added)} suburb record(s) to {os.path.relpath(data_path)}")
+    if filled:
+        print(f"✅ {'Would fill' if args.dry_run else 'Filled'} {sum(map(len, filled.values()))} field(s) "
+              f"of {len(filled)} record(s) from their pages")
+    if skipped:
+        print(f"⚠️  Skipped {len(skipped)} page(s) whose file name is not the component their slug routes to: "
+              f"{', '.join(skipped)}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render location pages from a template and per-suburb records")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--data', default=DATA_PATH, help="suburb records and default copy (default: %(default)s)")
+    parser.add_argument('--output', help="directory to write pages to (default: the data file's output under --root)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render_parser = commands.add_parser('render', help="render the pages and write the ones that changed")
+    render_parser.add_argument('names', nargs='*', help="only render these suburbs (default: all records)")
+    render_parser.add_argument('--k', type=int, default=suburb_catalog.DEFAULT_NEIGHBOURS,
+                               help="neighbouring suburbs in a default areaServed (default: %(default)s)")
+    render_parser.add_argument('--site-url', default=SITE_URL, help="scheme and host of the page URLs (default: %(default)s)")
+    render_parser.add_argument('--path', default=LOCATION_PATH,
+                               help="path of a location page, with {slug} for its suburb; a service may name its own "
+                                    "(default: %(default)s)")
+    render_parser.add_argument('--adopt', action='store_true',
+                               help="fill records from the hand-written pages and replace those whose copy "
+                                    "the render holds")
+    render_parser.add_argument('--force', action='store_true',
+                               help="with --adopt, replace hand-written pages even when the render drops copy")
+    render_parser.add_argument('--dry-run', action='store_true', help="list the pages that would be written")
+    render_parser.add_argument('--diff', action='store_true', help="with --dry-run, print a unified diff per page")
+    render_parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+
+    import_parser = commands.add_parser('import', help="add records for existing pages and fill the fields "
+                                                       "existing records lack from their pages")
+    import_parser.add_argument('names', nargs='*', help="only import these pages, by component name")
+    import_parser.add_argument('--dry-run', action='store_true', help="count the records and fields without saving them")
+
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
+    data_path = os.path.abspath(args.data)
+
+    with instrumentation.run('location_page_generator', args) as metrics:
+        data = load_data(data_path)
+        if args.command == 'render':
+            return render_command(args, root, data, data_path, metrics)
+        return import_command(args, root, data, data_path, metrics)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
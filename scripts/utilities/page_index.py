@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Persistent index of the page sources shared by the SEO utility scripts.
+
+Every script used to glob the pages directory and read each file just to look
+for a handful of props. The index scans the directory once, records what the
+scripts need (SEO component props, canonical/schema URLs, byte offsets of the
+elements and the import block) and stores it on disk keyed by file name,
+mtime, size and content hash. Later runs only stat the tree and re-parse the
+files that actually changed. Within one process the last index of each
+directory is also kept in memory, so commands chained through seo_tools.py
+skip even reloading the cache file and read each page at most once.
+
+Usage:
+    import page_index
+    index = page_index.scan_pages(locations_dir)
+    for filename, entry in sorted(index.items()):
+        print(filename, entry['urls'].get('canonical'))
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import instrumentation
+import jsx_locator
+from jsx_locator import SEO_COMPONENTS
+
+INDEX_VERSION = 2
+
+# Props that carry a page URL, in the order they are reported
+URL_PROPS = ('canonical', 'canonicalUrl', 'pageUrl', 'serviceUrl')
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+# {(pages_dir, index_path, suffix): (index, saved)} for the indexes scanned in this process
+_warm = {}
+
+
+def default_index_path(pages_dir):
+    """Return the cache file used for a pages directory"""
+    digest = hashlib.sha1(os.path.abspath(pages_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"page-index-{digest}.json")
+
+
+def parse_page(data):
+    """Extract the indexed fields from a page's raw bytes"""
+    found = jsx_locator.locate(data)
+    components = {}
+    urls = {}
+    for component in SEO_COMPONENTS:
+        elements = found['elements'].get(component)
+        if not elements:
+            continue
+        components[component] = [
+            {'start': start, 'end': end, 'props': props}
+            for start, end, props in elements
+        ]
+        for _, _, props in elements:
+            for prop in URL_PROPS:
+                value = props.get(prop)
+                if isinstance(value, str) and prop not in urls:
+                    urls[prop] = value
+
+    return {
+        'components': components,
+        'urls': urls,
+        'imports': jsx_locator.import_block(found['imports']),
+        'root': found['root'],
+        'has_canonical': b'canonical' in data,
+        'imports_seo_head': b'@/components/seo/SEOHead' in data,
+    }
+
+
+def _load_cache(index_path, pages_dir):
+    try:
+        with open(index_path, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cached.get('version') != INDEX_VERSION or cached.get('pages_dir') != os.path.abspath(pages_dir):
+        return {}
+    return cached.get('pages', {})
+
+
+def save_index(index, pages_dir, index_path=None):
+    """Write the index to disk atomically"""
+    index_path = index_path or default_index_path(pages_dir)
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        # dumps takes the C encoder's one-shot path; dump streams through the Python one
+        f.write(json.dumps({
+            'version': INDEX_VERSION,
+            'pages_dir': os.path.abspath(pages_dir),
+            'pages': index,
+        }, separators=(',', ':')))
+        instrumentation.current().wrote(f.tell())
+    os.replace(tmp_path, index_path)
+
+
+def scan_pages(pages_dir, index_path=None, suffix='.tsx', save=True):
+    """Return {filename: entry} for every page in pages_dir, re-parsing only changed files.
+
+    Files whose mtime and size match the cached entry are not opened at all.
+    Files that were touched but whose content hash is unchanged keep their
+    parsed data. The refreshed index is written back unless save is False.
+    A directory scanned before in this process starts from that index instead
+    of the cache file.
+    """
+    metrics = instrumentation.current()
+    index_path = index_path or default_index_path(pages_dir)
+    key = (os.path.abspath(pages_dir), os.path.abspath(index_path), suffix)
+    warm = _warm.get(key)
+    if warm is not None:
+        cached, saved = warm
+        metrics.count('index-warm')
+    else:
+        with metrics.stage('index-load'):
+            cached = _load_cache(index_path, pages_dir)
+        saved = True
+    index = {}
+    dirty = not saved
+
+    with metrics.stage('glob'):
+        found = []
+        with os.scandir(pages_dir) as it:
+            for e in it:
+                if not e.name.endswith(suffix) or not e.is_file():
+                    continue
+                try:
+                    found.append((e, e.stat()))
+                except FileNotFoundError:
+                    # Deleted (or renamed away by an editor's save) since the directory was listed
+                    continue
+    metrics.count('pages', len(found))
+
+    for dir_entry, stat in found:
+        previous = cached.get(dir_entry.name)
+        if previous and previous['mtime_ns'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+            index[dir_entry.name] = previous
+            continue
+
+        started = time.perf_counter()
+        with metrics.stage('read'):
+            try:
+                with open(dir_entry.path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+        dirty = True
+
+        if previous and previous['sha1'] == digest:
+            entry = dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            with metrics.stage('parse'):
+                entry = parse_page(data)
+            metrics.count('pages-parsed')
+            entry.update({
+                'stem': dir_entry.name[:-len(suffix)],
+                'sha1': digest,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+            })
+        index[dir_entry.name] = entry
+        metrics.file_time(dir_entry.name, time.perf_counter() - started, read=len(data))
+
+    if len(index) != len(cached):
+        dirty = True
+    if save and dirty:
+        with metrics.stage('index-save'):
+            save_index(index, pages_dir, index_path)
+    _warm[key] = (index, save or not dirty)
+    return index
+
+
+def read_page(pages_dir, filename):
+    """Read a page's raw bytes (offsets in the index refer to these bytes)"""
+    with open(os.path.join(pages_dir, filename), 'rb') as f:
+        return f.read()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index the page sources and report what they declare")
+    parser.add_argument('pages_dir', nargs='?', help="directory to index (default: the root's pages and location pages)")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    args = parser.parse_args(argv)
+
+    pages_dir = os.path.join(os.path.abspath(args.root), 'src', 'pages')
+    targets = [args.pages_dir] if args.pages_dir else [pages_dir, os.path.join(pages_dir, 'locations')]
+    for target in targets:
+        started = time.perf_counter()
+        pages = scan_pages(target)
+        with_canonical = sum(1 for entry in pages.values()
+                             if entry['urls'].get('canonical') or entry['urls'].get('canonicalUrl'))
+        print(f"Indexed {len(pages)} pages in {os.path.abspath(target)} ({time.perf_counter() - started:.3f}s)")
+        print(f"  {with_canonical} with a canonical URL")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
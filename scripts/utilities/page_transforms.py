@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Per-file page transforms used by the batch rewriter.
+
+Each transform takes (filename, content) with content as raw bytes and
+returns (new_content, messages). new_content is None when the file should be
+left alone. Transforms are plain module-level functions without side effects
+so they can be shipped to worker processes.
+"""
+
+import json
+
+import jsx_locator
+from slug_registry import SlugRegistry
+
+SITE_URL = "https://mouldrestoration.com.au"
+# Path of a location page's canonical URL, where the sitemap lists it and DynamicLocationPage serves it
+LOCATION_PATH = '/locations/{slug}'
+# Schemes earlier canonicals were written in; such canonicals are moved to the current one
+LEGACY_LOCATION_PATHS = ('/services/mould-removal-{slug}', '/mould-removal-{slug}-melbourne')
+
+# Suburb name conversions, memoised per process
+SUBURBS = SlugRegistry()
+
+
+def generate_suburb_title_description(suburb_name):
+    """Generate SEO title and description for suburb"""
+    suburb_display = SUBURBS.to_display(suburb_name)
+
+    title = f"Mould Removal {suburb_display} Melbourne - Professional Same-Day Service"
+    description = f"Professional mould removal {suburb_display} Melbourne. IICRC certified technicians, same-day service available, comprehensive restoration. Expert local service. Call 1800 954 117."
+
+    return title, description
+
+
+def slug_path(slug, path=LOCATION_PATH, fields=None):
+    """Path of the page for a kebab-case suburb slug under a path scheme such as '/locations/{slug}'.
+
+    Schemes may name other fields, such as {service}, which are taken from fields.
+    """
+    return path.format_map(dict(fields or {}, slug=slug))
+
+
+def location_path(filename, path=LOCATION_PATH):
+    """Path of a location page file under a path scheme"""
+    return slug_path(SUBURBS.to_kebab(filename), path)
+
+
+def location_canonical_url(filename, site_url=SITE_URL, path=LOCATION_PATH):
+    """Canonical URL written into a location page's LocationPageSEO"""
+    return f"{site_url}{location_path(filename, path)}"
+
+
+def is_stale_canonical(filename, url, site_url=SITE_URL, path=LOCATION_PATH):
+    """True if url is a canonical this script wrote for the page, on any host or known scheme, but not the current one.
+
+    Slugs are compared without their hyphens, so one written by an older name
+    conversion ('mc-kinnon' for McKinnon) still counts.
+    """
+    if not isinstance(url, str) or url == location_canonical_url(filename, site_url, path):
+        return False
+    written = url.split('://', 1)[-1]
+    written = written[written.find('/'):] if '/' in written else '/'
+    slug = SUBURBS.to_kebab(filename).replace('-', '')
+    for scheme in (path, LOCATION_PATH) + LEGACY_LOCATION_PATHS:
+        prefix, _, suffix = scheme.partition('{slug}')
+        if (len(written) > len(prefix) + len(suffix) and written.startswith(prefix) and written.endswith(suffix)
+                and written[len(prefix):len(written) - len(suffix)].replace('-', '') == slug):
+            return True
+    return False
+
+
+def is_page_canonical(filename, url, site_url=SITE_URL, path=LOCATION_PATH):
+    """True if url is the page's canonical on the current scheme or a stale one"""
+    return url == location_canonical_url(filename, site_url, path) or is_stale_canonical(filename, url, site_url, path)
+
+
+def needs_location_canonical(filename, entry, site_url=SITE_URL, path=LOCATION_PATH):
+    """True if inject_location_canonical would change a page, judged from its page index entry"""
+    if not entry['has_canonical'] or is_stale_canonical(filename, entry['urls'].get('canonical'), site_url, path):
+        return True
+    location_seo = entry['components'].get('LocationPageSEO')
+    props = location_seo[0]['props'] if location_seo else {}
+    return 'canonical' not in props and is_page_canonical(filename, props.get('canonicalUrl'), site_url, path)
+
+
+def inject_location_canonical(filename, content, site_url=SITE_URL, path=LOCATION_PATH):
+    """Add a canonical to LocationPageSEO, inserting the component and its import if missing.
+
+    A canonical written earlier under another host or path scheme is moved
+    to the current one; any other canonical is left as it is. LocationPageSEO
+    has no canonicalUrl prop, so a page's canonical given as one is replaced
+    with the canonical prop.
+    """
+    canonical_url = location_canonical_url(filename, site_url, path)
+    messages = []
+
+    # Locate the LocationPageSEO element, root element and imports in one pass
+    found = jsx_locator.locate(content)
+    location_seo = found['elements'].get('LocationPageSEO')
+
+    if location_seo:
+        start, end, props = location_seo[0]
+        # Check if canonical is already present
+        if 'canonical' in props:
+            if not is_stale_canonical(filename, props['canonical'], site_url, path):
+                return None, [f"{filename} already has canonical parameter, skipping..."]
+            spans = {}
+            jsx_locator.parse_element(content, start, spans)
+            value_start, value_end = spans['canonical']
+            content = content[:value_start] + f'"{canonical_url}"'.encode('utf-8') + content[value_end:]
+            return content, [f"Moved canonical URL in {filename} from {props['canonical']} to {canonical_url}"]
+        if is_page_canonical(filename, props.get('canonicalUrl'), site_url, path):
+            spans = {}
+            jsx_locator.parse_element(content, start, spans)
+            prop_start, value_end = spans['canonicalUrl']
+            prop_start = content.rindex(b'canonicalUrl', start, prop_start)
+            content = content[:prop_start] + f'canonical="{canonical_url}"'.encode('utf-8') + content[value_end:]
+            return content, [f"Replaced canonicalUrl {props['canonicalUrl']}, which LocationPageSEO ignores, "
+                             f"with canonical {canonical_url} in {filename}"]
+        # Add canonical parameter before the closing '/>'
+        offset = jsx_locator.closing_offset(content, start, end)
+        content = jsx_locator.insert(content, offset, f'\n        canonical="{canonical_url}"')
+        messages.append(f"Added canonical URL to existing LocationPageSEO in {filename}")
+        return content, messages
+
+    # Insert the LocationPageSEO component as the first child of the root element
+    if found['root'] is None:
+        return None, [f"Could not find suitable insertion point in {filename}"]
+
+    title, description = generate_suburb_title_description(filename)
+    location_seo_component = f'''      {{/* SEO Optimization for {filename.replace('.tsx', '')} */}}
+      <LocationPageSEO
+        suburb="{SUBURBS.to_display(filename)}"
+        service="removal"
+        title="{title}"
+        description="{description}"
+        canonical="{canonical_url}"
+      />
+
+'''
+    insertions = [(found['root']['insert'], location_seo_component)]
+    messages.append(f"Added LocationPageSEO component to {filename}")
+
+    # Add the import unless SEOHead already provides LocationPageSEO
+    import_edit = jsx_locator.import_insertion(
+        content, found['imports'], 'LocationPageSEO', '@/components/seo/SEOHead',
+        after='@/components/Navigation')
+    if import_edit:
+        insertions.append(import_edit)
+        messages.append(f"Added LocationPageSEO import to {filename}")
+
+    return jsx_locator.apply_insertions(content, insertions), messages
+
+
+def set_component_props(filename, content, component, props):
+    """Set props on the first <component> element, replacing or adding each one.
+
+    Strings are written as quoted attributes, anything else (lists, numbers,
+    booleans) as a JSON literal in braces.
+    """
+    found = jsx_locator.locate(content)
+    elements = found['elements'].get(component)
+    if not elements:
+        return None, [f"No {component} in {filename}, skipping..."]
+
+    start, end, current = elements[0]
+    spans = {}
+    jsx_locator.parse_element(content, start, spans)
+
+    insertions = []
+    replacements = []
+    messages = []
+    for name, value in props.items():
+        if current.get(name) == value:
+            continue
+        if isinstance(value, str):
+            quoted = '"' + value.replace('"', '&quot;') + '"'
+        else:
+            quoted = '{' + json.dumps(value, ensure_ascii=False) + '}'
+        if name in spans:
+            replacements.append((spans[name], quoted))
+            messages.append(f"Updated {component} {name} in {filename}")
+        else:
+            insertions.append((jsx_locator.closing_offset(content, start, end),
+                               f'\n        {name}={quoted}'))
+            messages.append(f"Added {component} {name} in {filename}")
+
+    if not insertions and not replacements:
+        return None, []
+
+    # Replace values from the end of the file so earlier spans stay valid
+    for (value_start, value_end), text in sorted(replacements, reverse=True):
+        content = content[:value_start] + text.encode('utf-8') + content[value_end:]
+    if insertions:
+        # Insertions all sit at the tag's closing offset, which shifted with the replacements
+        _, new_end, _ = jsx_locator.locate(content)['elements'][component][0]
+        offset = jsx_locator.closing_offset(content, start, new_end)
+        content = jsx_locator.insert(content, offset, ''.join(text for _, text in insertions))
+    return content, messages
+
+
+def set_location_seo_props(filename, content, props):
+    """Set props on the page's LocationPageSEO element"""
+    return set_component_props(filename, content, 'LocationPageSEO', props)
+
+
+def set_area_served(filename, content, k=None):
+    """Fill ServiceSchema areaServed with the suburb and its k nearest catalogued neighbours.
+
+    Suburbs already listed are kept, in their order; catalogued ones are only
+    added until the list names k suburbs besides the page's own, so a
+    hand-curated list of that length is left as it is.
+    """
+    import suburb_catalog  # brings in numpy, which only this transform needs
+    if k is None:
+        k = suburb_catalog.DEFAULT_NEIGHBOURS
+    catalog = suburb_catalog.default_catalog()
+    stem = filename[:-4] if filename.endswith('.tsx') else filename
+    if stem not in catalog:
+        return None, [f"{filename} is not in the suburb catalog, skipping..."]
+    elements = jsx_locator.locate(content)['elements'].get('ServiceSchema')
+    current = elements[0][2].get('areaServed', []) if elements else []
+    if not isinstance(current, list):
+        return None, [f"{filename} sets areaServed to an expression, skipping..."]
+
+    area_served = list(current)
+    for suburb in SUBURBS.bulk_to_display(catalog.area_served(stem, k)):
+        if len(area_served) > k:
+            break
+        if suburb not in area_served:
+            area_served.append(suburb)
+    return set_component_props(filename, content, 'ServiceSchema', {'areaServed': area_served})
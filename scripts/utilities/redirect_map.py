@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+"""
+Compile the site's old URL schemes into a short list of vercel.json redirects.
+
+A location page has been advertised under several paths: the canonical
+scheme earlier versions of page_transforms wrote
+(/services/mould-removal-kew), the schema pageUrl and the sitemap
+(/locations/kew). Page URLs and sitemaps also name more than one domain.
+The generator takes each page's live path (one that a route actually serves
+the page at) and derives a permanent redirect to it from every other path
+the page declares or was advertised under, plus a host redirect from every
+other domain to the site's (kept once nothing names the domain any more,
+since it was advertised before). Pages no route serves get no redirects, since
+there is nothing to send visitors to (DynamicLocationPage sends slugs
+missing from suburbData.ts to /areas), and paths App.tsx serves, such as
+the /services/mold-removal-kew routes, are never redirected.
+
+The path redirects are then compressed:
+
+  - each old -> new pair is split into the two prefixes and the part carried
+    over (the suburb slug), and pairs with the same prefixes become one
+    parameterised rule
+  - rules for the same destination whose sources differ in one run of
+    tokens are merged, the differing runs becoming a regex built from a
+    prefix trie (/services/:scheme(mould-(?:inspection|removal))-:suburb)
+  - a rule matches any slug if its destination serves any slug and that
+    would not also catch a path that is still served; then the slug
+    excludes the served ones with a lookahead, or is limited to a trie
+    regex of the known slugs (split to stay under Vercel's source length
+    limit), whichever is shorter. Rules into /locations/ always list their
+    slugs, since DynamicLocationPage only serves the ones in suburbData.ts
+  - pairs that fit no rule stay explicit, and come before the rules
+
+so thousands of suburbs under one scheme cost one rule. The rules replace the
+generated redirects in vercel.json; hand-written redirects, rewrites, headers
+and every other key are left as they are. Vercel rejects unknown keys, so the
+redirects the last run wrote are recorded in generated_redirects.json next
+to this script, and only entries identical to a recorded or newly generated
+one count as generated; anything edited or added by hand is kept.
+
+Usage:
+    python3 redirect_map.py [--root PROJECT] [--record FILE] [--dry-run] [--exact] [--json]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import consistency_checker
+import page_index
+from consistency_checker import DYNAMIC_LOCATION_COMPONENT, SITE_HOST, normalise_url
+from page_transforms import LEGACY_LOCATION_PATHS, LOCATION_PATH, location_path
+
+SITE_URL = "https://mouldrestoration.com.au"
+RECORD_VERSION = 1
+SLUG_PARAM = 'suburb'
+VARIANT_PARAM = 'scheme'
+# Prefix pairs with fewer redirects than this stay explicit
+MIN_RULE_PAIRS = 2
+# Declared URL props in the order that picks a live path when no sitemap lists the page
+LIVE_PROPS = ('pageUrl', 'serviceUrl', 'canonical', 'canonicalUrl')
+
+_REGEX_SPECIAL = frozenset('\\.^$*+?()[]{}|')
+# Characters with a meaning in a path-to-regexp source outside a (...) pattern
+_SOURCE_SPECIAL = re.compile(r'[:*+?(){}]')
+_TOKEN = re.compile(r'([/-])')
+_ANY_SEGMENT = r'[^/#?]+'
+# Longest source Vercel accepts; slug-limited rules beyond it are split
+MAX_SOURCE_LENGTH = 4096
+
+
+def derive_redirects(root, host=SITE_HOST):
+    """Work out every location page's live path and the paths that should redirect to it.
+
+    The live path is the sitemap URL that serves the page, else a declared
+    path or the canonical scheme's path that a route serves the page at.
+
+    Returns {'redirects': {old path: live path}, 'hosts': [other domains],
+    'protected': paths that must keep being served, 'dynamic': dynamic
+    route prefixes, 'open': the dynamic prefixes that serve any slug,
+    'conflicts': [...], 'unresolved': [page files no route serves]}.
+    """
+    pages = page_index.scan_pages(os.path.join(root, 'src', 'pages', 'locations'))
+    routes = consistency_checker.load_routes(os.path.join(root, 'src', 'App.tsx'))
+    suburb_slugs = consistency_checker.load_suburb_slugs(os.path.join(root, 'src', 'data', 'suburbData.ts'))
+    sitemaps = consistency_checker.load_sitemaps(os.path.join(root, 'public'))
+    checker = consistency_checker.Checker(pages, routes, suburb_slugs, sitemaps, host)
+    stems = {entry['stem'] for entry in pages.values()}
+
+    hosts = set()
+    listed = set()
+    sitemap_paths = {}
+    for sitemap in sitemaps:
+        for loc in sitemap['locs']:
+            loc_host, path = normalise_url(loc)
+            hosts.add(loc_host)
+            if sitemap['index'] or sitemap['images']:
+                continue
+            listed.add(path)
+            target = checker.resolve(path)
+            if target in stems:
+                sitemap_paths.setdefault(target, []).append(path)
+
+    live = {}
+    unresolved = []
+    for filename, entry in sorted(pages.items()):
+        stem = entry['stem']
+        declared = [normalise_url(entry['urls'][prop])[1] for prop in LIVE_PROPS if prop in entry['urls']]
+        # Only a path that serves the page can be redirected to
+        candidates = (sitemap_paths.get(stem)
+                      or [path for path in declared + [location_path(stem, LOCATION_PATH)] if checker.resolve(path) == stem])
+        if candidates:
+            live[stem] = candidates[0]
+        else:
+            unresolved.append(filename)
+    live_paths = set(live.values())
+
+    redirects = {}
+    conflicts = []
+    for filename, entry in sorted(pages.items()):
+        stem = entry['stem']
+        if stem not in live:
+            continue
+        new = live[stem]
+        # Canonicals written under an earlier scheme may still be indexed
+        olds = {location_path(stem, scheme) for scheme in LEGACY_LOCATION_PATHS}
+        for url in entry['urls'].values():
+            url_host, path = normalise_url(url)
+            hosts.add(url_host)
+            olds.add(path)
+        for old in sorted(olds - {new}):
+            target = checker.resolve(old)
+            if old in live_paths:
+                conflicts.append({'path': old, 'page': filename, 'detail': "is another page's live path"})
+            elif target is not None:
+                # A route still serves it, so it stays as it is
+                conflicts.append({'path': old, 'page': filename, 'detail': f"is served by {target}"})
+            elif redirects.setdefault(old, new) != new:
+                conflicts.append({'path': old, 'page': filename, 'detail': f"already redirects to {redirects[old]}"})
+
+    hosts.discard(None)
+    hosts.discard(host)
+    protected = set(routes['static']) | live_paths | (listed - set(redirects))
+    return {
+        'redirects': redirects,
+        'hosts': sorted(hosts),
+        'protected': protected,
+        'dynamic': [prefix for prefix, _ in routes['dynamic']],
+        'open': [prefix for prefix, component in routes['dynamic'] if component != DYNAMIC_LOCATION_COMPONENT],
+        'conflicts': conflicts,
+        'unresolved': unresolved,
+    }
+
+
+def _escape(text):
+    return ''.join('\\' + char if char in _REGEX_SPECIAL else char for char in text)
+
+
+def trie_pattern(strings):
+    """A regex matching exactly strings, with shared prefixes factored out through a character trie"""
+    trie = {}
+    for string in strings:
+        node = trie
+        for char in string:
+            node = node.setdefault(char, {})
+        node[None] = True
+
+    def emit(node):
+        branches = []
+        for char in sorted(key for key in node if key is not None):
+            child = node[char]
+            text = _escape(char)
+            # Follow single-child chains without nesting
+            while len(child) == 1 and None not in child:
+                (char, child), = child.items()
+                text += _escape(char)
+            branches.append(text + emit(child))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        if None in node:
+            single = len(branches) == 1 and len(branches[0]) == 1
+            body = (body if single or len(branches) > 1 else f"(?:{body})") + '?'
+        return body
+
+    return emit(trie)
+
+
+def split_pair(old, new):
+    """Split a redirect into (old prefix, old suffix, new prefix, carried part), or None if nothing carries over.
+
+    The carried part is the new path's last segment where the old path's last
+    segment contains it between separators (/mould-removal-kew-melbourne ->
+    /locations/kew carries 'kew'), else their longest common suffix from a
+    separator on (/services/mould-removal-kew -> /locations/kew).
+    """
+    old_dir, _, old_last = old.rpartition('/')
+    new_dir, _, new_last = new.rpartition('/')
+    at = old_last.find(new_last) if new_last else -1
+    while at >= 0:
+        end = at + len(new_last)
+        if (at == 0 or old_last[at - 1] in '-_.') and (end == len(old_last) or old_last[end] in '-_.'):
+            return f"{old_dir}/{old_last[:at]}", old_last[end:], f"{new_dir}/", new_last
+        at = old_last.find(new_last, at + 1)
+    size = 0
+    while size < min(len(old_last), len(new_last)) and old_last[-1 - size] == new_last[-1 - size]:
+        size += 1
+    carried = old_last[len(old_last) - size:]
+    while carried and carried[0] in '-_.':
+        carried = carried[1:]
+    if not carried:
+        return None
+    return old[:-len(carried)], '', new[:-len(carried)], carried
+
+
+def _split_sources(prefixes):
+    """Common leading and trailing token runs of several source prefixes, and the differing middles"""
+    tokens = [_TOKEN.split(prefix) for prefix in prefixes]
+    head = 0
+    while all(len(parts) > head for parts in tokens) and len({parts[head] for parts in tokens}) == 1:
+        head += 1
+    tail = 0
+    while (all(len(parts) - tail > head for parts in tokens)
+           and len({parts[len(parts) - 1 - tail] for parts in tokens}) == 1):
+        tail += 1
+    middles = [''.join(parts[head:len(parts) - tail]) for parts in tokens]
+    start = ''.join(tokens[0][:head])
+    end = ''.join(tokens[0][len(tokens[0]) - tail:])
+    return start, middles, end
+
+
+class Rule:
+    """One parameterised redirect: start + variant + end + slug + after -> destination + slug.
+
+    mode 'any' matches every slug, 'only' the given slugs and 'except' every
+    slug but the given ones.
+    """
+
+    def __init__(self, start, variants, end, after, destination, slugs, mode='any', excluded=()):
+        self.start = start
+        self.variants = sorted(variants)
+        self.end = end
+        self.after = after
+        self.destination = destination
+        self.slugs = slugs
+        self.mode = mode
+        self.excluded = sorted(excluded)
+
+        source = start
+        pattern = re.escape(start)
+        if len(self.variants) > 1:
+            variant = trie_pattern(self.variants)
+            source += f":{VARIANT_PARAM}({variant})"
+            pattern += f"(?:{variant})"
+        else:
+            source += self.variants[0]
+            pattern += re.escape(self.variants[0])
+        if mode == 'only':
+            slug = trie_pattern(slugs)
+        elif mode == 'except':
+            # The lookahead also has to fail with a trailing slash, which Vercel matches too
+            slug = f"(?!(?:{trie_pattern(self.excluded)}){_escape(after)}(?:[/#?]|$)){_ANY_SEGMENT}"
+        else:
+            slug = None
+        source += f"{end}:{SLUG_PARAM}" + (f"({slug})" if slug is not None else '') + after
+        pattern += re.escape(end) + f"(?P<slug>{slug if slug is not None else _ANY_SEGMENT})" + re.escape(after)
+        self.source = source
+        self._pattern = pattern + r'\Z'
+        self._regex = None
+
+    @property
+    def regex(self):
+        # Compiled on first use: most candidate rules are only compared by length
+        if self._regex is None:
+            self._regex = re.compile(self._pattern)
+        return self._regex
+
+    def as_redirect(self):
+        return {'source': self.source, 'destination': f"{self.destination}:{SLUG_PARAM}", 'permanent': True}
+
+    def caught(self, olds, protected):
+        """Served paths the rule would redirect although they are not among olds"""
+        return [path for path in protected if path not in olds and self.regex.match(path)]
+
+    def overlaps(self, dynamic):
+        # A dynamic route serves any segment under its prefix, so probe it with a slug no page uses
+        return any(self.regex.match(prefix + 'x-probe') for prefix in dynamic)
+
+
+def _only_rules(start, middles, end, after, destination, slugs):
+    """Slug-limited rules, split so no source exceeds MAX_SOURCE_LENGTH"""
+    rule = Rule(start, middles, end, after, destination, slugs, mode='only')
+    if len(rule.source) <= MAX_SOURCE_LENGTH or len(slugs) == 1:
+        return [rule]
+    half = len(slugs) // 2
+    return (_only_rules(start, middles, end, after, destination, slugs[:half])
+            + _only_rules(start, middles, end, after, destination, slugs[half:]))
+
+
+def make_rules(start, middles, end, after, destination, olds, slugs, protected, dynamic, exact=False):
+    """The shortest safe rules for one source shape: any slug, any slug but the served ones, or the known slugs"""
+    options = []
+    if not exact:
+        rule = Rule(start, middles, end, after, destination, slugs)
+        if not rule.overlaps(dynamic):
+            caught = rule.caught(olds, protected)
+            if not caught:
+                return [rule]
+            excluded = {rule.regex.match(path).group('slug') for path in caught}
+            rule = Rule(start, middles, end, after, destination, slugs, mode='except', excluded=excluded)
+            if len(rule.source) <= MAX_SOURCE_LENGTH:
+                options.append([rule])
+    options.append(_only_rules(start, middles, end, after, destination, slugs))
+    for rules in sorted(options, key=lambda rules: sum(len(rule.source) for rule in rules)):
+        if not any(rule.caught(olds, protected) for rule in rules):
+            return rules
+    return None
+
+
+def compress(redirects, protected=(), dynamic=(), exact=False, open_prefixes=None):
+    """Turn {old: new} into (rules, explicit), the rules as Rule objects and explicit as [(old, new)].
+
+    Rules into a destination prefix outside open_prefixes only match the
+    known slugs; with open_prefixes None every destination serves any slug.
+    """
+    groups = {}
+    explicit = []
+    for old, new in sorted(redirects.items()):
+        split = split_pair(old, new)
+        if split is None or any(_SOURCE_SPECIAL.search(part) for part in split[:3]):
+            explicit.append((old, new))
+            continue
+        start, after, destination, carried = split
+        groups.setdefault((destination, after), {}).setdefault(start, {})[carried] = old
+
+    rules = []
+    for (destination, after), sources in sorted(groups.items()):
+        for prefix in [prefix for prefix, carried in sources.items() if len(carried) < MIN_RULE_PAIRS]:
+            explicit.extend((old, redirects[old]) for old in sources.pop(prefix).values())
+        if not sources:
+            continue
+
+        # Try every source prefix in one rule first, then one rule per prefix
+        candidates = []
+        if len(sources) > 1:
+            start, middles, end = _split_sources(list(sources))
+            if all(middles):
+                olds = {old for carried in sources.values() for old in carried.values()}
+                slugs = sorted({slug for carried in sources.values() for slug in carried})
+                candidates.append([(start, middles, end, olds, slugs)])
+        candidates.append([(prefix, [''], '', set(carried.values()), sorted(carried))
+                           for prefix, carried in sorted(sources.items())])
+
+        for candidate in candidates:
+            chosen = []
+            for start, middles, end, olds, slugs in candidate:
+                limited = exact or (open_prefixes is not None and destination not in open_prefixes)
+                made = make_rules(start, middles, end, after, destination, olds, slugs, protected, dynamic, limited)
+                if made is None:
+                    break
+                chosen.extend(made)
+            else:
+                rules.extend(chosen)
+                break
+        else:
+            explicit.extend((old, redirects[old]) for carried in sources.values() for old in carried.values())
+    return rules, sorted(explicit)
+
+
+def host_redirect(host):
+    return {'source': '/:path*', 'has': [{'type': 'host', 'value': host}],
+            'destination': f"{SITE_URL}/:path*", 'permanent': True}
+
+
+def build_redirects(derived, exact=False):
+    """The generated vercel.json redirects: host redirects, then explicit paths, then parameterised rules"""
+    rules, explicit = compress(derived['redirects'], derived['protected'], derived['dynamic'], exact,
+                               derived['open'])
+    generated = [host_redirect(host) for host in derived['hosts']]
+    generated.extend({'source': old, 'destination': new, 'permanent': True} for old, new in explicit)
+    generated.extend(rule.as_redirect() for rule in rules)
+    return generated, rules, explicit
+
+
+def is_host_redirect(redirect):
+    """True for a redirect from another domain to the site's"""
+    return (redirect.get('destination', '').startswith(SITE_URL + '/')
+            and any(item.get('type') == 'host' for item in redirect.get('has', ())))
+
+
+def redirected_hosts(path):
+    """Domains vercel.json already redirects to the site's, which stay redirected once no page or sitemap names them"""
+    try:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    return {item['value'] for redirect in config.get('redirects', []) if is_host_redirect(redirect)
+            for item in redirect.get('has', ()) if item.get('type') == 'host' and 'value' in item}
+
+
+def default_record_path(root):
+    return os.path.join(root, 'scripts', 'utilities', 'generated_redirects.json')
+
+
+def load_record(path):
+    """The redirects the last run merged into vercel.json, or [] before the first run"""
+    try:
+        with open(path, 'r') as f:
+            record = json.load(f)
+    except FileNotFoundError:
+        return []
+    if record.get('version') != RECORD_VERSION:
+        raise ValueError(f"{path}: unsupported version {record.get('version')!r}")
+    return record['redirects']
+
+
+def save_record(path, redirects):
+    """Record the merged redirects via a temporary file; an unchanged record is not rewritten"""
+    text = json.dumps({'version': RECORD_VERSION, 'redirects': redirects}, indent=2, ensure_ascii=False) + '\n'
+    try:
+        with open(path, 'r') as f:
+            if f.read() == text:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return True
+
+
+def merge_vercel(path, generated, previous, dry_run=False):
+    """Replace the generated redirects in vercel.json, keeping everything else.
+
+    previous is the recorded output of the last run; an existing redirect is
+    replaced only if it is identical to one of those or to one of generated.
+    Returns (kept, merged, changed) where merged are the generated redirects
+    now in vercel.json, the ones to record for the next run.
+    """
+    with open(path, 'r') as f:
+        text = f.read()
+    config = json.loads(text)
+    owned = {json.dumps(redirect, sort_keys=True) for redirect in list(previous) + list(generated)}
+    kept = [redirect for redirect in config.get('redirects', []) if json.dumps(redirect, sort_keys=True) not in owned]
+    # A hand-written redirect for the same source wins
+    sources = {redirect.get('source') for redirect in kept}
+    merged = [redirect for redirect in generated if redirect['source'] not in sources]
+    config['redirects'] = kept + merged
+    updated = json.dumps(config, indent=2, ensure_ascii=False) + ('\n' if text.endswith('\n') else '')
+    changed = updated != text
+    if changed and not dry_run:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(updated)
+        os.replace(tmp_path, path)
+    return kept, merged, changed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Derive redirects from old URL schemes and merge them into vercel.json")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--vercel', help="vercel.json to update (default: <root>/vercel.json)")
+    parser.add_argument('--record', help="redirects written by the last run (default: <root>/scripts/utilities/generated_redirects.json)")
+    parser.add_argument('--exact', action='store_true', help="limit every rule to the known slugs instead of any slug")
+    parser.add_argument('--dry-run', action='store_true', help="show the rules without writing vercel.json")
+    parser.add_argument('--limit', type=int, default=10, help="explicit redirects and conflicts listed, 0 for all (default: 10)")
+    parser.add_argument('--json', action='store_true', help="print the generated redirects as JSON")
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    vercel_path = args.vercel or os.path.join(root, 'vercel.json')
+    record_path = args.record or default_record_path(root)
+    started = time.perf_counter()
+    try:
+        previous = load_record(record_path)
+    except ValueError as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    derived = derive_redirects(root)
+    derived['hosts'] = sorted(set(derived['hosts']) | redirected_hosts(vercel_path))
+    generated, rules, explicit = build_redirects(derived, args.exact)
+    dry_run = args.dry_run or args.json
+    kept, merged, changed = merge_vercel(vercel_path, generated, previous, dry_run=dry_run)
+    if not dry_run:
+        save_record(record_path, merged)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({'redirects': generated, 'pairs': len(derived['redirects']),
+                          'conflicts': derived['conflicts'], 'unresolved': derived['unresolved']}, indent=2))
+        return 0
+
+    def shown(items):
+        return items if args.limit == 0 else items[:args.limit]
+
+    print(f"🔀 {len(derived['redirects'])} path redirects and {len(derived['hosts'])} other domain(s) compiled into "
+          f"{len(generated)} rules in {elapsed:.3f}s")
+    for host in derived['hosts']:
+        print(f"   host  {host} -> {SITE_URL}")
+    for rule in rules:
+        scope = {'any': f"any slug, {len(rule.slugs)} known", 'only': f"{len(rule.slugs)} known slugs",
+                 'except': f"any slug but {len(rule.excluded)} served, {len(rule.slugs)} known"}[rule.mode]
+        print(f"   rule  {rule.source[:100]}{'...' if len(rule.source) > 100 else ''} -> "
+              f"{rule.destination}:{SLUG_PARAM} ({scope})")
+    for old, new in shown(explicit):
+        print(f"   path  {old} -> {new}")
+    if len(explicit) > len(shown(explicit)):
+        print(f"   ... and {len(explicit) - len(shown(explicit))} more explicit redirects")
+    if derived['conflicts']:
+        print(f"\n⚠️  {len(derived['conflicts'])} declared path(s) not redirected:")
+        for conflict in shown(derived['conflicts']):
+            print(f"   {conflict['path']} ({conflict['page']}) {conflict['detail']}")
+    if derived['unresolved']:
+        print(f"⚠️  {len(derived['unresolved'])} page(s) have no served path to redirect to: "
+              f"{', '.join(shown(derived['unresolved']))}")
+
+    action = "Would update" if args.dry_run else "Updated"
+    if changed:
+        print(f"\n✅ {action} {os.path.relpath(vercel_path, root)}, keeping {len(kept)} hand-written redirect(s)")
+    else:
+        print(f"\n✅ {os.path.relpath(vercel_path, root)} already up to date")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,689 @@
+#!/usr/bin/env python3
+"""
+JSON-LD validator for the LocalBusinessSchema and ServiceSchema elements.
+
+Pages never write JSON-LD themselves: they render <LocalBusinessSchema> and
+<ServiceSchema> from src/components/seo/SchemaMarkup.tsx with a few props,
+and the components build the JSON-LD from those props, their defaults and
+the BUSINESS_DATA constant. The validator reads the component source once
+(props interfaces, destructuring defaults, BUSINESS_DATA), rebuilds the
+object each element on a page would emit - dropping undefined values the
+way JSON.stringify does - and checks it against the schema.org subset
+bundled in schema_org_subset.json:
+
+  errors    - a required component prop or schema property is missing, a
+              prop is a single value where the component maps over an
+              array (or the reverse), a value renders as "undefined", a
+              value does not fit the property's range (e.g. a non-numeric
+              Offer price or a dayOfWeek that is not a DayOfWeek), or
+              pageUrl/serviceUrl is relative, on another host or on another
+              path than the page's canonical
+  warnings  - props the component does not accept, props given as
+              expressions that cannot be checked statically, properties
+              the type does not define or that schema.org has superseded,
+              recommended properties that are missing, and areaServed
+              names that are not catalogued suburbs
+
+Pages are read, parsed and validated in a process pool, fanned out like the
+batch rewriter. Results are cached per page by content hash; pages whose
+mtime and size are unchanged are not even read, and the cache is dropped
+whenever the component source, the schema subset or the suburb catalog
+changes.
+
+Usage:
+    python3 schema_validator.py [--root PROJECT] [--workers N] [--json] [--strict]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import page_index
+import suburb_catalog
+import watch_pages
+from consistency_checker import SITE_HOST, normalise_url
+from slug_registry import SlugRegistry
+
+CACHE_VERSION = 1
+SUBSET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'schema_org_subset.json')
+SCHEMA_MARKUP = os.path.join('src', 'components', 'seo', 'SchemaMarkup.tsx')
+
+COMPONENTS = ('LocalBusinessSchema', 'ServiceSchema')
+# The prop each component treats as the page URL, checked against the canonical
+PAGE_URL_PROPS = {'LocalBusinessSchema': 'pageUrl', 'ServiceSchema': 'serviceUrl'}
+# areaServed names that are not suburbs but are still valid
+REGION_AREAS = ('Melbourne',)
+AREA_SUFFIX = ', Victoria, Australia'
+
+_SKIP = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.S)
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_STRING = re.compile(r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'')
+_INTERFACE = re.compile(r'interface\s+(\w+)\s*\{')
+_MEMBER = re.compile(r'^\s*(\w+)(\?)?\s*:\s*([^;\n]+)', re.M)
+_COMPONENT = re.compile(r'export\s+const\s+(\w+)\s*:\s*React\.FC<(\w+)>\s*=\s*\(\s*\{')
+_BUSINESS_DATA = re.compile(r'const\s+BUSINESS_DATA\s*=\s*')
+
+_ABSOLUTE_URL = re.compile(r'https?://[^\s/$.?#][^\s]*$')
+_DATE = re.compile(r'\d{4}(?:-\d{2}(?:-\d{2})?)?$')
+_DATE_TIME = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?$')
+_TIME = re.compile(r'\d{2}:\d{2}(?::\d{2})?(?:Z|[+-]\d{2}:?\d{2})?$')
+_NUMERIC = re.compile(r'-?\d+(?:\.\d+)?$')
+_INTEGER = re.compile(r'-?\d+$')
+
+_SCHEMA_PREFIXES = ('https://schema.org/', 'http://schema.org/')
+
+
+class Undefined:
+    """JavaScript undefined: renders as 'undefined' in template literals, dropped by JSON.stringify"""
+
+    def __str__(self):
+        return 'undefined'
+
+    __repr__ = __str__
+
+
+UNDEFINED = Undefined()
+
+
+def parse_js_literal(text, pos=0):
+    """Parse the object, array, string, number or keyword literal at pos; return (value, end)"""
+    pos = _SKIP.match(text, pos).end()
+    char = text[pos:pos + 1]
+    if char in ('{', '['):
+        closing = '}' if char == '{' else ']'
+        container = {} if char == '{' else []
+        pos += 1
+        while True:
+            pos = _SKIP.match(text, pos).end()
+            if text.startswith(closing, pos):
+                return container, pos + 1
+            if char == '{':
+                match = _STRING.match(text, pos) or _IDENTIFIER.match(text, pos)
+                if not match:
+                    raise ValueError(f"expected a key at offset {pos}")
+                key = _unquote(match.group()) if match.group()[0] in '"\'' else match.group()
+                pos = _SKIP.match(text, match.end()).end()
+                if not text.startswith(':', pos):
+                    raise ValueError(f"expected ':' at offset {pos}")
+                container[key], pos = parse_js_literal(text, pos + 1)
+            else:
+                value, pos = parse_js_literal(text, pos)
+                container.append(value)
+            pos = _SKIP.match(text, pos).end()
+            if text.startswith(',', pos):
+                pos += 1
+            elif not text.startswith(closing, pos):
+                raise ValueError(f"expected ',' or '{closing}' at offset {pos}")
+    match = _STRING.match(text, pos)
+    if match:
+        return _unquote(match.group()), match.end()
+    match = _NUMBER.match(text, pos)
+    if match:
+        number = match.group()
+        return (float(number) if any(c in number for c in '.eE') else int(number)), match.end()
+    for keyword, value in (('true', True), ('false', False), ('null', None), ('undefined', UNDEFINED)):
+        if text.startswith(keyword, pos) and not _IDENTIFIER.match(text, pos + len(keyword)):
+            return value, pos + len(keyword)
+    raise ValueError(f"unsupported literal at offset {pos}")
+
+
+def _unquote(token):
+    if token[0] == "'":
+        token = '"' + token[1:-1].replace('\\\'', '\'').replace('"', '\\"') + '"'
+    return json.loads(token)
+
+
+def _block(text, start):
+    """End offset of the brace block opening at start"""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == '{':
+            depth += 1
+        elif text[i] == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    raise ValueError(f"unbalanced braces from offset {start}")
+
+
+def load_components(source):
+    """Read SchemaMarkup.tsx source: return (BUSINESS_DATA, {component: {'props', 'defaults'}})
+
+    props maps each prop of the component's interface to whether it is
+    required and whether it is an array
+    """
+    match = _BUSINESS_DATA.search(source)
+    if not match:
+        raise ValueError("BUSINESS_DATA not found")
+    business, _ = parse_js_literal(source, match.end())
+
+    interfaces = {}
+    for match in _INTERFACE.finditer(source):
+        body = source[match.end():_block(source, match.end() - 1) - 1]
+        # Only top-level members; nested object types are cut out first
+        depth_zero = re.sub(r'\{[^{}]*\}', '', body)
+        interfaces[match.group(1)] = {name: {'required': not optional, 'array': kind.strip().endswith('[]')}
+                                      for name, optional, kind in _MEMBER.findall(depth_zero)}
+
+    components = {}
+    for match in _COMPONENT.finditer(source):
+        name, interface = match.groups()
+        if name not in COMPONENTS:
+            continue
+        params = source[match.end():_block(source, match.end() - 1) - 1]
+        defaults = {}
+        for part in params.split(','):
+            prop, _, default = part.partition('=')
+            prop, default = prop.strip(), default.strip()
+            if not default:
+                continue
+            if default.startswith('BUSINESS_DATA.'):
+                value = business
+                for key in default.split('.')[1:]:
+                    value = value[key]
+            else:
+                value, _ = parse_js_literal(default)
+            defaults[prop] = value
+        components[name] = {'props': interfaces.get(interface, {}), 'defaults': defaults}
+    missing = [name for name in COMPONENTS if name not in components]
+    if missing:
+        raise ValueError(f"components not found: {', '.join(missing)}")
+    return business, components
+
+
+def _areas(areas):
+    if not isinstance(areas, list):
+        return UNDEFINED
+    return [{'@type': 'City', 'name': f"{area}{AREA_SUFFIX}"} for area in areas]
+
+
+def local_business_jsonld(props, business):
+    """The object LocalBusinessSchema passes to JSON.stringify"""
+    url = business['url']
+    return {
+        '@context': 'https://schema.org',
+        '@type': 'LocalBusiness',
+        '@id': f"{url}#business",
+        'name': business['name'],
+        'alternateName': 'Mould Restoration Melbourne',
+        'description': business['description'],
+        'url': url,
+        'logo': business['logo'],
+        'image': business['image'],
+        'telephone': business['telephone'],
+        'email': business['email'],
+        'address': dict({'@type': 'PostalAddress'}, **business['address']),
+        'geo': {'@type': 'GeoCoordinates', 'latitude': business['geo']['latitude'],
+                'longitude': business['geo']['longitude']},
+        'openingHoursSpecification': [
+            {'@type': 'OpeningHoursSpecification', 'dayOfWeek': hours[:2], 'opens': '07:00', 'closes': '19:00'}
+            for hours in business['openingHours']],
+        'aggregateRating': dict({'@type': 'AggregateRating'}, **business['aggregateRating']),
+        'areaServed': _areas(business['serviceArea']),
+        'serviceArea': {
+            '@type': 'GeoCircle',
+            'geoMidpoint': {'@type': 'GeoCoordinates', 'latitude': business['geo']['latitude'],
+                            'longitude': business['geo']['longitude']},
+            'geoRadius': '50000',
+        },
+        'foundingDate': business['foundingDate'],
+        'numberOfEmployees': '5-10',
+        'hasCredential': business['certifications'],
+        'vatID': business['abn'],
+        'sameAs': [
+            'https://www.google.com/maps/search/mould+restoration+melbourne',
+            'https://www.yellowpages.com.au/mould-restoration-melbourne',
+            'https://www.facebook.com/mouldrestorationmelbourne',
+        ],
+        'potentialAction': {
+            '@type': 'ReserveAction',
+            'target': {
+                '@type': 'EntryPoint',
+                'urlTemplate': f"{url}/contact",
+                'inLanguage': 'en-AU',
+                'actionPlatform': ['http://schema.org/DesktopWebPlatform', 'http://schema.org/MobileWebPlatform'],
+            },
+            'result': {'@type': 'Reservation', 'name': f"Professional Mould Inspection {props['location']}"},
+        },
+    }
+
+
+def service_jsonld(props, business):
+    """The object ServiceSchema passes to JSON.stringify"""
+    url = business['url']
+    return {
+        '@context': 'https://schema.org',
+        '@type': 'Service',
+        '@id': f"{props['serviceUrl']}#service",
+        'name': props['serviceName'],
+        'description': props['serviceDescription'],
+        'url': props['serviceUrl'],
+        'image': business['image'],
+        'provider': {'@type': 'LocalBusiness', '@id': f"{url}#business", 'name': business['name'],
+                     'telephone': business['telephone'], 'url': url},
+        'areaServed': _areas(props['areaServed']),
+        'hasOfferCatalog': {
+            '@type': 'OfferCatalog',
+            'name': props['serviceName'],
+            'itemListElement': [{
+                '@type': 'Offer',
+                'itemOffered': {'@type': 'Service', 'name': props['serviceName']},
+                'price': 'Contact for Quote',
+                'priceCurrency': 'AUD',
+                'availability': 'https://schema.org/InStock',
+                'validFrom': '2024-01-01',
+                'priceRange': props['priceRange'],
+                'seller': {'@type': 'LocalBusiness', '@id': f"{url}#business"},
+            }],
+        },
+        'serviceType': 'Professional Mould Services',
+        'category': 'Mould Inspection and Remediation',
+        'termsOfService': f"{url}/terms",
+        'audience': {'@type': 'Audience',
+                     'geographicArea': {'@type': 'City', 'name': f"Melbourne{AREA_SUFFIX}"}},
+    }
+
+
+BUILDERS = {'LocalBusinessSchema': local_business_jsonld, 'ServiceSchema': service_jsonld}
+
+
+def stringify(value):
+    """Apply JSON.stringify's handling of undefined: dropped from objects, null in arrays"""
+    if isinstance(value, dict):
+        return {key: stringify(item) for key, item in value.items() if item is not UNDEFINED}
+    if isinstance(value, list):
+        return [None if item is UNDEFINED else stringify(item) for item in value]
+    return value
+
+
+class SchemaSubset:
+    """Type hierarchy, property ranges and requirements from schema_org_subset.json"""
+
+    def __init__(self, data):
+        self.types = data['types']
+        self.enumerations = {name: set(members) for name, members in data.get('enumerations', {}).items()}
+        self._ancestors = {}
+        self._properties = {}
+
+    @classmethod
+    def load(cls, path=SUBSET_PATH):
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def ancestors(self, name):
+        """The type and every type it inherits from"""
+        found = self._ancestors.get(name)
+        if found is None:
+            found = [name]
+            for parent in self.types.get(name, {}).get('parents', ()):
+                found.extend(ancestor for ancestor in self.ancestors(parent) if ancestor not in found)
+            self._ancestors[name] = found
+        return found
+
+    def _merged(self, name, key):
+        merged = {} if key in ('properties', 'superseded') else []
+        for ancestor in reversed(self.ancestors(name)):
+            value = self.types.get(ancestor, {}).get(key)
+            if not value:
+                continue
+            if isinstance(merged, dict):
+                merged.update(value)
+            else:
+                merged.extend(item for item in value if item not in merged)
+        return merged
+
+    def properties(self, name):
+        found = self._properties.get(name)
+        if found is None:
+            found = self._properties[name] = self._merged(name, 'properties')
+        return found
+
+    def check(self, node, path='', opaque=()):
+        """Validate a JSON-LD node tree; yield (severity, code, path, message)"""
+        types = node.get('@type')
+        types = types if isinstance(types, list) else [types]
+        known = [name for name in types if name in self.types]
+        label = '/'.join(str(name) for name in types)
+        if not known:
+            yield 'warning', 'unknown-type', path, f"type {label} is not in the bundled schema.org subset"
+            return
+
+        defined = {}
+        superseded = {}
+        for name in known:
+            defined.update(self.properties(name))
+            superseded.update(self._merged(name, 'superseded'))
+        present = {key for key, value in node.items() if value is not None and value != [] and value != ''}
+        # A nested node with an @id refers to the full node, so only its own values are checked
+        reference = bool(path) and '@id' in node
+        for name in ([] if reference else known):
+            for prop in self._merged(name, 'required'):
+                if prop not in present:
+                    yield 'error', 'missing-required', _join(path, prop), f"{name} requires {prop}"
+            for group in self._merged(name, 'required_any'):
+                if not present.intersection(group):
+                    yield 'error', 'missing-required', path, f"{name} requires one of {', '.join(group)}"
+            # Recommendations are for the emitted node, not for the nodes nested in it
+            for prop in self._merged(name, 'recommended') if not path else ():
+                if prop not in present:
+                    yield 'warning', 'missing-recommended', _join(path, prop), f"{name} should have {prop}"
+
+        for key, value in node.items():
+            if key.startswith('@'):
+                if isinstance(value, str) and 'undefined' in value:
+                    yield 'error', 'undefined-value', _join(path, key), f"{key} renders as {value!r}"
+                continue
+            where = _join(path, key)
+            if key in superseded:
+                yield 'warning', 'superseded', where, f"{key} is superseded by {superseded[key]} on {label}"
+            expected = defined.get(key)
+            if expected is None:
+                yield 'warning', 'unknown-property', where, f"{label} does not define {key}"
+                continue
+            for i, item in enumerate(value if isinstance(value, list) else [value]):
+                item_path = f"{where}[{i}]" if isinstance(value, list) else where
+                yield from self._check_value(item, expected, key, item_path, opaque)
+
+    def _check_value(self, value, expected, key, path, opaque):
+        if value is None:
+            return
+        if isinstance(value, dict):
+            types = value.get('@type')
+            types = types if isinstance(types, list) else [types]
+            known = [name for name in types if name in self.types]
+            if known and not any(ancestor in expected for name in known for ancestor in self.ancestors(name)):
+                yield 'error', 'invalid-value', path, \
+                    f"{key} expects {' or '.join(expected)}, got {'/'.join(map(str, types))}"
+            yield from self.check(value, path, opaque)
+            return
+        if isinstance(value, str) and any(text in value for text in opaque):
+            return
+        if isinstance(value, str) and 'undefined' in value:
+            yield 'error', 'undefined-value', path, f"{key} renders as {value!r}"
+            return
+        if not any(self._fits(value, kind) for kind in expected):
+            yield 'error', 'invalid-value', path, f"{key} expects {' or '.join(expected)}, got {value!r}"
+
+    def _fits(self, value, kind):
+        if isinstance(value, bool):
+            return kind == 'Boolean'
+        if isinstance(value, (int, float)):
+            return kind in ('Number', 'Text') or kind == 'Integer' and float(value).is_integer()
+        if not isinstance(value, str):
+            return False
+        if kind in self.enumerations:
+            member = value
+            for prefix in _SCHEMA_PREFIXES:
+                if member.startswith(prefix):
+                    member = member[len(prefix):]
+            return member in self.enumerations[kind]
+        if kind == 'Text':
+            return True
+        if kind == 'URL':
+            return bool(_ABSOLUTE_URL.match(value))
+        if kind == 'Number':
+            return bool(_NUMERIC.match(value))
+        if kind == 'Integer':
+            return bool(_INTEGER.match(value))
+        if kind == 'Date':
+            return bool(_DATE.match(value))
+        if kind == 'DateTime':
+            return bool(_DATE_TIME.match(value) or _DATE.match(value))
+        if kind == 'Time':
+            return bool(_TIME.match(value))
+        return False
+
+
+def _join(path, key):
+    return f"{path}.{key}" if path else key
+
+
+def _is_expression(value):
+    return isinstance(value, str) and value.startswith('{') and value.endswith('}')
+
+
+def validate_element(component, props, canonical, context):
+    """Rebuild one element's JSON-LD and return its issues as dicts"""
+    spec = context['components'][component]
+    issues = []
+
+    def add(severity, code, path, message):
+        issues.append({'severity': severity, 'code': code, 'component': component, 'path': path,
+                       'message': message})
+
+    values = dict(spec['defaults'])
+    opaque = []
+    for prop, value in props.items():
+        if prop not in spec['props']:
+            add('warning', 'unknown-prop', prop, f"{component} does not accept {prop}; it is ignored")
+            continue
+        if _is_expression(value):
+            add('warning', 'expression-prop', prop, f"{prop} is an expression and is not checked")
+            opaque.append(value)
+            # Stands in for the items, so values built from them are recognised as unchecked
+            value = [value] if spec['props'][prop]['array'] else value
+        elif spec['props'][prop]['array'] != isinstance(value, list):
+            expected = 'an array' if spec['props'][prop]['array'] else 'a single value'
+            add('error', 'invalid-prop', prop, f"{prop} must be {expected}; the component cannot render it")
+            value = UNDEFINED
+        values[prop] = value
+    for prop, declared in spec['props'].items():
+        if prop not in values:
+            if declared['required']:
+                add('error', 'missing-prop', prop, f"{component} requires {prop}")
+            values[prop] = UNDEFINED
+
+    jsonld = stringify(BUILDERS[component](values, context['business']))
+    for severity, code, path, message in context['subset'].check(jsonld, opaque=tuple(opaque)):
+        add(severity, code, path, message)
+
+    url_prop = PAGE_URL_PROPS[component]
+    url = props.get(url_prop)
+    if isinstance(url, str) and url_prop in spec['props'] and not _is_expression(url):
+        parts = urlsplit(url)
+        host, path = normalise_url(url)
+        if not parts.scheme:
+            add('error', 'url-host', url_prop, f"{url_prop} {url} is not absolute")
+        elif host != context['host']:
+            add('error', 'url-host', url_prop, f"{url_prop} host {host} is not {context['host']}")
+        elif canonical and not _is_expression(canonical) and path != normalise_url(canonical)[1]:
+            add('error', 'url-path', url_prop, f"{url_prop} and the canonical have different paths")
+
+    areas = context['areas']
+    for area in jsonld.get('areaServed') or ():
+        name = area.get('name', '') if isinstance(area, dict) else ''
+        if any(text in name for text in opaque):
+            continue
+        name = name[:-len(AREA_SUFFIX)] if name.endswith(AREA_SUFFIX) else name
+        if name not in areas:
+            add('warning', 'unknown-area', 'areaServed', f"{name} is not a catalogued suburb")
+    return issues
+
+
+def validate_page(data, context):
+    """Issues for every schema element on a page, given its raw bytes"""
+    entry = page_index.parse_page(data)
+    canonical = entry['urls'].get('canonical') or entry['urls'].get('canonicalUrl')
+    issues = []
+    for component in COMPONENTS:
+        for element in entry['components'].get(component, ()):
+            issues.extend(validate_element(component, element['props'], canonical, context))
+    return issues
+
+
+_context = None
+
+
+def _init_worker(context):
+    global _context
+    _context = context
+
+
+def _validate_job(job):
+    """Worker: hash one page and validate it unless the hash is already cached"""
+    path, cached_sha1 = job
+    with open(path, 'rb') as f:
+        data = f.read()
+    sha1 = hashlib.sha1(data).hexdigest()
+    if sha1 == cached_sha1:
+        return sha1, None
+    return sha1, validate_page(data, _context)
+
+
+def load_context(root, subset_path=SUBSET_PATH):
+    """Everything validation depends on besides the page, plus a digest of it for the cache"""
+    with open(os.path.join(root, SCHEMA_MARKUP), 'rb') as f:
+        markup = f.read()
+    with open(subset_path, 'rb') as f:
+        subset_bytes = f.read()
+    business, components = load_components(markup.decode('utf-8'))
+    registry = SlugRegistry()
+    areas = sorted({registry.to_display(name) for name in suburb_catalog.load_catalog().columns['name']}
+                   | set(REGION_AREAS))
+
+    digest = hashlib.sha1()
+    for part in (str(CACHE_VERSION).encode(), markup, subset_bytes, '\n'.join(areas).encode(), SITE_HOST.encode()):
+        digest.update(part)
+        digest.update(b'\0')
+    return {
+        'business': business,
+        'components': components,
+        'subset': SchemaSubset(json.loads(subset_bytes)),
+        'areas': frozenset(areas),
+        'host': SITE_HOST,
+        'digest': digest.hexdigest(),
+    }
+
+
+def default_cache_path(root):
+    digest = hashlib.sha1(os.path.realpath(root).encode()).hexdigest()[:12]
+    return os.path.join(page_index.CACHE_DIR, f"schema-validation-{digest}.json")
+
+
+def _load_cache(path, digest):
+    try:
+        with open(path, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cached.get('digest') != digest:
+        return {}
+    return cached.get('pages', {})
+
+
+def _save_cache(path, digest, pages):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({'digest': digest, 'pages': pages}, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def validate_project(root, workers=None, cache_path=None):
+    """Validate every page under src/pages; return ({page: issues}, counts)"""
+    pages_dir = os.path.join(root, 'src', 'pages')
+    context = load_context(root)
+    cache_path = cache_path or default_cache_path(root)
+    cached = _load_cache(cache_path, context['digest'])
+    found = watch_pages.snapshot(pages_dir)
+
+    entries = {}
+    jobs = []
+    for name in sorted(found):
+        mtime_ns, size = found[name]
+        entry = cached.get(name)
+        if entry and entry['mtime_ns'] == mtime_ns and entry['size'] == size:
+            entries[name] = entry
+        else:
+            jobs.append(name)
+
+    # Read and validate the changed pages, fanned out like the batch rewriter
+    args = [(os.path.join(pages_dir, name), (cached.get(name) or {}).get('sha1')) for name in jobs]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(jobs) < 2 * workers:
+        _init_worker(context)
+        computed = [_validate_job(job) for job in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(context,)) as pool:
+            computed = list(pool.map(_validate_job, args, chunksize=max(1, len(args) // (workers * 4))))
+
+    validated = 0
+    for name, (sha1, issues) in zip(jobs, computed):
+        if issues is None:
+            issues = cached[name]['issues']
+        else:
+            validated += 1
+        mtime_ns, size = found[name]
+        entries[name] = {'mtime_ns': mtime_ns, 'size': size, 'sha1': sha1, 'issues': issues}
+
+    if jobs or set(entries) != set(cached):
+        _save_cache(cache_path, context['digest'], entries)
+
+    results = {name: entry['issues'] for name, entry in entries.items()}
+    counts = {
+        'pages': len(entries),
+        'validated': validated,
+        'cached': len(entries) - validated,
+        'errors': sum(issue['severity'] == 'error' for issues in results.values() for issue in issues),
+        'warnings': sum(issue['severity'] == 'warning' for issues in results.values() for issue in issues),
+    }
+    return results, counts
+
+
+def group_issues(results):
+    """Issues grouped by (severity, code, component, path, message), most widespread first"""
+    groups = {}
+    for page, issues in results.items():
+        for issue in issues:
+            key = (issue['severity'], issue['code'], issue['component'], issue['path'], issue['message'])
+            groups.setdefault(key, []).append(page)
+    ordered = sorted(groups.items(), key=lambda item: (item[0][0] != 'error', -len(item[1]), item[0]))
+    return [dict(zip(('severity', 'code', 'component', 'path', 'message'), key), pages=sorted(pages))
+            for key, pages in ordered]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate the JSON-LD the schema components emit on every page")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for pages not in the cache (default: CPU count)")
+    parser.add_argument('--limit', type=int, default=10, help="issue groups listed, 0 for all (default: 10)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    parser.add_argument('--strict', action='store_true', help="exit with status 1 when any error is found")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results, counts = validate_project(os.path.abspath(args.root), workers=args.workers)
+    elapsed = time.perf_counter() - started
+    groups = group_issues(results)
+
+    if args.json:
+        print(json.dumps({'counts': counts, 'groups': groups, 'seconds': round(elapsed, 3)}, indent=2))
+    else:
+        affected = sum(1 for issues in results.values() if issues)
+        print(f"🔎 Checked {counts['pages']} pages ({counts['validated']} validated, {counts['cached']} from cache) "
+              f"in {elapsed:.3f}s")
+        shown = groups if args.limit == 0 else groups[:args.limit]
+        for group in shown:
+            icon = '❌' if group['severity'] == 'error' else '⚠️ '
+            pages = group['pages']
+            sample = ', '.join(pages[:3]) + (f" +{len(pages) - 3} more" if len(pages) > 3 else '')
+            print(f"  {icon} {group['component']} {group['path']}: {group['message']} "
+                  f"[{group['code']}] x{len(pages)} ({sample})")
+        if len(groups) > len(shown):
+            print(f"  ... {len(groups) - len(shown)} more issue group(s)")
+        print(f"\n{counts['errors']} error(s), {counts['warnings']} warning(s) on {affected} page(s)")
+
+    return 1 if args.strict and counts['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
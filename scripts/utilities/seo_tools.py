@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the SEO utility scripts.
+
+Every script keeps its own main(argv) and can still be run directly; this
+front end runs them as subcommands, several per invocation:
+
+    python3 seo_tools.py [--root PROJECT] COMMAND [ARGS...] [COMMAND [ARGS...] ...]
+
+A token that names a command starts the next command, so
+
+    python3 seo_tools.py --root ../other-checkout scan canonicals --dry-run sitemap --incremental
+
+scans the pages, dry-runs the location canonicals and regenerates the
+sitemap of another checkout. Commands run in order and the chain stops at
+the first one that fails.
+
+A command's module is only imported when the command runs, so --help, the
+command list and small commands start without loading NumPy, the process
+pool machinery or the other scripts. Commands chained in one invocation
+share the in-process page index (see page_index.py): the first command
+that scans a directory reads and parses its pages, and later ones only stat
+them again, so a page is read once unless a command rewrote it.
+
+--root is passed on to every command that takes one; without it each
+command uses the repository this script lives in. --report writes each
+command's exit status and duration to a JSON file (see site_batch.py).
+"""
+
+import importlib
+import json
+import os
+import sys
+import time
+
+# name: (module, takes --root, summary); summaries live here so listing them imports nothing
+COMMANDS = {
+    'scan': ('page_index', True, "index the page sources and report what they declare"),
+    'canonicals': ('update_location_canonicals', True, "add or update the canonical URLs of the location pages"),
+    'service-canonicals': ('update_canonicals', True, "add ServicePageSEO canonical URLs to the service pages"),
+    'area-served': ('update_area_served', True, "add catalogued neighbours to ServiceSchema areaServed"),
+    'sitemap': ('updated_sitemap_generator', True, "generate the page, service and location sitemaps and the sitemap index"),
+    'image-sitemap': ('image_sitemap', True, "generate sitemap-images.xml from the pages and the Vite build"),
+    'diff-locations': ('temp_location_converter', True, "compare location pages with the sitemap"),
+    'check': ('consistency_checker', True, "check pages, routes, sitemaps and canonicals agree"),
+    'schema': ('schema_validator', True, "validate the JSON-LD the schema components emit"),
+    'snippets': ('snippet_auditor', True, "audit titles and meta descriptions as search results show them"),
+    'links': ('link_graph', True, "analyse the internal-link graph"),
+    'duplicates': ('duplicate_content', True, "report near-duplicate location pages"),
+    'cannibalisation': ('keyword_cannibalisation', True, "report pages whose titles, H1s and descriptions target one query"),
+    'redirects': ('redirect_map', True, "compile old URL schemes into vercel.json redirects"),
+    'generate': ('location_page_generator', True, "render location pages from the template and suburb records"),
+    'bundle': ('bundle_budget', True, "per-route JS/CSS sizes and budgets from the Vite build manifest"),
+    'verify': ('link_verifier', True, "fetch every sitemap and canonical URL from a build"),
+    'indexnow': ('indexnow_notifier', True, "queue and submit changed URLs to IndexNow"),
+    'watch': ('watch_pages', True, "keep sitemaps and canonicals up to date as pages change"),
+    'sites': ('site_batch', False, "rebuild every site in sites.json concurrently"),
+    'lighthouse': ('lighthouse_history', False, "collect Lighthouse runs and report regressions"),
+    'catalog': ('suburb_catalog', False, "summarise or extend the suburb catalog"),
+}
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = [
+        "usage: seo_tools.py [--root PROJECT] [--report PATH] COMMAND [ARGS...] [COMMAND [ARGS...] ...]",
+        "",
+        "Run one or more SEO utilities; a token naming a command starts the next one.",
+        "",
+        "options:",
+        "  -h, --help      show this help message and exit",
+        "  --root PROJECT  project root passed to every command that takes one",
+        "                  (default: the repository this script lives in)",
+        "  --report PATH   write each command's status and duration to PATH as JSON",
+        "",
+        "commands (COMMAND --help for its options):",
+    ]
+    lines.extend(f"  {name:<{width}}  {summary}" for name, (_, _, summary) in COMMANDS.items())
+    return '\n'.join(lines)
+
+
+def split_commands(tokens):
+    """Split arguments that start with a command name into [(command, args)]"""
+    chain = []
+    for token in tokens:
+        if token in COMMANDS:
+            chain.append((token, []))
+        else:
+            chain[-1][1].append(token)
+    return chain
+
+
+def run_command(name, args, root=None):
+    """Import a command's module and run its main; return the exit status"""
+    module_name, takes_root, _ = COMMANDS[name]
+    module = importlib.import_module(module_name)
+    argv = (['--root', root] if root and takes_root else []) + list(args)
+    try:
+        status = module.main(argv)
+    except SystemExit as error:
+        # argparse exits for --help and usage errors
+        status = error.code
+    if status is None:
+        return 0
+    return status if isinstance(status, int) else 1
+
+
+def write_report(path, root, results):
+    """Write the chain's results atomically, so a reader never sees a partial report"""
+    failed = [result for result in results if result['status']]
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'root': root, 'status': failed[0]['status'] if failed else 0, 'commands': results}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    tokens = list(sys.argv[1:] if argv is None else argv)
+    root = None
+    report = None
+    while tokens and tokens[0] not in COMMANDS:
+        option = tokens.pop(0)
+        if option in ('-h', '--help'):
+            print(usage())
+            return 0
+        if option == '--root' and tokens:
+            root = os.path.abspath(tokens.pop(0))
+        elif option.startswith('--root='):
+            root = os.path.abspath(option[len('--root='):])
+        elif option == '--report' and tokens:
+            report = tokens.pop(0)
+        elif option.startswith('--report='):
+            report = option[len('--report='):]
+        else:
+            print(f"{usage().splitlines()[0]}\nseo_tools.py: error: unknown option or command: {option}", file=sys.stderr)
+            return 2
+    if not tokens:
+        print(usage(), file=sys.stderr)
+        return 2
+
+    chain = split_commands(tokens)
+    results = []
+    for position, (name, args) in enumerate(chain):
+        if len(chain) > 1:
+            print(f"\n▶️  {name} {' '.join(args)}".rstrip())
+        started = time.perf_counter()
+        status = run_command(name, args, root)
+        seconds = time.perf_counter() - started
+        results.append({'command': name, 'args': args, 'status': status, 'seconds': round(seconds, 3)})
+        if len(chain) > 1:
+            print(f"⏱️  {name} finished in {seconds:.3f}s")
+        if status:
+            skipped = [later for later, _ in chain[position + 1:]]
+            if skipped:
+                print(f"❌ {name} exited with status {status}, not running {', '.join(skipped)}", file=sys.stderr)
+            break
+    if report:
+        write_report(report, root, results)
+    return results[-1]['status']
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Run the SEO pipeline for every site in sites.json at once.
+
+Sister sites run off the same codebase from their own checkouts, each with
+its own canonical host, location URL scheme, suburb catalog and city
+centre. The URL scheme is the path pattern of a location page, such as
+/locations/{slug} or /services/mould-removal-{slug}; sites are served over
+https. sites.json lists them; roots and catalogs are relative to the file,
+and a site's Vite build is <root>/dist unless "dist" names another
+directory under its root:
+
+    {"version": 1, "sites": [{"name": "melbourne", "root": "../..", "path": "/locations/{slug}",
+                              "host": "mouldrestoration.com.au", "catalog": "suburb_catalog.json",
+                              "origin": [-37.8136, 144.9631]}]}
+
+Each site gets one seo_tools.py process running the chain
+
+    canonicals --site-url URL --path PATH
+    sitemap --incremental --site-url URL --path PATH --catalog ... --origin ...
+    image-sitemap --site-url URL --path PATH --dist DIST
+    check --host HOST --path PATH
+
+so every stage builds the site's own URLs, and a site's commands share its
+page index while sites share no module state. The image sitemap is written
+into the site's build, as `npm run build` does, and is skipped for a site
+that has not been built. The check reports issues without failing the site
+unless --strict is given.
+
+The processes run concurrently; with --jobs sites at a time the cores are
+split between them for the per-site worker pools, so a rebuild of several
+sites takes about as long as the slowest one. Every site writes
+its output to its own log under --log-dir, and the batch ends with one
+combined report. The exit status is 1 if any site failed.
+
+Usage:
+    python3 site_batch.py [--sites sites.json] [--only melbourne] [--dry-run] [--strict] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import page_index
+import suburb_catalog
+from page_transforms import LOCATION_PATH
+
+SITES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sites.json')
+SITES_VERSION = 1
+SEO_TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seo_tools.py')
+LOG_DIR = os.path.join(page_index.CACHE_DIR, 'site-batch')
+
+
+def load_sites(path=SITES_PATH):
+    """Load and check the site list, resolving paths against the file's directory"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != SITES_VERSION:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}")
+    base = os.path.dirname(os.path.abspath(path))
+    sites = []
+    for entry in data['sites']:
+        name = entry.get('name')
+        if not name or not entry.get('host'):
+            raise ValueError(f"{path}: every site needs a name and a host")
+        location_path = entry.get('path', LOCATION_PATH)
+        if not location_path.startswith('/') or '{slug}' not in location_path:
+            raise ValueError(f"{path}: {name}: path must start with / and contain {{slug}}, e.g. {LOCATION_PATH}")
+        sites.append({
+            'name': name,
+            'root': os.path.normpath(os.path.join(base, entry['root'])),
+            'host': entry['host'],
+            'site_url': f"https://{entry['host']}",
+            'path': location_path,
+            'dist': os.path.normpath(os.path.join(base, entry['root'], entry.get('dist', 'dist'))),
+            'catalog': os.path.normpath(os.path.join(base, entry.get('catalog', suburb_catalog.CATALOG_PATH))),
+            'origin': tuple(entry.get('origin', suburb_catalog.ORIGIN)),
+        })
+
+    for field in ('name', 'root'):
+        values = [site[field] for site in sites]
+        duplicated = sorted({value for value in values if values.count(value) > 1})
+        if duplicated:
+            # Two sites in one checkout would rewrite each other's pages and sitemaps
+            raise ValueError(f"{path}: more than one site uses the {field} {', '.join(duplicated)}")
+    return sites
+
+
+def site_chain(site, workers, dry_run=False, strict=False):
+    """The seo_tools.py arguments that rebuild one site"""
+    urls = ['--site-url', site['site_url'], '--path', site['path']]
+    canonicals = ['canonicals'] + urls + ['--workers', str(workers)]
+    # --origin=... so a negative latitude is not taken for an option
+    sitemap = ['sitemap', '--incremental'] + urls + ['--catalog', site['catalog'],
+                                                     f"--origin={','.join(str(value) for value in site['origin'])}"]
+    # Written into the build like `npm run build` does; without a build there is nothing to list it in
+    images = ['image-sitemap'] + urls + ['--dist', site['dist']] if os.path.isdir(site['dist']) else []
+    check = ['check', '--host', site['host'], '--path', site['path']] + (['--strict'] if strict else [])
+    if dry_run:
+        # The sitemap generator has no dry run; the check reads whatever is on disk
+        return canonicals + ['--dry-run'] + (images + ['--dry-run'] if images else []) + check
+    return canonicals + sitemap + images + check
+
+
+def run_site(site, workers, log_dir, dry_run=False, strict=False):
+    """Rebuild one site in its own process and return its part of the report"""
+    log_path = os.path.join(log_dir, f"{site['name']}.log")
+    report_path = os.path.join(log_dir, f"{site['name']}.report.json")
+    if os.path.exists(report_path):
+        os.remove(report_path)
+    command = [sys.executable, SEO_TOOLS, '--root', site['root'], '--report', report_path]
+    command += site_chain(site, workers, dry_run, strict)
+
+    started = time.perf_counter()
+    with open(log_path, 'w') as log:
+        status = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT,
+                                env=dict(os.environ, PYTHONUNBUFFERED='1')).returncode
+    seconds = time.perf_counter() - started
+
+    try:
+        with open(report_path, 'r') as f:
+            commands = json.load(f)['commands']
+    except (OSError, ValueError):
+        # The chain crashed before it could report
+        commands = []
+    return {
+        'name': site['name'],
+        'root': site['root'],
+        'site_url': site['site_url'],
+        'path': site['path'],
+        'status': status,
+        'seconds': round(seconds, 3),
+        'commands': commands,
+        'log': log_path,
+    }
+
+
+def run_sites(sites, jobs=None, workers=None, log_dir=LOG_DIR, dry_run=False, strict=False):
+    """Rebuild every site, jobs at a time, and return the reports in site order"""
+    os.makedirs(log_dir, exist_ok=True)
+    jobs = max(1, min(jobs or len(sites), len(sites)))
+    workers = workers or max(1, (os.cpu_count() or 1) // jobs)
+    # Threads only wait on the site processes, which do the work
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(run_site, site, workers, log_dir, dry_run, strict) for site in sites]
+        return [future.result() for future in futures]
+
+
+def print_report(results, seconds):
+    total = sum(result['seconds'] for result in results)
+    slowest = max(results, key=lambda result: result['seconds'])
+    print(f"🌐 Rebuilt {len(results)} site(s) in {seconds:.2f}s "
+          f"(slowest {slowest['name']} {slowest['seconds']:.2f}s, {total:.2f}s summed)")
+    width = max(len(result['name']) for result in results)
+    for result in results:
+        steps = '  '.join(
+            f"{command['command']} {command['seconds']:.2f}s" + (f" ❌ {command['status']}" if command['status'] else '')
+            for command in result['commands'])
+        if not result['commands']:
+            steps = f"exited with status {result['status']} before reporting"
+        icon = '❌' if result['status'] else '✅'
+        print(f"  {icon} {result['name']:<{width}}  {result['site_url']}{result['path']}  {steps}")
+        if result['status']:
+            print(f"     see {result['log']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run canonicals, sitemaps and check for every configured site")
+    parser.add_argument('--sites', default=SITES_PATH, help="site list (default: %(default)s)")
+    parser.add_argument('--only', nargs='+', metavar='NAME', help="only rebuild these sites")
+    parser.add_argument('--jobs', type=int, default=None, help="sites rebuilt at once (default: all)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes per site (default: the cores divided between the running sites)")
+    parser.add_argument('--log-dir', default=LOG_DIR, help="directory for the per-site logs (default: %(default)s)")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="diff the canonicals and run the check without writing pages or sitemaps")
+    parser.add_argument('--strict', action='store_true', help="fail a site when its consistency check finds issues")
+    parser.add_argument('--json', action='store_true', help="print the combined report as JSON")
+    args = parser.parse_args(argv)
+
+    sites = load_sites(args.sites)
+    if args.only:
+        unknown = sorted(set(args.only) - {site['name'] for site in sites})
+        if unknown:
+            parser.error(f"unknown site(s): {', '.join(unknown)}")
+        sites = [site for site in sites if site['name'] in args.only]
+    if not sites:
+        print(f"No sites configured in {args.sites}")
+        return 0
+
+    started = time.perf_counter()
+    results = run_sites(sites, args.jobs, args.workers, args.log_dir, args.dry_run, args.strict)
+    seconds = time.perf_counter() - started
+    failed = [result for result in results if result['status']]
+
+    if args.json:
+        print(json.dumps({'seconds': round(seconds, 3), 'failed': len(failed), 'sites': results}, indent=2))
+    else:
+        print_report(results, seconds)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Streaming sitemap writer.
+
+Entries are written to the open file handle as they are added, so memory use
+does not grow with the number of URLs. Output is split into numbered shards
+whenever a shard would exceed the URL or byte limit from the sitemaps.org
+protocol (50,000 URLs / 50 MB uncompressed), and can optionally be gzipped.
+
+For incremental builds the writer can run in hash-only mode to learn each
+shard's digest without touching disk, and then in atomic mode with a set of
+shards to skip, so only shards whose content changed are rewritten (via a
+temporary file and os.replace).
+
+Usage:
+    with SitemapWriter(public_dir, 'sitemap-locations') as writer:
+        writer.add('https://mouldrestoration.com.au/locations/kew', priority=0.9)
+    write_sitemap_index(os.path.join(public_dir, 'sitemap.xml'), [...])
+"""
+
+import gzip
+import hashlib
+import os
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+IMAGE_NS = 'http://www.google.com/schemas/sitemap-image/1.1'
+
+URLSET_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"{extra_ns}
+        xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+        xsi:schemaLocation="http://www.sitemaps.org/schemas/sitemap/0.9
+        http://www.sitemaps.org/schemas/sitemap/0.9/sitemap.xsd">
+
+'''
+URLSET_FOOTER = '</urlset>\n'
+
+INDEX_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+'''
+INDEX_FOOTER = '</sitemapindex>\n'
+
+_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def format_url(loc, lastmod=None, changefreq=None, priority=None, extra=''):
+    """Render a single <url> entry"""
+    lines = ['  <url>', f'    <loc>{escape(loc)}</loc>']
+    if lastmod:
+        lines.append(f'    <lastmod>{lastmod}</lastmod>')
+    if changefreq:
+        lines.append(f'    <changefreq>{changefreq}</changefreq>')
+    if priority is not None:
+        lines.append(f'    <priority>{priority}</priority>')
+    if extra:
+        lines.append(extra.rstrip('\n'))
+    lines.append('  </url>\n')
+    return '\n'.join(lines)
+
+
+class SitemapWriter:
+    """Write <url> entries into one or more numbered sitemap shards.
+
+    Shards are named <basename>-1.xml, <basename>-2.xml, ... while writing.
+    If everything fits in one shard it is renamed to <basename>.xml on close,
+    so small sites keep their existing file name.
+
+    hash_only computes the shard names and digests without writing anything.
+    atomic writes each shard to a temporary file and renames it into place.
+    skip_shards is a set of 0-based shard numbers that are hashed but not
+    written, for shards already known to be up to date.
+    """
+
+    def __init__(self, directory, basename, max_urls=MAX_URLS, max_bytes=MAX_BYTES,
+                 gzip_output=False, image_namespace=False, header_comments=(),
+                 hash_only=False, atomic=False, skip_shards=()):
+        if max_urls < 1:
+            raise ValueError("max_urls must be at least 1")
+        self.directory = directory
+        self.basename = basename
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.gzip_output = gzip_output
+        self.header = URLSET_HEADER.format(
+            extra_ns=f'\n        xmlns:image="{IMAGE_NS}"' if image_namespace else '')
+        if header_comments:
+            self.header += ''.join(f'  <!-- {text} -->\n' for text in header_comments) + '\n'
+        self.hash_only = hash_only
+        self.atomic = atomic
+        self.skip_shards = set(skip_shards)
+        self.shards = []
+        self.digests = []
+        self.written = []
+        self.total_urls = 0
+        self._handle = None
+        self._hash = None
+        self._tmp_path = None
+        self._open = False
+        self._urls = 0
+        self._bytes = 0
+
+    @property
+    def extension(self):
+        return '.xml.gz' if self.gzip_output else '.xml'
+
+    def _shard_path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _open_shard(self):
+        number = len(self.shards)
+        name = f"{self.basename}-{number + 1}{self.extension}"
+        path = self._shard_path(name)
+        self._handle = None
+        if not self.hash_only and number not in self.skip_shards:
+            self._tmp_path = f"{path}.tmp" if self.atomic else None
+            target = self._tmp_path or path
+            if self.gzip_output:
+                # Fixed mtime keeps the compressed output byte-for-byte reproducible
+                self._handle = gzip.GzipFile(target, 'wb', mtime=0)
+            else:
+                self._handle = open(target, 'wb')
+        self.shards.append(name)
+        self._hash = hashlib.sha1()
+        self._open = True
+        self._urls = 0
+        self._bytes = 0
+        self._write(self.header)
+
+    def _close_shard(self, keep=True):
+        if not self._open:
+            return
+        self._write(URLSET_FOOTER)
+        self.digests.append(self._hash.hexdigest())
+        self._open = False
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+        if self._tmp_path:
+            if keep:
+                os.replace(self._tmp_path, self._tmp_path[:-len('.tmp')])
+            else:
+                os.remove(self._tmp_path)
+            self._tmp_path = None
+        if keep:
+            self.written.append(self.shards[-1])
+
+    def _write(self, text):
+        data = text.encode('utf-8')
+        self._hash.update(data)
+        if self._handle is not None:
+            self._handle.write(data)
+        self._bytes += len(data)
+
+    def _fits(self, size):
+        footer = len(URLSET_FOOTER)
+        return self._urls < self.max_urls and self._bytes + size + footer <= self.max_bytes
+
+    def comment(self, text):
+        """Write an XML comment into the current shard"""
+        if not self._open:
+            self._open_shard()
+        self._write(f'  <!-- {text} -->\n')
+
+    def blank_line(self):
+        if self._open:
+            self._write('\n')
+
+    def add(self, loc, lastmod=None, changefreq=None, priority=None, extra=''):
+        """Stream one <url> entry, starting a new shard if this one is full.
+
+        Raises ValueError for an entry that would not fit even in a new shard,
+        rather than starting shards that hold no URLs.
+        """
+        entry = format_url(loc, lastmod, changefreq, priority, extra)
+        size = len(entry.encode('utf-8'))
+        if len(self.header.encode('utf-8')) + size + len(URLSET_FOOTER) > self.max_bytes:
+            raise ValueError(f"sitemap entry for {loc} is {size} bytes, too large for a {self.max_bytes}-byte shard")
+        if not self._open:
+            self._open_shard()
+        elif not self._fits(size) and self._urls:
+            self._close_shard()
+            self._open_shard()
+        self._write(entry)
+        self._urls += 1
+        self.total_urls += 1
+
+    def close(self):
+        """Finish the last shard and return the list of shard file names"""
+        if not self._open and not self.shards:
+            self._open_shard()
+        self._close_shard()
+        count = len(self.shards)
+        single = f"{self.basename}{self.extension}"
+        if count == 1:
+            if self.written:
+                os.replace(self._shard_path(self.shards[0]), self._shard_path(single))
+                self.written = [single]
+            self.shards = [single]
+        if self.hash_only:
+            return list(self.shards)
+        if count > 1 and os.path.exists(self._shard_path(single)):
+            os.remove(self._shard_path(single))
+        self._remove_stale_shards(count + 1)
+        return list(self.shards)
+
+    def _remove_stale_shards(self, number):
+        """Delete higher-numbered shards left over from a previous, larger run"""
+        while True:
+            path = self._shard_path(f"{self.basename}-{number}{self.extension}")
+            if not os.path.exists(path):
+                break
+            os.remove(path)
+            number += 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._close_shard(keep=False)
+
+
+def file_digest(path):
+    """Return the SHA-1 of a sitemap file's uncompressed content as the writer hashes it, or None if it is missing"""
+    digest = hashlib.sha1()
+    try:
+        with (gzip.open if path.endswith('.gz') else open)(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    except (OSError, EOFError):
+        return None
+    return digest.hexdigest()
+
+
+def write_sitemap_index(path, sitemaps, lastmod=None, only_if_changed=False):
+    """Write a <sitemapindex> pointing at the given sitemap URLs.
+
+    sitemaps is an iterable of URLs or (url, lastmod) pairs and is consumed
+    lazily. The index is written to a temporary file and renamed into place;
+    with only_if_changed the temporary file is dropped instead when it matches
+    the index already at path, so an unchanged index is not touched.
+    """
+    count = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(INDEX_HEADER)
+        for item in sitemaps:
+            if isinstance(item, tuple):
+                loc, item_lastmod = item
+            else:
+                loc, item_lastmod = item, lastmod
+            f.write('  <sitemap>\n')
+            f.write(f'    <loc>{escape(loc)}</loc>\n')
+            if item_lastmod:
+                f.write(f'    <lastmod>{item_lastmod}</lastmod>\n')
+            f.write('  </sitemap>\n')
+            count += 1
+        f.write(INDEX_FOOTER)
+    if only_if_changed and file_digest(tmp_path) == file_digest(path):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+    return count
+
+
+def add_to_sitemap_index(path, locs):
+    """Add the sitemap URLs missing from the index at path, keeping its entries; returns the URLs added.
+
+    Tools that write their sitemap into the build after Vite has copied
+    public/sitemap.xml there register it in that copy this way.
+    """
+    entries = [(sitemap.findtext(f'{_NS}loc'), sitemap.findtext(f'{_NS}lastmod'))
+               for sitemap in ElementTree.parse(path).getroot()]
+    listed = {loc for loc, _ in entries}
+    added = [loc for loc in locs if loc not in listed]
+    if added:
+        write_sitemap_index(path, entries + [(loc, None) for loc in added], only_if_changed=True)
+    return added
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Single source of truth for suburb name conversions.
+
+Location pages are named in CamelCase (MelbourneCBD.tsx), URLs use kebab-case
+(/locations/melbourne-cbd) and copy uses display names (Melbourne CBD). The
+scripts used to carry three slightly different converters; this registry
+builds one bidirectional CamelCase <-> kebab <-> display table up front, so
+every later conversion is a dictionary lookup. Names that are not in the
+table yet are converted once by the rules below and then memoised.
+
+Usage:
+    from slug_registry import SlugRegistry
+    registry = SlugRegistry(stems_from_page_index)
+    registry.to_kebab('McKinnon')        # 'mckinnon'
+    registry.to_camel('melbourne-cbd')   # 'MelbourneCBD'
+    registry.to_display('StKildaEast')   # 'St Kilda East'
+
+Run directly to self-check every location page name.
+"""
+
+import os
+import re
+import sys
+
+# Names the word-splitting rules get wrong: CamelCase -> (kebab, display)
+SPECIAL_NAMES = {
+    'McKinnon': ('mckinnon', 'McKinnon'),
+}
+
+# Words kept upper-case when converting back from kebab-case
+ACRONYMS = {'cbd': 'CBD', 'se': 'SE'}
+
+# Word boundaries: capitalised words, acronym runs not followed by lower-case, digit runs
+_WORDS = re.compile(r'[A-Z][a-z]+|[A-Z]+(?![a-z])|[a-z]+|\d+')
+
+
+def _strip_extension(name):
+    return name[:-4] if name.endswith('.tsx') else name
+
+
+def split_words(camel):
+    """Split a CamelCase suburb name into its words"""
+    return _WORDS.findall(camel)
+
+
+def rule_kebab(camel):
+    """Rule-based CamelCase -> kebab-case"""
+    if camel in SPECIAL_NAMES:
+        return SPECIAL_NAMES[camel][0]
+    return '-'.join(word.lower() for word in split_words(camel))
+
+
+def rule_display(camel):
+    """Rule-based CamelCase -> display name"""
+    if camel in SPECIAL_NAMES:
+        return SPECIAL_NAMES[camel][1]
+    return ' '.join(split_words(camel))
+
+
+def rule_camel(kebab):
+    """Rule-based kebab-case -> CamelCase"""
+    for camel, (special_kebab, _) in SPECIAL_NAMES.items():
+        if kebab == special_kebab:
+            return camel
+    return ''.join(ACRONYMS.get(part, part.capitalize()) for part in kebab.split('-') if part)
+
+
+class SlugRegistry:
+    """Bidirectional CamelCase / kebab-case / display-name table"""
+
+    def __init__(self, names=()):
+        self.kebab_by_camel = {}
+        self.camel_by_kebab = {}
+        self.display_by_camel = {}
+        self.camel_by_display = {}
+        self.collisions = []
+        self.bulk_add(names)
+
+    def add(self, name):
+        """Register a CamelCase name (a trailing .tsx is ignored) and return it"""
+        camel = _strip_extension(name)
+        if camel in self.kebab_by_camel:
+            return camel
+        kebab = rule_kebab(camel)
+        display = rule_display(camel)
+        existing = self.camel_by_kebab.get(kebab)
+        if existing is not None and existing != camel:
+            self.collisions.append((kebab, existing, camel))
+        self.kebab_by_camel[camel] = kebab
+        self.display_by_camel[camel] = display
+        self.camel_by_kebab.setdefault(kebab, camel)
+        self.camel_by_display.setdefault(display, camel)
+        return camel
+
+    def bulk_add(self, names):
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self.kebab_by_camel)
+
+    def __contains__(self, name):
+        return _strip_extension(name) in self.kebab_by_camel
+
+    def to_kebab(self, name):
+        """CamelCase (or Page.tsx) -> kebab-case"""
+        kebab = self.kebab_by_camel.get(name)
+        if kebab is None:
+            kebab = self.kebab_by_camel[self.add(name)]
+        return kebab
+
+    def to_display(self, name):
+        """CamelCase (or Page.tsx) -> display name"""
+        display = self.display_by_camel.get(name)
+        if display is None:
+            display = self.display_by_camel[self.add(name)]
+        return display
+
+    def to_camel(self, kebab):
+        """kebab-case -> CamelCase"""
+        camel = self.camel_by_kebab.get(kebab)
+        if camel is None:
+            camel = self.add(rule_camel(kebab))
+        return camel
+
+    def from_display(self, display):
+        """Display name -> CamelCase"""
+        camel = self.camel_by_display.get(display)
+        if camel is None:
+            camel = self.add(display.replace(' ', ''))
+        return camel
+
+    def bulk_to_kebab(self, names):
+        """Convert many CamelCase names; known names cost one lookup each"""
+        lookup = self.kebab_by_camel.get
+        return [lookup(name) or self.to_kebab(name) for name in names]
+
+    def bulk_to_camel(self, kebabs):
+        lookup = self.camel_by_kebab.get
+        return [lookup(kebab) or self.to_camel(kebab) for kebab in kebabs]
+
+    def bulk_to_display(self, names):
+        lookup = self.display_by_camel.get
+        return [lookup(name) or self.to_display(name) for name in names]
+
+    def self_check(self, legacy=True):
+        """Return a list of human-readable problems with the table.
+
+        Checks that every name round-trips through kebab-case and display
+        form, that no two names share a slug, and (with legacy) where the
+        converters the scripts used to carry disagree with the registry.
+        """
+        problems = []
+        for kebab, first, second in self.collisions:
+            problems.append(f"{first} and {second} both map to '{kebab}'")
+        for camel, kebab in sorted(self.kebab_by_camel.items()):
+            if rule_camel(kebab) != camel and self.camel_by_kebab.get(kebab) == camel:
+                problems.append(f"{camel} -> '{kebab}' only round-trips through the table "
+                                f"(rules give {rule_camel(kebab)})")
+            display = self.display_by_camel[camel]
+            if display.replace(' ', '') != camel:
+                problems.append(f"{camel} -> display '{display}' does not round-trip")
+            if legacy:
+                for label, convert in LEGACY_CONVERTERS.items():
+                    old = convert(camel)
+                    if old != kebab:
+                        problems.append(f"{camel}: {label} gave '{old}', registry gives '{kebab}'")
+        return problems
+
+
+# The converters the scripts used before the registry, kept for self_check()
+def _legacy_two_pass(name):
+    special_cases = {
+        "MelbourneCBD": "melbourne-cbd",
+        "StKilda": "st-kilda",
+        "StKildaEast": "st-kilda-east",
+        "WheelersHillSE": "wheelers-hill-se",
+    }
+    if name in special_cases:
+        return special_cases[name]
+    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
+    return re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1).lower()
+
+
+def _legacy_sitemap(name):
+    if name == "McKinnon":
+        return "mckinnon"
+    return _legacy_two_pass(name)
+
+
+def _legacy_single_pass(name):
+    # Its special-case table only repeated the rule output, apart from MelbourneCBD
+    if name == 'MelbourneCBD':
+        return 'melbourne-cbd'
+    return re.sub('([a-z])([A-Z])', r'\1-\2', name).lower()
+
+
+LEGACY_CONVERTERS = {
+    'temp_location_converter.camel_to_kebab': _legacy_two_pass,
+    'updated_sitemap_generator.camel_to_kebab': _legacy_sitemap,
+    'update_location_canonicals.suburb_to_url_slug': _legacy_single_pass,
+}
+
+
+if __name__ == '__main__':
+    import page_index
+
+    target = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src', 'pages', 'locations')
+    registry = SlugRegistry(entry['stem'] for entry in page_index.scan_pages(target).values())
+    problems = registry.self_check(legacy=False)
+    print(f"Checked {len(registry)} suburb names")
+    for problem in registry.self_check():
+        print(f"  {problem}")
+    # Legacy disagreements are informational; only registry problems fail the check
+    sys.exit(1 if problems else 0)
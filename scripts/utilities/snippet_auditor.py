@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+SERP snippet auditor for page titles and meta descriptions.
+
+Titles and descriptions come from three places that drift apart:
+
+  page       - the title/description props of LocationPageSEO and
+               ServicePageSEO in each page (descriptions passed as
+               getSuburbMetaDescription('slug') are resolved to the table)
+  table      - SUBURB_META_DESCRIPTIONS in src/components/seo/MetaDescriptions.tsx
+  generator  - page_transforms.generate_suburb_title_description, which the
+               canonical injector writes into pages that lack LocationPageSEO
+
+All of them are extracted into one columnar table, one row per
+(url, source, field). Rendered widths are measured in pixels the way Google
+lays the snippet out (Arial, 20px titles, 14px descriptions): every string is
+concatenated into one array of code points and looked up in a precomputed
+per-glyph advance-width table, so the whole corpus is measured with a few
+NumPy operations instead of a Python loop per character. The auditor then
+reports:
+
+  truncated      - wider than the SERP cut-off, with where the cut falls
+  duplicates     - the same text on several URLs, exactly or once the
+                   page's own suburb name, case and punctuation are ignored,
+                   found through a hash index keyed by the normalised text
+  disagreements  - the sources give different text for the same suburb
+
+Props left unset fall back to text SEOHead generates at runtime; they are
+counted but not measured.
+
+Usage:
+    python3 snippet_auditor.py [--root PROJECT] [--limit 10] [--json]
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+import page_index
+from consistency_checker import normalise_url
+from page_transforms import SUBURBS, generate_suburb_title_description, location_canonical_url
+
+SOURCES = ('page', 'table', 'generator')
+FIELDS = ('title', 'description')
+
+# Google's desktop SERP: font size and the width at which text is cut off, in pixels
+FONT_PX = {'title': 20, 'description': 14}
+LIMIT_PX = {'title': 600, 'description': 920}
+
+# Arial advance widths in 1/1000 em for U+0020 .. U+007E
+_ASCII_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,   # space .. /
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,   # 0 .. ?
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,  # @ .. O
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,   # P .. _
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,   # ` .. o
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,        # p .. ~
+)
+# Punctuation and accented letters that turn up in copy
+_EXTRA_WIDTHS = {
+    0x00A0: 278, 0x00A9: 737, 0x00AE: 737, 0x00B7: 278, 0x00E9: 556, 0x00E8: 556,
+    0x2013: 556, 0x2014: 1000, 0x2018: 222, 0x2019: 222, 0x201C: 333, 0x201D: 333,
+    0x2022: 350, 0x2026: 1000, 0x2122: 1000,
+}
+# Used for every code point not in the table
+DEFAULT_WIDTH = 556
+
+
+def _glyph_table():
+    # One slot per code point up to the last known glyph, plus a final default slot
+    table = np.full(max(_EXTRA_WIDTHS) + 2, DEFAULT_WIDTH, dtype=np.float64)
+    table[0x20:0x7F] = _ASCII_WIDTHS
+    for code, width in _EXTRA_WIDTHS.items():
+        table[code] = width
+    return table
+
+
+GLYPH_WIDTHS = _glyph_table()
+
+_TABLE_ENTRY = re.compile(
+    rb"""['"]([\w-]+)['"]:\s*\{\s*name:\s*'((?:[^'\\]|\\.)*)',\s*slug:\s*'((?:[^'\\]|\\.)*)',"""
+    rb"""\s*description:\s*'((?:[^'\\]|\\.)*)'""")
+_TABLE_FALLBACK = re.compile(rb'`(Mould removal \$\{suburbSlug[^`]*)`')
+_META_LOOKUP = re.compile(rb"""const\s+(\w+)\s*=\s*getSuburbMetaDescription\(\s*['"]([^'"]+)['"]\s*\)""")
+_JS_ESCAPE = re.compile(r"\\(.)")
+_NON_WORD = re.compile(r'[^a-z0-9]+')
+
+
+def measure(texts, font_px, limit_px):
+    """Return (widths, fits) for a list of strings.
+
+    widths is each string's rendered width in pixels; fits is how many of
+    its characters fit within limit_px.
+    """
+    if not texts:
+        return np.zeros(0), np.zeros(0, dtype=np.int64)
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+    advances = GLYPH_WIDTHS[np.minimum(codes, len(GLYPH_WIDTHS) - 1)] * (font_px / 1000.0)
+    cumulative = np.concatenate(([0.0], np.cumsum(advances)))
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    widths = cumulative[ends] - cumulative[starts]
+    # Last code point whose right edge is still inside the limit
+    fits = np.searchsorted(cumulative, cumulative[starts] + limit_px, side='right') - 1 - starts
+    return widths, np.minimum(fits, lengths)
+
+
+def _js_string(raw):
+    return _JS_ESCAPE.sub(r'\1', raw.decode('utf-8'))
+
+
+def load_meta_table(path):
+    """Return ({slug: {'name', 'description'}}, fallback template) from MetaDescriptions.tsx"""
+    if not os.path.exists(path):
+        return {}, None
+    with open(path, 'rb') as f:
+        data = f.read()
+    table = {}
+    for key, name, slug, description in _TABLE_ENTRY.findall(data):
+        table[_js_string(slug)] = {'name': _js_string(name), 'description': _js_string(description)}
+    fallback = _TABLE_FALLBACK.search(data)
+    return table, fallback.group(1).decode('utf-8') if fallback else None
+
+
+def table_description(table, fallback, slug):
+    """What getSuburbMetaDescription(slug) returns"""
+    if slug in table:
+        return table[slug]['description']
+    if fallback is None:
+        return None
+    return fallback.replace("${suburbSlug.replace(/-/g, ' ')}", slug.replace('-', ' '))
+
+
+def normalise_text(text, suburb=None):
+    """Key for near-exact matching: the suburb name, case and punctuation are ignored"""
+    text = text.lower()
+    if suburb:
+        text = text.replace(suburb.lower(), ' suburbname ')
+    return _NON_WORD.sub(' ', text).strip()
+
+
+class SnippetTable:
+    """Columnar table of every title and description, one row per (url, source, field)"""
+
+    COLUMNS = ('url', 'slug', 'suburb', 'source', 'field', 'text', 'origin')
+
+    def __init__(self):
+        self.columns = {column: [] for column in self.COLUMNS}
+        self.defaulted = []
+        self.unresolved = []
+
+    def __len__(self):
+        return len(self.columns['text'])
+
+    def add(self, url, slug, suburb, source, field, text, origin):
+        for column, value in zip(self.COLUMNS, (url, slug, suburb, source, field, text, origin)):
+            self.columns[column].append(value)
+
+    def rows(self, field):
+        """Indices of the rows for one field"""
+        return [i for i, value in enumerate(self.columns['field']) if value == field]
+
+
+def collect(root):
+    """Extract every title and description under a project root into a SnippetTable"""
+    snippets = SnippetTable()
+    locations_dir = os.path.join(root, 'src', 'pages', 'locations')
+    pages_dir = os.path.join(root, 'src', 'pages')
+    table, fallback = load_meta_table(os.path.join(root, 'src', 'components', 'seo', 'MetaDescriptions.tsx'))
+    page_urls = {}
+
+    for directory, component, location in ((locations_dir, 'LocationPageSEO', True),
+                                            (pages_dir, 'ServicePageSEO', False)):
+        if not os.path.isdir(directory):
+            continue
+        relative = os.path.relpath(directory, root)
+        for filename, entry in sorted(page_index.scan_pages(directory).items()):
+            elements = entry['components'].get(component)
+            if not elements:
+                continue
+            props = elements[0]['props']
+            stem = entry['stem']
+            origin = f"{relative}/{filename}"
+            canonical = props.get('canonical') or props.get('canonicalUrl')
+            if location:
+                slug = SUBURBS.to_kebab(stem)
+                suburb = SUBURBS.to_display(stem)
+                url = normalise_url(canonical if isinstance(canonical, str) else location_canonical_url(filename))[1]
+                page_urls[slug] = url
+            else:
+                slug = suburb = None
+                url = normalise_url(canonical)[1] if isinstance(canonical, str) else f"/{stem}"
+
+            source_data = None
+            for field in FIELDS:
+                value = props.get(field)
+                if value is None:
+                    snippets.defaulted.append((url, field, origin))
+                    continue
+                if isinstance(value, str) and value.startswith('{'):
+                    # description={suburbMetaDescription}, bound from getSuburbMetaDescription('slug')
+                    if source_data is None:
+                        source_data = page_index.read_page(directory, filename)
+                    lookups = dict(_META_LOOKUP.findall(source_data))
+                    lookup = lookups.get(value[1:-1].strip().encode('utf-8'))
+                    value = table_description(table, fallback, lookup.decode('utf-8')) if lookup else None
+                    if value is None:
+                        snippets.unresolved.append((url, field, origin))
+                        continue
+                elif isinstance(value, str):
+                    value = html.unescape(value)
+                else:
+                    snippets.unresolved.append((url, field, origin))
+                    continue
+                snippets.add(url, slug, suburb, 'page', field, value, origin)
+
+            if location:
+                title, description = generate_suburb_title_description(filename)
+                snippets.add(url, slug, suburb, 'generator', 'title', title, 'page_transforms.py')
+                snippets.add(url, slug, suburb, 'generator', 'description', description, 'page_transforms.py')
+
+    for slug, row in sorted(table.items()):
+        url = page_urls.get(slug) or normalise_url(location_canonical_url(SUBURBS.to_camel(slug)))[1]
+        snippets.add(url, slug, row['name'], 'table', 'description', row['description'],
+                     'src/components/seo/MetaDescriptions.tsx')
+    return snippets
+
+
+def find_truncated(snippets, field):
+    """Rows of one field wider than the SERP limit, widest first"""
+    rows = snippets.rows(field)
+    texts = [snippets.columns['text'][i] for i in rows]
+    widths, fits = measure(texts, FONT_PX[field], LIMIT_PX[field])
+    over = np.flatnonzero(widths > LIMIT_PX[field])
+    found = []
+    for position in over[np.argsort(-widths[over], kind='stable')]:
+        i = rows[position]
+        text = texts[position]
+        found.append({
+            'url': snippets.columns['url'][i],
+            'source': snippets.columns['source'][i],
+            'width': round(float(widths[position]), 1),
+            'shown': text[:int(fits[position])].rstrip() + ' ...',
+            'origin': snippets.columns['origin'][i],
+        })
+    return found, widths
+
+
+def find_duplicates(snippets, field):
+    """Return (exact, near) groups of URLs sharing a text.
+
+    Both go through a hash index keyed by the text (exact) or by its
+    normalised form (near); a group only counts when it spans several URLs.
+    Near groups that are a single exact text are left to the exact list.
+    """
+    exact = {}
+    near = {}
+    columns = snippets.columns
+    for i in snippets.rows(field):
+        text = columns['text'][i]
+        exact.setdefault(text, set()).add(columns['url'][i])
+        group = near.setdefault(normalise_text(text, columns['suburb'][i]), {'urls': set(), 'texts': set()})
+        group['urls'].add(columns['url'][i])
+        group['texts'].add(text)
+
+    exact_groups = [{'text': text, 'urls': sorted(urls)} for text, urls in exact.items() if len(urls) > 1]
+    near_groups = [{'text': min(group['texts']), 'variants': len(group['texts']), 'urls': sorted(group['urls'])}
+                   for group in near.values() if len(group['urls']) > 1 and len(group['texts']) > 1]
+    exact_groups.sort(key=lambda group: -len(group['urls']))
+    near_groups.sort(key=lambda group: -len(group['urls']))
+    return exact_groups, near_groups
+
+
+def find_disagreements(snippets, field):
+    """Suburbs whose sources give different text for a field"""
+    by_slug = {}
+    columns = snippets.columns
+    for i in snippets.rows(field):
+        slug = columns['slug'][i]
+        if slug is not None:
+            by_slug.setdefault(slug, {})[columns['source'][i]] = (columns['url'][i], columns['text'][i])
+
+    found = []
+    for slug, values in sorted(by_slug.items()):
+        texts = {source: text for source, (_, text) in values.items()}
+        if len(set(texts.values())) < 2:
+            continue
+        pairs = [f"{a}!={b}" for n, a in enumerate(SOURCES) for b in SOURCES[n + 1:]
+                 if a in texts and b in texts and texts[a] != texts[b]]
+        url = values.get('page', next(iter(values.values())))[0]
+        found.append({'url': url, 'slug': slug, 'pairs': pairs, 'texts': texts})
+    return found
+
+
+def audit(root):
+    """Run every check and return the report as a dict"""
+    snippets = collect(root)
+    report = {
+        'rows': len(snippets),
+        'sources': {source: snippets.columns['source'].count(source) for source in SOURCES},
+        'defaulted': [{'url': url, 'field': field, 'origin': origin} for url, field, origin in snippets.defaulted],
+        'unresolved': [{'url': url, 'field': field, 'origin': origin} for url, field, origin in snippets.unresolved],
+        'fields': {},
+    }
+    for field in FIELDS:
+        truncated, widths = find_truncated(snippets, field)
+        exact, near = find_duplicates(snippets, field)
+        disagreements = find_disagreements(snippets, field)
+        pair_counts = {}
+        for item in disagreements:
+            for pair in item['pairs']:
+                pair_counts[pair] = pair_counts.get(pair, 0) + 1
+        report['fields'][field] = {
+            'median_width': round(float(np.median(widths)), 1) if len(widths) else 0.0,
+            'truncated': truncated,
+            'exact_duplicates': exact,
+            'near_duplicates': near,
+            'disagreements': disagreements,
+            'disagreement_pairs': pair_counts,
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit page titles and meta descriptions as they render in search results")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--limit', type=int, default=10, help="entries listed per section, 0 for all (default: 10)")
+    parser.add_argument('--json', action='store_true', help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = audit(os.path.abspath(args.root))
+    report['seconds'] = round(time.perf_counter() - started, 3)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    def shown(items):
+        return items if args.limit == 0 else items[:args.limit]
+
+    sources = ', '.join(f"{count} {source}" for source, count in report['sources'].items())
+    print(f"🔎 Audited {report['rows']} snippets ({sources}) in {report['seconds']:.3f}s")
+    if report['defaulted']:
+        print(f"   {len(report['defaulted'])} prop(s) unset, SEOHead generates them at runtime")
+    if report['unresolved']:
+        print(f"⚠️  {len(report['unresolved'])} prop(s) are expressions the auditor cannot resolve")
+
+    for field, result in report['fields'].items():
+        print(f"\n=== {field}s (limit {LIMIT_PX[field]}px at {FONT_PX[field]}px, median {result['median_width']}px) ===")
+
+        print(f"\n{len(result['truncated'])} truncated:")
+        for item in shown(result['truncated']):
+            print(f"  {item['width']:.0f}px  {item['url']} [{item['source']}]")
+            print(f"         {item['shown']}")
+
+        print(f"\n{len(result['exact_duplicates'])} exact duplicate group(s):")
+        for group in shown(result['exact_duplicates']):
+            print(f"  {len(group['urls'])} URLs: {group['text'][:90]}")
+
+        print(f"\n{len(result['near_duplicates'])} near-duplicate group(s) (suburb name, case and punctuation ignored):")
+        for group in shown(result['near_duplicates']):
+            print(f"  {len(group['urls'])} URLs, {group['variants']} variants: {group['text'][:90]}")
+
+        pairs = ', '.join(f"{pair}: {count}" for pair, count in sorted(result['disagreement_pairs'].items()))
+        print(f"\n{len(result['disagreements'])} suburb(s) where the sources disagree ({pairs or 'none'}):")
+        for item in shown(result['disagreements']):
+            print(f"  {item['url']}  {', '.join(item['pairs'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Per-file extraction cache over src/, and the import resolution the page
+scanners share.
+
+link_graph.py and image_sitemap.py both walk each page and the components it
+imports, and both only need to re-read the files that changed. SourceCache
+keeps extract(data) for every src-relative path keyed by mtime, size and
+content hash; resolve_import() follows '@/...' and relative specifiers the way
+Vite does. Nothing here needs NumPy, so the build-time image sitemap can use
+it with a plain python3.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+
+CACHE_VERSION = 1
+
+PAGES_MODULE_PREFIX = './pages/'
+
+_IMPORT_FROM = re.compile(rb'''import\s[^;]*?\bfrom\s+["']([^"']+)["']''')
+_IMPORT_SUFFIXES = ('', '.tsx', '.ts', '.jsx', '.js', '/index.tsx', '/index.ts')
+
+
+def import_specifiers(data):
+    """Return the specifiers of the `import ... from '...'` statements in a source file"""
+    return [spec.decode('utf-8') for spec in _IMPORT_FROM.findall(data)]
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_import(src_dir, importer_dir, spec):
+    """Return the src-relative path an import specifier in importer_dir points at, or None"""
+    if spec.startswith('@/'):
+        base = os.path.join(src_dir, spec[2:])
+    elif spec.startswith('.'):
+        base = os.path.join(src_dir, importer_dir, spec)
+    else:
+        return None
+    for suffix in _IMPORT_SUFFIXES:
+        path = os.path.normpath(base + suffix)
+        if os.path.isfile(path):
+            return os.path.relpath(path, src_dir)
+    return None
+
+
+def page_files(pages_dir, suffix='.tsx'):
+    """Return the src/pages-relative path of every page source, sorted"""
+    found = []
+    for directory, _, filenames in os.walk(pages_dir):
+        for filename in filenames:
+            if filename.endswith(suffix):
+                found.append(os.path.relpath(os.path.join(directory, filename), pages_dir))
+    return sorted(found)
+
+
+class SourceCache:
+    """extract(data) results per src-relative path, refreshed on change.
+
+    Each tool passes its own extractor together with its own cache_path.
+    """
+
+    def __init__(self, src_dir, cache_path, extract):
+        self.src_dir = os.path.abspath(src_dir)
+        self.cache_path = cache_path
+        self.extract = extract
+        self.entries = self._load()
+        self.seen = set()
+        self.parsed = 0
+        self.dirty = False
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if cached.get('version') != CACHE_VERSION or cached.get('src_dir') != self.src_dir:
+            return {}
+        return cached.get('files', {})
+
+    def get(self, relpath):
+        """Return the cached entry for relpath, re-reading the file if it changed.
+
+        Import specifiers are cached unresolved, since what they point at
+        depends on the rest of the tree.
+        """
+        self.seen.add(relpath)
+        stat = os.stat(os.path.join(self.src_dir, relpath))
+        previous = self.entries.get(relpath)
+        if previous and previous['mtime_ns'] == stat.st_mtime_ns and previous['size'] == stat.st_size:
+            return previous
+
+        with open(os.path.join(self.src_dir, relpath), 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        self.dirty = True
+        if previous and previous['sha1'] == digest:
+            entry = dict(previous, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+        else:
+            entry = self.extract(data)
+            entry.update({'sha1': digest, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size})
+            self.parsed += 1
+        self.entries[relpath] = entry
+        return entry
+
+    def save(self):
+        """Write the cache back atomically, dropping files that were not visited"""
+        stale = set(self.entries) - self.seen
+        if not self.dirty and not stale:
+            return
+        for relpath in stale:
+            del self.entries[relpath]
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            # dumps() encodes in C; dump() streams through the pure-Python encoder
+            f.write(json.dumps({'version': CACHE_VERSION, 'src_dir': self.src_dir, 'files': self.entries},
+                               separators=(',', ':')))
+        os.replace(tmp_path, self.cache_path)
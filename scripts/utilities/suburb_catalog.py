@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Local geospatial catalog of the suburbs we have location pages for.
+
+suburb_catalog.json stores one column per field (name, lat, lon, postcode,
+region) rather than one object per suburb, with regions dictionary-encoded,
+so the whole table loads as a handful of arrays. From those arrays the
+catalog derives, in one batched computation each:
+
+  - sitemap priorities: haversine distance from the CBD mapped onto the
+    PRIORITY_BANDS tiers and capped per region, replacing the
+    hand-maintained priority dict
+  - areaServed lists: each suburb's k nearest catalogued neighbours, found
+    through a uniform grid index instead of comparing every pair
+
+NumPy is used for the distance maths when it is installed; without it the
+same results come from a pure-Python path.
+
+Usage:
+    import suburb_catalog
+    catalog = suburb_catalog.load_catalog()
+    catalog.priorities()['Kew']          # 0.9
+    catalog.area_served('Kew', k=4)      # ['Kew', 'Hawthorn', ...]
+
+Run directly to summarise the catalog and check the grid index against a
+brute-force search, or with --import rows.csv (name,lat,lon,postcode,region)
+to add or update suburbs in bulk.
+"""
+
+import argparse
+import bisect
+import csv
+import json
+import math
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # optional; the pure-Python path gives the same results
+    np = None
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'suburb_catalog.json')
+CATALOG_VERSION = 1
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+
+# Melbourne GPO, the point priorities are measured from
+ORIGIN = (-37.8136, 144.9631)
+
+# (max distance from the CBD in km, priority); anything farther gets DEFAULT_PRIORITY
+PRIORITY_BANDS = ((4.0, 0.95), (8.0, 0.9), (12.0, 0.85), (20.0, 0.8))
+DEFAULT_PRIORITY = 0.75
+
+# Highest tier a region can reach, following the hand-assigned tiers this replaces
+REGION_MAX_PRIORITY = {
+    'Inner Melbourne': 0.95,
+    'Eastern Suburbs': 0.9,
+    'Coastal Areas': 0.9,
+    'Northern Suburbs': 0.8,
+    'Southern Suburbs': 0.8,
+    'Western Suburbs': 0.75,
+}
+
+# Neighbours listed after the suburb itself in areaServed
+DEFAULT_NEIGHBOURS = 4
+
+# Grid cell edge; a few suburbs per cell at metropolitan density
+GRID_CELL_KM = 4.0
+
+COLUMNS = ('name', 'lat', 'lon', 'postcode', 'region')
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distances in km from one point to many"""
+    if np is not None:
+        lat1, lon1 = np.radians(lat), np.radians(lon)
+        lat2, lon2 = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lons, dtype=float))
+        a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    cos_lat1 = math.cos(lat1)
+    distances = []
+    for other_lat, other_lon in zip(lats, lons):
+        lat2, lon2 = math.radians(other_lat), math.radians(other_lon)
+        a = math.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+        distances.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a)))
+    return distances
+
+
+def band_priority(distance_km):
+    """Priority tier for a single distance from the CBD"""
+    limits = [limit for limit, _ in PRIORITY_BANDS]
+    position = bisect.bisect_left(limits, distance_km)
+    return PRIORITY_BANDS[position][1] if position < len(PRIORITY_BANDS) else DEFAULT_PRIORITY
+
+
+def band_label(priority):
+    """Describe a priority tier for sitemap comments"""
+    capped = '' if priority == max(REGION_MAX_PRIORITY.values()) else ' or capped by region'
+    for limit, band in PRIORITY_BANDS:
+        if band == priority:
+            return f"Within {limit:g} km of the CBD{capped} ({priority} priority)"
+    return f"Beyond {PRIORITY_BANDS[-1][0]:g} km of the CBD{capped} ({priority} priority)"
+
+
+class SuburbCatalog:
+    """Columnar suburb table with batched priority and nearest-neighbour queries"""
+
+    def __init__(self, columns=None):
+        columns = columns or {column: [] for column in COLUMNS}
+        lengths = {len(columns[column]) for column in COLUMNS}
+        if len(lengths) != 1:
+            raise ValueError(f"catalog columns have different lengths: {sorted(lengths)}")
+        self.columns = {column: list(columns[column]) for column in COLUMNS}
+        self.position = {name: i for i, name in enumerate(self.columns['name'])}
+        self._neighbours = {}
+
+    def __len__(self):
+        return len(self.columns['name'])
+
+    def __contains__(self, name):
+        return name in self.position
+
+    def row(self, name):
+        """Return one suburb as a dict"""
+        i = self.position[name]
+        return {column: self.columns[column][i] for column in COLUMNS}
+
+    def upsert(self, name, lat, lon, postcode, region):
+        """Add a suburb or replace its fields"""
+        values = {'name': name, 'lat': float(lat), 'lon': float(lon),
+                  'postcode': str(postcode), 'region': region}
+        i = self.position.get(name)
+        if i is None:
+            self.position[name] = len(self)
+            for column in COLUMNS:
+                self.columns[column].append(values[column])
+        else:
+            for column in COLUMNS:
+                self.columns[column][i] = values[column]
+        self._neighbours = {}
+
+    def distances_from(self, lat, lon):
+        """Distance in km from a point to every suburb, in catalog order"""
+        return haversine_km(lat, lon, self.columns['lat'], self.columns['lon'])
+
+    def priorities(self, origin=ORIGIN):
+        """Return {name: sitemap priority} from each suburb's distance to the CBD and region"""
+        distances = self.distances_from(*origin)
+        caps = [REGION_MAX_PRIORITY.get(region, DEFAULT_PRIORITY) for region in self.columns['region']]
+        if np is not None:
+            limits = np.array([limit for limit, _ in PRIORITY_BANDS])
+            tiers = np.array([band for _, band in PRIORITY_BANDS] + [DEFAULT_PRIORITY])
+            values = np.minimum(tiers[np.searchsorted(limits, distances, side='left')], caps).tolist()
+        else:
+            values = [min(band_priority(distance), cap) for distance, cap in zip(distances, caps)]
+        return dict(zip(self.columns['name'], values))
+
+    def _grid(self, cell_km):
+        """Project onto a local plane (km) and bucket every suburb into square cells"""
+        lats, lons = self.columns['lat'], self.columns['lon']
+        lat0 = sum(lats) / len(lats) if lats else ORIGIN[0]
+        scale_x = KM_PER_DEGREE * math.cos(math.radians(lat0))
+        points = [(lon * scale_x, lat * KM_PER_DEGREE) for lat, lon in zip(lats, lons)]
+        cells = {}
+        for i, (x, y) in enumerate(points):
+            cells.setdefault((math.floor(x / cell_km), math.floor(y / cell_km)), []).append(i)
+        return points, cells
+
+    def nearest(self, k=DEFAULT_NEIGHBOURS, cell_km=GRID_CELL_KM):
+        """Return {name: [k nearest other suburbs, closest first]} for every suburb.
+
+        Each query scans rings of grid cells outwards and stops once the k-th
+        candidate is closer than anything an unscanned ring could hold, so
+        the cost grows with the number of suburbs rather than its square.
+        """
+        if k in self._neighbours:
+            return self._neighbours[k]
+        names = self.columns['name']
+        lats, lons = self.columns['lat'], self.columns['lon']
+        points, cells = self._grid(cell_km)
+        wanted = min(k, len(names) - 1)
+        result = {}
+
+        for i, (x, y) in enumerate(points):
+            cx, cy = math.floor(x / cell_km), math.floor(y / cell_km)
+            candidates = []
+            ring = 0
+            while True:
+                for gx in range(cx - ring, cx + ring + 1):
+                    for gy in range(cy - ring, cy + ring + 1):
+                        if max(abs(gx - cx), abs(gy - cy)) == ring:
+                            candidates.extend(j for j in cells.get((gx, gy), ()) if j != i)
+                if len(candidates) >= wanted:
+                    # Points in unscanned rings are at least ring * cell_km away
+                    planar = sorted(math.hypot(points[j][0] - x, points[j][1] - y) for j in candidates)
+                    if not wanted or planar[wanted - 1] <= ring * cell_km:
+                        break
+                if len(candidates) >= len(names) - 1:
+                    break
+                ring += 1
+
+            distances = haversine_km(lats[i], lons[i], [lats[j] for j in candidates],
+                                     [lons[j] for j in candidates])
+            ranked = sorted(zip((float(d) for d in distances), (names[j] for j in candidates)))
+            result[names[i]] = [name for _, name in ranked[:wanted]]
+
+        self._neighbours[k] = result
+        return result
+
+    def nearest_brute_force(self, k=DEFAULT_NEIGHBOURS):
+        """Reference all-pairs search used to check the grid index"""
+        names = self.columns['name']
+        result = {}
+        for i, name in enumerate(names):
+            distances = self.distances_from(self.columns['lat'][i], self.columns['lon'][i])
+            ranked = sorted((float(d), other) for d, other in zip(distances, names) if other != name)
+            result[name] = [other for _, other in ranked[:k]]
+        return result
+
+    def area_served(self, name, k=DEFAULT_NEIGHBOURS):
+        """The suburb followed by its k nearest catalogued neighbours"""
+        return [name] + self.nearest(k)[name]
+
+    def to_json(self):
+        regions = sorted(set(self.columns['region']))
+        region_ids = {region: i for i, region in enumerate(regions)}
+        return {
+            'version': CATALOG_VERSION,
+            'regions': regions,
+            'columns': {
+                'name': self.columns['name'],
+                'lat': [round(value, 4) for value in self.columns['lat']],
+                'lon': [round(value, 4) for value in self.columns['lon']],
+                'postcode': self.columns['postcode'],
+                'region': [region_ids[region] for region in self.columns['region']],
+            },
+        }
+
+
+def load_catalog(path=CATALOG_PATH):
+    """Load the catalog file"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != CATALOG_VERSION:
+        raise ValueError(f"{path}: unsupported catalog version {data.get('version')}")
+    columns = dict(data['columns'])
+    columns['region'] = [data['regions'][i] for i in columns['region']]
+    return SuburbCatalog(columns)
+
+
+def save_catalog(catalog, path=CATALOG_PATH):
+    """Write the catalog via a temporary file and atomic rename, one column per line"""
+    data = catalog.to_json()
+    lines = [f'  "{column}": {json.dumps(values, ensure_ascii=False)}' for column, values in data['columns'].items()]
+    text = (f'{{\n "version": {data["version"]},\n "regions": {json.dumps(data["regions"])},\n'
+            f' "columns": {{\n' + ',\n'.join(lines) + '\n }\n}\n')
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+_default = None
+
+
+def default_catalog():
+    """The shipped catalog, loaded once per process"""
+    global _default
+    if _default is None:
+        _default = load_catalog()
+    return _default
+
+
+def import_rows(catalog, csv_path):
+    """Add or update suburbs from a CSV with name,lat,lon,postcode,region columns"""
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        catalog.upsert(row['name'], row['lat'], row['lon'], row['postcode'], row['region'])
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise or extend the suburb catalog")
+    parser.add_argument('--catalog', default=CATALOG_PATH, help="catalog file (default: %(default)s)")
+    parser.add_argument('--import', dest='import_csv', metavar='CSV',
+                        help="add or update suburbs from a name,lat,lon,postcode,region CSV")
+    parser.add_argument('--k', type=int, default=DEFAULT_NEIGHBOURS, help="neighbours per suburb (default: 4)")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog(args.catalog) if os.path.exists(args.catalog) else SuburbCatalog()
+    if args.import_csv:
+        count = import_rows(catalog, args.import_csv)
+        save_catalog(catalog, args.catalog)
+        print(f"Imported {count} rows, catalog now has {len(catalog)} suburbs")
+
+    priorities = catalog.priorities()
+    print(f"{len(catalog)} suburbs in {len(set(catalog.columns['region']))} regions"
+          f" ({'numpy' if np is not None else 'pure Python'})")
+    for priority in sorted(set(priorities.values()), reverse=True):
+        count = sum(1 for value in priorities.values() if value == priority)
+        print(f"  {band_label(priority)}: {count}")
+
+    mismatches = [name for name, neighbours in catalog.nearest_brute_force(args.k).items()
+                  if catalog.nearest(args.k)[name] != neighbours]
+    print(f"Grid index agrees with brute force for {len(catalog) - len(mismatches)}/{len(catalog)} suburbs")
+    for name in mismatches:
+        print(f"  {name}: grid {catalog.nearest(args.k)[name]}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,89 +1,75 @@
 #!/usr/bin/env python3
-import re
+import argparse
+import os
+import sys
 
-# List of all 145 location files (CamelCase)
-all_locations = [
-    "Abbotsford", "AlbertPark", "Alphington", "Altona", "Armadale", "AscotVale",
-    "Ashwood", "Aspendale", "Balaclava", "Balwyn", "Bentleigh", "Berwick",
-    "Blackburn", "BlackburnNorth", "BlackburnSouth", "Bonbeach", "BoxHill",
-    "Braybrook", "Brighton", "BrightonEast", "Broadmeadows", "Brunswick",
-    "Bulleen", "Bundoora", "Burnley", "Burwood", "Camberwell", "Canterbury",
-    "Carlton", "Carnegie", "Carrum", "Caulfield", "CaulfieldEast", "CaulfieldNorth",
-    "CaulfieldSouth", "Chadstone", "Chatham", "Cheltenham", "Clayton", "CliftonHill",
-    "Coburg", "Collingwood", "Cranbourne", "Cremorne", "Croydon", "Dandenong",
-    "DeerPark", "Docklands", "Doncaster", "EastMelbourne", "Edithvale", "Elsternwick",
-    "Elwood", "Epping", "Essendon", "Fairfield", "Fitzroy", "Flemington", "Footscray",
-    "ForestHill", "Frankston", "FrankstonSouth", "GlenIris", "GlenWaverley", "Hampton",
-    "Hawthorn", "Heidelberg", "Highett", "HoppersCrossing", "Hughesdale", "Huntingdale",
-    "Ivanhoe", "Kensington", "Kew", "Keysborough", "Kooyong", "Lalor", "Laverton",
-    "Lilydale", "Malvern", "MalvernEast", "ManorLakes", "Maribyrnong", "McKinnon",
-    "MelbourneCBD", "Mentone", "MiddlePark", "MillPark", "Mitcham", "MontAlbert",
-    "MooneePonds", "Mordialloc", "MountWaverley", "Mulgrave", "Murrumbeena",
-    "NarreWarren", "Newport", "NoblePark", "Northcote", "NorthMelbourne", "NottingHill",
-    "Nunawading", "Oakleigh", "Ormond", "Parkdale", "Parkmore", "Parkville",
-    "PointCook", "PortMelbourne", "Prahran", "Preston", "PrincesHill", "Reservoir",
-    "Richmond", "Ringwood", "Ripponlea", "Sandringham", "Seddon", "Southbank",
-    "SouthMelbourne", "SouthWharf", "SouthYarra", "Spotswood", "Springvale",
-    "StKilda", "StKildaEast", "Sunshine", "SurreyHills", "Tarneit", "Templestowe",
-    "Thomastown", "Thornbury", "Toorak", "Tottenham", "Truganina", "Vermont",
-    "Werribee", "WestMelbourne", "WheelersHill", "WheelersHillSE", "WilliamsLanding",
-    "Williamstown", "Windsor", "WyndhamVale", "Yarraville"
-]
+import instrumentation
+import page_index
+from consistency_checker import load_sitemaps, normalise_url
+from page_transforms import LOCATION_PATH
+from slug_registry import SlugRegistry
 
-# Current sitemap locations (kebab-case)
-current_sitemap = [
-    "abbotsford", "albert-park", "alphington", "altona", "armadale", "ascot-vale",
-    "ashwood", "aspendale", "balaclava", "balwyn", "bentleigh", "blackburn",
-    "bonbeach", "box-hill", "brighton", "brighton-east", "broadmeadows", "brunswick",
-    "bulleen", "bundoora", "burwood", "camberwell", "carlton", "carnegie", "carrum",
-    "caulfield", "chadstone", "clayton", "clifton-hill", "coburg", "collingwood",
-    "cremorne", "croydon", "dandenong", "docklands", "doncaster", "east-melbourne",
-    "edithvale", "elsternwick", "elwood", "epping", "essendon", "fairfield", "fitzroy",
-    "flemington", "footscray", "forest-hill", "glen-iris", "glen-waverley", "hampton",
-    "hawthorn", "heidelberg", "hoppers-crossing", "hughesdale", "huntingdale", "ivanhoe",
-    "kensington", "kew", "kooyong", "lalor", "laverton", "lilydale", "malvern",
-    "malvern-east", "manor-lakes", "maribyrnong", "mckinnon", "melbourne-cbd", "mentone",
-    "middle-park", "mill-park", "mitcham", "moonee-ponds", "mordialloc", "mount-waverley",
-    "mulgrave", "murrumbeena", "newport", "noble-park", "north-melbourne", "northcote",
-    "notting-hill", "nunawading", "oakleigh", "ormond", "parkdale", "parkville",
-    "point-cook", "port-melbourne", "prahran", "preston", "princes-hill", "reservoir",
-    "richmond", "ringwood", "sandringham", "seddon", "south-melbourne", "south-yarra",
-    "southbank", "spotswood", "springvale", "st-kilda", "sunshine", "tarneit",
-    "templestowe", "thomastown", "thornbury", "toorak", "truganina", "vermont",
-    "werribee", "west-melbourne", "wheelers-hill", "williams-landing", "williamstown",
-    "windsor", "wyndham-vale", "yarraville"
-]
 
-def camel_to_kebab(name):
-    """Convert CamelCase to kebab-case"""
-    # Special cases
-    special_cases = {
-        "MelbourneCBD": "melbourne-cbd",
-        "StKilda": "st-kilda",
-        "StKildaEast": "st-kilda-east",
-        "WheelersHillSE": "wheelers-hill-se"
-    }
+def sitemap_locations(public_dir, path=LOCATION_PATH):
+    """Kebab-case suburbs of the location URLs under the path scheme that the page sitemaps list"""
+    prefix, _, suffix = path.partition('{slug}')
+    listed = set()
+    for sitemap in load_sitemaps(public_dir):
+        if sitemap['index'] or sitemap['images']:
+            continue
+        for loc in sitemap['locs']:
+            loc_path = normalise_url(loc)[1]
+            if (len(loc_path) > len(prefix) + len(suffix) and loc_path.startswith(prefix)
+                    and loc_path.endswith(suffix)):
+                slug = loc_path[len(prefix):len(loc_path) - len(suffix)]
+                if '/' not in slug:
+                    listed.add(slug)
+    return listed
 
-    if name in special_cases:
-        return special_cases[name]
 
-    # Regular conversion: insert hyphen before uppercase letters (except first)
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1).lower()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the location pages with the locations the sitemaps list")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--path', default=LOCATION_PATH,
+                        help="path of a location page, with {slug} for its suburb (default: %(default)s)")
+    parser.add_argument('--all', action='store_true', help="also list every location page in kebab-case")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    root = os.path.abspath(args.root)
 
-# Convert all locations to kebab-case
-all_kebab = [camel_to_kebab(loc) for loc in all_locations]
+    with instrumentation.run('temp_location_converter', args) as metrics:
+        # All location files (CamelCase), taken from the shared page index
+        with metrics.stage('scan'):
+            locations_dir = os.path.join(root, 'src', 'pages', 'locations')
+            all_locations = sorted(entry['stem'] for entry in page_index.scan_pages(locations_dir).values())
 
-# Find missing locations
-missing = set(all_kebab) - set(current_sitemap)
+        # Convert all locations to kebab-case
+        with metrics.stage('convert'):
+            all_kebab = SlugRegistry(all_locations).bulk_to_kebab(all_locations)
 
-print(f"Total locations: {len(all_locations)}")
-print(f"Current sitemap entries: {len(current_sitemap)}")
-print(f"Missing locations ({len(missing)}):")
-for loc in sorted(missing):
-    print(f"  {loc}")
+        with metrics.stage('sitemaps'):
+            current_sitemap = sitemap_locations(os.path.join(root, 'public'), args.path)
 
-# Print all kebab-case locations for reference
-print("\nAll 145 locations in kebab-case:")
-for i, loc in enumerate(sorted(all_kebab)):
-    print(f"{i+1:3d}. {loc}")
\ No newline at end of file
+        # Find missing locations, and listed locations without a page
+        missing = set(all_kebab) - current_sitemap
+        orphaned = current_sitemap - set(all_kebab)
+
+        print(f"Total locations: {len(all_locations)}")
+        print(f"Current sitemap entries: {len(current_sitemap)}")
+        print(f"Missing locations ({len(missing)}):")
+        for loc in sorted(missing):
+            print(f"  {loc}")
+        print(f"Listed without a page ({len(orphaned)}):")
+        for loc in sorted(orphaned):
+            print(f"  {loc}")
+
+        if args.all:
+            print(f"\nAll {len(all_kebab)} locations in kebab-case:")
+            for i, loc in enumerate(sorted(all_kebab)):
+                print(f"{i+1:3d}. {loc}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
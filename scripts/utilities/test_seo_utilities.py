@@ -0,0 +1,1438 @@
+"""
+Tests for the SEO utilities whose results the scripts rely on without
+looking, each checked against a brute-force computation or a small fixture.
+
+Run from the repository root:
+    python3 -m pytest -q scripts/utilities
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import random
+import struct
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+
+import batch_rewriter
+import bundle_budget
+import consistency_checker
+import duplicate_content
+import indexnow_notifier
+import instrumentation
+import jsx_locator
+import keyword_cannibalisation
+import lighthouse_history
+import link_graph
+import link_verifier
+import location_page_generator
+import page_index
+import page_transforms
+import redirect_map
+import schema_validator
+import site_batch
+import snippet_auditor
+import suburb_catalog
+import update_location_canonicals
+import updated_sitemap_generator
+import watch_pages
+from sitemap_writer import SitemapWriter, add_to_sitemap_index, file_digest, write_sitemap_index
+from slug_registry import SlugRegistry
+
+LOCATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src', 'pages', 'locations')
+
+
+def shout(filename, content):
+    """Batch transform: upper-case the file"""
+    return content.upper(), [f"{filename} upper-cased"]
+
+
+def write_pages(pages_dir, pages):
+    for name, content in pages.items():
+        with open(os.path.join(pages_dir, name), 'wb') as f:
+            f.write(content)
+
+
+def read_pages(pages_dir):
+    pages = {}
+    for name in sorted(os.listdir(pages_dir)):
+        with open(os.path.join(pages_dir, name), 'rb') as f:
+            pages[name] = f.read()
+    return pages
+
+
+# batch_rewriter.commit
+
+def test_commit_refuses_a_file_changed_on_disk(tmp_path):
+    write_pages(tmp_path, {'A.tsx': b'a page\n', 'B.tsx': b'b page\n'})
+    changes = [result for result in batch_rewriter.transform_all(str(tmp_path), ['A.tsx', 'B.tsx'], shout, workers=1)
+               if result['content'] is not None]
+    write_pages(tmp_path, {'B.tsx': b'b page, edited meanwhile\n'})
+
+    with pytest.raises(batch_rewriter.BatchError, match='B.tsx changed on disk'):
+        batch_rewriter.commit(str(tmp_path), changes)
+    assert read_pages(tmp_path) == {'A.tsx': b'a page\n', 'B.tsx': b'b page, edited meanwhile\n'}
+
+
+def test_commit_rolls_back_when_a_replace_fails(tmp_path, monkeypatch):
+    write_pages(tmp_path, {'A.tsx': b'a page\n', 'B.tsx': b'b page\n'})
+    changes = batch_rewriter.transform_all(str(tmp_path), ['A.tsx', 'B.tsx'], shout, workers=1)
+    changes.insert(1, {'filename': 'New.tsx', 'content': b'new page\n', 'mtime_ns': None, 'size': None})
+
+    replace = os.replace
+
+    def failing_replace(src, dst):
+        if src == os.path.join(tmp_path, 'B.tsx' + batch_rewriter.TMP_SUFFIX):
+            raise OSError("disk full")
+        replace(src, dst)
+
+    monkeypatch.setattr(batch_rewriter.os, 'replace', failing_replace)
+    with pytest.raises(OSError, match='disk full'):
+        batch_rewriter.commit(str(tmp_path), changes)
+    # A.tsx and New.tsx were already in place; both are undone and nothing is left behind
+    assert read_pages(tmp_path) == {'A.tsx': b'a page\n', 'B.tsx': b'b page\n'}
+
+
+def test_commit_applies_every_change(tmp_path):
+    write_pages(tmp_path, {'A.tsx': b'a page\n', 'B.tsx': b'b page\n'})
+    batch = batch_rewriter.run_batch(str(tmp_path), ['A.tsx', 'B.tsx'], shout, workers=1)
+    assert batch['changed'] == ['A.tsx', 'B.tsx']
+    assert read_pages(tmp_path) == {'A.tsx': b'A PAGE\n', 'B.tsx': b'B PAGE\n'}
+
+
+# jsx_locator.locate
+
+PAGE = '''import React from 'react';
+import { LocationPageSEO } from '@/components/seo/SEOHead';
+
+// <LocationPageSEO title="commented out" />
+/* return (<section> */
+const note = "return (<span>";
+const hint = `
+  <ServiceSchema name="in a template" />
+`;
+
+export default function Café() {
+  return (
+    <div className="page">
+      <LocationPageSEO
+        title="Mould Removal Café Street"
+        canonical="https://mouldrestoration.com.au/locations/kew"
+        areaServed={["Kew", "Hawthorn"]}
+      />
+      <p>We're at https://mouldrestoration.com.au <ServiceSchema name="Mould's end" /></p>
+    </div>
+  );
+}
+'''.encode('utf-8')
+
+
+def test_locate_returns_byte_offsets():
+    found = jsx_locator.locate(PAGE)
+
+    assert [statement['module'] for statement in found['imports']] == ['react', '@/components/seo/SEOHead']
+    root = found['root']
+    assert PAGE[root['start']:root['end']] == b'<div className="page">'
+    assert root['insert'] == PAGE.index(b'      <LocationPageSEO')
+
+    [(start, end, props)] = found['elements']['LocationPageSEO']
+    assert start == PAGE.index(b'<LocationPageSEO\n')
+    assert PAGE[start:end].endswith(b'/>') and PAGE[end:end + 1] == b'\n'
+    assert props == {'title': 'Mould Removal Café Street',
+                     'canonical': 'https://mouldrestoration.com.au/locations/kew',
+                     'areaServed': ['Kew', 'Hawthorn']}
+
+    [(start, end, props)] = found['elements']['ServiceSchema']
+    assert PAGE[start:end] == b'<ServiceSchema name="Mould\'s end" />'
+    assert props == {'name': "Mould's end"}
+
+
+def test_locate_offsets_drive_insertions():
+    found = jsx_locator.locate(PAGE)
+    start, end, _ = found['elements']['LocationPageSEO'][0]
+    spans = {}
+    jsx_locator.parse_element(PAGE, start, spans)
+    value_start, value_end = spans['canonical']
+    assert PAGE[value_start:value_end] == b'"https://mouldrestoration.com.au/locations/kew"'
+
+    updated = jsx_locator.apply_insertions(PAGE, [(jsx_locator.closing_offset(PAGE, start, end), '\n        noindex'),
+                                                  (found['root']['insert'], '      {/* first */}\n')])
+    [(_, _, props)] = jsx_locator.locate(updated)['elements']['LocationPageSEO']
+    assert props['noindex'] is True
+    assert b'<div className="page">\n      {/* first */}\n      <LocationPageSEO' in updated
+
+
+@pytest.mark.parametrize('clause, extended', [
+    ("{ ServicePageSEO }", "{ ServicePageSEO, LocationPageSEO }"),
+    ("{\n  ServicePageSEO,\n  SEOHead,\n}", "{\n  ServicePageSEO,\n  SEOHead, LocationPageSEO,\n}"),
+    ("{ }", "{ LocationPageSEO }"),
+])
+def test_import_insertion_extends_the_clause(clause, extended):
+    data = f"import {clause} from '@/components/seo/SEOHead';\n".encode()
+    edit = jsx_locator.import_insertion(data, jsx_locator.locate(data)['imports'],
+                                        'LocationPageSEO', '@/components/seo/SEOHead')
+    assert jsx_locator.apply_insertions(data, [edit]) == f"import {extended} from '@/components/seo/SEOHead';\n".encode()
+
+
+# slug_registry
+
+def location_stems():
+    return sorted(name[:-4] for name in os.listdir(LOCATIONS_DIR) if name.endswith('.tsx'))
+
+
+def test_slugs_round_trip_through_the_table():
+    stems = location_stems()
+    registry = SlugRegistry(stems)
+    assert not registry.collisions
+    for stem in stems:
+        assert registry.to_camel(registry.to_kebab(stem)) == stem
+        assert registry.from_display(registry.to_display(stem)) == stem
+    assert registry.bulk_to_camel(registry.bulk_to_kebab(stems)) == stems
+
+
+@pytest.mark.parametrize('camel, kebab, display', [
+    ('StKildaEast', 'st-kilda-east', 'St Kilda East'),
+    ('MelbourneCBD', 'melbourne-cbd', 'Melbourne CBD'),
+    ('WheelersHillSE', 'wheelers-hill-se', 'Wheelers Hill SE'),
+    ('McKinnon', 'mckinnon', 'McKinnon'),
+])
+def test_slugs_round_trip_by_the_rules(camel, kebab, display):
+    # A fresh registry has to get there from the rules alone
+    assert SlugRegistry().to_kebab(camel + '.tsx') == kebab
+    assert SlugRegistry().to_camel(kebab) == camel
+    assert SlugRegistry().to_display(camel) == display
+    assert SlugRegistry().from_display(display) == camel
+
+
+# duplicate_content: MinHash and LSH against exact shingle Jaccard
+
+def corpus(seed=7):
+    """Three unrelated pages, near-copies of two of them and a half rewrite"""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(2000)]
+
+    def page(length=400):
+        return [rng.choice(vocabulary) for _ in range(length)]
+
+    def edit(words, changes):
+        words = list(words)
+        for position in rng.sample(range(len(words)), changes):
+            words[position] = rng.choice(vocabulary)
+        return words
+
+    a, b, c = page(), page(), page()
+    pages = {'A': a, 'A1': edit(a, 2), 'A2': edit(a, 3), 'B': b, 'B1': edit(b, 1), 'C': c,
+             'C-half': c[:200] + page(200)}
+    return {name: ' '.join(words) for name, words in pages.items()}
+
+
+def jaccard(left, right):
+    return len(left & right) / len(left | right)
+
+
+def test_minhash_estimates_shingle_jaccard():
+    hasher = duplicate_content.MinHasher()
+    texts = corpus()
+    names = sorted(texts)
+    shingles = {name: set(hasher.shingles(hasher.word_hashes(texts[name])).tolist()) for name in names}
+    signatures = {name: hasher.signature(texts[name])[0] for name in names}
+    for i, first in enumerate(names):
+        for second in names[i + 1:]:
+            estimate = np.mean(signatures[first] == signatures[second])
+            # 256 permutations: the standard error is at most 1/32
+            assert abs(estimate - jaccard(shingles[first], shingles[second])) < 0.1, (first, second)
+
+
+def test_lsh_clusters_match_brute_force():
+    hasher = duplicate_content.MinHasher()
+    texts = corpus()
+    names = sorted(texts)
+    shingles = [set(hasher.shingles(hasher.word_hashes(texts[name])).tolist()) for name in names]
+    signatures = np.array([hasher.signature(texts[name])[0] for name in names])
+
+    clusters, uniqueness = duplicate_content.analyse(signatures, threshold=0.8)
+
+    # Brute force: connected components of the pairs whose exact Jaccard is above the threshold
+    parent = list(range(len(names)))
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            if jaccard(shingles[i], shingles[j]) >= 0.8:
+                parent[duplicate_content._find(parent, j)] = duplicate_content._find(parent, i)
+    expected = {}
+    for i in range(len(names)):
+        expected.setdefault(duplicate_content._find(parent, i), set()).add(names[i])
+    expected = sorted(sorted(group) for group in expected.values() if len(group) > 1)
+    assert expected == [['A', 'A1', 'A2'], ['B', 'B1']]
+    assert sorted(sorted(names[i] for i in cluster) for cluster in clusters) == expected
+
+    for i, name in enumerate(names):
+        best = max(jaccard(shingles[i], shingles[j]) for j in range(len(names)) if j != i)
+        if best >= 0.5:
+            assert abs(uniqueness[i] - (1 - best)) < 0.1, name
+        else:
+            # LSH may never pair a page that has no near-copy; it then counts as unique
+            assert uniqueness[i] >= 1 - best - 0.1, name
+
+
+# link_graph.LinkGraph.pagerank against the dense linear system
+
+def test_pagerank_matches_dense_solution():
+    rng = np.random.default_rng(3)
+    n = 40
+    sources = rng.integers(0, n, 200)
+    targets = rng.integers(0, n, 200)
+    # Pages 0..4 keep no outgoing links so the dangling-page share is exercised
+    keep = sources >= 5
+    graph = link_graph.LinkGraph.from_edges([f"page{i}" for i in range(n)], sources[keep], targets[keep])
+    ranks, iterations = graph.pagerank()
+
+    links = np.zeros((n, n))
+    for source, target in zip(sources[keep], targets[keep]):
+        if source != target:
+            links[source, target] = 1
+    assert graph.edge_count == int(links.sum())
+    out_degree = links.sum(axis=1)
+    transition = np.where(out_degree[:, None] > 0, links / np.maximum(out_degree, 1)[:, None], 1.0 / n)
+    damping = link_graph.DAMPING
+    expected = np.linalg.solve(np.eye(n) - damping * transition.T, np.full(n, (1 - damping) / n))
+
+    assert iterations < link_graph.MAX_ITERATIONS
+    assert ranks.sum() == pytest.approx(1.0)
+    assert np.allclose(ranks, expected, atol=1e-8)
+
+
+def test_click_depth_matches_breadth_first_search():
+    graph = link_graph.LinkGraph.from_edges(list('abcdef'), [0, 0, 1, 2, 3, 5], [1, 2, 3, 3, 4, 0])
+    assert graph.click_depth(0).tolist() == [0, 1, 1, 2, 3, -1]
+
+
+# keyword_cannibalisation.SimilarityIndex against dense cosine similarity
+
+def similarity_fixture(seed=11, count=80, terms=60):
+    """CSR rows with a few terms on most rows, some near-duplicate rows and L2-normalised weights"""
+    rng = np.random.default_rng(seed)
+    dense = np.zeros((count, terms))
+    for row in range(count):
+        dense[row, rng.choice(np.arange(3, terms), 6, replace=False)] = rng.random(6) + 0.1
+        dense[row, :3] = rng.random(3) * 0.3 * (rng.random(3) < 0.8)
+    # Rows made of common terms alone, so the common-heavy path has work to do
+    dense[:4, 3:] = 0
+    for row in range(10, 30, 2):
+        dense[row + 1] = dense[row] + rng.random(terms) * (dense[row] > 0) * 0.2
+    dense /= np.linalg.norm(dense, axis=1)[:, None]
+
+    indptr = np.concatenate(([0], np.cumsum((dense > 0).sum(axis=1))))
+    indices = np.nonzero(dense)[1].astype(np.int64)
+    return dense, indptr, indices, dense[dense > 0]
+
+
+@pytest.mark.parametrize('top_k', [2, 100])
+def test_similarity_index_matches_dense_cosine(top_k):
+    dense, indptr, indices, data = similarity_fixture()
+    threshold = 0.5
+    index = keyword_cannibalisation.SimilarityIndex(indptr, indices, data, common_df=0.05)
+    assert len(index.common) and len(index.common_heavy(threshold))
+
+    rows, others, similarities = index.top_pairs(threshold, top_k)
+    found = {}
+    for row, other, similarity in zip(rows.tolist(), others.tolist(), similarities.tolist()):
+        found.setdefault(row, {})[other] = similarity
+
+    cosine = dense @ dense.T
+    np.fill_diagonal(cosine, -1)
+    expected = {}
+    for row in range(len(dense)):
+        order = [other for other in np.argsort(-cosine[row]) if cosine[row, other] >= threshold][:top_k]
+        if order:
+            expected[row] = {int(other): cosine[row, other] for other in order}
+
+    assert found.keys() == expected.keys()
+    for row, matches in expected.items():
+        assert found[row].keys() == matches.keys(), row
+        for other, similarity in matches.items():
+            assert found[row][other] == pytest.approx(similarity), (row, other)
+
+
+# indexnow_notifier.submit against a local stand-in endpoint
+
+class IndexNowStandIn(BaseHTTPRequestHandler):
+    """Answers each POST with the next scripted (status, headers) and records what was sent"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.received.append((time.monotonic(), payload))
+        status, headers = self.server.responses.pop(0) if self.server.responses else (200, {})
+        body = b'' if status in indexnow_notifier.ACCEPTED else f"status {status}".encode()
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), IndexNowStandIn)
+    server.received, server.responses = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/indexnow"
+    server.shutdown()
+    server.server_close()
+
+
+SITE = indexnow_notifier.SITE_URL
+URLS = {f"{SITE}/locations/suburb-{number}": f"hash{number}" for number in range(5)}
+
+
+def submit(state_path, url, batch_size=2, **options):
+    options = dict({'concurrency': 1, 'rate': 0, 'timeout': 5, 'backoff': 0.05}, **options)
+    batches = indexnow_notifier.make_batches(indexnow_notifier.load_state(state_path)['pending'], batch_size)
+    return asyncio.run(indexnow_notifier.submit(batches, url, 'test-key', f"{SITE}/test-key.txt",
+                                                path=state_path, **options))
+
+
+def test_submit_sends_every_batch_and_records_it(tmp_path, endpoint):
+    server, url = endpoint
+    state_path = str(tmp_path / 'state.json')
+    assert sorted(indexnow_notifier.enqueue(URLS, path=state_path)) == sorted(URLS)
+
+    results = submit(state_path, url)
+    assert [result['status'] for result in results] == [200, 200, 200]
+    assert [len(payload['urlList']) for _, payload in server.received] == [2, 2, 1]
+    assert {url for _, payload in server.received for url in payload['urlList']} == set(URLS)
+    assert all(payload['host'] == 'mouldrestoration.com.au' and payload['key'] == 'test-key'
+               and payload['keyLocation'] == f"{SITE}/test-key.txt" for _, payload in server.received)
+    state = indexnow_notifier.load_state(state_path)
+    assert state['pending'] == {} and state['submitted'] == URLS
+    # Nothing changed since, so nothing is queued again
+    assert indexnow_notifier.enqueue(URLS, path=state_path) == []
+
+
+def test_submit_defers_after_a_429(tmp_path, endpoint):
+    server, url = endpoint
+    state_path = str(tmp_path / 'state.json')
+    indexnow_notifier.enqueue(URLS, path=state_path)
+    server.responses = [(429, {'Retry-After': '1'})]
+
+    [result] = submit(state_path, url, batch_size=10)
+    assert (result['status'], result['attempts']) == (200, 2)
+    (first, _), (second, payload) = server.received
+    # Retry-After holds the pool back instead of the jittered backoff
+    assert second - first >= 0.95
+    assert sorted(payload['urlList']) == sorted(URLS)
+
+
+def test_submit_backs_off_exponentially(tmp_path, endpoint):
+    server, url = endpoint
+    state_path = str(tmp_path / 'state.json')
+    indexnow_notifier.enqueue(URLS, path=state_path)
+    server.responses = [(503, {}), (503, {}), (502, {})]
+
+    [result] = submit(state_path, url, batch_size=10, backoff=0.1)
+    assert (result['status'], result['attempts']) == (200, 4)
+    times = [received for received, _ in server.received]
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    # Jitter keeps each delay between half and all of backoff * 2 ** (attempt - 1)
+    for attempt, gap in enumerate(gaps, 1):
+        assert gap >= 0.1 * 2 ** (attempt - 1) * 0.5 - 0.01, gaps
+
+
+def test_failed_batch_stays_queued_on_disk(tmp_path, endpoint):
+    server, url = endpoint
+    state_path = str(tmp_path / 'state.json')
+    indexnow_notifier.enqueue(URLS, path=state_path)
+    # The first batch is accepted, the second gives up after its attempts, the third is rejected outright
+    server.responses = [(200, {}), (500, {}), (500, {}), (403, {})]
+
+    results = submit(state_path, url, max_attempts=2)
+    assert [(result['status'], result['attempts']) for result in results] == [(200, 1), (500, 2), (403, 1)]
+    accepted = server.received[0][1]['urlList']
+    state = indexnow_notifier.load_state(state_path)
+    assert set(state['submitted']) == set(accepted)
+    assert set(state['pending']) == set(URLS) - set(accepted)
+
+    # A later run sends only what is still queued
+    server.received.clear()
+    results = submit(state_path, url, batch_size=10)
+    assert [result['status'] for result in results] == [200]
+    assert sorted(server.received[0][1]['urlList']) == sorted(set(URLS) - set(accepted))
+    assert indexnow_notifier.load_state(state_path) == {'version': indexnow_notifier.STATE_VERSION,
+                                                         'submitted': URLS, 'pending': {}}
+
+
+# sitemap_writer.SitemapWriter
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def write_urls(directory, count, **options):
+    with SitemapWriter(str(directory), 'sitemap-test', **options) as writer:
+        for number in range(count):
+            writer.add(f"{SITE}/page-{number}", lastmod='2026-01-01', priority=0.5)
+    return writer
+
+
+def shard_locs(path):
+    with (gzip.open if str(path).endswith('.gz') else open)(path, 'rb') as f:
+        root = ElementTree.fromstring(f.read())
+    return [url.findtext(f'{SITEMAP_NS}loc') for url in root]
+
+
+def test_writer_shards_by_url_count(tmp_path):
+    writer = write_urls(tmp_path, 5, max_urls=2)
+    assert writer.shards == writer.written == ['sitemap-test-1.xml', 'sitemap-test-2.xml', 'sitemap-test-3.xml']
+    assert writer.total_urls == 5
+    assert [len(shard_locs(tmp_path / name)) for name in writer.shards] == [2, 2, 1]
+    assert sum((shard_locs(tmp_path / name) for name in writer.shards), []) == [f"{SITE}/page-{number}"
+                                                                                for number in range(5)]
+    assert writer.digests == [file_digest(str(tmp_path / name)) for name in writer.shards]
+
+    # Fewer URLs later: one shard under the plain name, the numbered ones are removed
+    writer = write_urls(tmp_path, 2, max_urls=2)
+    assert writer.shards == ['sitemap-test.xml']
+    assert sorted(os.listdir(tmp_path)) == ['sitemap-test.xml']
+
+
+def test_writer_shards_by_size(tmp_path):
+    writer = write_urls(tmp_path, 20, max_bytes=2000)
+    assert len(writer.shards) > 1
+    assert all(os.path.getsize(tmp_path / name) <= 2000 for name in writer.shards)
+    assert sum(len(shard_locs(tmp_path / name)) for name in writer.shards) == 20
+
+
+def test_writer_rejects_an_entry_no_shard_can_hold(tmp_path):
+    with pytest.raises(ValueError, match='too large'):
+        with SitemapWriter(str(tmp_path), 'sitemap-test', max_bytes=2000, atomic=True) as writer:
+            writer.add(f"{SITE}/page-0")
+            writer.add(f"{SITE}/{'x' * 2000}")
+    assert writer.shards == ['sitemap-test-1.xml'] and writer.written == []
+    assert os.listdir(tmp_path) == []
+
+
+def test_writer_gzip_is_reproducible(tmp_path):
+    os.mkdir(tmp_path / 'plain')
+    os.mkdir(tmp_path / 'gzip')
+    plain = write_urls(tmp_path / 'plain', 5, max_urls=2)
+    compressed = write_urls(tmp_path / 'gzip', 5, max_urls=2, gzip_output=True)
+    assert compressed.shards == [name + '.gz' for name in plain.shards]
+    for name, gz_name in zip(plain.shards, compressed.shards):
+        with gzip.open(tmp_path / 'gzip' / gz_name, 'rb') as f:
+            assert f.read() == (tmp_path / 'plain' / name).read_bytes()
+    assert compressed.digests == plain.digests
+
+    # A second run produces the same bytes, so unchanged shards compare equal
+    first = [(tmp_path / 'gzip' / name).read_bytes() for name in compressed.shards]
+    write_urls(tmp_path / 'gzip', 5, max_urls=2, gzip_output=True)
+    assert [(tmp_path / 'gzip' / name).read_bytes() for name in compressed.shards] == first
+
+
+def test_hash_only_writes_nothing(tmp_path):
+    plan = write_urls(tmp_path, 5, max_urls=2, hash_only=True)
+    assert os.listdir(tmp_path) == []
+    assert plan.written == []
+    assert plan.shards == ['sitemap-test-1.xml', 'sitemap-test-2.xml', 'sitemap-test-3.xml']
+    assert plan.digests == write_urls(tmp_path, 5, max_urls=2).digests
+
+
+def test_atomic_writer_skips_unchanged_shards(tmp_path):
+    write_urls(tmp_path, 5, max_urls=2)
+    first = tmp_path / 'sitemap-test-1.xml'
+    os.utime(first, ns=(0, 0))
+
+    writer = write_urls(tmp_path, 5, max_urls=2, atomic=True, skip_shards={0})
+    assert writer.written == ['sitemap-test-2.xml', 'sitemap-test-3.xml']
+    assert os.stat(first).st_mtime_ns == 0
+    assert writer.digests[0] == file_digest(str(first))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_failed_atomic_write_leaves_the_old_shard(tmp_path):
+    write_urls(tmp_path, 2)
+    before = (tmp_path / 'sitemap-test.xml').read_bytes()
+    with pytest.raises(RuntimeError):
+        with SitemapWriter(str(tmp_path), 'sitemap-test', atomic=True) as writer:
+            writer.add(f"{SITE}/other")
+            raise RuntimeError("interrupted")
+    assert os.listdir(tmp_path) == ['sitemap-test.xml']
+    assert (tmp_path / 'sitemap-test.xml').read_bytes() == before
+
+
+def test_add_to_sitemap_index_keeps_existing_entries(tmp_path):
+    index = tmp_path / 'sitemap.xml'
+    write_sitemap_index(str(index), [(f"{SITE}/sitemap-pages.xml", '2026-01-01')])
+    assert add_to_sitemap_index(str(index), [f"{SITE}/sitemap-images.xml"]) == [f"{SITE}/sitemap-images.xml"]
+    assert lastmods(index) == {f"{SITE}/sitemap-pages.xml": '2026-01-01', f"{SITE}/sitemap-images.xml": None}
+    before = index.read_bytes()
+    assert add_to_sitemap_index(str(index), [f"{SITE}/sitemap-images.xml"]) == []
+    assert index.read_bytes() == before
+
+# updated_sitemap_generator.update_sitemaps --incremental on a small checkout
+
+APP = b"""const Index = lazy(() => import('./pages/Index'));
+<Route path="/" element={<Index />} />
+"""
+LOCATION_PAGE = '''export const {stem} = () => (
+  <div>
+    <LocationPageSEO suburb="{stem}" canonical="https://mouldrestoration.com.au/locations/{stem}" />
+  </div>
+);
+'''
+COMMITTED = '2025-01-02'
+
+
+def git(root, *command):
+    subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *command], cwd=root,
+                   check=True, capture_output=True,
+                   env=dict(os.environ, GIT_COMMITTER_DATE=f"{COMMITTED}T00:00:00", GIT_AUTHOR_DATE=f"{COMMITTED}T00:00:00"))
+
+
+@pytest.fixture
+def checkout(tmp_path, monkeypatch):
+    """A committed project with three location pages and its generated sitemaps, like a fresh clone"""
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(updated_sitemap_generator, 'MANIFEST_PATH', str(tmp_path / 'cache' / 'sitemap-manifest.json'))
+    root = tmp_path / 'site'
+    (root / 'src' / 'pages' / 'locations').mkdir(parents=True)
+    (root / 'public').mkdir()
+    (root / 'src' / 'App.tsx').write_bytes(APP)
+    (root / 'src' / 'pages' / 'Index.tsx').write_text("export default () => <main />;\n")
+    for stem in ('Kew', 'Hawthorn', 'Richmond'):
+        (root / 'src' / 'pages' / 'locations' / f"{stem}.tsx").write_text(LOCATION_PAGE.format(stem=stem))
+    pages_path = tmp_path / 'pages.json'
+    pages_path.write_text(json.dumps({'version': 1, 'sitemaps': [{'name': 'sitemap-pages', 'sections': [
+        {'comment': 'Home', 'urls': [{'path': '/', 'priority': 1.0}]}]}]}))
+    # An image sitemap that used to be committed and has since moved into the build
+    (root / 'public' / 'sitemap-images.xml').write_text('<urlset/>\n')
+    git(root, 'init', '-q')
+    git(root, 'add', '.')
+    git(root, 'commit', '-q', '-m', 'pages')
+    git(root, 'rm', '-q', 'public/sitemap-images.xml')
+    git(root, 'commit', '-q', '-m', 'image sitemap moved to the build')
+    (root / 'public').mkdir(exist_ok=True)
+
+    def run(**options):
+        return updated_sitemap_generator.update_sitemaps(
+            str(root / 'src' / 'pages' / 'locations'), str(root / 'public'), incremental=True,
+            pages_path=str(pages_path), **options)
+
+    run(max_urls=1)
+    git(root, 'add', '.')
+    git(root, 'commit', '-q', '-m', 'sitemaps')
+    # A clean checkout has no manifest
+    for name in os.listdir(tmp_path / 'cache'):
+        os.remove(tmp_path / 'cache' / name)
+    return root, run
+
+
+def public_files(root):
+    return {name: (os.stat(root / 'public' / name).st_mtime_ns, (root / 'public' / name).read_bytes())
+            for name in sorted(os.listdir(root / 'public'))}
+
+
+def lastmods(path):
+    return {url.findtext(f'{SITEMAP_NS}loc'): url.findtext(f'{SITEMAP_NS}lastmod')
+            for url in ElementTree.parse(path).getroot()}
+
+
+def test_unchanged_checkout_writes_nothing(checkout):
+    root, run = checkout
+    before = public_files(root)
+    for _ in range(2):
+        _, writer, page_writers, index_count = run(max_urls=1)
+        assert writer.written == [] and [page_writer.written for page_writer in page_writers] == [[]]
+        assert index_count is None
+        assert public_files(root) == before
+    # Lastmods come from the commits, and the image sitemap is left to the build's copy of the index
+    assert set(lastmods(root / 'public' / 'sitemap.xml').values()) == {COMMITTED}
+    assert f"{SITE}/sitemap-images.xml" not in lastmods(root / 'public' / 'sitemap.xml')
+    assert set(lastmods(root / 'public' / 'sitemap-locations-1.xml').values()) == {COMMITTED}
+
+
+def test_edited_page_rewrites_only_its_shard(checkout):
+    root, run = checkout
+    page = root / 'src' / 'pages' / 'locations' / 'Kew.tsx'
+    page.write_text(page.read_text().replace('<div>', '<div className="kew">'))
+    edited = 1772582400  # 2026-03-04
+    os.utime(page, (edited, edited))
+    before = public_files(root)
+
+    _, writer, _, index_count = run(max_urls=1)
+    [shard] = writer.written
+    assert lastmods(root / 'public' / shard) == {f"{SITE}/locations/kew": '2026-03-04'}
+    assert index_count == 4
+    after = public_files(root)
+    assert {name for name in after if after[name] != before[name]} == {shard, 'sitemap.xml'}
+
+    # The manifest now knows the edit; touching the page without changing it writes nothing
+    os.utime(page, (edited + 86400 * 30, edited + 86400 * 30))
+    _, writer, _, index_count = run(max_urls=1)
+    assert writer.written == [] and index_count is None
+    assert public_files(root) == after
+
+
+
+def test_added_page_rewrites_only_the_last_shard(checkout):
+    root, run = checkout
+    run(max_urls=2)
+    before = public_files(root)
+    # Not in the suburb catalog, so it sorts last, into the lowest tier
+    (root / 'src' / 'pages' / 'locations' / 'Zeehan.tsx').write_text(LOCATION_PAGE.format(stem='Zeehan'))
+
+    _, writer, _, _ = run(max_urls=2)
+    assert writer.written == ['sitemap-locations-2.xml']
+    after = public_files(root)
+    assert {name for name in after if after[name] != before[name]} == {'sitemap-locations-2.xml', 'sitemap.xml'}
+    assert list(lastmods(root / 'public' / 'sitemap-locations-2.xml'))[-1] == f"{SITE}/locations/zeehan"
+
+# redirect_map.merge_vercel
+
+def redirect(source, destination, **extra):
+    return dict({'source': source, 'destination': destination, 'permanent': True}, **extra)
+
+
+def test_merge_replaces_only_recorded_redirects(tmp_path):
+    old_rule = redirect('/services/mould-removal-:suburb(kew|hawthorn)', '/locations/:suburb')
+    new_rule = redirect('/services/mould-removal-:suburb(kew|hawthorn|richmond)', '/locations/:suburb')
+    hand_written = [redirect('/home', '/'), redirect('/foo', '/locations/kew'),
+                    # A generated rule edited by hand is no longer the generator's
+                    dict(old_rule, permanent=False)]
+    vercel_path = tmp_path / 'vercel.json'
+    vercel_path.write_text(json.dumps({'framework': 'vite', 'redirects': hand_written[:2] + [old_rule] + hand_written[2:]}))
+
+    kept, merged, changed = redirect_map.merge_vercel(str(vercel_path), [new_rule], [old_rule])
+    assert changed and kept == hand_written and merged == [new_rule]
+    config = json.loads(vercel_path.read_text())
+    assert config == {'framework': 'vite', 'redirects': hand_written + [new_rule]}
+
+    text = vercel_path.read_text()
+    assert redirect_map.merge_vercel(str(vercel_path), [new_rule], merged) == (hand_written, [new_rule], False)
+    assert vercel_path.read_text() == text
+
+
+def test_hand_written_source_wins(tmp_path):
+    vercel_path = tmp_path / 'vercel.json'
+    vercel_path.write_text(json.dumps({'redirects': [redirect('/old', '/locations/kew')]}))
+    kept, merged, _ = redirect_map.merge_vercel(str(vercel_path), [redirect('/old', '/locations/hawthorn')], [])
+    assert kept == [redirect('/old', '/locations/kew')] and merged == []
+
+
+def test_redirect_map_keeps_hand_written_rules_and_is_idempotent(tmp_path, capsys):
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+    with open(os.path.join(root, 'vercel.json')) as f:
+        config = json.load(f)
+    config['redirects'].insert(0, redirect('/foo', '/locations/kew'))
+    vercel_path = tmp_path / 'vercel.json'
+    vercel_path.write_text(json.dumps(config, indent=2) + '\n')
+    record_path = tmp_path / 'generated_redirects.json'
+    arguments = ['--root', root, '--vercel', str(vercel_path), '--record', str(record_path)]
+
+    assert redirect_map.main(arguments) == 0
+    first = (vercel_path.read_text(), record_path.read_text())
+    assert redirect('/foo', '/locations/kew') in json.loads(first[0])['redirects']
+    assert redirect('/foo', '/locations/kew') not in json.loads(first[1])['redirects']
+
+    assert redirect_map.main(arguments) == 0
+    assert (vercel_path.read_text(), record_path.read_text()) == first
+    assert 'already up to date' in capsys.readouterr().out.splitlines()[-1]
+
+
+# Modules the build and every seo_tools command load must not pull in numpy
+
+@pytest.mark.parametrize('module', ['page_transforms', 'image_sitemap'])
+def test_build_scripts_import_without_numpy(module):
+    check = f"import sys, {module}; sys.exit('numpy' in sys.modules)"
+    subprocess.run([sys.executable, '-c', check], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+
+# location_page_generator: records filled from hand-written pages, and --adopt / --force keeping their copy
+
+KEW_COPY = {
+    'intro': "Heritage home specialists serving Kew's leafy streets.",
+    'local': ["Kew sits on the Yarra, 7 km from the CBD.", "Its Victorian homes hold damp in their cellars."],
+    'issues': [{'title': 'Heritage Moisture', 'text': 'Original brickwork draws water up from the garden beds.'}],
+    'process': [{'title': 'Heritage Assessment', 'text': 'Moisture mapping around period timber work.'}],
+    'cta': "Protect your Kew home with heritage-safe mould removal.",
+}
+
+
+@pytest.fixture
+def location_site(tmp_path, monkeypatch):
+    """A project with a hand-written Kew page laid out like the template, and a Kew record without its copy"""
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    data = location_page_generator.load_data()
+    data['template'] = os.path.join(os.path.dirname(location_page_generator.DATA_PATH), data['template'])
+    data['suburbs'] = [dict({'name': 'Kew'}, **KEW_COPY)]
+    pages, _ = location_page_generator.build_pages(data, suburb_catalog.default_catalog())
+    [(filename, context)] = pages
+    with open(data['template'], encoding='utf-8') as f:
+        page = location_page_generator.render_page(location_page_generator.compile_template(f.read()), context)
+    # Hand-written: no marker, and markup of its own
+    page = page.replace(b'text-accent-teal', b'text-success')
+
+    data['suburbs'] = [{'name': 'Kew'}]
+    data_path = tmp_path / 'location_pages.json'
+    location_page_generator.save_data(data, str(data_path))
+    locations = tmp_path / 'site' / 'src' / 'pages' / 'locations'
+    locations.mkdir(parents=True)
+    (locations / filename).write_bytes(page)
+
+    def generate(*argv):
+        return location_page_generator.main(['--root', str(tmp_path / 'site'), '--data', str(data_path), *argv])
+
+    return generate, data_path, locations / filename
+
+
+def test_page_content_reads_the_template_layout(location_site):
+    _, _, page = location_site
+    content = page.read_bytes()
+    root = jsx_locator.locate(content)['root']
+    assert location_page_generator.page_content(content[root['start']:].decode('utf-8')) == dict(
+        KEW_COPY, heading='Professional Mould Removal & Inspection in Kew, Melbourne',
+        highlights=['Same-day professional service to Kew', 'IICRC-certified technicians',
+                    '100% satisfaction guarantee'])
+
+
+def test_import_fills_the_copy_a_record_lacks(location_site):
+    generate, data_path, _ = location_site
+    assert generate('import') == 0
+    # Copy that matches the defaults stays out of the record
+    assert location_page_generator.load_data(str(data_path))['suburbs'] == [dict({'name': 'Kew'}, **KEW_COPY)]
+
+
+def test_adopt_keeps_the_page_copy(location_site):
+    generate, data_path, page = location_site
+    assert generate('render', '--workers', '1') == 0
+    assert not page.read_bytes().startswith(location_page_generator.GENERATED_MARKER.encode('utf-8'))
+
+    assert generate('render', '--adopt', '--workers', '1') == 0
+    adopted = page.read_bytes()
+    assert adopted.startswith(location_page_generator.GENERATED_MARKER.encode('utf-8'))
+    assert all(text.encode('utf-8') in adopted for text in KEW_COPY['local'])
+    assert location_page_generator.load_data(str(data_path))['suburbs'] == [dict({'name': 'Kew'}, **KEW_COPY)]
+
+
+def test_adopt_refuses_to_drop_copy_and_force_reports_it(location_site, capsys):
+    generate, _, page = location_site
+    extra = b'<p className="mt-2">Kew Heritage Society members get a free inspection.</p>'
+    page.write_bytes(page.read_bytes().replace(b'</section>', b'</section>\n' + extra, 1))
+    before = page.read_bytes()
+
+    assert generate('render', '--adopt', '--workers', '1') == 0
+    assert page.read_bytes() == before
+    assert 'Did not adopt 1 page(s)' in capsys.readouterr().out
+
+    assert generate('render', '--adopt', '--force', '--workers', '1') == 0
+    forced = page.read_bytes()
+    assert b'Kew Heritage Society' not in forced
+    assert all(text.encode('utf-8') in forced for text in KEW_COPY['local'])
+    assert "lost 1 piece(s) of copy, starting with 'Kew Heritage Society" in capsys.readouterr().out
+
+
+# update_location_canonicals: canonicals only moved to URLs a route serves
+
+ROUTED_APP = b"""const DynamicLocationPage = lazy(() => import('./pages/DynamicLocationPage'));
+<Route path="/locations/:suburb" element={<DynamicLocationPage />} />
+"""
+SEO_PAGE = '''export const {stem} = () => (
+  <div>
+    <LocationPageSEO
+      suburb="{stem}"
+      {prop}="{url}"
+    />
+  </div>
+);
+'''
+
+
+def test_canonicals_move_only_to_routed_urls(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    locations = tmp_path / 'src' / 'pages' / 'locations'
+    locations.mkdir(parents=True)
+    (tmp_path / 'src' / 'App.tsx').write_bytes(ROUTED_APP)
+    (tmp_path / 'src' / 'data').mkdir()
+    (tmp_path / 'src' / 'data' / 'suburbData.ts').write_text("[{ slug: 'kew' }, { slug: 'armadale' }]\n")
+    pages = {
+        'Kew': ('canonical', f"{SITE}/services/mould-removal-kew"),
+        # Not in suburbData, so /locations/abbotsford redirects to /areas
+        'Abbotsford': ('canonical', f"{SITE}/services/mould-removal-abbotsford"),
+        # LocationPageSEO ignores canonicalUrl
+        'Armadale': ('canonicalUrl', "https://mouldrestorationco.com.au/locations/armadale"),
+    }
+    for stem, (prop, url) in pages.items():
+        (locations / f"{stem}.tsx").write_text(SEO_PAGE.format(stem=stem, prop=prop, url=url))
+    abbotsford = (locations / 'Abbotsford.tsx').read_bytes()
+
+    assert update_location_canonicals.main(['--root', str(tmp_path), '--workers', '1']) == 0
+    assert (locations / 'Kew.tsx').read_text() == SEO_PAGE.format(
+        stem='Kew', prop='canonical', url=f"{SITE}/locations/kew")
+    assert (locations / 'Armadale.tsx').read_text() == SEO_PAGE.format(
+        stem='Armadale', prop='canonical', url=f"{SITE}/locations/armadale")
+    assert (locations / 'Abbotsford.tsx').read_bytes() == abbotsford
+
+
+# bundle_budget: chunk history and budget checks on a small build
+
+BUDGET_APP = b"""const About = lazy(() => import('./pages/About'));
+<Route path="/about" element={<About />} />
+"""
+BUDGET_MANIFEST = {
+    'index.html': {'file': 'assets/index-AAAAAAAA.js', 'isEntry': True},
+    'src/pages/About.tsx': {'file': 'assets/About-BBBBBBBB.js', 'imports': ['_index-CCCCCCCC.js']},
+    # Rollup names a shared chunk after its first module, so it shares the entry's name
+    '_index-CCCCCCCC.js': {'file': 'assets/index-CCCCCCCC.js'},
+}
+
+
+@pytest.fixture
+def build(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'App.tsx').write_bytes(BUDGET_APP)
+    (tmp_path / 'dist' / '.vite').mkdir(parents=True)
+    (tmp_path / 'dist' / '.vite' / 'manifest.json').write_text(json.dumps(BUDGET_MANIFEST))
+    (tmp_path / 'dist' / 'assets').mkdir()
+    for file, size in (('index-AAAAAAAA.js', 300), ('About-BBBBBBBB.js', 200), ('index-CCCCCCCC.js', 100)):
+        (tmp_path / 'dist' / 'assets' / file).write_bytes(b'x' * size)
+    (tmp_path / 'budgets.json').write_text(json.dumps({'version': 1, 'budgets': [{'routes': '*', 'js': 500}]}))
+    return tmp_path
+
+
+def test_same_named_chunks_are_all_counted(build):
+    report = bundle_budget.analyse(str(build), str(build / 'dist'), workers=1)
+    assert report['chunks']['assets/index.js']['files'] == ['assets/index-AAAAAAAA.js', 'assets/index-CCCCCCCC.js']
+    assert report['chunks']['assets/index.js']['raw'] == 400
+
+    (build / 'dist' / 'assets' / 'index-CCCCCCCC.js').write_bytes(b'x' * 150)
+    changed = bundle_budget.analyse(str(build), str(build / 'dist'), workers=1)
+    assert [delta[:2] for delta in bundle_budget.chunk_deltas(changed['chunks'], report['chunks'])] == [
+        ('assets/index.js', 50)]
+
+
+def test_exceeded_budget_fails_only_with_strict(build, capsys):
+    command = ['--root', str(build), '--budgets', str(build / 'budgets.json'), '--workers', '1']
+    assert bundle_budget.main(command) == 0
+    assert '1 budget(s) exceeded (exit status 0 without --strict)' in capsys.readouterr().out
+    assert bundle_budget.main(command + ['--strict']) == 1
+
+
+# page_transforms.set_area_served: catalogued neighbours added to a hand-curated list
+
+def service_schema(area_served):
+    return f"<div>\n  <ServiceSchema\n    serviceName=\"Kew\"\n    areaServed={{{json.dumps(area_served)}}}\n  />\n</div>\n".encode()
+
+
+def test_area_served_keeps_the_listed_suburbs():
+    curated = ["Kew", "Kew East", "Hawthorn", "Balwyn", "Camberwell"]
+    assert page_transforms.set_area_served('Kew.tsx', service_schema(curated), k=4) == (None, [])
+
+    content, _ = page_transforms.set_area_served('Kew.tsx', service_schema(["Kew", "Kew East"]), k=4)
+    area_served = jsx_locator.locate(content)['elements']['ServiceSchema'][0][2]['areaServed']
+    assert area_served[:2] == ["Kew", "Kew East"] and len(area_served) == 5
+    assert area_served[2:] == [suburb for suburb in SlugRegistry().bulk_to_display(
+        suburb_catalog.default_catalog().area_served('Kew', 4)) if suburb != "Kew"][:3]
+
+
+# lighthouse_history: streaming extraction against json.load, and the regression report
+
+def lighthouse_report(fetch_time, lcp, performance, url=f"{SITE}/services", error=None):
+    """A report shaped like Lighthouse's, with screenshots large enough to span several read chunks"""
+    report = {
+        'lighthouseVersion': '12.0.0',
+        'requestedUrl': url,
+        'finalDisplayedUrl': url + '/',
+        'fetchTime': fetch_time,
+        'configSettings': {'formFactor': 'mobile', 'locale': 'en-AU', 'nested': [{'a': '}{'}]},
+        'audits': {
+            'final-screenshot': {'details': {'data': 'data:image/jpeg;base64,' + 'A' * 150000}},
+            'largest-contentful-paint': {'numericValue': lcp, 'displayValue': '"quoted" \\ [text]'},
+            'cumulative-layout-shift': {'numericValue': 0.01},
+            'render-blocking-resources': {'details': {'type': 'opportunity', 'overallSavingsMs': 300.4,
+                                                      'items': [{'url': 'x' * 80000}]}},
+            'unused-css-rules': {'details': {'type': 'opportunity', 'overallSavingsMs': 0,
+                                             'overallSavingsBytes': 2048}},
+        },
+        'categories': {'performance': {'score': performance}, 'seo': {'score': 1}},
+        'i18n': {'rendererFormattedStrings': {f"key{number}": "{braces} [brackets]" for number in range(2000)}},
+    }
+    if error:
+        report['runtimeError'] = {'code': error, 'message': 'failed'}
+    return report
+
+
+def test_extract_run_matches_the_parsed_report(tmp_path):
+    path = tmp_path / 'services-mobile.json'
+    data = lighthouse_report('2026-01-01T00:00:00.000Z', 2500.5, 0.87)
+    path.write_text(json.dumps(data, indent=2))
+    assert path.stat().st_size > 3 * lighthouse_history.CHUNK_SIZE
+
+    run = lighthouse_history.extract_run(str(path))
+    assert run['requested_url'] == data['requestedUrl'] and run['final_url'] == data['finalDisplayedUrl']
+    assert (run['fetch_time'], run['form_factor'], run['error']) == (data['fetchTime'], 'mobile', None)
+    assert (run['lcp'], run['cls'], run['tbt']) == (2500.5, 0.01, None)
+    assert (run['performance'], run['seo'], run['accessibility']) == (0.87, 1, None)
+    assert run['opportunities'] == [['render-blocking-resources', 300, 0], ['unused-css-rules', 0, 2048]]
+
+    (tmp_path / 'budget.json').write_text(json.dumps({'budgets': []}))
+    assert lighthouse_history.extract_run(str(tmp_path / 'budget.json')) is None
+
+
+def test_report_flags_runs_worse_than_the_baseline(tmp_path):
+    history = lighthouse_history.History(str(tmp_path / 'history.json'))
+    runs = [(1, 2000, 0.9, None), (2, 2050, 0.9, None), (3, 1980, 0.91, None),
+            (4, 9000, None, 'NO_FCP'), (5, 2600, 0.9, None), (6, 2040, 0.8, None)]
+    for day, lcp, performance, error in runs:
+        run = dict.fromkeys(lighthouse_history.METRICS)
+        run.update(requested_url=f"{SITE}/services", final_url=None, fetch_time=f"2026-01-0{day}T00:00:00Z",
+                   form_factor='mobile', error=error, opportunities=[], lcp=lcp, performance=performance)
+        assert history.add(run, f"run-{day}.json")
+    assert not history.add(run, 'again.json')
+    history.save()
+
+    result = lighthouse_history.report(lighthouse_history.History.load(history.path))
+    assert (result['runs'], result['failed_runs']) == (6, 1)
+    [group] = result['groups']
+    assert (group['page'], group['form_factor'], group['runs']) == ('/services', 'mobile', 5)
+    lcp = group['metrics']['lcp']
+    # The failed run's 9000 ms is neither a regression nor part of a baseline
+    assert [event['file'] for event in lcp['regressions']] == ['run-5.json']
+    assert lcp['latest'] == 2040 and lcp['baseline'] == 2025
+    assert [event['file'] for event in group['metrics']['performance']['regressions']] == ['run-6.json']
+    assert group['metrics']['cls'] == {'latest': None, 'baseline': None, 'change': None, 'regressions': []}
+
+
+# consistency_checker: one fixture tree with an issue of every category, and the allowlist
+
+CHECKED_APP = ROUTED_APP + b"""const About = lazy(() => import('./pages/About'));
+<Route path="/about" element={<About />} />
+"""
+
+
+def urlset(*paths):
+    urls = ''.join(f"  <url><loc>{SITE}{path}</loc></url>\n" for path in paths)
+    return f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n{urls}</urlset>\n'
+
+
+@pytest.fixture
+def checked_site(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    locations = tmp_path / 'src' / 'pages' / 'locations'
+    locations.mkdir(parents=True)
+    (tmp_path / 'src' / 'App.tsx').write_bytes(CHECKED_APP)
+    (tmp_path / 'src' / 'data').mkdir()
+    (tmp_path / 'src' / 'data' / 'suburbData.ts').write_text("[{ slug: 'kew' }, { slug: 'hawthorn' }, { slug: 'carlton' }]\n")
+    pages = {
+        'Kew': f"{SITE}/locations/kew",
+        # Relative, and in no sitemap
+        'Hawthorn': "/locations/hawthorn",
+        # The email domain, and a suburb suburbData does not route
+        'Burnley': "https://mouldandrestoration.com.au/locations/burnley",
+        # Claims Kew's URL
+        'Carlton': f"{SITE}/locations/kew",
+    }
+    for stem, url in pages.items():
+        (locations / f"{stem}.tsx").write_text(SEO_PAGE.format(stem=stem, prop='canonical', url=url))
+    (tmp_path / 'public').mkdir()
+    (tmp_path / 'public' / 'sitemap-locations.xml').write_text(urlset('/locations/kew', '/locations/carlton',
+                                                                       '/locations/burnley'))
+    (tmp_path / 'public' / 'sitemap-pages.xml').write_text(urlset('/about', '/locations/kew', '/faq'))
+    return tmp_path
+
+
+def test_checker_reports_every_category(checked_site):
+    issues, counts = consistency_checker.check_project(str(checked_site))
+    assert counts == {'pages': 4, 'routes': 2, 'sitemaps': 2, 'sitemap_urls': 6}
+    found = {category: sorted((issue['url'], issue['source']) for issue in issues[category])
+             for category in consistency_checker.CATEGORIES}
+    assert found == {
+        'unrouted': [
+            ("https://mouldandrestoration.com.au/locations/burnley", "src/pages/locations/Burnley.tsx (canonical)"),
+            (f"{SITE}/faq", "public/sitemap-pages.xml"),
+            (f"{SITE}/locations/burnley", "public/sitemap-locations.xml"),
+            (f"{SITE}/locations/kew", "src/pages/locations/Carlton.tsx (canonical)"),
+        ],
+        'missing-from-sitemap': [
+            ("/locations/hawthorn", "src/pages/locations/Hawthorn.tsx"),
+            ("https://mouldandrestoration.com.au/locations/burnley", "src/pages/locations/Burnley.tsx"),
+        ],
+        'non-canonical': [
+            ("/locations/hawthorn", "src/pages/locations/Hawthorn.tsx"),
+            (f"{SITE}/locations/carlton", "public/sitemap-locations.xml"),
+        ],
+        'cross-domain': [
+            ("https://mouldandrestoration.com.au/locations/burnley", "src/pages/locations/Burnley.tsx (canonical)"),
+        ],
+        'duplicated': [
+            (f"{SITE}/locations/kew", "public/sitemap-pages.xml"),
+            # Pages are walked in name order, so Carlton claims the URL first
+            (f"{SITE}/locations/kew", "src/pages/locations/Kew.tsx"),
+        ],
+    }
+
+
+def test_allowlist_counts_known_issues_as_allowed(checked_site, capsys):
+    allowlist = checked_site / 'allowlist.json'
+    allowlist.write_text(json.dumps({'version': 1, 'allowed': [
+        {'reason': "Burnley is not routed yet", 'category': ['unrouted', 'missing-from-sitemap'],
+         'source': ['src/pages/locations/Burnley.tsx*', 'public/sitemap-locations.xml'], 'url': '*/burnley'},
+        {'reason': "no longer needed", 'url': f"{SITE}/locations/richmond"},
+    ]}))
+    command = ['--root', str(checked_site), '--allowlist', str(allowlist), '--json']
+    assert consistency_checker.main(command) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert [len(report['allowed'][category]) for category in consistency_checker.CATEGORIES] == [2, 1, 0, 0, 0]
+    assert [issue['url'] for issue in report['issues']['cross-domain']] == [
+        "https://mouldandrestoration.com.au/locations/burnley"]
+    assert [rule['reason'] for rule in report['unused_rules']] == ["no longer needed"]
+    assert consistency_checker.main(command + ['--strict']) == 1
+
+
+def test_repository_has_no_issues_beyond_the_allowlist():
+    assert consistency_checker.main(['--strict', '--limit', '0']) == 0
+
+
+# schema_validator: the schema.org subset check, component props and the literal parser
+
+VALID_SERVICE = {
+    '@context': 'https://schema.org', '@type': 'Service', 'name': 'Mould Removal Kew',
+    'description': 'Mould removal in Kew.', 'url': f"{SITE}/locations/kew",
+    'provider': {'@type': 'LocalBusiness', 'name': 'Mould & Restoration Co.', 'telephone': '1800954117',
+                 'url': SITE, 'image': f"{SITE}/logo.png", 'priceRange': '$$',
+                 'address': {'@type': 'PostalAddress', 'addressLocality': 'Melbourne'}},
+    'areaServed': [{'@type': 'City', 'name': 'Kew, Victoria, Australia'}],
+    'hasOfferCatalog': {'@type': 'OfferCatalog', 'name': 'Mould Removal', 'itemListElement': [
+        {'@type': 'Offer', 'price': '450', 'priceCurrency': 'AUD', 'availability': 'https://schema.org/InStock'}]},
+}
+
+
+def test_subset_accepts_a_valid_service():
+    assert list(schema_validator.SchemaSubset.load().check(VALID_SERVICE)) == []
+
+
+def test_subset_reports_missing_and_invalid_properties():
+    node = json.loads(json.dumps(VALID_SERVICE))
+    del node['name']
+    del node['provider']['address']
+    node['hasOfferCatalog']['itemListElement'][0]['price'] = 'Contact for Quote'
+    issues = {(code, path) for _, code, path, _ in schema_validator.SchemaSubset.load().check(node)}
+    assert issues == {('missing-required', 'name'), ('missing-required', 'provider.address'),
+                      ('invalid-value', 'hasOfferCatalog.itemListElement[0].price')}
+
+
+def test_missing_component_prop_is_an_error():
+    context = schema_validator.load_context(os.path.join(LOCATIONS_DIR, '..', '..', '..'))
+    props = {'serviceName': 'Mould Removal Kew', 'serviceDescription': 'Mould removal in Kew.',
+             'serviceUrl': f"{SITE}/locations/kew", 'areaServed': ['Kew']}
+    canonical = f"{SITE}/locations/kew"
+    baseline = {issue['code'] for issue in schema_validator.validate_element('ServiceSchema', props, canonical, context)}
+    assert 'missing-prop' not in baseline and 'url-path' not in baseline
+
+    del props['serviceDescription']
+    props['areaServed'] = 'Kew'
+    props['serviceUrl'] = f"{SITE}/locations/hawthorn"
+    issues = {(issue['severity'], issue['code'], issue['path'])
+              for issue in schema_validator.validate_element('ServiceSchema', props, canonical, context)}
+    assert {('error', 'missing-prop', 'serviceDescription'), ('error', 'invalid-prop', 'areaServed'),
+            ('error', 'url-path', 'serviceUrl')} <= issues
+
+
+def test_js_literals_parse_or_fail_with_an_offset():
+    value, end = schema_validator.parse_js_literal("""{ name: 'Kew', "geo": { lat: -37.8, ok: true }, // note
+        areas: ['Kew', "Hawthorn",], missing: undefined }""")
+    assert value == {'name': 'Kew', 'geo': {'lat': -37.8, 'ok': True}, 'areas': ['Kew', 'Hawthorn'],
+                     'missing': schema_validator.UNDEFINED}
+    for malformed in ('{ name: "Kew" geo: 1 }', '{ geo: { lat: } }', "['Kew', 'Hawthorn'", '{ "name" 1 }'):
+        with pytest.raises(ValueError, match='offset'):
+            schema_validator.parse_js_literal(malformed)
+    with pytest.raises(ValueError, match='offset'):
+        schema_validator.load_components('const BUSINESS_DATA = { name: "Mould & Restoration Co.", url: };')
+
+
+# link_verifier.verify against a local stand-in site
+
+class SiteStandIn(BaseHTTPRequestHandler):
+    """A page, a redirect to it, a missing page and one that answers too late"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(1)
+        if self.path == '/old-page':
+            status, headers, body = 301, {'Location': '/page'}, b''
+        elif self.path in ('/page', '/slow'):
+            status, headers = 200, {'Content-Type': 'text/html; charset=utf-8'}
+            body = (f'<html><head><title>Page {self.path}</title>'
+                    f'<link rel="canonical" href="{SITE}/page"></head><body></body></html>').encode()
+        else:
+            status, headers, body = 404, {'Content-Type': 'text/html'}, b'<title>Not found</title>'
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_verify_follows_redirects_and_reports_failures():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{SITE}/page", f"{SITE}/old-page", f"{SITE}/missing", f"{SITE}/slow"]
+    try:
+        results, opened = asyncio.run(link_verifier.verify(urls, base, concurrency=2, timeout=0.3))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    page, old, missing, slow = results
+    assert (page['status'], page['title'], page['canonical'], page['redirects']) == (
+        200, 'Page /page', f"{SITE}/page", [])
+    assert (old['status'], old['redirects'], old['canonical']) == (200, [[301, f"{base}/page"]], f"{SITE}/page")
+    assert (missing['status'], missing['error']) == (404, None)
+    assert slow['status'] is None and slow['error'].startswith('TimeoutError')
+    # Keep-alive: the two workers reuse their connections, only the timed-out one is reopened
+    assert opened <= 3
+
+    report = link_verifier.analyse(results, {url: ['test'] for url in urls})
+    assert [(entry['url'], entry['status']) for entry in report['failed']] == [
+        (f"{SITE}/missing", 404), (f"{SITE}/slow", None)]
+    assert [entry['url'] for entry in report['redirected']] == [f"{SITE}/old-page"]
+    # The redirect lands on /page, whose canonical is /page, so that is no mismatch
+    assert report['canonical_mismatch'] == [] and report['canonical_missing'] == []
+    assert report['shared_titles'] == [{'title': 'Page /page', 'urls': [f"{SITE}/page", f"{SITE}/old-page"]}]
+
+
+# site_batch: two sister sites rebuilt at once keep their own URLs and sitemaps
+
+SISTER_PAGE = '''export const {stem} = () => (
+  <div>
+    <LocationPageSEO suburb="{stem}" />
+    <img src="/images/{stem}.png" alt="{stem}" />
+  </div>
+);
+'''
+
+
+def png(width, height):
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', len(header)) + b'IHDR' + header + b'\0' * 4
+
+
+def sister_site(root, host, stems, prefix):
+    (root / 'src' / 'pages' / 'locations').mkdir(parents=True)
+    (root / 'src' / 'App.tsx').write_bytes(APP + ROUTED_APP.replace(b'/locations/', prefix.encode()))
+    (root / 'src' / 'data').mkdir()
+    (root / 'src' / 'data' / 'suburbData.ts').write_text(''.join(f"{{ slug: '{stem.lower()}' }},\n" for stem in stems))
+    (root / 'src' / 'pages' / 'Index.tsx').write_text("export default () => <main />;\n")
+    (root / 'public' / 'images').mkdir(parents=True)
+    # Built earlier: Vite copied the committed sitemap index into dist/
+    (root / 'dist').mkdir()
+    write_sitemap_index(str(root / 'dist' / 'sitemap.xml'), [f"https://{host}/sitemap-pages.xml"])
+    for stem in stems:
+        (root / 'src' / 'pages' / 'locations' / f"{stem}.tsx").write_text(SISTER_PAGE.format(stem=stem))
+        (root / 'public' / 'images' / f"{stem}.png").write_bytes(png(1200, 800))
+
+
+def sitemap_urls(directory):
+    return {name: sorted(shard_locs(directory / name)) for name in sorted(os.listdir(directory))
+            if name.startswith('sitemap') and name.endswith('.xml')}
+
+
+def test_site_batch_keeps_each_sites_urls_apart(tmp_path):
+    sister_site(tmp_path / 'melbourne', 'melbourne.example', ['Kew', 'Hawthorn'], '/locations/')
+    sister_site(tmp_path / 'geelong', 'geelong.example', ['Richmond'], '/suburbs/')
+    catalog = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'suburb_catalog.json')
+    (tmp_path / 'sites.json').write_text(json.dumps({'version': 1, 'sites': [
+        {'name': 'melbourne', 'root': 'melbourne', 'host': 'melbourne.example', 'path': '/locations/{slug}',
+         'catalog': catalog},
+        {'name': 'geelong', 'root': 'geelong', 'host': 'geelong.example', 'path': '/suburbs/{slug}',
+         'catalog': catalog, 'origin': [-38.1499, 144.3617]},
+    ]}))
+
+    command = ['--sites', str(tmp_path / 'sites.json'), '--log-dir', str(tmp_path / 'logs'), '--workers', '1', '--json']
+    assert site_batch.main(command) == 0, [(tmp_path / 'logs' / name).read_text() for name in os.listdir(tmp_path / 'logs')]
+
+    for name, host, path, stems in (('melbourne', 'melbourne.example', '/locations/{slug}', ['hawthorn', 'kew']),
+                                    ('geelong', 'geelong.example', '/suburbs/{slug}', ['richmond'])):
+        root = tmp_path / name
+        pages = [f"https://{host}{path.format(slug=slug)}" for slug in stems]
+        for stem, page in zip(sorted(stem.capitalize() for stem in stems), pages):
+            assert f'canonical="{page}"' in (root / 'src' / 'pages' / 'locations' / f"{stem}.tsx").read_text()
+        public = sitemap_urls(root / 'public')
+        assert public['sitemap-locations.xml'] == pages
+        assert all(url.startswith(f"https://{host}/") for urls in public.values() for url in urls)
+        # The image sitemap goes into the site's own build and its index, never into public/
+        assert 'sitemap-images.xml' not in public
+        built = sitemap_urls(root / 'dist')
+        assert built['sitemap-images.xml'] == pages
+        images = (root / 'dist' / 'sitemap-images.xml').read_text()
+        assert images.count(f"<image:loc>https://{host}/images/") == len(stems) and images.count('.example') == 2 * len(stems)
+        assert built['sitemap.xml'] == [f"https://{host}/sitemap-images.xml", f"https://{host}/sitemap-pages.xml"]
+
+
+# snippet_auditor: pixel widths against a per-character loop, truncation and duplicates
+
+def test_measure_matches_a_per_character_loop():
+    texts = ['Mould Removal Kew', '', 'Café – “quoted” 🙂', 'W' * 40, 'i' * 200]
+    widths, fits = snippet_auditor.measure(texts, 20, 600)
+    table = snippet_auditor.GLYPH_WIDTHS
+    for text, width, fit in zip(texts, widths, fits):
+        advances = [table[min(ord(char), len(table) - 1)] * 20 / 1000 for char in text]
+        assert width == pytest.approx(sum(advances))
+        assert fit == next((n for n in range(len(text)) if sum(advances[:n + 1]) > 600), len(text))
+
+
+def snippet_table(rows):
+    snippets = snippet_auditor.SnippetTable()
+    for url, suburb, field, text in rows:
+        snippets.add(url, suburb and suburb.lower(), suburb, 'page', field, text, f"{url}.tsx")
+    return snippets
+
+
+def test_long_titles_and_descriptions_are_truncated():
+    long_title = 'Professional Mould Removal and Remediation Services in Kew, Melbourne - Same Day'
+    long_description = 'Mould inspection, removal and remediation for homes and businesses. ' * 3
+    snippets = snippet_table([
+        ('/locations/kew', 'Kew', 'title', long_title),
+        ('/locations/kew', 'Kew', 'description', long_description),
+        ('/locations/hawthorn', 'Hawthorn', 'title', 'Mould Removal Hawthorn'),
+        ('/locations/hawthorn', 'Hawthorn', 'description', 'Same-day mould removal in Hawthorn.'),
+    ])
+    for field, text in (('title', long_title), ('description', long_description)):
+        [found], widths = snippet_auditor.find_truncated(snippets, field)
+        assert found['url'] == '/locations/kew' and found['width'] > snippet_auditor.LIMIT_PX[field]
+        assert found['shown'].endswith(' ...') and text.startswith(found['shown'][:-4])
+        assert len(found['shown']) - 4 < len(text)
+        assert widths[1] <= snippet_auditor.LIMIT_PX[field]
+
+
+def test_duplicates_exact_and_ignoring_the_suburb():
+    snippets = snippet_table([
+        ('/locations/kew', 'Kew', 'title', 'Mould Removal Kew | Mould & Restoration Co'),
+        ('/locations/hawthorn', 'Hawthorn', 'title', 'Mould removal Hawthorn - Mould & Restoration Co.'),
+        ('/locations/richmond', 'Richmond', 'title', 'Mould Removal Richmond | Mould & Restoration Co'),
+        ('/services', None, 'title', 'Mould Services | Mould & Restoration Co'),
+        ('/services/inspection', None, 'title', 'Mould Services | Mould & Restoration Co'),
+    ])
+    exact, near = snippet_auditor.find_duplicates(snippets, 'title')
+    assert exact == [{'text': 'Mould Services | Mould & Restoration Co', 'urls': ['/services', '/services/inspection']}]
+    assert near == [{'text': 'Mould Removal Kew | Mould & Restoration Co', 'variants': 3,
+                     'urls': ['/locations/hawthorn', '/locations/kew', '/locations/richmond']}]
+
+
+# watch_pages: snapshots, change detection and one processed batch
+
+def test_snapshot_and_changed_paths(tmp_path):
+    (tmp_path / 'locations').mkdir()
+    (tmp_path / 'About.tsx').write_text('a')
+    (tmp_path / 'locations' / 'Kew.tsx').write_text('kew')
+    (tmp_path / 'locations' / 'notes.md').write_text('not a page')
+    before = watch_pages.snapshot(str(tmp_path))
+    assert sorted(before) == ['About.tsx', os.path.join('locations', 'Kew.tsx')]
+    assert before['About.tsx'][1] == 1
+
+    (tmp_path / 'About.tsx').write_text('about')
+    (tmp_path / 'locations' / 'Kew.tsx').unlink()
+    (tmp_path / 'locations' / 'Hawthorn.tsx').write_text('hawthorn')
+    after = watch_pages.snapshot(str(tmp_path))
+    assert watch_pages.changed_paths(before, after) == {
+        'About.tsx', os.path.join('locations', 'Kew.tsx'), os.path.join('locations', 'Hawthorn.tsx')}
+    assert watch_pages.changed_paths(after, watch_pages.snapshot(str(tmp_path))) == set()
+
+
+def test_watcher_processes_a_batch_and_ignores_its_own_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(updated_sitemap_generator, 'MANIFEST_PATH', str(tmp_path / 'cache' / 'sitemap-manifest.json'))
+    locations = tmp_path / 'src' / 'pages' / 'locations'
+    locations.mkdir(parents=True)
+    (tmp_path / 'public').mkdir()
+    (tmp_path / 'src' / 'App.tsx').write_bytes(ROUTED_APP)
+    (tmp_path / 'src' / 'data').mkdir()
+    (tmp_path / 'src' / 'data' / 'suburbData.ts').write_text("[{ slug: 'kew' }, { slug: 'hawthorn' }]\n")
+    (locations / 'Kew.tsx').write_text(SEO_PAGE.format(stem='Kew', prop='canonical', url=f"{SITE}/locations/kew"))
+
+    watcher = watch_pages.PageWatcher(str(tmp_path), interval=0.01, debounce=0.05)
+    watcher.known = watch_pages.snapshot(watcher.pages_dir)
+    watcher.process(set(watcher.known))
+    assert shard_locs(tmp_path / 'public' / 'sitemap-locations.xml') == [f"{SITE}/locations/kew"]
+
+    # A new page without a canonical: the watcher sees it, writes the canonical and lists the page
+    (locations / 'Hawthorn.tsx').write_text("export const Hawthorn = () => (\n  <div>\n"
+                                            "    <LocationPageSEO\n      suburb=\"Hawthorn\"\n    />\n  </div>\n);\n")
+    changed = watcher.wait_for_changes()
+    assert changed == {os.path.join('locations', 'Hawthorn.tsx')}
+    messages = watcher.process(changed)
+    assert f'canonical="{SITE}/locations/hawthorn"' in (locations / 'Hawthorn.tsx').read_text()
+    assert any('sitemap-locations.xml' in message for message in messages)
+    assert sorted(shard_locs(tmp_path / 'public' / 'sitemap-locations.xml')) == [
+        f"{SITE}/locations/hawthorn", f"{SITE}/locations/kew"]
+
+    # Its own rewrite of Hawthorn.tsx is already known, so the next poll finds nothing
+    assert watch_pages.changed_paths(watcher.known, watch_pages.snapshot(watcher.pages_dir)) == set()
+    # Processing an unchanged page again rewrites nothing
+    assert watcher.process({os.path.join('locations', 'Kew.tsx')}) == []
+
+
+# instrumentation: the --metrics-json artifact
+
+def test_metrics_json_has_the_documented_schema(tmp_path, monkeypatch):
+    monkeypatch.setattr(page_index, 'CACHE_DIR', str(tmp_path / 'cache'))
+    locations = tmp_path / 'src' / 'pages' / 'locations'
+    locations.mkdir(parents=True)
+    (tmp_path / 'src' / 'App.tsx').write_bytes(ROUTED_APP)
+    (tmp_path / 'src' / 'data').mkdir()
+    (tmp_path / 'src' / 'data' / 'suburbData.ts').write_text("[{ slug: 'kew' }]\n")
+    (locations / 'Kew.tsx').write_text(SEO_PAGE.format(stem='Kew', prop='canonical',
+                                                       url=f"{SITE}/services/mould-removal-kew"))
+    metrics_path = tmp_path / 'metrics.json'
+
+    assert update_location_canonicals.main(['--root', str(tmp_path), '--workers', '1', '--profile',
+                                            '--metrics-json', str(metrics_path)]) == 0
+    metrics = json.loads(metrics_path.read_text())
+
+    assert set(metrics) == {'version', 'script', 'finished', 'seconds', 'cpu_seconds', 'peak_rss_bytes',
+                            'peak_rss_children_bytes', 'bytes_read', 'bytes_written', 'stages', 'counters',
+                            'files', 'patterns', 'hotspots'}
+    assert metrics['version'] == instrumentation.METRICS_VERSION
+    assert metrics['script'] == 'update_location_canonicals'
+    assert metrics['finished'].endswith('+00:00')
+    for key in ('seconds', 'cpu_seconds'):
+        assert isinstance(metrics[key], (int, float)) and metrics[key] >= 0
+    for key in ('peak_rss_bytes', 'peak_rss_children_bytes', 'bytes_read', 'bytes_written'):
+        assert isinstance(metrics[key], int) and metrics[key] >= 0
+    assert metrics['bytes_read'] > 0 and metrics['bytes_written'] > 0
+
+    assert 'scan' in metrics['stages']
+    for stage in metrics['stages'].values():
+        assert set(stage) == {'calls', 'seconds', 'cpu_seconds'} and stage['calls'] >= 1
+    assert all(isinstance(value, int) for value in metrics['counters'].values())
+    assert 'Kew.tsx' in metrics['files']
+    for entry in metrics['files'].values():
+        assert set(entry) == {'seconds', 'read', 'written'}
+    for stats in metrics['patterns'].values():
+        assert set(stats) == {'pattern', 'calls', 'matches', 'seconds'} and stats['calls'] >= 1
+    assert metrics['hotspots']
+    for row in metrics['hotspots']:
+        assert set(row) == {'function', 'calls', 'primitive_calls', 'seconds', 'cumulative_seconds'}
+
+    # Without --profile the artifact has the same keys and no hotspots
+    assert update_location_canonicals.main(['--root', str(tmp_path), '--workers', '1',
+                                            '--metrics-json', str(metrics_path)]) == 0
+    metrics_again = json.loads(metrics_path.read_text())
+    assert set(metrics_again) == set(metrics) and metrics_again['hotspots'] is None
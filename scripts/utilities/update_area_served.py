@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+import argparse
+import os
+import sys
+
+import batch_rewriter
+import page_index
+import suburb_catalog
+from page_transforms import set_area_served
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Add catalogued neighbours to each location page's ServiceSchema areaServed, "
+                    "keeping the suburbs it already lists")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--k', type=int, default=suburb_catalog.DEFAULT_NEIGHBOURS,
+                        help="neighbouring suburbs a page should list besides its own (default: %(default)s)")
+    parser.add_argument('--dry-run', action='store_true', help="print a unified diff per file instead of writing")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+    locations_dir = os.path.join(os.path.abspath(args.root), 'src', 'pages', 'locations')
+
+    # Only pages with a ServiceSchema carry areaServed
+    index = page_index.scan_pages(locations_dir)
+    location_files = sorted(name for name, entry in index.items() if 'ServiceSchema' in entry['components'])
+
+    print(f"Found {len(location_files)} location files with a ServiceSchema")
+
+    try:
+        batch = batch_rewriter.run_batch(locations_dir, location_files, set_area_served,
+                                         options={'k': args.k}, workers=args.workers, dry_run=args.dry_run)
+    except batch_rewriter.BatchError as error:
+        print(f"Batch aborted, no files were changed: {error}")
+        return 1
+
+    for result in batch['results']:
+        for message in result['messages']:
+            print(f"  {message}")
+        if args.dry_run and result['filename'] in batch['diffs']:
+            sys.stdout.write(batch['diffs'][result['filename']])
+
+    action = "Would update" if args.dry_run else "Updated"
+    print(f"Batch areaServed update completed! {action} {len(batch['changed'])} files.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
-import re
+import sys
+
+import instrumentation
+import jsx_locator
+import page_index
 
 # Define the service pages that need canonical URLs
 service_pages = {
@@ -31,52 +36,40 @@ service_pages = {
     }
 }
 
-# Directory path
-pages_dir = "/Users/michaelyoussef/APP/mould-restoration-clone/src/pages/"
-
-for filename, config in service_pages.items():
+def update_page(pages_dir, filename, config, entry, metrics):
+    """Add the canonical to one service page; returns True if the file was written"""
     file_path = os.path.join(pages_dir, filename)
-
-    if not os.path.exists(file_path):
-        print(f"File {filename} not found, skipping...")
-        continue
-
     print(f"Processing {filename}...")
 
-    with open(file_path, 'r') as file:
-        content = file.read()
-
     # Check if file already has SEOHead import
-    if 'ServicePageSEO' in content or 'SEOHead' in content:
+    if 'ServicePageSEO' in entry['components'] or entry['imports_seo_head']:
         print(f"  {filename} already has SEO components, checking canonical...")
-        if 'canonicalUrl=' in content:
+        if 'canonicalUrl' in entry['urls']:
             print(f"  {filename} already has canonical URL, skipping...")
-            continue
-
-    # Add SEOHead import if not present
-    if 'ServicePageSEO' not in content and 'SEOHead' not in content:
-        # Find the import statements section and add SEOHead import
-        import_pattern = r'(import.*from \'@/components/ContactSection\';\n)'
-        if re.search(import_pattern, content):
-            content = re.sub(
-                import_pattern,
-                r'\1import { ServicePageSEO } from \'@/components/seo/SEOHead\';\n',
-                content
-            )
-            print(f"  Added ServicePageSEO import to {filename}")
-        else:
-            # Try alternative pattern
-            contact_import = "import { ContactSection } from '@/components/ContactSection';"
-            if contact_import in content:
-                content = content.replace(
-                    contact_import,
-                    f"{contact_import}\nimport {{ ServicePageSEO }} from '@/components/seo/SEOHead';"
-                )
-                print(f"  Added ServicePageSEO import to {filename} (alternative method)")
-
-    # Add SEO component after return statement
-    return_pattern = r'(\s+return \(\s+<div[^>]*>\s*)(.*?Professional Service Bar)'
-    seo_component = f'''      {{/* SEO Optimization for {filename.replace('.tsx', '')} */}}
+            return False
+
+    with metrics.stage('read'):
+        with open(file_path, 'rb') as file:
+            content = file.read()
+    metrics.read(len(content), filename)
+
+    # Locate the imports, root element and any ServicePageSEO in one pass
+    with metrics.stage('locate'):
+        found = jsx_locator.locate(content)
+    service_seo = found['elements'].get('ServicePageSEO')
+
+    if service_seo:
+        # Component exists without canonicalUrl: add the prop before its '/>'
+        start, end, _ = service_seo[0]
+        offset = jsx_locator.closing_offset(content, start, end)
+        content = jsx_locator.insert(content, offset, f'\n        canonicalUrl="{config["canonical"]}"')
+        print(f"  Added canonicalUrl to existing ServicePageSEO in {filename}")
+    elif found['root'] is None:
+        print(f"  Could not find suitable insertion point in {filename}")
+        return False
+    else:
+        # Add SEO component as the first child of the root element
+        seo_component = f'''      {{/* SEO Optimization for {filename.replace('.tsx', '')} */}}
       <ServicePageSEO
         service="{config['service']}"
         title="{config['title']}"
@@ -84,21 +77,53 @@ for filename, config in service_pages.items():
         canonicalUrl="{config['canonical']}"
       />
 
-      {{/* '''
-
-    if re.search(return_pattern, content, re.DOTALL):
-        content = re.sub(
-            return_pattern,
-            rf'\1{seo_component}\2',
-            content,
-            flags=re.DOTALL
-        )
+'''
+        insertions = [(found['root']['insert'], seo_component)]
         print(f"  Added SEO component to {filename}")
 
+        # Add SEOHead import if not present, after the ContactSection import when there is one
+        import_edit = jsx_locator.import_insertion(
+            content, found['imports'], 'ServicePageSEO', '@/components/seo/SEOHead',
+            after='@/components/ContactSection')
+        if import_edit:
+            insertions.append(import_edit)
+            print(f"  Added ServicePageSEO import to {filename}")
+
+        content = jsx_locator.apply_insertions(content, insertions)
+
     # Write the updated content back to file
-    with open(file_path, 'w') as file:
-        file.write(content)
+    with metrics.stage('write'):
+        with open(file_path, 'wb') as file:
+            file.write(content)
+    metrics.wrote(len(content), filename)
 
     print(f"  Successfully updated {filename}")
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Add ServicePageSEO canonical URLs to the service pages")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    pages_dir = os.path.join(os.path.abspath(args.root), 'src', 'pages')
+
+    with instrumentation.run('update_canonicals', args) as metrics:
+        with metrics.stage('scan'):
+            index = page_index.scan_pages(pages_dir)
+
+        for filename, config in service_pages.items():
+            entry = index.get(filename)
+            if entry is None:
+                print(f"File {filename} not found, skipping...")
+                continue
+            with metrics.file(filename):
+                update_page(pages_dir, filename, config, entry, metrics)
+
+        print("Batch canonical URL update completed!")
+    return 0
+
 
-print("Batch canonical URL update completed!")
\ No newline at end of file
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,291 +1,437 @@
 #!/usr/bin/env python3
-import re
-
-# List of all 145 location files with priority classifications
-locations_with_priority = {
-    # Inner Melbourne Premium Suburbs (0.95 priority)
-    "MelbourneCBD": 0.95,
-    "Carlton": 0.95,
-    "Fitzroy": 0.95,
-    "Richmond": 0.95,
-    "SouthYarra": 0.95,
-    "Prahran": 0.95,
-
-    # Premium Eastern Suburbs (0.9 priority)
-    "Toorak": 0.9,
-    "Malvern": 0.9,
-    "MalvernEast": 0.9,
-    "Armadale": 0.9,
-    "Hawthorn": 0.9,
-    "Kew": 0.9,
-    "Camberwell": 0.9,
-    "GlenWaverley": 0.9,
-    "Balwyn": 0.9,
-    "Kooyong": 0.9,
-
-    # Bayside Premium Suburbs (0.9 priority)
-    "Brighton": 0.9,
-    "BrightonEast": 0.9,
-    "Sandringham": 0.9,
-    "Hampton": 0.9,
-    "StKilda": 0.9,
-    "Elsternwick": 0.85,
-    "Elwood": 0.85,
-    "Ripponlea": 0.85,
-
-    # CBD Adjacent Areas (0.85 priority)
-    "Southbank": 0.85,
-    "Docklands": 0.85,
-    "EastMelbourne": 0.85,
-    "WestMelbourne": 0.85,
-    "NorthMelbourne": 0.85,
-    "SouthMelbourne": 0.85,
-    "PortMelbourne": 0.85,
-    "AlbertPark": 0.85,
-    "MiddlePark": 0.85,
-    "Parkville": 0.85,
-    "SouthWharf": 0.85,
-
-    # Inner Creative Corridor (0.85 priority)
-    "Collingwood": 0.85,
-    "Abbotsford": 0.85,
-    "Cremorne": 0.85,
-    "Windsor": 0.85,
-    "Alphington": 0.85,
-    "PrincesHill": 0.85,
-    "CliftonHill": 0.85,
-    "Burnley": 0.85,
-
-    # Northern Suburbs (0.8 priority)
-    "Brunswick": 0.8,
-    "Coburg": 0.8,
-    "Preston": 0.8,
-    "Thornbury": 0.8,
-    "Northcote": 0.8,
-    "Fairfield": 0.8,
-    "Ivanhoe": 0.8,
-    "Heidelberg": 0.8,
-    "Bundoora": 0.8,
-    "MillPark": 0.8,
-    "Reservoir": 0.8,
-    "Thomastown": 0.8,
-    "Epping": 0.8,
-    "Lalor": 0.8,
-    "Broadmeadows": 0.8,
-
-    # Eastern Suburbs (0.8 priority)
-    "BoxHill": 0.8,
-    "Blackburn": 0.8,
-    "BlackburnNorth": 0.8,
-    "BlackburnSouth": 0.8,
-    "ForestHill": 0.8,
-    "Burwood": 0.8,
-    "MountWaverley": 0.8,
-    "WheelersHill": 0.8,
-    "WheelersHillSE": 0.8,
-    "GlenIris": 0.8,
-    "Ashwood": 0.8,
-    "Chadstone": 0.8,
-    "Oakleigh": 0.8,
-    "Clayton": 0.8,
-    "Mulgrave": 0.8,
-    "Carnegie": 0.8,
-    "Caulfield": 0.8,
-    "CaulfieldEast": 0.8,
-    "CaulfieldNorth": 0.8,
-    "CaulfieldSouth": 0.8,
-    "Ringwood": 0.8,
-    "Mitcham": 0.8,
-    "Vermont": 0.8,
-    "Nunawading": 0.8,
-    "Croydon": 0.8,
-    "Lilydale": 0.8,
-    "Doncaster": 0.8,
-    "Bulleen": 0.8,
-    "Templestowe": 0.8,
-    "Bentleigh": 0.8,
-    "MontAlbert": 0.8,
-
-    # Western Suburbs (0.75 priority)
-    "Footscray": 0.75,
-    "Williamstown": 0.75,
-    "Altona": 0.75,
-    "Newport": 0.75,
-    "Yarraville": 0.75,
-    "Seddon": 0.75,
-    "Spotswood": 0.75,
-    "Maribyrnong": 0.75,
-    "Essendon": 0.75,
-    "MooneePonds": 0.75,
-    "AscotVale": 0.75,
-    "Flemington": 0.75,
-    "Kensington": 0.75,
-    "Sunshine": 0.75,
-    "Laverton": 0.75,
-    "PointCook": 0.75,
-    "Werribee": 0.75,
-    "HoppersCrossing": 0.75,
-    "Tarneit": 0.75,
-    "Truganina": 0.75,
-    "WyndhamVale": 0.75,
-    "ManorLakes": 0.75,
-    "WilliamsLanding": 0.75,
-    "Braybrook": 0.75,
-    "DeerPark": 0.75,
-    "Tottenham": 0.75,
-
-    # Southeastern Suburbs (0.75 priority)
-    "Dandenong": 0.75,
-    "NoblePark": 0.75,
-    "Springvale": 0.75,
-    "Keysborough": 0.75,
-    "NarreWarren": 0.75,
-    "Berwick": 0.75,
-    "Cranbourne": 0.75,
-
-    # Coastal & Bayside Extended (0.75 priority)
-    "Mentone": 0.75,
-    "Parkdale": 0.75,
-    "Mordialloc": 0.75,
-    "Aspendale": 0.75,
-    "Edithvale": 0.75,
-    "Bonbeach": 0.75,
-    "Carrum": 0.75,
-    "McKinnon": 0.75,
-    "Ormond": 0.75,
-    "Balaclava": 0.75,
-    "Murrumbeena": 0.75,
-    "Hughesdale": 0.75,
-    "Huntingdale": 0.75,
-    "NottingHill": 0.75,
-    "Highett": 0.75,
-    "Cheltenham": 0.75,
-    "Frankston": 0.75,
-    "FrankstonSouth": 0.75,
-    "StKildaEast": 0.75,
-    "Canterbury": 0.75,
-    "Chatham": 0.75,
-    "SurreyHills": 0.75,
-    "Parkmore": 0.75
-}
-
-def camel_to_kebab(name):
-    """Convert CamelCase to kebab-case"""
-    # Special cases
-    special_cases = {
-        "MelbourneCBD": "melbourne-cbd",
-        "StKilda": "st-kilda",
-        "StKildaEast": "st-kilda-east",
-        "WheelersHillSE": "wheelers-hill-se",
-        "McKinnon": "mckinnon"  # Fixed: McKinnon should be mckinnon, not mc-kinnon
+import argparse
+import functools
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import consistency_checker
+import indexnow_notifier
+import instrumentation
+import page_index
+import suburb_catalog
+from page_transforms import LOCATION_PATH, slug_path
+from sitemap_writer import MAX_BYTES, MAX_URLS, SitemapWriter, file_digest, write_sitemap_index
+from slug_registry import SlugRegistry
+
+SITE_URL = "https://mouldrestoration.com.au"
+
+# Previous page hashes, lastmods, shard and index digests for incremental runs, one file per output directory
+MANIFEST_PATH = os.path.join(page_index.CACHE_DIR, "sitemap-manifest.json")
+
+# Core and service pages, listed by hand and written one sitemap each
+PAGES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sitemap_pages.json')
+
+# Files a relative import in App.tsx can resolve to
+_MODULE_SUFFIXES = ('.tsx', '.ts', '.jsx', '.js', '/index.tsx', '/index.ts')
+
+def load_locations(locations_dir, catalog_path=suburb_catalog.CATALOG_PATH, origin=suburb_catalog.ORIGIN):
+    """Scan the location pages through the shared page index and look up their priorities.
+
+    Returns {'index', 'pages', 'suburbs', 'priorities', 'uncatalogued'}; pages
+    are the sorted stems of the location pages that exist on disk.
+    """
+    index = page_index.scan_pages(locations_dir)
+    pages = sorted(entry['stem'] for entry in index.values())
+    # Sitemap priorities computed from the suburb catalog (distance from the CBD, capped per region)
+    catalog = suburb_catalog.load_catalog(catalog_path)
+    return {
+        'directory': locations_dir,
+        'index': index,
+        'pages': pages,
+        'suburbs': SlugRegistry(pages),
+        'priorities': catalog.priorities(origin),
+        'uncatalogued': [location for location in pages if location not in catalog],
     }
 
-    if name in special_cases:
-        return special_cases[name]
+def manifest_path(output_dir):
+    """Return the manifest file used for an output directory"""
+    digest = hashlib.sha1(os.path.abspath(output_dir).encode('utf-8')).hexdigest()[:12]
+    return MANIFEST_PATH.replace('.json', f"-{digest}.json")
+
+def load_manifest(output_dir):
+    """Load the previous run's manifest, or an empty one.
+
+    Manifests used to be shared by every output directory; when a directory
+    has none of its own the page lastmods of the shared file are still used,
+    which is safe because a page only keeps one while its content hash
+    matches. Its shard digests describe another directory and are dropped.
+    """
+    try:
+        with open(manifest_path(output_dir), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(MANIFEST_PATH, 'r') as f:
+            return {'pages': json.load(f).get('pages', {}), 'shards': {}}
+    except (OSError, ValueError):
+        return {'pages': {}, 'shards': {}}
+
+def save_manifest(manifest, output_dir):
+    """Write the manifest via a temporary file and atomic rename"""
+    path = manifest_path(output_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def mtime_date(mtime_ns):
+    """Format a file mtime as a W3C date for <lastmod>"""
+    return datetime.fromtimestamp(mtime_ns / 1e9, timezone.utc).date().isoformat()
+
+def commit_dates(*directories):
+    """Return {real path: date of the last commit touching it} for the unmodified files under directories.
+
+    One git log covers every directory, so a run reads the history once and
+    passes the result along. Only files still tracked and unchanged in the
+    working tree get a date: files deleted since their last commit, files
+    with uncommitted changes and directories outside the checkout of the
+    first one are left out, so callers fall back to the mtime.
+    """
+    def git(*command, cwd):
+        return subprocess.run(['git', '-c', 'core.quotePath=false', *command], cwd=cwd,
+                              capture_output=True, text=True, check=True).stdout
+    try:
+        top = git('rev-parse', '--show-toplevel', cwd=directories[0]).strip()
+        paths = [os.path.relpath(os.path.realpath(directory), top) for directory in directories]
+        paths = [path for path in paths if path != '..' and not path.startswith('..' + os.sep)]
+        if not paths:
+            return {}
+        modified = set(git('diff', '--name-only', 'HEAD', '--', *paths, cwd=top).splitlines())
+        tracked = set(git('ls-files', '--', *paths, cwd=top).splitlines()) - modified
+        log = git('log', '--format=%x00%cs', '--name-only', '--', *paths, cwd=top)
+    except (OSError, subprocess.CalledProcessError):
+        return {}
+    dates = {}
+    date = None
+    for line in log.splitlines():
+        if line.startswith('\0'):
+            date = line[1:]
+        elif line in tracked:
+            # The log runs newest first, so the first date seen for a file is its latest
+            dates.setdefault(os.path.join(top, line), date)
+    return dates
+
+def file_lastmod(directory, name, committed):
+    """Return the last commit date of an unmodified file, else its mtime date, or None if it is missing"""
+    path = os.path.join(os.path.realpath(directory), name)
+    if path in committed:
+        return committed[path]
+    try:
+        return mtime_date(os.stat(path).st_mtime_ns)
+    except OSError:
+        return None
+
+def page_lastmods(locations, manifest, committed=None):
+    """Return {stem: {'sha1', 'lastmod'}} for every location page.
+
+    A committed, unmodified page takes the date of its last commit, so a fresh
+    clone produces the same sitemap as the checkout it came from. A page with
+    local changes keeps its previous lastmod while its content hash is
+    unchanged, so touching a file without editing it does not advertise a
+    change; otherwise it takes the date of its file mtime.
+    """
+    previous = manifest.get('pages', {})
+    committed = committed or {}
+    directory = os.path.realpath(locations['directory'])
+    pages = {}
+    for filename, entry in locations['index'].items():
+        prior = previous.get(entry['stem'])
+        path = os.path.join(directory, filename)
+        if path in committed:
+            lastmod = committed[path]
+        elif prior and prior['sha1'] == entry['sha1']:
+            lastmod = prior['lastmod']
+        else:
+            lastmod = mtime_date(entry['mtime_ns'])
+        pages[entry['stem']] = {'sha1': entry['sha1'], 'lastmod': lastmod}
+    return pages
+
+def location_entries(locations, pages):
+    """Yield (kebab_name, priority, lastmod) for every location page, highest priority first"""
+    # Pages missing from the catalog fall into the lowest tier
+    priorities = locations['priorities']
+    keyed = sorted(
+        (-priorities.get(location, suburb_catalog.DEFAULT_PRIORITY), locations['suburbs'].to_kebab(location), location)
+        for location in locations['pages']
+    )
+    for negative_priority, kebab_name, location in keyed:
+        yield kebab_name, -negative_priority, pages[location]['lastmod']
+
+def generate_sitemap(locations, output_dir, pages, max_urls=MAX_URLS, max_bytes=MAX_BYTES, gzip_output=False,
+                     hash_only=False, skip_shards=(), site_url=SITE_URL, path=LOCATION_PATH):
+    """Stream the location sitemap into output_dir.
+
+    Returns (writer, shard_lastmods) where shard_lastmods holds the newest
+    lastmod of each shard, for the sitemap index.
+    """
+
+    # Every shard repeats the header, so nothing in it may depend on the other shards' pages
+    header_comments = (
+        "Melbourne Mould Removal Location Pages - Complete Technical SEO Coverage",
+        "Standardised URL Structure | Strategic Internal Linking",
+        f"URL STRUCTURE: {slug_path('[suburb]', path)} with optimised canonical URLs",
+    )
 
-    # Regular conversion: insert hyphen before uppercase letters (except first)
-    s1 = re.sub('(.)([A-Z][a-z]+)', r'\1-\2', name)
-    return re.sub('([a-z0-9])([A-Z])', r'\1-\2', s1).lower()
+    writer = SitemapWriter(output_dir, 'sitemap-locations', max_urls=max_urls,
+                           max_bytes=max_bytes, gzip_output=gzip_output,
+                           header_comments=header_comments, hash_only=hash_only,
+                           atomic=True, skip_shards=skip_shards)
+    shard_lastmods = []
+    with writer:
+        current_priority = None
+        for location, priority, lastmod in location_entries(locations, pages):
+            if priority != current_priority:
+                if current_priority is not None:
+                    writer.blank_line()
+                writer.comment(suburb_catalog.band_label(priority))
+                current_priority = priority
+            writer.add(f"{site_url}{slug_path(location, path)}", lastmod=lastmod,
+                       changefreq="weekly", priority=priority)
+            if len(shard_lastmods) < len(writer.shards):
+                shard_lastmods.append(lastmod)
+            else:
+                shard_lastmods[-1] = max(shard_lastmods[-1], lastmod)
+        writer.blank_line()
 
-def generate_sitemap():
-    """Generate the complete sitemap XML"""
+    return writer, shard_lastmods
 
-    # Group locations by priority
-    priority_groups = {
-        0.95: [],
-        0.9: [],
-        0.85: [],
-        0.8: [],
-        0.75: []
+def load_page_sitemaps(path=PAGES_PATH):
+    """Load the hand-listed sitemaps, rejecting a path listed more than once"""
+    with open(path, 'r') as f:
+        data = json.load(f)
+    if data.get('version') != 1:
+        raise ValueError(f"{path}: unsupported version {data.get('version')!r}")
+    listed = {}
+    for sitemap in data['sitemaps']:
+        for section in sitemap['sections']:
+            for url in section['urls']:
+                if url['path'] in listed:
+                    raise ValueError(f"{path}: {url['path']} is listed in both {listed[url['path']]} and {sitemap['name']}")
+                listed[url['path']] = sitemap['name']
+    return data['sitemaps']
+
+def source_lastmods(src_dir, paths, committed):
+    """Return {path: lastmod} from the component App.tsx routes each path to.
+
+    committed is commit_dates() over src_dir. Paths no static route serves
+    get no lastmod.
+    """
+    routes = consistency_checker.load_routes(os.path.join(src_dir, 'App.tsx'))
+    lastmods = {}
+    for path in paths:
+        component = routes['static'].get(consistency_checker.normalise_url(path)[1])
+        module = routes['modules'].get(component, '')
+        if not module.startswith('./'):
+            continue
+        for suffix in _MODULE_SUFFIXES:
+            name = module[2:] + suffix
+            if os.path.exists(os.path.join(src_dir, name)):
+                lastmods[path] = file_lastmod(src_dir, name, committed)
+                break
+    return lastmods
+
+def generate_page_sitemap(sitemap, output_dir, lastmods, max_urls=MAX_URLS, max_bytes=MAX_BYTES,
+                          gzip_output=False, hash_only=False, skip_shards=(), site_url=SITE_URL, path=LOCATION_PATH):
+    """Stream one hand-listed sitemap into output_dir.
+
+    Returns (writer, shard_lastmods) like generate_sitemap; path is accepted
+    so both take the same options.
+    """
+    writer = SitemapWriter(output_dir, sitemap['name'], max_urls=max_urls, max_bytes=max_bytes,
+                           gzip_output=gzip_output, hash_only=hash_only, atomic=True, skip_shards=skip_shards)
+    shard_lastmods = []
+    with writer:
+        for section in sitemap['sections']:
+            writer.comment(section['comment'])
+            for url in section['urls']:
+                lastmod = lastmods.get(url['path'])
+                writer.add(f"{site_url}{url['path']}", lastmod=lastmod,
+                           changefreq=url.get('changefreq'), priority=url.get('priority'))
+                if len(shard_lastmods) < len(writer.shards):
+                    shard_lastmods.append(lastmod)
+                elif lastmod:
+                    shard_lastmods[-1] = max(shard_lastmods[-1] or lastmod, lastmod)
+            writer.blank_line()
+    return writer, shard_lastmods
+
+def generate_incremental(generate, output_dir, previous):
+    """Rewrite only the shards whose content differs from what is on disk.
+
+    generate is generate_sitemap or generate_page_sitemap with everything but
+    the writer mode bound, and previous the {shard: digest} the manifest holds
+    for it. A hash-only pass computes every shard's digest without writing
+    anything; each is compared with the digest of the file already in
+    output_dir, so a shard that was reverted or edited outside the generator
+    is rewritten even when the manifest says it is current. If every shard
+    matches and the manifest lists the same shards, nothing is written.
+    """
+    plan, shard_lastmods = generate(hash_only=True)
+    unchanged = {
+        number for number, (name, digest) in enumerate(zip(plan.shards, plan.digests))
+        if file_digest(os.path.join(output_dir, name)) == digest
     }
+    if len(unchanged) == len(plan.shards) and set(previous) == set(plan.shards):
+        return plan, shard_lastmods
+    return generate(skip_shards=unchanged)
+
+def generate_sitemap_index(output_dir, shards, site_url=SITE_URL):
+    """Regenerate sitemap.xml as a <sitemapindex> over the (name, lastmod) shards.
+
+    Only sitemaps kept in output_dir are listed; image_sitemap.py adds its
+    own entry to the copy of the index in the build it writes into.
+    sitemap.xml is left untouched when its content is unchanged.
+    """
+    return write_sitemap_index(os.path.join(output_dir, 'sitemap.xml'),
+                               ((f"{site_url}/{name}", lastmod) for name, lastmod in shards), only_if_changed=True)
+
+def update_sitemaps(locations_dir, output_dir, incremental=False, catalog_path=suburb_catalog.CATALOG_PATH,
+                    origin=suburb_catalog.ORIGIN, pages_path=PAGES_PATH, **options):
+    """Regenerate the page and location sitemaps, the index and the manifest from the current pages.
+
+    locations_dir is <root>/src/pages/locations; the hand-listed pages take
+    their lastmod from the components App.tsx routes them to. Returns
+    (locations, writer, page_writers, index_count) where index_count is None
+    if the index did not need rewriting.
+    """
+    metrics = instrumentation.current()
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(locations_dir)))
+    path = options.get('path', LOCATION_PATH)
+    with metrics.stage('scan'):
+        locations = load_locations(locations_dir, catalog_path, origin)
+        page_sitemaps = load_page_sitemaps(pages_path)
+        listed = [url['path'] for sitemap in page_sitemaps for section in sitemap['sections'] for url in section['urls']]
+        overlap = set(listed) & {slug_path(locations['suburbs'].to_kebab(stem), path) for stem in locations['pages']}
+        if overlap:
+            raise ValueError(f"{pages_path}: {', '.join(sorted(overlap))} already in the location sitemap")
+    with metrics.stage('manifest'):
+        manifest = load_manifest(output_dir)
+        committed = commit_dates(src_dir)
+        pages = page_lastmods(locations, manifest, committed)
+        sources = source_lastmods(src_dir, listed, committed)
 
-    for location, priority in locations_with_priority.items():
-        kebab_name = camel_to_kebab(location)
-        priority_groups[priority].append(kebab_name)
-
-    # Sort each group alphabetically
-    for priority in priority_groups:
-        priority_groups[priority].sort()
-
-    # Generate XML
-    xml_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
-        xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
-        xsi:schemaLocation="http://www.sitemaps.org/schemas/sitemap/0.9
-        http://www.sitemaps.org/schemas/sitemap/0.9/sitemap.xsd">
-
-  <!-- Melbourne Mould Removal Location Pages - Complete Technical SEO Coverage -->
-  <!-- Generated: 2025-09-17 | Total Pages: 145 | Standardised URL Structure | Strategic Internal Linking -->
-  <!-- NEW STRUCTURE: /locations/[suburb] with optimised canonical URLs -->
-
-'''
-
-    # Add entries by priority groups
-    priority_labels = {
-        0.95: "Inner Melbourne Premium Suburbs (0.95 priority)",
-        0.9: "Premium Eastern & Bayside Suburbs (0.9 priority)",
-        0.85: "CBD Adjacent & Inner Creative Areas (0.85 priority)",
-        0.8: "Northern & Eastern Suburbs (0.8 priority)",
-        0.75: "Western, Southeastern & Extended Bayside (0.75 priority)"
+    previous = manifest.get('sitemaps', {})
+    page_writers = []
+    shards = []
+    with metrics.stage('pages'):
+        for sitemap in page_sitemaps:
+            generate = functools.partial(generate_page_sitemap, sitemap, output_dir, sources, **options)
+            if incremental:
+                page_writer, shard_lastmods = generate_incremental(generate, output_dir,
+                                                                   previous.get(sitemap['name'], {}))
+            else:
+                page_writer, shard_lastmods = generate()
+            page_writers.append(page_writer)
+            shards.extend(zip(page_writer.shards, shard_lastmods))
+    with metrics.stage('sitemap'):
+        generate = functools.partial(generate_sitemap, locations, output_dir, pages, **options)
+        if incremental:
+            writer, shard_lastmods = generate_incremental(generate, output_dir, manifest.get('shards', {}))
+        else:
+            writer, shard_lastmods = generate()
+        shards.extend(zip(writer.shards, shard_lastmods))
+    for name in [name for page_writer in page_writers for name in page_writer.written] + writer.written:
+        metrics.wrote(os.path.getsize(os.path.join(output_dir, name)), name)
+
+    new_manifest = {
+        'pages': pages,
+        'sitemaps': {sitemap['name']: dict(zip(page_writer.shards, page_writer.digests))
+                     for sitemap, page_writer in zip(page_sitemaps, page_writers)},
+        'shards': dict(zip(writer.shards, writer.digests)),
     }
+    index_count = None
+    # The index is a few entries and only replaced when its content differs, so it is always rebuilt
+    index_path = os.path.join(output_dir, 'sitemap.xml')
+    index_digest = file_digest(index_path)
+    with metrics.stage('index'):
+        count = generate_sitemap_index(output_dir, shards, options.get('site_url', SITE_URL))
+    new_digest = file_digest(index_path)
+    if new_digest != index_digest:
+        index_count = count
+        metrics.wrote(os.path.getsize(index_path), 'sitemap.xml')
+    index_digest = new_digest
+
+    new_manifest['index'] = index_digest
+    if new_manifest != manifest:
+        with metrics.stage('manifest-save'):
+            save_manifest(new_manifest, output_dir)
+    return locations, writer, page_writers, index_count
+
+def parse_origin(value):
+    """Parse a LAT,LON command-line value"""
+    try:
+        lat, lon = (float(part) for part in value.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LAT,LON, got {value!r}") from None
+    return lat, lon
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the page, service and location sitemaps and the sitemap index")
+    parser.add_argument('--root', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'),
+                        help="project root (default: the repository this script lives in)")
+    parser.add_argument('--site-url', default=SITE_URL, help="scheme and host of the sitemap URLs (default: %(default)s)")
+    parser.add_argument('--path', default=LOCATION_PATH,
+                        help="path of a location page, with {slug} for its suburb (default: %(default)s)")
+    parser.add_argument('--pages', default=PAGES_PATH,
+                        help="hand-listed core and service pages (default: %(default)s)")
+    parser.add_argument('--catalog', default=suburb_catalog.CATALOG_PATH,
+                        help="suburb catalog the priorities come from (default: %(default)s)")
+    parser.add_argument('--origin', type=parse_origin, default=suburb_catalog.ORIGIN, metavar='LAT,LON',
+                        help="city centre the priorities are measured from (default: the Melbourne GPO)")
+    parser.add_argument('--max-urls', type=int, default=MAX_URLS, help="URLs per shard (default: %(default)s)")
+    parser.add_argument('--max-bytes', type=int, default=MAX_BYTES, help="uncompressed bytes per shard (default: %(default)s)")
+    parser.add_argument('--gzip', action='store_true', help="write .xml.gz shards")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only rewrite shards whose entries changed since the last run")
+    parser.add_argument('--notify', action='store_true',
+                        help="queue the location URLs whose pages changed for indexnow_notifier.py submit")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    locations_dir = os.path.join(os.path.abspath(args.root), 'src', 'pages', 'locations')
+    public_dir = os.path.join(os.path.abspath(args.root), 'public')
+    options = {'max_urls': args.max_urls, 'max_bytes': args.max_bytes, 'gzip_output': args.gzip,
+               'site_url': args.site_url.rstrip('/'), 'path': args.path}
+
+    # Generate and save the sitemaps
+    try:
+        with instrumentation.run('updated_sitemap_generator', args):
+            locations, writer, page_writers, index_count = update_sitemaps(
+                locations_dir, public_dir, args.incremental, args.catalog, args.origin, args.pages, **options)
+    except (OSError, ValueError) as error:
+        print(f"❌ {error}", file=sys.stderr)
+        return 1
+    location_pages = locations['pages']
+    if locations['uncatalogued']:
+        print(f"⚠️  {len(locations['uncatalogued'])} location pages are not in the suburb catalog and get the lowest priority: "
+              f"{', '.join(locations['uncatalogued'])}")
+    if index_count is not None:
+        print(f"✅ Regenerated sitemap.xml index with {index_count} sitemaps")
+
+    for page_writer in page_writers:
+        if page_writer.written:
+            print(f"✅ Updated {', '.join(page_writer.written)} with {page_writer.total_urls} pages")
+    if writer.written:
+        print(f"✅ Updated {', '.join(writer.written)} with all {len(location_pages)} location pages")
+    else:
+        print(f"✅ No location pages changed, {', '.join(writer.shards)} already up to date")
+    print(f"✅ Total entries: {len(location_pages)}")
+
+    # Verify count
+    print(f"✅ Verified XML entries: {writer.total_urls}")
+
+    if args.notify:
+        site_url = options['site_url']
+        hashes = indexnow_notifier.location_hashes(locations['index'], locations['suburbs'], site_url, args.path)
+        queued = indexnow_notifier.enqueue(hashes, prefix=indexnow_notifier.location_url('', site_url, args.path))
+        pending = indexnow_notifier.load_state()['pending']
+        print(f"📮 Queued {len(queued)} changed location URLs for IndexNow, {len(pending)} pending in total")
+
+    return 0
 
-    for priority in sorted(priority_groups.keys(), reverse=True):
-        if priority_groups[priority]:
-            xml_content += f"  <!-- {priority_labels[priority]} -->\n"
-            for location in priority_groups[priority]:
-                xml_content += f'''  <url>
-    <loc>https://mouldrestoration.com.au/locations/{location}</loc>
-    <lastmod>2025-09-17</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>{priority}</priority>
-  </url>
-'''
-            xml_content += "\n"
-
-    xml_content += "</urlset>\n"
-
-    return xml_content
-
-# Generate and save the sitemap
-sitemap_content = generate_sitemap()
-
-with open("/Users/michaelyoussef/APP/mould-restoration-clone/public/sitemap-locations.xml", "w") as f:
-    f.write(sitemap_content)
-
-print("✅ Updated sitemap-locations.xml with all 145 location pages")
-print(f"✅ Total entries: {len(locations_with_priority)}")
-
-# Verify count
-total_count = sitemap_content.count('<loc>')
-print(f"✅ Verified XML entries: {total_count}")
-
-# Show the missing locations that were added
-current_sitemap = [
-    "abbotsford", "albert-park", "alphington", "altona", "armadale", "ascot-vale",
-    "ashwood", "aspendale", "balaclava", "balwyn", "bentleigh", "blackburn",
-    "bonbeach", "box-hill", "brighton", "brighton-east", "broadmeadows", "brunswick",
-    "bulleen", "bundoora", "burwood", "camberwell", "carlton", "carnegie", "carrum",
-    "caulfield", "chadstone", "clayton", "clifton-hill", "coburg", "collingwood",
-    "cremorne", "croydon", "dandenong", "docklands", "doncaster", "east-melbourne",
-    "edithvale", "elsternwick", "elwood", "epping", "essendon", "fairfield", "fitzroy",
-    "flemington", "footscray", "forest-hill", "glen-iris", "glen-waverley", "hampton",
-    "hawthorn", "heidelberg", "hoppers-crossing", "hughesdale", "huntingdale", "ivanhoe",
-    "kensington", "kew", "kooyong", "lalor", "laverton", "lilydale", "malvern",
-    "malvern-east", "manor-lakes", "maribyrnong", "mckinnon", "melbourne-cbd", "mentone",
-    "middle-park", "mill-park", "mitcham", "moonee-ponds", "mordialloc", "mount-waverley",
-    "mulgrave", "murrumbeena", "newport", "noble-park", "north-melbourne", "northcote",
-    "notting-hill", "nunawading", "oakleigh", "ormond", "parkdale", "parkville",
-    "point-cook", "port-melbourne", "prahran", "preston", "princes-hill", "reservoir",
-    "richmond", "ringwood", "sandringham", "seddon", "south-melbourne", "south-yarra",
-    "southbank", "spotswood", "springvale", "st-kilda", "sunshine", "tarneit",
-    "templestowe", "thomastown", "thornbury", "toorak", "truganina", "vermont",
-    "werribee", "west-melbourne", "wheelers-hill", "williams-landing", "williamstown",
-    "windsor", "wyndham-vale", "yarraville"
-]
-
-all_new_locations = [camel_to_kebab(loc) for loc in locations_with_priority.keys()]
-missing_locations = set(all_new_locations) - set(current_sitemap)
-
-print(f"\n🆕 Added {len(missing_locations)} missing locations:")
-for loc in sorted(missing_locations):
-    print(f"   • {loc}")
\ No newline at end of file
+if __name__ == '__main__':
+    sys.exit(main())
@@ -20,7 +20,7 @@ export const Armadale = () => {
         description="Armadale High Street heritage & luxury home mould experts. Established suburb specialists treating period properties & prestigious estates. Professional service. Call 1800 954 117"
         suburb="Armadale"
         postcode="3143"
-        canonicalUrl="https://mouldrestorationco.com.au/locations/armadale"
+        canonical="https://mouldrestoration.com.au/locations/armadale"
       />
       <LocalBusinessSchema
         businessName="Mould & Restoration Co"
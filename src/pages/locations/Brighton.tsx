@@ -61,7 +61,7 @@ export const Brighton = () => {
         emergency={false}
         title="Coastal Property Mould Removal & Inspection in Brighton, Melbourne"
         description={brightonMetaDescription}
-        canonical="https://mouldrestoration.com.au/services/mould-removal-brighton"
+        canonical="https://mouldrestoration.com.au/locations/brighton"
       />
 
       {/* Enhanced Schema Markup with Coastal Specializations */}
@@ -18,7 +18,7 @@ export const BrightonEast = () => {
         suburb="Brighton East"
         title="Mould Removal Brighton East - Coastal Property Specialists | Mould & Restoration Co"
         description="Brighton East residential & school zone mould experts. Boundary Road specialists treating family homes & established neighbourhood properties. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-brighton-east"
+        canonical="https://mouldrestoration.com.au/locations/brighton-east"
       />
 
       <LocalBusinessSchema
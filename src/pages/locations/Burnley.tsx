@@ -21,7 +21,7 @@ export const Burnley = () => {
         title="Professional Mould Removal Burnley VIC 3121 | Expert Inspection & Remediation"
         description="Expert mould removal services in Burnley, Melbourne. Professional inspection, safe remediation, and prevention. Sports precinct specialists. Call 1800 954 117 today."
         keywords="mould removal Burnley, mould inspection Burnley VIC, sports precinct mould specialist, MCG proximity mould service"
-        canonical="https://mouldandrestoration.com.au/locations/burnley"
+        canonical="https://mouldrestoration.com.au/locations/burnley"
       />
 
       <LocalBusinessSchema
@@ -55,7 +55,7 @@ export const Carlton = () => {
         emergency={false}
         title="Mould Removal Carlton Melbourne - Victorian Heritage Property Specialists"
         description="Mould removal Carlton Melbourne - Victorian heritage property specialists. University precinct & terrace house experts. Call 1800 954 117"
-        canonical="https://mouldrestoration.com.au/services/mould-removal-carlton"
+        canonical="https://mouldrestoration.com.au/locations/carlton"
       />
       <LocalBusinessSchema
         pageName="Carlton Mould Removal"
@@ -18,7 +18,7 @@ export const Carnegie = () => {
         suburb="Carnegie"
         title="Mould Removal Carnegie - Village Community Specialists | Mould & Restoration Co"
         description="Carnegie shopping & community hub mould specialists. Koornang Road experts treating diverse family homes & multicultural neighbourhood properties. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-carnegie"
+        canonical="https://mouldrestoration.com.au/locations/carnegie"
       />
 
       <LocalBusinessSchema
@@ -20,7 +20,7 @@ export const Caulfield = () => {
         description="Caulfield racecourse & university precinct mould experts. Station area specialists treating student housing & established family homes. Professional service. Call 1800 954 117"
         suburb="Caulfield"
         postcode="3162"
-        canonicalUrl="https://mouldrestorationco.com.au/locations/caulfield"
+        canonical="https://mouldrestoration.com.au/locations/caulfield"
       />
       <LocalBusinessSchema
         businessName="Mould & Restoration Co"
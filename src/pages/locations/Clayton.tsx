@@ -18,7 +18,7 @@ export const Clayton = () => {
         suburb="Clayton"
         title="Mould Removal Clayton - University Precinct Specialists | Mould & Restoration Co"
         description="Clayton university & research precinct mould specialists. Monash University area experts treating student accommodation & multicultural family homes. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-clayton"
+        canonical="https://mouldrestoration.com.au/locations/clayton"
       />
 
       <LocalBusinessSchema
@@ -19,7 +19,7 @@ export const Docklands = () => {
         suburb="Docklands"
         title="Mould Removal Docklands Melbourne - Professional Service - Same-day Available 7am-7pm | Mould & Restoration Co"
         description="Docklands waterfront & modern precinct mould specialists. NewQuay experts treating luxury apartments & high-density waterfront developments. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-docklands"
+        canonical="https://mouldrestoration.com.au/locations/docklands"
       />
 
       <LocalBusinessSchema
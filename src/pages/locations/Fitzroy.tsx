@@ -19,7 +19,7 @@ export const Fitzroy = () => {
         suburb="Fitzroy"
         title="Mould Removal Fitzroy Melbourne - Professional Service - Same-day Available 7am-7pm | Mould & Restoration Co"
         description="Fitzroy heritage warehouse & creative studio mould specialists. Brunswick Street professionals treating converted lofts & artist spaces. Expert service. Call 1800 954 117"
-        canonical="/services/mould-removal-fitzroy"
+        canonical="https://mouldrestoration.com.au/locations/fitzroy"
       />
 
       <LocalBusinessSchema
@@ -20,7 +20,7 @@ export const GlenIris = () => {
         description="Glen Iris leafy suburban mould specialists. Malvern Road family home experts treating established gardens & mature tree properties. Professional service. Call 1800 954 117"
         suburb="Glen Iris"
         postcode="3146"
-        canonicalUrl="https://mouldrestorationco.com.au/locations/glen-iris"
+        canonical="https://mouldrestoration.com.au/locations/glen-iris"
       />
       <LocalBusinessSchema
         businessName="Mould & Restoration Co"
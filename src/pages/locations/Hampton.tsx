@@ -18,7 +18,7 @@ export const Hampton = () => {
         suburb="Hampton"
         title="Mould Removal Hampton - Bayside Family Specialists | Mould & Restoration Co"
         description="Hampton bayside village & heritage home mould specialists. Coastal proximity experts treating weatherboard cottages & beachside properties. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-hampton"
+        canonical="https://mouldrestoration.com.au/locations/hampton"
       />
 
       <LocalBusinessSchema
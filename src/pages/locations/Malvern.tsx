@@ -21,7 +21,7 @@ export const Malvern = () => {
         description="Malvern prestigious residential & tram route mould specialists. High Street experts treating luxury period homes & established garden properties. Professional service. Call 1800 954 117"
         suburb="Malvern"
         postcode="3144"
-        canonical="https://mouldrestoration.com.au/mould-removal-malvern-melbourne"
+        canonical="https://mouldrestoration.com.au/locations/malvern"
         keywords="mould removal Malvern Melbourne, mould inspection Malvern, professional mould removal Malvern, mould treatment Malvern Melbourne"
       />
 
@@ -18,7 +18,7 @@ export const MalvernEast = () => {
         suburb="Malvern East"
         title="Mould Removal Malvern East - Prestigious Residential Specialists | Mould & Restoration Co"
         description="Malvern East period home & garden suburb mould experts. Wattletree Road professionals treating heritage properties & established family homes. Expert service. Call 1800 954 117"
-        canonical="/services/mould-removal-malvern-east"
+        canonical="https://mouldrestoration.com.au/locations/malvern-east"
       />
 
       <LocalBusinessSchema
@@ -5,7 +5,7 @@ import { Navigation } from "@/components/Navigation";
 import { Breadcrumb } from "@/components/Breadcrumb";
 import { LocationPageSEO, LocalBusinessSchema, ServiceSchema } from "@/components/seo";
 
-export const MelbourneCBD = () => {
+export const MelbourneCbd = () => {
   const breadcrumbItems = [
     { label: "Home", href: "/" },
     { label: "Services", href: "/services" },
@@ -18,7 +18,7 @@ export const MelbourneCBD = () => {
         suburb="Melbourne CBD"
         title="Mould Removal Melbourne CBD - Professional Service - Same-day Available 7am-7pm | Mould & Restoration Co"
         description="Melbourne CBD commercial & high-rise apartment mould experts. Business district specialists treating office buildings & luxury residential towers. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-melbourne-cbd"
+        canonical="https://mouldrestoration.com.au/locations/melbourne-cbd"
       />
 
       <LocalBusinessSchema
@@ -18,7 +18,7 @@ export const Mentone = () => {
         suburb="Mentone"
         title="Mould Removal Mentone - Family Beach Living Specialists | Mould & Restoration Co"
         description="Mentone beach & shopping village mould specialists. Charman Road experts treating coastal families & beachside heritage properties. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-mentone"
+        canonical="https://mouldrestoration.com.au/locations/mentone"
       />
 
       <LocalBusinessSchema
@@ -18,7 +18,7 @@ export const Mordialloc = () => {
         suburb="Mordialloc"
         title="Mould Removal Mordialloc - Creek & Beach Living Specialists | Mould & Restoration Co"
         description="Mordialloc creek & bayside village mould experts. Main Street professionals treating waterfront homes & established coastal community properties. Expert service. Call 1800 954 117"
-        canonical="/services/mould-removal-mordialloc"
+        canonical="https://mouldrestoration.com.au/locations/mordialloc"
       />
 
       <LocalBusinessSchema
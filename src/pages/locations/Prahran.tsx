@@ -21,7 +21,7 @@ export const Prahran = () => {
         description="Prahran Chapel Street & commercial district mould experts. Retail space specialists treating nightlife venues & mixed-use properties. Expert service. Call 1800 954 117"
         suburb="Prahran"
         postcode="3181"
-        canonicalUrl="https://mouldrestorationco.com.au/locations/prahran"
+        canonical="https://mouldrestoration.com.au/locations/prahran"
       />
       <LocalBusinessSchema
         businessName="Mould & Restoration Co"
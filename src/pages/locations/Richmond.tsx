@@ -23,7 +23,7 @@ export const Richmond = () => {
         emergency={false}
         title="Mould Removal Richmond Melbourne - Warehouse Conversion & Heritage Specialists"
         description="Mould removal Richmond Melbourne - Warehouse conversion specialists. Industrial heritage & Swan Street precinct experts. Call 1800 954 117"
-        canonical="https://mouldrestoration.com.au/services/mould-removal-richmond"
+        canonical="https://mouldrestoration.com.au/locations/richmond"
       />
       <LocalBusinessSchema
         pageName="Richmond Mould Removal"
@@ -18,7 +18,7 @@ export const Sandringham = () => {
         suburb="Sandringham"
         title="Mould Removal Sandringham - Beachside Living Specialists | Mould & Restoration Co"
         description="Sandringham beach & station precinct mould experts. Bay Road professionals treating coastal homes & family properties near the foreshore. Expert service. Call 1800 954 117"
-        canonical="/services/mould-removal-sandringham"
+        canonical="https://mouldrestoration.com.au/locations/sandringham"
       />
 
       <LocalBusinessSchema
@@ -19,7 +19,7 @@ export const SouthMelbourne = () => {
         suburb="South Melbourne"
         title="Mould Removal South Melbourne - Professional Service - Same-day Available 7am-7pm | Mould & Restoration Co"
         description="South Melbourne market district & heritage precinct mould experts. Clarendon Street specialists treating period terraces & converted warehouse apartments. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-south-melbourne"
+        canonical="https://mouldrestoration.com.au/locations/south-melbourne"
       />
 
       <LocalBusinessSchema
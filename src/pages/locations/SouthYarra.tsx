@@ -21,7 +21,7 @@ export const SouthYarra = () => {
         description="South Yarra apartment & high-rise mould specialists. Domain precinct professionals treating luxury towers & heritage terraces. Expert service. Call 1800 954 117"
         suburb="South Yarra"
         postcode="3141"
-        canonical="https://mouldrestoration.com.au/mould-removal-south-yarra-melbourne"
+        canonical="https://mouldrestoration.com.au/locations/south-yarra"
         keywords="mould removal South Yarra Melbourne, mould inspection South Yarra, professional mould removal South Yarra, mould treatment South Yarra Melbourne"
       />
 
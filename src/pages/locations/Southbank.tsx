@@ -19,7 +19,7 @@ export const Southbank = () => {
         suburb="Southbank"
         title="Mould Removal Southbank Melbourne - Professional Service - Same-day Available 7am-7pm | Mould & Restoration Co"
         description="Southbank luxury tower & riverside apartment mould specialists. Crown precinct experts treating high-rise living & waterfront properties. Professional service. Call 1800 954 117"
-        canonical="/services/mould-removal-southbank"
+        canonical="https://mouldrestoration.com.au/locations/southbank"
       />
 
       <LocalBusinessSchema
@@ -20,7 +20,7 @@ export const StKilda = () => {
         description="St Kilda beachside & entertainment district mould specialists. Acland Street professionals treating heritage apartments & coastal entertainment venues. Expert service. Call 1800 954 117"
         suburb="St Kilda"
         postcode="3182"
-        canonicalUrl="https://mouldrestorationco.com.au/locations/st-kilda"
+        canonical="https://mouldrestoration.com.au/locations/st-kilda"
       />
       <LocalBusinessSchema
         businessName="Mould & Restoration Co"
@@ -20,7 +20,7 @@ export const Windsor = () => {
         description="Windsor heritage terrace & Chapel Street precinct mould experts. Inner-city specialists treating period properties & converted apartments. Professional service. Call 1800 954 117"
         suburb="Windsor"
         postcode="3181"
-        canonicalUrl="https://mouldrestorationco.com.au/locations/windsor"
+        canonical="https://mouldrestoration.com.au/locations/windsor"
       />
       <LocalBusinessSchema
         businessName="Mould & Restoration Co"
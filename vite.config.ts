@@ -91,6 +91,7 @@ export default defineConfig(({ mode }) => ({
   },
   build: {
     target: 'es2020',
+    manifest: true, // dist/.vite/manifest.json, read by scripts/utilities/bundle_budget.py
     chunkSizeWarningLimit: 300, // Reduced from 600kb to enforce smaller chunks
     minify: 'terser',
     terserOptions: {